@@ -0,0 +1,89 @@
+"""
+Benchmark comparing sequential and pipelined ClippingsService.generate_output() wall-clock time for JSON and Excel
+output formats on generated Clippings file.
+
+Usage:
+    python -m benchmarks.benchmark_pipeline --clippings 200000
+"""
+
+import os
+import tempfile
+import time
+
+import click
+
+from clippings_cli.clippings_service.service import ClippingsService
+from clippings_cli.clippings_service.streams import open_output_stream
+
+CLIPPING_TEMPLATE: str = (
+    "Book {book} (Author {author})\n"
+    "- Your Highlight on page {page} | location {location}-{location_end} | Added on Sunday, 1 January 2023 05:00:00\n"
+    "\n"
+    "Highlighted content number {number} of book {book}, long enough to be similar to regular Kindle highlight.\n"
+    "==========\n"
+)
+
+
+def generate_input(path: str, clippings: int) -> None:
+    """
+    Generates Clippings input file, compressed according to path extension.
+
+    Args:
+        path (str): Path to input file.
+        clippings (int): Number of Clippings in file.
+    """
+    with open_output_stream(path) as file:
+        for number in range(clippings):
+            file.write(
+                CLIPPING_TEMPLATE.format(
+                    book=number % 500,
+                    author=number % 100,
+                    page=number % 400,
+                    location=number % 5000,
+                    location_end=number % 5000 + 2,
+                    number=number,
+                ).encode("utf8")
+            )
+
+
+def measure(input_path: str, output_path: str, format: str, pipelined: bool) -> float:
+    """
+    Measures wall-clock time of single output generation.
+
+    Args:
+        input_path (str): Path to input file.
+        output_path (str): Path to output file.
+        format (str): Output format.
+        pipelined (bool): Whether to use pipelined mode.
+
+    Returns:
+        float: Generation time in seconds.
+    """
+    service = ClippingsService(input_path=input_path, output_path=output_path)
+    start = time.perf_counter()
+    service.generate_output(format=format, pipelined=pipelined)
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--clippings", default=200_000, help="Number of generated Clippings.")
+@click.option("--compression", default="", type=click.Choice(["", ".gz", ".bz2", ".xz"]), help="Input compression.")
+def benchmark(clippings: int, compression: str):
+    """Compare sequential and pipelined output generation."""
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, f"My Clippings.txt{compression}")
+        generate_input(input_path, clippings)
+        results = []
+        for format, extension in (("json", "json"), ("excel", "xlsx")):
+            output_path = os.path.join(directory, f"Output.{extension}")
+            sequential = measure(input_path, output_path, format, pipelined=False)
+            pipelined = measure(input_path, output_path, format, pipelined=True)
+            results.append((format, sequential, pipelined))
+    click.echo(f"\nClippings: {clippings}, input: My Clippings.txt{compression}")
+    click.echo(f"{'Format':<8}{'Sequential [s]':>16}{'Pipelined [s]':>16}{'Speedup':>10}")
+    for format, sequential, pipelined in results:
+        click.echo(f"{format:<8}{sequential:>16.2f}{pipelined:>16.2f}{sequential / pipelined:>9.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
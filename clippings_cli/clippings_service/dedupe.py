@@ -0,0 +1,204 @@
+"""
+File containing FuzzyDeduplicator class finding near-duplicate Clippings, like the same passage highlighted in
+different editions of a book, with MinHash signatures and locality-sensitive hashing.
+
+Constants:
+    SHINGLE_SIZE (int) - Number of words in a single content shingle.
+    NUM_PERMUTATIONS (int) - Number of MinHash permutations (signature length).
+    DEFAULT_THRESHOLD (float) - Default estimated Jaccard similarity of duplicated Clippings contents.
+"""
+
+import hashlib
+import os
+import re
+import struct
+from operator import eq
+from typing import Iterable, Iterator
+
+from clippings_cli.clippings_service.files import WRITE_BUFFER_SIZE, atomic_write, file_lock
+
+SHINGLE_SIZE: int = 3
+NUM_PERMUTATIONS: int = 64
+DEFAULT_THRESHOLD: float = 0.8
+
+_MAX_HASH = (1 << 32) - 1
+_WORD_PATTERN = re.compile(r"\w+")
+_SHINGLE_HASHES = struct.Struct(f"<{NUM_PERMUTATIONS}I")
+_CACHE_HEADER = struct.pack("<4sHH", b"CLMH", 1, NUM_PERMUTATIONS)
+_CACHE_HEADER_SIZE = len(_CACHE_HEADER)
+_CACHE_RECORD = struct.Struct(f"<20s{NUM_PERMUTATIONS}I")
+
+
+def get_shingles(content: str) -> set[bytes]:
+    """
+    Splits content into shingles - sequences of SHINGLE_SIZE consecutive words, ignoring case and punctuation.
+    Content shorter than SHINGLE_SIZE words is a single shingle.
+
+    Args:
+        content (str): Clipping content.
+
+    Returns:
+        set[bytes]: Encoded content shingles.
+    """
+    words = _WORD_PATTERN.findall(content.casefold())
+    if len(words) <= SHINGLE_SIZE:
+        return {" ".join(words).encode("utf-8")} if words else set()
+    return {" ".join(shingle).encode("utf-8") for shingle in zip(*(words[offset:] for offset in range(SHINGLE_SIZE)))}
+
+
+def get_signature(shingles: Iterable[bytes]) -> tuple[int, ...]:
+    """
+    Computes MinHash signature of shingles set. Every shingle is hashed once with extendable-output SHAKE-128 function
+    into NUM_PERMUTATIONS independent 32-bit hashes, and every signature value is the minimum of single hash over
+    all shingles, so fraction of equal values of two signatures estimates Jaccard similarity of their shingles sets.
+
+    Args:
+        shingles (Iterable[bytes]): Content shingles.
+
+    Returns:
+        tuple[int, ...]: MinHash signature of NUM_PERMUTATIONS values.
+    """
+    hashes = [_SHINGLE_HASHES.unpack(hashlib.shake_128(shingle).digest(_SHINGLE_HASHES.size)) for shingle in shingles]
+    if not hashes:
+        return (_MAX_HASH,) * NUM_PERMUTATIONS
+    return tuple(map(min, zip(*hashes)))
+
+
+def get_bands(threshold: float) -> tuple[int, int]:
+    """
+    Selects number of LSH bands and rows per band, for which probability of becoming candidates grows the most
+    steeply around threshold - (1 / bands) ** (1 / rows) closest to threshold.
+
+    Args:
+        threshold (float): Estimated Jaccard similarity of duplicates.
+
+    Returns:
+        tuple[int, int]: Number of bands and number of rows in a band.
+    """
+    options = [
+        (bands, NUM_PERMUTATIONS // bands) for bands in range(1, NUM_PERMUTATIONS + 1) if not NUM_PERMUTATIONS % bands
+    ]
+    return min(options, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - threshold))
+
+
+class FuzzyDeduplicator:
+    """
+    Class detecting near-duplicate Clippings in a stream. Signature of every Clipping content is split into bands,
+    and every band is hashed into LSH bucket, so only Clippings sharing at least one bucket are compared. The first
+    Clipping of duplicates group is kept, next ones are reported as duplicates.
+
+    Signatures can be cached in binary file between runs, keyed with content hash, so only new Clippings are
+    shingled and hashed.
+
+    Args:
+        threshold (float): Minimal estimated Jaccard similarity of duplicated Clippings contents.
+        cache_path (str | None): Path to signatures cache file.
+
+    Attributes:
+        duplicates_count (int): Number of Clippings found to be duplicates.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, cache_path: str | None = None):
+        self.threshold: float = threshold
+        self.cache_path: str | None = cache_path
+        self.duplicates_count: int = 0
+        self._min_equal: float = threshold * NUM_PERMUTATIONS
+        bands, rows = get_bands(threshold)
+        self._bands: list[slice] = [slice(start, start + rows) for start in range(0, bands * rows, rows)]
+        self._buckets: dict[int, list[int]] = {}
+        self._signatures: list[tuple[int, ...]] = []
+        self._cache: dict[bytes, tuple[int, ...]] = {}
+        self._new_cache_records: list[bytes] = []
+        self._cache_valid: bool = True
+        if cache_path:
+            self._load_cache()
+
+    def _load_cache(self) -> None:
+        """Loads signatures from cache file under shared lock, ignoring it, if created with different settings."""
+        try:
+            with file_lock(self.cache_path, shared=True), open(self.cache_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return
+        if not data.startswith(_CACHE_HEADER) or (len(data) - _CACHE_HEADER_SIZE) % _CACHE_RECORD.size:
+            self._cache_valid = False
+            return
+        for digest, *signature in _CACHE_RECORD.iter_unpack(memoryview(data)[_CACHE_HEADER_SIZE:]):
+            self._cache[digest] = tuple(signature)
+
+    def save_cache(self) -> None:
+        """
+        Appends signatures computed in current run to cache file, rewriting it atomically if it was invalid. Cache file
+        is locked, so signatures of concurrent runs are never interleaved.
+        """
+        if not self.cache_path or (self._cache_valid and not self._new_cache_records):
+            return
+        with file_lock(self.cache_path):
+            if not self._cache_valid or not os.path.exists(self.cache_path):
+                with atomic_write(self.cache_path) as file:
+                    file.write(_CACHE_HEADER)
+                    file.writelines(_CACHE_RECORD.pack(digest, *signature) for digest, signature in self._cache.items())
+            else:
+                with open(self.cache_path, "ab", buffering=WRITE_BUFFER_SIZE) as file:
+                    file.writelines(self._new_cache_records)
+        self._cache_valid = True
+        self._new_cache_records = []
+
+    def signature(self, content: str) -> tuple[int, ...]:
+        """
+        Returns MinHash signature of content, taken from cache if possible.
+
+        Args:
+            content (str): Clipping content.
+
+        Returns:
+            tuple[int, ...]: MinHash signature.
+        """
+        digest = hashlib.sha1(content.encode("utf-8"), usedforsecurity=False).digest()
+        if (signature := self._cache.get(digest)) is None:
+            signature = self._cache[digest] = get_signature(get_shingles(content))
+            self._new_cache_records.append(_CACHE_RECORD.pack(digest, *signature))
+        return signature
+
+    def is_duplicate(self, clipping: dict) -> bool:
+        """
+        Checks if Clipping content is near-duplicate of any previously checked, not duplicated Clipping.
+
+        Args:
+            clipping (dict): Parsed Clipping.
+
+        Returns:
+            bool: Whether Clipping is a duplicate.
+        """
+        if not (content := clipping.get("content")):
+            return False
+        signature = self.signature(content)
+        keys = [hash((index, signature[band])) for index, band in enumerate(self._bands)]
+        checked = set()
+        for key in keys:
+            for candidate in self._buckets.get(key, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if sum(map(eq, signature, self._signatures[candidate])) >= self._min_equal:
+                    self.duplicates_count += 1
+                    return True
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(position)
+        return False
+
+    def filter(self, clippings: Iterable[dict]) -> Iterator[dict]:
+        """
+        Yields Clippings that are not near-duplicates of previous ones.
+
+        Args:
+            clippings (Iterable[dict]): Parsed Clippings.
+
+        Yields:
+            dict: Unique Clipping.
+        """
+        for clipping in clippings:
+            if not self.is_duplicate(clipping):
+                yield clipping
@@ -0,0 +1,112 @@
+"""
+File containing helpers for safe file access by concurrent runs - atomic replacement of output files and advisory
+locks of files shared between runs, like caches and manifests.
+
+Constants:
+    WRITE_BUFFER_SIZE (int) - Size of write buffer of atomically written files.
+    LOCK_SUFFIX (str) - Suffix of lock file created next to locked file.
+"""
+
+import os
+import secrets
+import stat
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+WRITE_BUFFER_SIZE: int = 1 << 20
+LOCK_SUFFIX: str = ".lock"
+
+_TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0) | getattr(os, "O_NOFOLLOW", 0)
+
+
+def _create_temp_file(directory: str, filename: str) -> tuple[int, str]:
+    """
+    Creates new temporary file next to written file. File is created with 0o666 mode, so the kernel applies umask
+    of the process, like for files created with open(), without reading umask.
+
+    Args:
+        directory (str): Directory of written file.
+        filename (str): Name of written file.
+
+    Returns:
+        tuple[int, str]: Descriptor and path of temporary file.
+    """
+    while True:
+        temp_path = os.path.join(directory, f".{filename}.{secrets.token_hex(8)}.tmp")
+        try:
+            return os.open(temp_path, _TEMP_FLAGS, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "wb", encoding: str | None = None) -> Iterator[IO]:
+    """
+    Opens temporary file in directory of path for writing, with large write buffer. When the block finishes without
+    error, temporary file replaces file at path in a single os.replace() call, so readers and concurrent runs see
+    either previous or complete new file, never a partially written one. On error temporary file is removed and
+    previous file is kept. Replaced file keeps its permissions, new file gets permissions following umask.
+
+    Args:
+        path (str): Path to written file. Parent directories are created if needed.
+        mode (str): Write mode. [wb|w]
+        encoding (str | None): Encoding of text mode file.
+
+    Yields:
+        IO: Temporary file object.
+    """
+    directory, filename = os.path.split(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temp_path = _create_temp_file(directory, filename)
+    try:
+        if hasattr(os, "fchmod") and os.path.exists(path):
+            os.fchmod(descriptor, stat.S_IMODE(os.stat(path).st_mode))
+        with os.fdopen(descriptor, mode, buffering=WRITE_BUFFER_SIZE, encoding=encoding) as file:
+            yield file
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+@contextmanager
+def file_lock(path: str, shared: bool = False) -> Iterator[None]:
+    """
+    Holds advisory lock of file shared by concurrent runs, waiting until it is released by other runs. Lock is taken
+    on separate lock file (path with LOCK_SUFFIX), so locked file can be atomically replaced while lock is held. Lock
+    files are never removed, as removing them would let two runs lock different files.
+
+    Args:
+        path (str): Path to locked file.
+        shared (bool): Whether to take shared (reading) lock instead of exclusive one. On Windows locks are always
+        exclusive.
+    """
+    lock_path = f"{path}{LOCK_SUFFIX}"
+    if directory := os.path.dirname(lock_path):
+        os.makedirs(directory, exist_ok=True)
+    with open(lock_path, "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
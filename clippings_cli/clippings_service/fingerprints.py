@@ -0,0 +1,283 @@
+"""
+File containing FingerprintStore class remembering Clippings already exported by previous runs, so only new Clippings
+are written to output, and BloomFilter class used by the store to skip disk lookups of new Clippings.
+
+Fingerprints are kept in state directory in two files:
+* FINGERPRINTS_DATABASE - SQLite table of fingerprints of all exported Clippings, the exact set,
+* FINGERPRINTS_FILTER - Bloom filter of the same fingerprints (header followed by filter bits), loaded into memory.
+
+Fingerprint missing in Bloom filter was certainly never exported, so new Clippings are checked in memory only. Only
+Clippings found in the filter - exported ones and rare false positives - are looked up in the database.
+
+Constants:
+    FINGERPRINT_FIELDS (tuple[str, ...]) - Clipping fields identifying exported Clipping.
+    FINGERPRINTS_DATABASE (str) - Name of fingerprints database file in state directory.
+    FINGERPRINTS_FILTER (str) - Name of Bloom filter file in state directory.
+    FILTER_CAPACITY (int) - Initial number of fingerprints Bloom filter is sized for. Filter is rebuilt with doubled
+    capacity, once it holds more fingerprints.
+    FILTER_BITS_PER_KEY (int) - Number of Bloom filter bits per fingerprint of its capacity.
+    FILTER_HASHES (int) - Number of Bloom filter bits set for every fingerprint.
+"""
+
+import hashlib
+import os
+import sqlite3
+import struct
+from typing import Iterable
+
+from clippings_cli.clippings_service.files import atomic_write, file_lock
+
+FINGERPRINT_FIELDS: tuple[str, ...] = ("book", "clipping_type", "page_number", "location", "created_at", "content")
+FINGERPRINTS_DATABASE: str = "fingerprints.sqlite3"
+FINGERPRINTS_FILTER: str = "fingerprints.bloom"
+FILTER_CAPACITY: int = 1 << 16
+FILTER_BITS_PER_KEY: int = 10
+FILTER_HASHES: int = 7
+
+_FILTER_HEADER = struct.Struct("<4sHHQQ")
+_FILTER_MAGIC = b"CLBF"
+_FILTER_VERSION = 1
+
+
+def get_fingerprint(clipping: dict) -> bytes:
+    """
+    Computes fingerprint of Clipping - 128-bit BLAKE2b digest of its FINGERPRINT_FIELDS values, so the same Clipping
+    read from Clippings file or from its export has the same fingerprint.
+
+    Args:
+        clipping (dict): Parsed Clipping.
+
+    Returns:
+        bytes: Fingerprint of Clipping.
+    """
+    book = clipping.get("book") or {}
+    values = [book.get("title"), book.get("author"), *(clipping.get(field) for field in FINGERPRINT_FIELDS[1:])]
+    return hashlib.blake2b("\x1f".join(map(str, values)).encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """
+    Class of Bloom filter of fingerprints - bit array, in which every fingerprint sets FILTER_HASHES bits, so
+    fingerprint with any of its bits unset was never added. Bit positions are derived from fingerprint itself with
+    double hashing, without hashing it again. With FILTER_BITS_PER_KEY bits per fingerprint about 1% of fingerprints
+    never added are reported as added, until number of fingerprints exceeds capacity.
+
+    Args:
+        capacity (int): Number of fingerprints filter is sized for.
+
+    Attributes:
+        capacity (int): Number of fingerprints filter is sized for.
+        count (int): Number of added fingerprints.
+        bits (bytearray): Filter bits.
+    """
+
+    def __init__(self, capacity: int = FILTER_CAPACITY):
+        self.capacity: int = capacity
+        self.count: int = 0
+        self.bits: bytearray = bytearray(capacity * FILTER_BITS_PER_KEY // 8 + 1)
+        self._size: int = len(self.bits) * 8
+
+    def _positions(self, fingerprint: bytes) -> list[int]:
+        """
+        Returns positions of filter bits of fingerprint.
+
+        Args:
+            fingerprint (bytes): Fingerprint of at least 16 bytes.
+
+        Returns:
+            list[int]: Bit positions.
+        """
+        first = int.from_bytes(fingerprint[:8], "little")
+        second = int.from_bytes(fingerprint[8:16], "little") | 1
+        return [(first + index * second) % self._size for index in range(FILTER_HASHES)]
+
+    def add(self, fingerprint: bytes) -> None:
+        """
+        Adds fingerprint to filter.
+
+        Args:
+            fingerprint (bytes): Fingerprint.
+        """
+        bits = self.bits
+        for position in self._positions(fingerprint):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, fingerprint: bytes) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(fingerprint))
+
+    def save(self, path: str) -> None:
+        """
+        Writes filter to file, replacing it atomically.
+
+        Args:
+            path (str): Path to filter file.
+        """
+        with atomic_write(path) as file:
+            file.write(_FILTER_HEADER.pack(_FILTER_MAGIC, _FILTER_VERSION, FILTER_HASHES, self.capacity, self.count))
+            file.write(self.bits)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter | None":
+        """
+        Reads filter from file.
+
+        Args:
+            path (str): Path to filter file.
+
+        Returns:
+            BloomFilter | None: Loaded filter or None, if file does not exist or was created with different settings.
+        """
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            magic, version, hashes, capacity, count = _FILTER_HEADER.unpack_from(data)
+        except struct.error:
+            return None
+        header_size = _FILTER_HEADER.size
+        bits = memoryview(data)[header_size:]
+        if (magic, version, hashes) != (_FILTER_MAGIC, _FILTER_VERSION, FILTER_HASHES):
+            return None
+        if len(bits) != capacity * FILTER_BITS_PER_KEY // 8 + 1:
+            return None
+        bloom_filter = cls(capacity)
+        bloom_filter.bits[:], bloom_filter.count = bits, count
+        return bloom_filter
+
+
+class FingerprintStore:
+    """
+    Class checking whether Clippings were exported by previous runs, kept in state directory. Fingerprints of new
+    Clippings are kept in memory until commit() is called after successful export, so Clippings of failed run are
+    exported again by the next one. Commits of concurrent runs are serialized with file lock of the database.
+
+    Args:
+        state_dir (str): Path to state directory. It is created, if needed.
+
+    Attributes:
+        state_dir (str): Path to state directory.
+        database_path (str): Path to fingerprints database.
+        filter_path (str): Path to Bloom filter file.
+        exported_count (int): Number of checked Clippings exported by previous runs or earlier in the same run.
+    """
+
+    def __init__(self, state_dir: str):
+        self.state_dir: str = state_dir
+        self.database_path: str = os.path.join(state_dir, FINGERPRINTS_DATABASE)
+        self.filter_path: str = os.path.join(state_dir, FINGERPRINTS_FILTER)
+        self.exported_count: int = 0
+        self._connection: sqlite3.Connection | None = None
+        self._new: set[bytes] = set()
+        os.makedirs(state_dir, exist_ok=True)
+        self._filter: BloomFilter = BloomFilter.load(self.filter_path) or self._rebuild_filter()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens fingerprints database, creating fingerprints table, if needed.
+
+        Returns:
+            sqlite3.Connection: Database connection.
+        """
+        connection = sqlite3.connect(self.database_path, timeout=60, check_same_thread=False)
+        connection.execute("CREATE TABLE IF NOT EXISTS fingerprints (fingerprint BLOB PRIMARY KEY) WITHOUT ROWID")
+        return connection
+
+    def _rebuild_filter(self, new: Iterable[bytes] = ()) -> BloomFilter:
+        """
+        Builds Bloom filter of all fingerprints of the database and given new fingerprints, sized for twice their
+        number.
+
+        Args:
+            new (Iterable[bytes]): Fingerprints not committed to the database yet.
+
+        Returns:
+            BloomFilter: Bloom filter of fingerprints.
+        """
+        new = list(new)
+        connection = self._connect()
+        try:
+            stored = connection.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+            bloom_filter = BloomFilter(max(FILTER_CAPACITY, 2 * (stored + len(new))))
+            for (fingerprint,) in connection.execute("SELECT fingerprint FROM fingerprints"):
+                bloom_filter.add(fingerprint)
+        finally:
+            connection.close()
+        for fingerprint in new:
+            bloom_filter.add(fingerprint)
+        return bloom_filter
+
+    def _is_stored(self, fingerprint: bytes) -> bool:
+        """
+        Looks up fingerprint in fingerprints database.
+
+        Args:
+            fingerprint (bytes): Fingerprint.
+
+        Returns:
+            bool: Whether fingerprint is stored in the database.
+        """
+        if self._connection is None:
+            if not os.path.exists(self.database_path):
+                return False
+            self._connection = self._connect()
+        query = "SELECT 1 FROM fingerprints WHERE fingerprint = ?"
+        return self._connection.execute(query, (fingerprint,)).fetchone() is not None
+
+    def is_new(self, clipping: dict) -> bool:
+        """
+        Checks if Clipping was not exported yet, registering it as exported by current run, if it is new. Fingerprints
+        of current run are kept in a set, so Bloom filter holds only stored fingerprints and keeps its false positive
+        rate, however many new Clippings are checked.
+
+        Args:
+            clipping (dict): Parsed Clipping.
+
+        Returns:
+            bool: Whether Clipping is new.
+        """
+        fingerprint = get_fingerprint(clipping)
+        if fingerprint in self._new or (fingerprint in self._filter and self._is_stored(fingerprint)):
+            self.exported_count += 1
+            return False
+        self._new.add(fingerprint)
+        return True
+
+    def commit(self) -> None:
+        """
+        Stores fingerprints of Clippings exported by current run. Bloom filter is saved first, merged with filter saved
+        by concurrent runs meanwhile, so it never misses a fingerprint of the database, even if run is interrupted
+        before fingerprints are inserted. Filter holding more fingerprints than its capacity is rebuilt from the
+        database, with doubled capacity.
+        """
+        if not self._new:
+            self.close()
+            return
+        with file_lock(self.database_path):
+            bloom_filter = BloomFilter.load(self.filter_path)
+            if bloom_filter is None or bloom_filter.count + len(self._new) > bloom_filter.capacity:
+                bloom_filter = self._rebuild_filter(self._new)
+            else:
+                for fingerprint in self._new:
+                    bloom_filter.add(fingerprint)
+            bloom_filter.save(self.filter_path)
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO fingerprints VALUES (?)",
+                        ((fingerprint,) for fingerprint in sorted(self._new)),
+                    )
+            finally:
+                connection.close()
+        self._filter, self._new = bloom_filter, set()
+        self.close()
+
+    def close(self) -> None:
+        """Closes database connection used for lookups."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -1,28 +1,124 @@
 """
-File containing functions for handling Excel Clippings file.
+File containing functions for handling Excel Clippings file. Workbooks are written in write-only mode, so rows are
+streamed to output instead of being kept in memory.
+
+Constants:
+    FIELDS (OrderedDict[str, dict]) - Excel columns by header - Clipping field, fetch method, width and number flag.
+    Columns of integer page and location ranges follow columns of earlier exports, so their positions are kept.
+    NOTE_FIELD (tuple[str, dict]) - Excel column of notes joined to highlights, written after content column.
+    SUMMARY_FIELDS (dict[str, int]) - Widths of summary sheet columns by header.
+    EXCEL_MAX_ROWS (int) - Maximal number of rows of Excel sheet, including headers row.
+    SHEET_TITLE_LENGTH (int) - Maximal length of Excel sheet title.
+    CLIPPINGS_SHEET_TITLE (str) - Title of sheet containing all Clippings.
+    SUMMARY_SHEET_TITLE (str) - Title of summary sheet of per-book sheets workbook.
+    MAX_OPEN_SHEETS (int) - Maximal number of per-book sheets written at once. Every open sheet keeps its temporary
+    file open, so rows of further books are spilled to temporary file and written after all Clippings are grouped.
 """
 
-import os
+import json
+import re
+import tempfile
 from collections import OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
 from openpyxl.workbook import Workbook
-from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+
+from clippings_cli.clippings_service.streams import open_output_stream
+from clippings_cli.clippings_service.validators import describe_errors
 
 FIELDS: OrderedDict[str, dict] = OrderedDict(
     [
-        ("Book title", {"fetch_method": lambda clipping: clipping["book"]["title"], "width": 20}),
-        ("Book author", {"fetch_method": lambda clipping: clipping["book"]["author"], "width": 20}),
-        ("Content", {"fetch_method": lambda clipping: clipping["content"], "width": 100}),
-        ("Page number", {"fetch_method": lambda clipping: clipping["page_number"], "width": 10, "is_number": True}),
-        ("Location", {"fetch_method": lambda clipping: clipping["location"], "width": 10}),
-        ("Created at", {"fetch_method": lambda clipping: clipping["created_at"], "width": 10}),
-        ("Clipping type", {"fetch_method": lambda clipping: clipping["clipping_type"], "width": 10}),
-        ("Errors", {"fetch_method": lambda clipping: str(clipping["errors"]), "width": 20}),
+        (
+            "Book title",
+            {"field": "book", "fetch_method": lambda clipping: (clipping.get("book") or {}).get("title"), "width": 20},
+        ),
+        (
+            "Book author",
+            {"field": "book", "fetch_method": lambda clipping: (clipping.get("book") or {}).get("author"), "width": 20},
+        ),
+        ("Content", {"field": "content", "fetch_method": lambda clipping: clipping.get("content"), "width": 100}),
+        (
+            "Page number",
+            {"field": "page_number", "fetch_method": lambda clipping: clipping.get("page_number"), "width": 10},
+        ),
+        ("Location", {"field": "location", "fetch_method": lambda clipping: clipping.get("location"), "width": 10}),
+        (
+            "Created at",
+            {"field": "created_at", "fetch_method": lambda clipping: clipping.get("created_at"), "width": 10},
+        ),
+        (
+            "Clipping type",
+            {"field": "clipping_type", "fetch_method": lambda clipping: clipping.get("clipping_type"), "width": 10},
+        ),
+        (
+            "Errors",
+            {
+                "field": "errors",
+                "fetch_method": lambda clipping: describe_errors(clipping.get("errors", 0)) or None,
+                "width": 20,
+            },
+        ),
+        (
+            "Page start",
+            {
+                "field": "page_start",
+                "fetch_method": lambda clipping: clipping.get("page_start"),
+                "width": 10,
+                "is_number": True,
+            },
+        ),
+        (
+            "Page end",
+            {
+                "field": "page_end",
+                "fetch_method": lambda clipping: clipping.get("page_end"),
+                "width": 10,
+                "is_number": True,
+            },
+        ),
+        (
+            "Location start",
+            {
+                "field": "location_start",
+                "fetch_method": lambda clipping: clipping.get("location_start"),
+                "width": 10,
+                "is_number": True,
+            },
+        ),
+        (
+            "Location end",
+            {
+                "field": "location_end",
+                "fetch_method": lambda clipping: clipping.get("location_end"),
+                "width": 10,
+                "is_number": True,
+            },
+        ),
     ]
 )
+NOTE_FIELD: tuple[str, dict] = (
+    "Note",
+    {"field": "note", "fetch_method": lambda clipping: (clipping.get("note") or {}).get("content"), "width": 50},
+)
+SUMMARY_FIELDS: dict[str, int] = {
+    "Book title": 20,
+    "Book author": 20,
+    "Sheet": 20,
+    "Clippings": 10,
+    "Highlights": 10,
+    "Notes": 10,
+    "Bookmarks": 10,
+}
+EXCEL_MAX_ROWS: int = 1_048_576
+SHEET_TITLE_LENGTH: int = 31
+CLIPPINGS_SHEET_TITLE: str = "Clippings"
+SUMMARY_SHEET_TITLE: str = "Summary"
+MAX_OPEN_SHEETS: int = 64
 HEADERS_STYLING = {
     "font": Font(bold=True, color="FFFFFF"),
     "fill": PatternFill(start_color="595959", end_color="595959", fill_type="solid"),
@@ -36,81 +132,269 @@ DATA_STYLING: dict = {
     "font": Font(color="000000"),
     "fill": PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid"),
     "alignment": Alignment(horizontal="left", vertical="center"),
+    "number_alignment": Alignment(horizontal="right", vertical="center"),
+    "number_format": "0",
     "border": Border(
         left=Side(style="thin"), right=Side(style="thin"), top=Side(style="thin"), bottom=Side(style="thin")
     ),
 }
 
 
-def apply_headers_styling(ws: Worksheet) -> None:
+def get_sheet_title(name: str, used_titles: set[str]) -> str:
     """
-    Function to apply styling to Worksheet headers:
-    * Background color
-    * Font color
-    * Borders
-    * Enable filtering
-    * Column width
+    Converts name to unique Excel sheet title - characters not allowed in sheet titles are replaced and title is
+    truncated to SHEET_TITLE_LENGTH characters. Titles used already (compared case-insensitively) get number suffix,
+    like "Book title (2)". Returned title is added to used titles.
 
     Args:
-        ws (Worksheet): Excel worksheet object.
+        name (str): Sheet name, like book title.
+        used_titles (set[str]): Lowercase titles of workbook sheets.
+
+    Returns:
+        str: Sheet title.
+    """
+    base = re.sub(r"[\[\]:*?/\\]", " ", name).strip(" '")[:SHEET_TITLE_LENGTH] or "Unknown"
+    title, number = base, 1
+    while title.lower() in used_titles:
+        number += 1
+        suffix = f" ({number})"
+        title = base[: SHEET_TITLE_LENGTH - len(suffix)] + suffix
+    used_titles.add(title.lower())
+    return title
+
+
+class _SheetWriter:
+    """
+    Writer of rows of single group (all Clippings or Clippings of single book) into write-only sheets with styled
+    headers row and data cells. When sheet reaches max_rows, following rows are written to next sheet, with the same
+    headers.
+
+    Args:
+        workbook (Workbook): Write-only workbook.
+        name (str): Name of the group, used for sheet titles.
+        headers (list[str]): Column headers.
+        widths (list[int]): Column widths.
+        used_titles (set[str]): Lowercase titles of workbook sheets.
+        max_rows (int): Maximal number of sheet rows, including headers row.
+        numbers (list[bool] | None): Number flags of columns or None if there are no number columns.
+
+    Attributes:
+        titles (list[str]): Titles of written sheets.
+    """
+
+    def __init__(
+        self,
+        workbook: Workbook,
+        name: str,
+        headers: list[str],
+        widths: list[int],
+        used_titles: set[str],
+        max_rows: int = EXCEL_MAX_ROWS,
+        numbers: list[bool] | None = None,
+    ):
+        self.titles: list[str] = []
+        self._workbook = workbook
+        self._name = name
+        self._headers = headers
+        self._widths = widths
+        self._used_titles = used_titles
+        self._max_rows = max_rows
+        self._numbers = numbers or [False] * len(headers)
+        self._sheet: WriteOnlyWorksheet | None = None
+        self._cells: list[WriteOnlyCell] = []
+        self._rows = 0
+
+    def _add_sheet(self) -> None:
+        """Closes current sheet with headers filter and starts next one with styled headers row and data cells."""
+        self._close_sheet()
+        title = get_sheet_title(self._name, self._used_titles)
+        self._sheet = self._workbook.create_sheet(title)
+        self.titles.append(title)
+        for column, width in enumerate(self._widths, 1):
+            self._sheet.column_dimensions[get_column_letter(column)].width = width
+        self._sheet.append([_header_cell(self._sheet, header) for header in self._headers])
+        self._cells = [_data_cell(self._sheet, is_number) for is_number in self._numbers]
+        self._rows = 1
+
+    def _close_sheet(self) -> None:
+        """Adds filter of all written rows to headers of current sheet and closes its temporary file."""
+        if self._sheet is not None:
+            self._sheet.auto_filter.ref = f"A1:{get_column_letter(len(self._headers))}{self._rows}"
+            self._sheet.close()
+
+    def start(self) -> None:
+        """Creates first sheet with headers row, if it was not created yet, fixing sheet position in workbook."""
+        if self._sheet is None:
+            self._add_sheet()
+
+    def append(self, row: list[Any]) -> None:
+        """
+        Appends row to current sheet, starting next sheet if current one is full. Rows are written out on append,
+        so styled cells of every column are created once per sheet and only their values are replaced.
+
+        Args:
+            row (list[Any]): Row values.
+        """
+        if self._sheet is None or self._rows == self._max_rows:
+            self._add_sheet()
+        for cell, value in zip(self._cells, row):
+            cell.value = value
+        self._sheet.append(self._cells)
+        self._rows += 1
+
+    def close(self) -> None:
+        """Finishes last sheet, creating sheet with headers only, if no rows were written."""
+        self.start()
+        self._close_sheet()
+
+
+def _header_cell(ws: WriteOnlyWorksheet, header: str) -> WriteOnlyCell:
     """
-    for cell in ws[1]:
-        cell.font = HEADERS_STYLING["font"]
-        cell.fill = HEADERS_STYLING["fill"]
-        cell.alignment = HEADERS_STYLING["alignment"]
-        cell.border = HEADERS_STYLING["border"]
+    Creates headers row cell of write-only sheet, styled according to HEADERS_STYLING dictionary.
 
-    # Add filters to the headers
-    ws.auto_filter.ref = ws.dimensions
+    Args:
+        ws (WriteOnlyWorksheet): Write-only worksheet.
+        header (str): Column header.
 
-    # Adjust column widths
-    for col in ws.columns:
-        col_letter = col[0].column_letter
-        ws.column_dimensions[col_letter].width = FIELDS[col[0].value].get("width", 2)
+    Returns:
+        WriteOnlyCell: Styled cell.
+    """
+    cell = WriteOnlyCell(ws, value=header)
+    cell.font = HEADERS_STYLING["font"]
+    cell.fill = HEADERS_STYLING["fill"]
+    cell.alignment = HEADERS_STYLING["alignment"]
+    cell.border = HEADERS_STYLING["border"]
+    return cell
 
 
-def apply_data_cells_styling(ws: Worksheet):
+def _data_cell(ws: WriteOnlyWorksheet, is_number: bool = False) -> WriteOnlyCell:
     """
-    Function to apply styling to Worksheet data cells:
-    * Background color
-    * Font color
-    * Borders
+    Creates data cell of write-only sheet column, styled according to DATA_STYLING dictionary - cells of number
+    columns are right aligned and formatted as integers.
 
     Args:
-        ws (Worksheet): Excel worksheet object.
+        ws (WriteOnlyWorksheet): Write-only worksheet.
+        is_number (bool): Whether cell belongs to number column.
+
+    Returns:
+        WriteOnlyCell: Styled cell.
     """
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-        for cell in row:
-            cell.font = DATA_STYLING["font"]
-            cell.fill = DATA_STYLING["fill"]
-            cell.alignment = DATA_STYLING["alignment"]
-            cell.border = DATA_STYLING["border"]
+    cell = WriteOnlyCell(ws)
+    cell.font = DATA_STYLING["font"]
+    cell.fill = DATA_STYLING["fill"]
+    cell.border = DATA_STYLING["border"]
+    if is_number:
+        cell.alignment = DATA_STYLING["number_alignment"]
+        cell.number_format = DATA_STYLING["number_format"]
+    else:
+        cell.alignment = DATA_STYLING["alignment"]
+    return cell
 
 
-def generate_excel(clippings: list[dict[str, Any]], output_path: Path | str) -> dict:
+def generate_excel(
+    clippings: Iterable[dict[str, Any]],
+    output_path: Path | str,
+    fields: Iterable[str] | None = None,
+    sheet_per_book: bool = False,
+    max_rows: int = EXCEL_MAX_ROWS,
+    notes: bool = False,
+) -> dict:
     """
-    In provided output_path creates Excel file containing data collected from Clippings input file.
+    In provided output_path creates Excel file containing data collected from Clippings input file. Workbook is
+    written in write-only mode - rows are streamed to temporary sheet files, with styled headers row and data cells,
+    number columns formatted as integers. Sheets reaching max_rows are continued in next sheets, like "Clippings (2)".
+
+    With sheet_per_book, Clippings of every book are written to separate sheet, titled after the book, and summary
+    sheet with numbers of Clippings of every book, counted in the same pass, is placed first.
 
     Args:
-        clippings (list[dict]): List of collected Clippings.
-        output_path (Path | str): Path to output file.
+        clippings (Iterable[dict]): Collected Clippings.
+        output_path (Path | str): Path to output file, compressed output file or "-" for standard output.
+        fields (Iterable[str] | None): Clipping fields to write or None for all columns. Only columns of requested
+        fields are fetched.
+        sheet_per_book (bool): Whether to write Clippings of every book to separate sheet, with summary sheet.
+        max_rows (int): Maximal number of sheet rows, including headers row.
+        notes (bool): Whether to write content of notes joined to highlights in "Note" column.
 
     Returns:
         dict: Dictionary containing data about potential errors.
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.append(list(FIELDS.keys()))
-
-    for clipping in clippings:
-        ws.append([FIELDS[key]["fetch_method"](clipping) for key in FIELDS])
+    fields = set(fields) if fields is not None else None
+    columns = [(key, column) for key, column in FIELDS.items() if fields is None or column["field"] in fields]
+    if notes:
+        columns.insert(
+            next((i + 1 for i, (key, _) in enumerate(columns) if key == "Content"), len(columns)), NOTE_FIELD
+        )
+    headers = [key for key, _ in columns]
+    widths = [column.get("width", 2) for _, column in columns]
+    numbers = [column.get("is_number", False) for _, column in columns]
+    fetch_methods = [column["fetch_method"] for _, column in columns]
+    wb = Workbook(write_only=True)
+    used_titles: set[str] = set()
 
-    apply_headers_styling(ws)
-    apply_data_cells_styling(ws)
+    if not sheet_per_book:
+        writer = _SheetWriter(wb, CLIPPINGS_SHEET_TITLE, headers, widths, used_titles, max_rows, numbers)
+        for clipping in clippings:
+            writer.append([fetch_method(clipping) for fetch_method in fetch_methods])
+        writer.close()
+    else:
+        summary = _SheetWriter(
+            wb, SUMMARY_SHEET_TITLE, list(SUMMARY_FIELDS), list(SUMMARY_FIELDS.values()), used_titles, max_rows
+        )
+        # Summary sheet is created before sheets of books, so it is the first sheet of workbook.
+        summary.start()
+        writers: dict[tuple[str, str], _SheetWriter] = {}
+        counts: dict[tuple[str, str], list[int]] = {}
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as spill:
+            for clipping in clippings:
+                book = clipping.get("book") or {}
+                key = (book.get("title") or "Unknown", book.get("author") or "Unknown")
+                row = [fetch_method(clipping) for fetch_method in fetch_methods]
+                if key not in counts:
+                    counts[key] = [0, 0, 0, 0]
+                    if len(writers) < MAX_OPEN_SHEETS:
+                        writers[key] = _SheetWriter(wb, key[0], headers, widths, used_titles, max_rows, numbers)
+                if (writer := writers.get(key)) is not None:
+                    writer.append(row)
+                else:
+                    spill.write(json.dumps([*key, row], ensure_ascii=False, default=str) + "\n")
+                book_counts = counts[key]
+                book_counts[0] += 1
+                match clipping.get("clipping_type"):
+                    case "Highlight":
+                        book_counts[1] += 1
+                    case "Note":
+                        book_counts[2] += 1
+                    case "Bookmark":
+                        book_counts[3] += 1
+            for writer in writers.values():
+                writer.close()
+            # Spilled books are written in batches of MAX_OPEN_SHEETS sheets, every batch in one pass over spill file.
+            spilled = [key for key in counts if key not in writers]
+            for batch_start in range(0, len(spilled), MAX_OPEN_SHEETS):
+                batch_end = batch_start + MAX_OPEN_SHEETS
+                batch = {
+                    key: _SheetWriter(wb, key[0], headers, widths, used_titles, max_rows, numbers)
+                    for key in spilled[batch_start:batch_end]
+                }
+                spill.seek(0)
+                for line in spill:
+                    title, author, row = json.loads(line)
+                    if (writer := batch.get((title, author))) is not None:
+                        writer.append(row)
+                for writer in batch.values():
+                    writer.close()
+                writers.update(batch)
+        for key, book_counts in counts.items():
+            summary.append([*key, writers[key].titles[0], *book_counts])
+        summary.close()
 
     try:
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        wb.save(output_path)
+        with open_output_stream(str(output_path)) as stream:
+            wb.save(stream)
     except PermissionError as e:
+        for ws in wb.worksheets:
+            if not ws.closed:
+                ws.close()
         return {"error": e}
     return {}
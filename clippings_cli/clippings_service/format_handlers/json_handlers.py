@@ -2,27 +2,39 @@
 File containing functions for handling JSON Clippings file.
 """
 
+import io
 import json
-import os
-from typing import Any
+from typing import Any, Iterable
 
+from clippings_cli.clippings_service.streams import open_output_stream
 
-def generate_json(clippings: list[dict[str, Any]], output_path: str):
+
+def generate_json(clippings: Iterable[dict[str, Any]], output_path: str):
     """
-    In provided output_path creates JSON file containing data collected from Clippings input file.
+    In provided output_path creates JSON file containing data collected from Clippings input file. Clippings are
+    encoded and written one by one, so they can be streamed from parser straight to output.
 
     Args:
-        clippings (list[dict]): List of collected Clippings.
-        output_path (str): Full path to output file.
+        clippings (Iterable[dict]): Collected Clippings.
+        output_path (str): Full path to output file, compressed output file or "-" for standard output.
 
     Returns:
         dict: Dictionary containing data about potential errors.
     """
 
     try:
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as json_file:
-            json.dump(clippings, json_file, ensure_ascii=False, indent=4)
+        with open_output_stream(output_path) as stream:
+            json_file = io.TextIOWrapper(stream, encoding="utf-8")
+            try:
+                separator = "[\n    "
+                for clipping in clippings:
+                    json_file.write(separator)
+                    json_file.write(json.dumps(clipping, ensure_ascii=False, indent=4).replace("\n", "\n    "))
+                    separator = ",\n    "
+                json_file.write("[]" if separator == "[\n    " else "\n]")
+            finally:
+                json_file.flush()
+                json_file.detach()
     except PermissionError as e:
         return {"error": e}
     return {}
@@ -0,0 +1,284 @@
+"""
+File containing functions for handling per-book Markdown and HTML Clippings pages.
+
+Constants:
+    PAGE_FORMATS (dict[str, PageFormat]) - Templates and file extension of every supported page format.
+    PAGE_WORKERS (int) - Number of threads rendering and writing book pages.
+    MANIFEST_FILENAME (str) - Name of file storing content hashes of written pages in output directory.
+    PAGE_FIELDS (tuple[str, ...]) - Clipping fields rendered on every page, required when output fields are selected.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+from typing import Any, Callable, Iterable, NamedTuple
+
+from clippings_cli.clippings_service.files import atomic_write, file_lock
+from clippings_cli.clippings_service.streams import STDIO_PATH
+
+PAGE_FIELDS: tuple[str, ...] = ("book", "clipping_type", "location", "created_at", "content")
+
+_MARKDOWN_INLINE_PATTERN = re.compile(r"([\\`*_\[\]<&|~])")
+_MARKDOWN_BLOCK_PATTERN = re.compile(r"^([ \t]*)([#>+=-])", re.MULTILINE)
+_MARKDOWN_LIST_PATTERN = re.compile(r"^([ \t]*\d+)([.)])", re.MULTILINE)
+
+
+def escape_markdown(value: str) -> str:
+    """
+    Escapes Markdown metacharacters of text with backslashes, so Clippings text is rendered literally. Characters
+    special anywhere (emphasis, links, code, tables, raw HTML and entities) are always escaped, characters starting
+    headings, quotes and lists only at line start.
+
+    Args:
+        value (str): Text.
+
+    Returns:
+        str: Escaped text.
+    """
+    value = _MARKDOWN_INLINE_PATTERN.sub(r"\\\1", value)
+    value = _MARKDOWN_BLOCK_PATTERN.sub(r"\1\\\2", value)
+    return _MARKDOWN_LIST_PATTERN.sub(r"\1\\\2", value)
+
+
+class PageFormat(NamedTuple):
+    """Precompiled templates of page format."""
+
+    extension: str
+    escape: Callable[[str], str]
+    quote: Callable[[str], str]
+    book: Template
+    clipping: Template
+    note: Template
+    index: Template
+    index_entry: Template
+
+
+PAGE_FORMATS: dict[str, PageFormat] = {
+    "markdown": PageFormat(
+        extension="md",
+        escape=escape_markdown,
+        quote=lambda value: value.replace("\n", "\n> "),
+        book=Template("# $title\n\n*$author*\n\n$clippings"),
+        clipping=Template("## $clipping_type - $position\n\n*$created_at*\n\n> $content\n\n$note"),
+        note=Template("**Note:** $content\n\n"),
+        index=Template("# Clippings\n\n$books"),
+        index_entry=Template("* [$title]($filename) - $author ($count)\n"),
+    ),
+    "html": PageFormat(
+        extension="html",
+        escape=html.escape,
+        quote=lambda value: value.replace("\n", "<br>\n"),
+        book=Template(
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>$title</title>\n</head>\n<body>\n'
+            "<h1>$title</h1>\n<p><em>$author</em></p>\n$clippings</body>\n</html>\n"
+        ),
+        clipping=Template(
+            "<section>\n<h2>$clipping_type - $position</h2>\n<p><em>$created_at</em></p>\n"
+            "<blockquote>$content</blockquote>\n$note</section>\n"
+        ),
+        note=Template("<p><strong>Note:</strong> $content</p>\n"),
+        index=Template(
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>Clippings</title>\n</head>\n<body>\n'
+            "<h1>Clippings</h1>\n<ul>\n$books</ul>\n</body>\n</html>\n"
+        ),
+        index_entry=Template('<li><a href="$filename">$title</a> - $author ($count)</li>\n'),
+    ),
+}
+PAGE_WORKERS: int = min(8, (os.cpu_count() or 1) + 4)
+MANIFEST_FILENAME: str = ".manifest.json"
+
+_SLUG_PATTERN = re.compile(r"[^\w]+")
+
+
+def get_page_filename(title: str, author: str, extension: str) -> str:
+    """
+    Returns file name of book page - slug of book title followed by short hash of book title and author, so pages of
+    books with similar titles never overwrite each other.
+
+    Args:
+        title (str): Book title.
+        author (str): Book author.
+        extension (str): Page file extension.
+
+    Returns:
+        str: Page file name, like "django-for-apis-1a2b3c4d.md".
+    """
+    slug = _SLUG_PATTERN.sub("-", title.lower()).strip("-")[:80] or "book"
+    digest = hashlib.sha1(f"{title}\n{author}".encode("utf-8"), usedforsecurity=False).hexdigest()[:8]
+    return f"{slug}-{digest}.{extension}"
+
+
+def render_book_page(page_format: PageFormat, title: str, author: str, clippings: list[dict[str, Any]]) -> str:
+    """
+    Renders page of single book. Notes joined to highlights are rendered below highlighted content.
+
+    Args:
+        page_format (PageFormat): Page format.
+        title (str): Book title.
+        author (str): Book author.
+        clippings (list[dict]): Clippings of the book.
+
+    Returns:
+        str: Page content.
+    """
+    escape = page_format.escape
+    entries = []
+    for clipping in clippings:
+        position = f"location {clipping.get('location')}"
+        if clipping.get("page_number"):
+            position = f"page {clipping['page_number']}, {position}"
+        entries.append(
+            page_format.clipping.substitute(
+                clipping_type=escape(clipping.get("clipping_type") or ""),
+                position=escape(position),
+                created_at=escape(clipping.get("created_at") or ""),
+                content=page_format.quote(escape(clipping.get("content") or "")),
+                note=(
+                    page_format.note.substitute(content=page_format.quote(escape(note.get("content") or "")))
+                    if (note := clipping.get("note"))
+                    else ""
+                ),
+            )
+        )
+    return page_format.book.substitute(title=escape(title), author=escape(author), clippings="".join(entries))
+
+
+def _write_page(path: str, content: str, known_hash: str | None) -> tuple[str, bool]:
+    """
+    Writes page file atomically, unless its content hash is equal to hash stored in manifest and file exists.
+
+    Args:
+        path (str): Full path to page file.
+        content (str): Page content.
+        known_hash (str | None): Content hash stored in manifest.
+
+    Returns:
+        tuple[str, bool]: Content hash and whether file was written.
+    """
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    if content_hash == known_hash and os.path.exists(path):
+        return content_hash, False
+    with atomic_write(path, "w", encoding="utf-8") as file:
+        file.write(content)
+    return content_hash, True
+
+
+def _write_pages(
+    books: dict[tuple[str, str], list[dict]], output_path: str, manifest_path: str, page_format: PageFormat
+) -> dict[str, tuple[str, bool]]:
+    """
+    Writes pages of books and index page, which content changed since last generation, removes pages of books no
+    longer present and updates manifest.
+
+    Args:
+        books (dict[tuple[str, str], list[dict]]): Clippings by book (title, author) pair.
+        output_path (str): Full path to output directory.
+        manifest_path (str): Full path to manifest file.
+        page_format (PageFormat): Page format.
+
+    Returns:
+        dict[str, tuple[str, bool]]: Content hash and whether file was written, by page file name.
+    """
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            known_hashes = json.load(file)["files"]
+    except (FileNotFoundError, ValueError, KeyError):
+        known_hashes = {}
+
+    filenames = {key: get_page_filename(*key, page_format.extension) for key in books}
+    index = page_format.index.substitute(
+        books="".join(
+            page_format.index_entry.substitute(
+                filename=filenames[key],
+                title=page_format.escape(key[0]),
+                author=page_format.escape(key[1]),
+                count=len(books[key]),
+            )
+            for key in sorted(books)
+        )
+    )
+
+    def write_book(key: tuple[str, str]) -> tuple[str, bool]:
+        content = render_book_page(page_format, *key, books[key])
+        return _write_page(os.path.join(output_path, filenames[key]), content, known_hashes.get(filenames[key]))
+
+    index_filename = f"index.{page_format.extension}"
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS, thread_name_prefix="page-writer") as executor:
+        results = dict(zip(filenames.values(), executor.map(write_book, books)))
+    results[index_filename] = _write_page(
+        os.path.join(output_path, index_filename), index, known_hashes.get(index_filename)
+    )
+
+    for filename in known_hashes.keys() - results.keys():
+        if os.path.exists(path := os.path.join(output_path, filename)):
+            os.remove(path)
+    with atomic_write(manifest_path, "w", encoding="utf-8") as file:
+        json.dump({"files": {name: content_hash for name, (content_hash, _) in results.items()}}, file, indent=4)
+    return results
+
+
+def generate_pages(clippings: Iterable[dict[str, Any]], output_path: str, format: str) -> dict:
+    """
+    In provided output directory creates page file for every book, containing its Clippings, and index page linking
+    all of them. Clippings are grouped by book while being streamed from parser. Pages are rendered and written by
+    pool of threads. Content hashes of pages are stored in manifest file, so pages of unchanged books are not
+    rewritten on regeneration and pages of books no longer present are removed. Pages are replaced atomically and
+    manifest is locked for the whole generation, so concurrent runs writing to the same directory are serialized.
+
+    Args:
+        clippings (Iterable[dict]): Collected Clippings.
+        output_path (str): Full path to output directory.
+        format (str): Page format. [markdown|html]
+
+    Returns:
+        dict: Dictionary containing data about potential errors or numbers of written and skipped pages.
+    """
+    if output_path == STDIO_PATH:
+        return {"error": "Pages can not be written to standard output."}
+    page_format = PAGE_FORMATS[format]
+    books: dict[tuple[str, str], list[dict]] = {}
+    for clipping in clippings:
+        book = clipping.get("book") or {"title": "Unknown", "author": "Unknown"}
+        books.setdefault((book["title"], book["author"]), []).append(clipping)
+
+    manifest_path = os.path.join(output_path, MANIFEST_FILENAME)
+    try:
+        os.makedirs(output_path, exist_ok=True)
+        with file_lock(manifest_path):
+            results = _write_pages(books, output_path, manifest_path, page_format)
+    except PermissionError as e:
+        return {"error": e}
+    written = sum(is_written for _, is_written in results.values())
+    return {"written": written, "skipped": len(results) - written}
+
+
+def generate_markdown(clippings: Iterable[dict[str, Any]], output_path: str) -> dict:
+    """
+    In provided output directory creates Markdown page for every book. See generate_pages().
+
+    Args:
+        clippings (Iterable[dict]): Collected Clippings.
+        output_path (str): Full path to output directory.
+
+    Returns:
+        dict: Dictionary containing data about potential errors or numbers of written and skipped pages.
+    """
+    return generate_pages(clippings, output_path, "markdown")
+
+
+def generate_html(clippings: Iterable[dict[str, Any]], output_path: str) -> dict:
+    """
+    In provided output directory creates HTML page for every book. See generate_pages().
+
+    Args:
+        clippings (Iterable[dict]): Collected Clippings.
+        output_path (str): Full path to output directory.
+
+    Returns:
+        dict: Dictionary containing data about potential errors or numbers of written and skipped pages.
+    """
+    return generate_pages(clippings, output_path, "html")
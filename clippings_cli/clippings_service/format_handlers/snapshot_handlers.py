@@ -0,0 +1,306 @@
+"""
+File containing functions for handling binary columnar Clippings snapshot file and ClippingsSnapshot class reading it
+with memory mapping.
+
+Snapshot file layout (little-endian):
+* header - magic bytes, format version, number of blocks and number of Clippings,
+* blocks directory - name, offset and size of every block,
+* blocks, aligned to 8 bytes - UTF-8 contents with their byte offsets, fixed-width columns of book codes, Clipping type
+  codes, creation timestamps, page numbers, locations and errors codes, and string table of book titles, authors and
+  Clipping types, referenced by books and Clipping types blocks.
+
+Constants:
+    SNAPSHOT_MAGIC (bytes) - Magic bytes starting every snapshot file.
+    SNAPSHOT_VERSION (int) - Version of snapshot format.
+    SNAPSHOT_BLOCKS (dict[str, str]) - Array type code of every snapshot block, in order of blocks in file.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from typing import Any, Iterable, Iterator
+
+from clippings_cli.clippings_service.files import atomic_write
+from clippings_cli.clippings_service.streams import STDIO_PATH, strip_compression_extension
+from clippings_cli.clippings_service.table import (
+    INTEGER_COLUMNS,
+    NULL,
+    ClippingsTable,
+    build_clipping,
+    to_epoch,
+)
+from clippings_cli.clippings_service.validators import validate_codes
+
+SNAPSHOT_MAGIC: bytes = b"CLSN"
+SNAPSHOT_VERSION: int = 1
+SNAPSHOT_BLOCKS: dict[str, str] = {
+    "content": "B",
+    "content_offsets": "q",
+    "book": "i",
+    "clipping_type": "i",
+    **{name: "q" for name in INTEGER_COLUMNS},
+    "errors": "B",
+    "books": "i",
+    "clipping_types": "i",
+    "string_offsets": "q",
+    "strings": "B",
+}
+
+_HEADER = struct.Struct("<4sHHQ")
+_BLOCK_ENTRY = struct.Struct("<16sQQ")
+_DATA_START = _HEADER.size + _BLOCK_ENTRY.size * len(SNAPSHOT_BLOCKS)
+
+
+def generate_snapshot(clippings: Iterable[dict[str, Any]], output_path: str) -> dict:
+    """
+    In provided output_path creates binary columnar snapshot file containing data collected from Clippings input file.
+    Contents are encoded and written while Clippings are streamed, only fixed-width columns and string table are kept
+    in memory until input ends. Output file is replaced atomically, once the snapshot is complete.
+
+    Args:
+        clippings (Iterable[dict]): Collected Clippings.
+        output_path (str): Full path to output file.
+
+    Returns:
+        dict: Dictionary containing data about potential errors.
+    """
+    if output_path == STDIO_PATH or strip_compression_extension(output_path) != output_path:
+        return {"error": "Snapshot can only be written to uncompressed file."}
+    blocks = {name: array(typecode) for name, typecode in SNAPSHOT_BLOCKS.items() if name != "content"}
+    strings: dict[str, int] = {}
+    book_codes: dict[tuple[str, str], int] = {}
+    type_codes: dict[str, int] = {}
+    blocks["string_offsets"].append(0)
+
+    def get_string_id(value: str | None) -> int:
+        if value is None:
+            return -1
+        if (string_id := strings.get(value)) is None:
+            string_id = strings[value] = len(strings)
+            blocks["strings"].frombytes(value.encode("utf-8"))
+            blocks["string_offsets"].append(len(blocks["strings"]))
+        return string_id
+
+    try:
+        with atomic_write(output_path) as file:
+            file.write(bytes(_DATA_START))
+            offset = 0
+            blocks["content_offsets"].append(offset)
+            for clipping in clippings:
+                if book := clipping.get("book"):
+                    key = (book["title"], book["author"])
+                    if (code := book_codes.get(key)) is None:
+                        code = book_codes[key] = len(book_codes)
+                        blocks["books"].extend((get_string_id(key[0]), get_string_id(key[1])))
+                    blocks["book"].append(code)
+                else:
+                    blocks["book"].append(-1)
+                if (clipping_type := clipping.get("clipping_type")) is not None:
+                    if (code := type_codes.get(clipping_type)) is None:
+                        code = type_codes[clipping_type] = len(type_codes)
+                        blocks["clipping_types"].append(get_string_id(clipping_type))
+                    blocks["clipping_type"].append(code)
+                else:
+                    blocks["clipping_type"].append(-1)
+                blocks["created_at"].append(
+                    to_epoch(created_at) if (created_at := clipping.get("created_at")) else NULL
+                )
+                for name in INTEGER_COLUMNS[1:]:
+                    blocks[name].append(NULL if (value := clipping.get(name)) is None else value)
+                blocks["errors"].append(
+                    errors if (errors := clipping.get("errors")) is not None else validate_codes(clipping)
+                )
+                content = (clipping.get("content") or "").encode("utf-8")
+                file.write(content)
+                offset += len(content)
+                blocks["content_offsets"].append(offset)
+
+            directory_entries = [_BLOCK_ENTRY.pack(b"content", _DATA_START, offset)]
+            position = _DATA_START + offset
+            for name, values in blocks.items():
+                padding = -position % 8
+                file.write(bytes(padding))
+                position += padding
+                if sys.byteorder != "little":
+                    values.byteswap()
+                values.tofile(file)
+                size = len(values) * values.itemsize
+                directory_entries.append(_BLOCK_ENTRY.pack(name.encode("ascii"), position, size))
+                position += size
+            file.seek(0)
+            file.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(SNAPSHOT_BLOCKS), len(blocks["errors"])))
+            file.write(b"".join(directory_entries))
+    except PermissionError as e:
+        return {"error": e}
+    return {}
+
+
+class ClippingsSnapshot:
+    """
+    Read-only view of Clippings snapshot file, memory-mapped in constant time. Only header and blocks directory are
+    read on opening - columns are exposed as memoryviews of mapped file and Clippings, strings and contents are
+    decoded on access, so operating system pages in only touched parts of the file.
+
+    Args:
+        path (str): Path to snapshot file.
+
+    Attributes:
+        path (str): Path to snapshot file.
+    """
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("Snapshot can be opened only on little-endian platform.")
+        self.path: str = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._view = memoryview(self._mmap)
+            magic, version, block_count, self._length = _HEADER.unpack_from(self._mmap)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"File [{path}] is not a Clippings snapshot of version {SNAPSHOT_VERSION}.")
+            self._blocks: dict[str, memoryview] = {}
+            for index in range(block_count):
+                name, offset, size = _BLOCK_ENTRY.unpack_from(self._mmap, _HEADER.size + index * _BLOCK_ENTRY.size)
+                name = name.rstrip(b"\0").decode("ascii")
+                if (end := offset + size) > len(self._mmap):
+                    raise ValueError(f"Block [{name}] of snapshot [{path}] is truncated.")
+                self._blocks[name] = self._view[offset:end].cast(SNAPSHOT_BLOCKS[name])
+        except (ValueError, KeyError, struct.error) as e:
+            self.close()
+            if isinstance(e, ValueError):
+                raise
+            raise ValueError(f"File [{path}] is not a valid Clippings snapshot.") from e
+        self._string = lru_cache(maxsize=4096)(self._decode_string)
+
+    def close(self) -> None:
+        """Releases memoryviews and closes mapped file. Columns returned by column() can not be used afterwards."""
+        for block in getattr(self, "_blocks", {}).values():
+            block.release()
+        if (view := getattr(self, "_view", None)) is not None:
+            view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "ClippingsSnapshot":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _decode_string(self, string_id: int) -> str | None:
+        """Decodes string from string table."""
+        if string_id < 0:
+            return None
+        offsets = self._blocks["string_offsets"]
+        start, end = offsets[string_id], offsets[string_id + 1]
+        return str(self._blocks["strings"][start:end], "utf-8")
+
+    def column(self, name: str) -> memoryview:
+        """
+        Returns column of codes, integers or errors codes as memoryview of mapped file - book, clipping_type,
+        created_at (Unix timestamps), page_start, page_end, location_start, location_end or errors. Missing values
+        are NULL (or -1 code).
+
+        Args:
+            name (str): Column name.
+
+        Returns:
+            memoryview: Column values.
+        """
+        return self._blocks[name]
+
+    def book(self, code: int) -> tuple[str, str]:
+        """
+        Decodes book from book code.
+
+        Args:
+            code (int): Book code from book column.
+
+        Returns:
+            tuple[str, str]: Book title and author.
+        """
+        books = self._blocks["books"]
+        return self._string(books[code * 2]), self._string(books[code * 2 + 1])
+
+    def clipping_type(self, code: int) -> str:
+        """
+        Decodes Clipping type from Clipping type code.
+
+        Args:
+            code (int): Clipping type code from clipping_type column.
+
+        Returns:
+            str: Clipping type.
+        """
+        return self._string(self._blocks["clipping_types"][code])
+
+    def content(self, position: int) -> str:
+        """
+        Decodes content of single Clipping.
+
+        Args:
+            position (int): Clipping position.
+
+        Returns:
+            str: Clipping content.
+        """
+        offsets = self._blocks["content_offsets"]
+        start, end = offsets[position], offsets[position + 1]
+        return str(self._blocks["content"][start:end], "utf-8")
+
+    def row(self, position: int) -> dict:
+        """
+        Decodes single Clipping, with the same keys as parsed Clipping.
+
+        Args:
+            position (int): Clipping position.
+
+        Returns:
+            dict: Clipping.
+        """
+        if not 0 <= position < self._length:
+            raise IndexError("Clipping position out of range.")
+        blocks = self._blocks
+        book_code, type_code = blocks["book"][position], blocks["clipping_type"][position]
+        return build_clipping(
+            self.book(book_code) if book_code >= 0 else None,
+            self.clipping_type(type_code) if type_code >= 0 else None,
+            [blocks[name][position] for name in INTEGER_COLUMNS],
+            blocks["errors"][position],
+            self.content(position),
+        )
+
+    def to_records(self) -> Iterator[dict]:
+        """
+        Yields all Clippings as dictionaries, so snapshot can be passed to output format handlers.
+
+        Yields:
+            dict: Clipping.
+        """
+        for position in range(self._length):
+            yield self.row(position)
+
+    def to_table(self) -> ClippingsTable:
+        """
+        Loads the whole snapshot into ClippingsTable, copying columns without decoding Clippings one by one.
+
+        Returns:
+            ClippingsTable: Table of Clippings.
+        """
+        table = ClippingsTable()
+        table.books = [self.book(code) for code in range(len(self._blocks["books"]) // 2)]
+        table.clipping_types = [self.clipping_type(code) for code in range(len(self._blocks["clipping_types"]))]
+        for name in table.columns:
+            table.columns[name].frombytes(self._blocks[name].tobytes())
+        contents = [self.content(position) for position in range(self._length)]
+        table.content_buffer = "".join(contents)
+        offset = 0
+        for content in contents:
+            offset += len(content)
+            table.content_offsets.append(offset)
+        return table
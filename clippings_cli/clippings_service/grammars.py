@@ -0,0 +1,236 @@
+"""
+File containing metadata grammar of Clippings files written by Kindle devices in different UI languages and function
+compiling it into single metadata regex.
+
+Every grammar describes metadata line, like "- Your Highlight on page 3 | location 41-41 | Added on Monday, 6 February
+2023 06:32:11", with regex fragments:
+* clipping - text preceding Clipping type word ("Your"),
+* page - text preceding page number ("on page"),
+* page_location - text preceding location, when page number is present ("location"),
+* location - text preceding location, when page number is missing ("at location"),
+* added - text preceding weekday and creation datetime ("Added on"). Weekday may be hyphenated, like Portuguese
+"segunda-feira",
+* created_at - regex of creation datetime with day, month name, year, hour, minute and second groups,
+and with Clipping type words and month names of the language.
+
+Constants:
+    METADATA_GRAMMARS (dict[str, dict[str, Any]]) - Metadata grammar by language code, in order of matching.
+    CLIPPING_TYPES (tuple[str, ...]) - Clipping types, used for Clippings of every language.
+"""
+
+from typing import Any, Iterable
+
+CLIPPING_TYPES: tuple[str, ...] = ("Highlight", "Note", "Bookmark")
+METADATA_GRAMMARS: dict[str, dict[str, Any]] = {
+    "en": {
+        "clipping": r"Your",
+        "page": r"on page",
+        "page_location": r"location",
+        "location": r"at location",
+        "added": r"Added on",
+        "created_at": r"^(\d{1,2}) (\w+) (\d{4}) (\d{1,2}):(\d{2}):(\d{2})$",
+        "types": ("Highlight", "Note", "Bookmark"),
+        "months": (
+            "January",
+            "February",
+            "March",
+            "April",
+            "May",
+            "June",
+            "July",
+            "August",
+            "September",
+            "October",
+            "November",
+            "December",
+        ),
+    },
+    "de": {
+        "clipping": r"Ihre?",
+        "page": r"auf Seite",
+        "page_location": r"Position",
+        "location": r"(?:bei|an) Position",
+        "added": r"Hinzugefügt am",
+        "created_at": r"^(\d{1,2})\. (\w+) (\d{4}) (\d{1,2}):(\d{2}):(\d{2})$",
+        "types": ("Markierung", "Notiz", "Lesezeichen"),
+        "months": (
+            "Januar",
+            "Februar",
+            "März",
+            "April",
+            "Mai",
+            "Juni",
+            "Juli",
+            "August",
+            "September",
+            "Oktober",
+            "November",
+            "Dezember",
+        ),
+    },
+    "es": {
+        "clipping": r"Tu",
+        "page": r"en la página",
+        "page_location": r"posición",
+        "location": r"en la posición",
+        "added": r"Añadido el",
+        "created_at": r"^(\d{1,2}) de (\w+) de (\d{4}),? (\d{1,2}):(\d{2}):(\d{2})$",
+        "types": ("subrayado", "nota", "marcador"),
+        "months": (
+            "enero",
+            "febrero",
+            "marzo",
+            "abril",
+            "mayo",
+            "junio",
+            "julio",
+            "agosto",
+            "septiembre",
+            "octubre",
+            "noviembre",
+            "diciembre",
+        ),
+    },
+    "fr": {
+        "clipping": r"Votre",
+        "page": r"sur la page",
+        "page_location": r"emplacement",
+        "location": r"à l['’]emplacement",
+        "added": r"Ajouté le",
+        "created_at": r"^(\d{1,2})(?:er)? (\w+) (\d{4}) (\d{1,2}):(\d{2}):(\d{2})$",
+        "types": ("surlignement", "note", "signet"),
+        "months": (
+            "janvier",
+            "février",
+            "mars",
+            "avril",
+            "mai",
+            "juin",
+            "juillet",
+            "août",
+            "septembre",
+            "octobre",
+            "novembre",
+            "décembre",
+        ),
+    },
+    "it": {
+        "clipping": r"(?:La tua|Il tuo)",
+        "page": r"a pagina",
+        "page_location": r"posizione",
+        "location": r"(?:alla|in) posizione",
+        "added": r"Aggiunto in data",
+        "created_at": r"^(\d{1,2}) (\w+) (\d{4}) (\d{1,2}):(\d{2}):(\d{2})$",
+        "types": ("evidenziazione", "nota", "segnalibro"),
+        "months": (
+            "gennaio",
+            "febbraio",
+            "marzo",
+            "aprile",
+            "maggio",
+            "giugno",
+            "luglio",
+            "agosto",
+            "settembre",
+            "ottobre",
+            "novembre",
+            "dicembre",
+        ),
+    },
+    "pt": {
+        "clipping": r"S(?:eu|ua)",
+        "page": r"na página",
+        "page_location": r"posição",
+        "location": r"na posição",
+        "added": r"Adicionado:",
+        "created_at": r"^(\d{1,2}) de (\w+) de (\d{4}) (\d{1,2}):(\d{2}):(\d{2})$",
+        "types": ("destaque", "nota", "marcador"),
+        "months": (
+            "janeiro",
+            "fevereiro",
+            "março",
+            "abril",
+            "maio",
+            "junho",
+            "julho",
+            "agosto",
+            "setembro",
+            "outubro",
+            "novembro",
+            "dezembro",
+        ),
+    },
+    "pl": {
+        "clipping": r"Twoj[ae]",
+        "page": r"na stronie",
+        "page_location": r"(?:lokalizacja|pozycja)",
+        "location": r"(?:w lokalizacji|w pozycji|na pozycji)",
+        "added": r"Dodano:?",
+        "created_at": r"^(\d{1,2}) (\w+) (\d{4}) (\d{1,2}):(\d{2}):(\d{2})$",
+        "types": ("zakreślenie", "notatka", "zakładka"),
+        "months": (
+            "stycznia",
+            "lutego",
+            "marca",
+            "kwietnia",
+            "maja",
+            "czerwca",
+            "lipca",
+            "sierpnia",
+            "września",
+            "października",
+            "listopada",
+            "grudnia",
+        ),
+    },
+    "nl": {
+        "clipping": r"Je",
+        "page": r"op pagina",
+        "page_location": r"locatie",
+        "location": r"op locatie",
+        "added": r"Toegevoegd op",
+        "created_at": r"^(\d{1,2}) (\w+) (\d{4}) (\d{1,2}):(\d{2}):(\d{2})$",
+        "types": ("markering", "notitie", "bladwijzer"),
+        "months": (
+            "januari",
+            "februari",
+            "maart",
+            "april",
+            "mei",
+            "juni",
+            "juli",
+            "augustus",
+            "september",
+            "oktober",
+            "november",
+            "december",
+        ),
+    },
+}
+
+_RANGE = r"\d+(?:-\d+)?"
+
+
+def compile_metadata_regex(languages: Iterable[str] | None = None) -> str:
+    """
+    Compiles metadata grammars into single anchored regex, alternating languages after common "- " prefix. Every
+    language alternative is a named group of language code, containing type, page, page_location, location and date
+    groups prefixed with language code, so language of matched line is the last matched group of the match.
+
+    Args:
+        languages (Iterable[str] | None): Codes of compiled languages or None for all languages.
+
+    Returns:
+        str: Metadata regex, to be compiled with re.IGNORECASE flag.
+    """
+    alternatives = []
+    for language in METADATA_GRAMMARS if languages is None else languages:
+        grammar = METADATA_GRAMMARS[language]
+        alternatives.append(
+            f"(?P<{language}>{grammar['clipping']} (?P<{language}_type>\\w+) "
+            f"(?:{grammar['page']} (?P<{language}_page>{_RANGE})"
+            f"(?: \\| {grammar['page_location']} (?P<{language}_page_location>{_RANGE}))?"
+            f"|{grammar['location']} (?P<{language}_location>{_RANGE})) "
+            f"\\| {grammar['added']} [\\w-]+,? (?P<{language}_date>.*))"
+        )
+    return f"^- (?:{'|'.join(alternatives)})$"
@@ -0,0 +1,228 @@
+"""
+File containing ClippingsIndex class keeping parsed Clippings in memory together with lookup indexes, refreshed
+incrementally when Clippings file grows.
+"""
+
+import io
+import os
+from typing import Iterator
+
+from clippings_cli.clippings_service.intervals import IntervalIndex
+from clippings_cli.clippings_service.offsets import SCAN_CHUNK_SIZE, find_record_ends
+from clippings_cli.clippings_service.parsers import iter_raw_records
+from clippings_cli.clippings_service.readers import get_input_format
+from clippings_cli.clippings_service.service import ClippingsService
+from clippings_cli.clippings_service.streams import STDIO_PATH, strip_compression_extension
+
+_HEAD_SIZE: int = 1024
+
+
+class ClippingsIndex:
+    """
+    Class keeping parsed Clippings in memory with indexes by book title and author. Appending Clippings to plain
+    Clippings file (the way Kindle does) is handled by parsing only newly added records. Any other modification of
+    Clippings file, as well as modification of compressed file or export, causes full reload.
+
+    Args:
+        input_path (str): Full path to input Clippings file, compressed Clippings file or JSON or Excel export.
+
+    Attributes:
+        clippings (list[dict]): Parsed Clippings.
+        books (dict[tuple[str, str], list[int]]): Positions of Clippings in clippings list by (title, author) pair.
+        authors (dict[str, list[int]]): Positions of Clippings in clippings list by author.
+    """
+
+    def __init__(self, input_path: str):
+        if input_path == STDIO_PATH:
+            raise ValueError("Clippings index can not be built from standard input.")
+        self.input_path: str = input_path
+        self.clippings: list[dict] = []
+        self.books: dict[tuple[str, str], list[int]] = {}
+        self.authors: dict[str, list[int]] = {}
+        self._contents: list[str] = []
+        self._locations: dict[tuple[str, str], IntervalIndex] = {}
+        self._service: ClippingsService = ClippingsService(input_path=input_path, output_path=STDIO_PATH)
+        self._incremental: bool = (
+            strip_compression_extension(input_path) == input_path and get_input_format(input_path) == "txt"
+        )
+        self._offset: int = 0
+        self._head: bytes = b""
+        self._signature: tuple[int, int] | None = None
+
+    def _reset(self) -> None:
+        """Removes all Clippings from index."""
+        self.clippings, self.books, self.authors, self._contents, self._locations = [], {}, {}, [], {}
+        self._offset, self._head = 0, b""
+
+    def _add(self, clippings: Iterator[dict]) -> int:
+        """
+        Adds Clippings to index.
+
+        Args:
+            clippings (Iterator[dict]): Parsed Clippings.
+
+        Returns:
+            int: Number of added Clippings.
+        """
+        start = len(self.clippings)
+        for position, clipping in enumerate(clippings, start=start):
+            self.clippings.append(clipping)
+            self._contents.append(clipping.get("content", "").casefold())
+            if book := clipping.get("book"):
+                key = (book["title"], book["author"])
+                self.books.setdefault(key, []).append(position)
+                self.authors.setdefault(book["author"], []).append(position)
+                self._locations.pop(key, None)
+        return len(self.clippings) - start
+
+    def _read_new_records(self) -> Iterator[list[str]]:
+        """
+        Reads complete raw records appended to plain Clippings file since last read, moving read offset after them.
+        File is read in chunks cut at the last line break and records are ended only by whole separator lines.
+
+        Yields:
+            list[str]: Lines of single Clipping record.
+        """
+        with open(self.input_path, "rb") as file:
+            if not self._head:
+                self._head = file.read(_HEAD_SIZE)
+            file.seek(self._offset)
+            carry = b""
+            while True:
+                chunk = file.read(SCAN_CHUNK_SIZE)
+                data = carry + chunk
+                cut = data.rfind(b"\n") + 1 if chunk else len(data)
+                end = 0
+                for end in find_record_ends(data[:cut], at_eof=not chunk):
+                    pass
+                if end:
+                    self._offset += end
+                    yield from iter_raw_records(io.BytesIO(data[:end].lstrip(b"\r\n")))
+                if not chunk:
+                    return
+                carry = data[end:]
+
+    def _is_appended(self, size: int) -> bool:
+        """
+        Checks if Clippings file was only appended since last read.
+
+        Args:
+            size (int): Current Clippings file size.
+
+        Returns:
+            bool: True if file is not smaller than already read part and starts with the same bytes.
+        """
+        if not self._incremental or size < self._offset:
+            return False
+        with open(self.input_path, "rb") as file:
+            return file.read(len(self._head)) == self._head
+
+    def refresh(self) -> int | None:
+        """
+        Updates index, if Clippings file was modified since last refresh.
+
+        Returns:
+            int | None: Number of added Clippings or None if index was fully reloaded.
+        """
+        stat = os.stat(self.input_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if signature == self._signature:
+            return 0
+        appended = self._signature is not None and self._is_appended(stat.st_size)
+        self._signature = signature
+        if appended:
+            return self._add(self._service.parse_raw_records(self._read_new_records()))
+        self._reset()
+        if self._incremental:
+            self._add(self._service.parse_raw_records(self._read_new_records()))
+        else:
+            self._add(self._service.iter_clippings())
+        return None
+
+    def filter(
+        self,
+        title: str | None = None,
+        author: str | None = None,
+        clipping_type: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> list[int]:
+        """
+        Returns positions of Clippings matching all given criteria.
+
+        Args:
+            title (str | None): Book title.
+            author (str | None): Book author.
+            clipping_type (str | None): Clipping type, case-insensitive.
+            since (str | None): Minimal creation datetime (inclusive), like "2025-01-01".
+            until (str | None): Maximal creation datetime (exclusive), like "2025-02-01".
+
+        Returns:
+            list[int]: Positions of matching Clippings in clippings list.
+        """
+        if title is not None:
+            positions = [
+                position
+                for (book_title, book_author), book_positions in self.books.items()
+                if book_title == title and author in (None, book_author)
+                for position in book_positions
+            ]
+            positions.sort()
+        elif author is not None:
+            positions = self.authors.get(author, [])
+        else:
+            positions = range(len(self.clippings))
+        if clipping_type is None and since is None and until is None:
+            return list(positions)
+        clipping_type = clipping_type.casefold() if clipping_type else None
+        result = []
+        for position in positions:
+            clipping = self.clippings[position]
+            if clipping_type and clipping.get("clipping_type", "").casefold() != clipping_type:
+                continue
+            created_at = clipping.get("created_at") or ""
+            if (since and created_at < since) or (until and created_at >= until):
+                continue
+            result.append(position)
+        return result
+
+    def overlapping(self, title: str, author: str, start: int, end: int | None = None) -> list[int]:
+        """
+        Returns positions of book Clippings with location range overlapping given range. Location index of a book is
+        built on first query and rebuilt only after new Clippings of that book are added.
+
+        Args:
+            title (str): Book title.
+            author (str): Book author.
+            start (int): Location range start.
+            end (int | None): Location range end. If not provided, Clippings covering start location are returned.
+
+        Returns:
+            list[int]: Positions of matching Clippings in clippings list.
+        """
+        key = (title, author)
+        if (locations := self._locations.get(key)) is None:
+            clippings = self.clippings
+            locations = self._locations[key] = IntervalIndex(
+                (clippings[position]["location_start"], clippings[position]["location_end"], position)
+                for position in self.books.get(key, [])
+                if clippings[position].get("location_start") is not None
+            )
+        return locations.overlapping(start, end)
+
+    def search(self, query: str, positions: list[int] | None = None) -> list[int]:
+        """
+        Returns positions of Clippings containing query in content, case-insensitive.
+
+        Args:
+            query (str): Searched phrase.
+            positions (list[int] | None): Positions of searched Clippings or None to search all of them.
+
+        Returns:
+            list[int]: Positions of matching Clippings in clippings list.
+        """
+        query = query.casefold()
+        contents = self._contents
+        if positions is None:
+            return [position for position, content in enumerate(contents) if query in content]
+        return [position for position in positions if query in contents[position]]
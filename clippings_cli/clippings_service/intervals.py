@@ -0,0 +1,52 @@
+"""
+File containing IntervalIndex class answering Clippings location range queries.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable
+
+
+class IntervalIndex:
+    """
+    Static index of closed integer intervals, like Clippings locations of single book. Intervals are kept in arrays
+    sorted by interval start, together with running maximum of interval ends. Query bisects intervals starting before
+    queried range end and scans them backwards only while running maximum of ends reaches queried range start, so
+    intervals that can not overlap the range are never visited.
+
+    Args:
+        intervals (Iterable[tuple[int, int, int]]): Triples of interval start, interval end and value (like Clipping
+        position) returned for matching interval.
+    """
+
+    def __init__(self, intervals: Iterable[tuple[int, int, int]]):
+        ordered = sorted(intervals)
+        self.starts: list[int] = [start for start, _, _ in ordered]
+        self.ends: list[int] = [end for _, end, _ in ordered]
+        self.values: list[int] = [value for _, _, value in ordered]
+        self._max_ends: list[int] = list(accumulate(self.ends, max))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def overlapping(self, start: int, end: int | None = None) -> list[int]:
+        """
+        Returns values of intervals overlapping closed range. If range end is not provided, values of intervals
+        covering start point are returned.
+
+        Args:
+            start (int): Range start.
+            end (int | None): Range end, equal to start by default.
+
+        Returns:
+            list[int]: Values of matching intervals in ascending order.
+        """
+        end = start if end is None else end
+        result = []
+        index = bisect_right(self.starts, end) - 1
+        while index >= 0 and self._max_ends[index] >= start:
+            if self.ends[index] >= start:
+                result.append(self.values[index])
+            index -= 1
+        result.sort()
+        return result
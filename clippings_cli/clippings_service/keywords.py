@@ -0,0 +1,109 @@
+"""
+File containing KeywordsMatcher class and functions compiling list of keywords into single regex, used to keep only
+Clippings mentioning any of the keywords.
+
+Keywords are merged into a trie before compilation, so the regex is a tree of alternations sharing common prefixes
+("data", "database", "date" become "dat(?:a(?:base)?|e)"). At every position of searched text regex engine follows
+single path of the trie, so matching time depends on length of keywords, not on their number, unlike alternation of
+separate keywords, where every keyword is tried at every position. Searched text is lowercased once, instead of
+matching the regex case-insensitively, which makes every character comparison slower.
+
+Constants:
+    COMMENT_PREFIX (str) - Prefix of comment lines of keywords file.
+"""
+
+import re
+from typing import Iterable
+
+COMMENT_PREFIX: str = "#"
+
+_END = ""
+
+
+def _compile_trie(node: dict) -> str:
+    """
+    Compiles trie node into regex matching any keyword suffix stored under the node.
+
+    Args:
+        node (dict): Trie node - children by character, with _END key for keyword ending at the node.
+
+    Returns:
+        str: Regex of the node.
+    """
+    optional = _END in node
+    alternatives = []
+    for char, child in sorted((char, child) for char, child in node.items() if char != _END):
+        prefix = r"\s+" if char == " " else re.escape(char)
+        alternatives.append(prefix + _compile_trie(child))
+    if not alternatives:
+        return ""
+    if len(alternatives) == 1 and not optional:
+        return alternatives[0]
+    return f"(?:{'|'.join(alternatives)}){'?' if optional else ''}"
+
+
+def compile_keywords_regex(keywords: Iterable[str]) -> str:
+    """
+    Compiles keywords into single regex matching any of them as whole words. Keywords are lowercased and every
+    whitespace in keyword matches any whitespace sequence, like line break or non-breaking space.
+
+    Args:
+        keywords (Iterable[str]): Keywords.
+
+    Returns:
+        str: Keywords regex, to be searched in lowercased text.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        if not (keyword := " ".join(keyword.lower().split())):
+            continue
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[_END] = {}
+    if not trie:
+        raise ValueError("At least one keyword is required.")
+    return rf"(?<!\w)(?:{_compile_trie(trie)})(?!\w)"
+
+
+def load_keywords(path: str) -> list[str]:
+    """
+    Reads keywords file - one keyword or phrase per line. Blank lines and lines starting with COMMENT_PREFIX are
+    skipped.
+
+    Args:
+        path (str): Path to keywords file.
+
+    Returns:
+        list[str]: Keywords.
+    """
+    with open(path, "r", encoding="utf-8-sig") as file:
+        return [keyword for line in file if (keyword := line.strip()) and not keyword.startswith(COMMENT_PREFIX)]
+
+
+class KeywordsMatcher:
+    """
+    Class checking if text mentions any of keywords, as whole words and case-insensitively, with single regex search.
+
+    Args:
+        keywords (Iterable[str]): Keywords or phrases.
+
+    Attributes:
+        pattern (re.Pattern): Compiled keywords regex.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.pattern: re.Pattern = re.compile(compile_keywords_regex(keywords))
+        self._search = self.pattern.search
+
+    def matches(self, text: str) -> bool:
+        """
+        Checks if text mentions any of keywords.
+
+        Args:
+            text (str): Searched text, like Clipping content.
+
+        Returns:
+            bool: Whether any keyword was found.
+        """
+        return self._search(text.lower()) is not None
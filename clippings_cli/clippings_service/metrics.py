@@ -0,0 +1,305 @@
+"""
+File containing RunMetrics class collecting counters and timings of ClippingsService run, exported for monitoring of
+unattended conversions in Prometheus textfile or JSON format.
+
+Constants:
+    METRICS_PREFIX (str) - Prefix of exported Prometheus metrics names.
+    STAGES (tuple[str, ...]) - Stages of run with measured durations.
+"""
+
+import io
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, BinaryIO, Iterable, Iterator
+
+from clippings_cli.clippings_service.files import atomic_write
+from clippings_cli.clippings_service.shards import get_manifest_path
+from clippings_cli.clippings_service.streams import STDIO_PATH
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRICS_PREFIX: str = "clippings_convert"
+STAGES: tuple[str, ...] = ("read", "parse", "write", "total")
+
+
+class _CountingReader(io.RawIOBase):
+    """
+    Read-only wrapper counting bytes read from wrapped stream. Bytes are counted per read chunk, not per record.
+
+    Args:
+        stream (BinaryIO): Wrapped binary stream.
+        metrics (RunMetrics): Metrics of the run.
+    """
+
+    def __init__(self, stream: BinaryIO, metrics: "RunMetrics"):
+        super().__init__()
+        self._stream = stream
+        self._metrics = metrics
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        count = self._stream.readinto(buffer) or 0
+        self._metrics.bytes_read += count
+        return count
+
+    def seekable(self) -> bool:
+        return self._stream.seekable()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._stream.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._stream.tell()
+
+
+def get_peak_rss() -> int | None:
+    """
+    Returns peak resident set size of current process.
+
+    Returns:
+        int | None: Peak resident set size in bytes or None, if it is not available on current platform.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_output_size(output_path: str, sharded: bool = False) -> int | None:
+    """
+    Returns size of output - output file, all files of output directory or all shards listed in manifest.
+
+    Args:
+        output_path (str): Full path to output file or directory.
+        sharded (bool): Whether output was split into shard files.
+
+    Returns:
+        int | None: Output size in bytes or None, if output was written to standard output or is missing.
+    """
+    try:
+        if output_path == STDIO_PATH:
+            return None
+        if sharded:
+            with open(get_manifest_path(output_path), "r", encoding="utf-8") as file:
+                return json.load(file)["bytes"]
+        if os.path.isdir(output_path):
+            return sum(entry.stat().st_size for entry in os.scandir(output_path) if entry.is_file())
+        return os.path.getsize(output_path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+class RunMetrics:
+    """
+    Class collecting counters and timings of single ClippingsService run with low overhead - stage timers are
+    accumulated per record with perf_counter and input bytes are counted per read chunk.
+
+    Write stage duration is time spent in output handler, excluding time of waiting for parsed Clippings. In
+    sequential mode stage durations add up to total duration, in pipelined mode stages overlap.
+
+    Attributes:
+        format (str | None): Output format of the run.
+        started_at (float): Run start timestamp.
+        success (bool): Whether run finished without errors.
+        records_parsed (int): Number of Clipping records processed.
+        records_invalid (int): Number of invalid Clippings.
+        records_rejected (int): Number of invalid Clippings written to reject file.
+        records_duplicate (int): Number of near-duplicate Clippings skipped.
+        invalid_fields (dict[str, int]): Numbers of invalid Clippings by missing field.
+        bytes_read (int): Number of (uncompressed) input bytes read.
+        output_bytes (int | None): Size of output.
+        peak_rss_bytes (int | None): Peak resident set size of process.
+        pages (dict[str, int]): Numbers of written and skipped pages of page formats.
+        pipelined (bool): Whether write stage runs in separate thread, measured with "write" and "write_wait" timers.
+    """
+
+    def __init__(self, format: str | None = None):
+        self.format: str | None = format
+        self.started_at: float = time.time()
+        self.success: bool = False
+        self.records_parsed: int = 0
+        self.records_invalid: int = 0
+        self.records_rejected: int = 0
+        self.records_duplicate: int = 0
+        self.invalid_fields: dict[str, int] = {}
+        self.bytes_read: int = 0
+        self.output_bytes: int | None = None
+        self.peak_rss_bytes: int | None = None
+        self.pages: dict[str, int] = {}
+        self.pipelined: bool = False
+        self._timers: dict[str, float] = {"read": 0.0, "parse": 0.0, "write": 0.0, "write_wait": 0.0, "total": 0.0}
+
+    def count_input(self, stream: BinaryIO) -> BinaryIO:
+        """
+        Wraps input stream, so bytes read from it are counted.
+
+        Args:
+            stream (BinaryIO): Binary input stream.
+
+        Returns:
+            BinaryIO: Counting input stream.
+        """
+        return _CountingReader(stream, self)
+
+    @contextmanager
+    def measure(self, timer: str) -> Iterator[None]:
+        """
+        Adds duration of the block to given timer.
+
+        Args:
+            timer (str): Timer name.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._timers[timer] += perf_counter() - start
+
+    def timed(self, items: Iterable, timer: str) -> Iterator:
+        """
+        Yields items, adding time spent on producing every item to given timer. Items generator is closed, when
+        iteration stops early.
+
+        Args:
+            items (Iterable): Items produced by measured stage.
+            timer (str): Timer name.
+
+        Yields:
+            Any: Produced item.
+        """
+        timers = self._timers
+        iterator = iter(items)
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    timers[timer] += perf_counter() - start
+                    return
+                timers[timer] += perf_counter() - start
+                yield item
+        finally:
+            if close := getattr(iterator, "close", None):
+                close()
+
+    def add_parse_time(self, duration: float) -> None:
+        """
+        Adds duration of single record parsing to parse timer.
+
+        Args:
+            duration (float): Parsing duration in seconds.
+        """
+        self._timers["parse"] += duration
+
+    @property
+    def durations(self) -> dict[str, float]:
+        """
+        Returns durations of run stages.
+
+        Returns:
+            dict[str, float]: Duration in seconds of every stage from STAGES.
+        """
+        timers = self._timers
+        if self.pipelined:
+            write = timers["write"] - timers["write_wait"]
+        else:
+            write = timers["total"] - timers["read"] - timers["parse"]
+        return {"read": timers["read"], "parse": timers["parse"], "write": max(write, 0.0), "total": timers["total"]}
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns metrics as JSON serializable dictionary.
+
+        Returns:
+            dict[str, Any]: Metrics of the run.
+        """
+        durations = self.durations
+        return {
+            "format": self.format,
+            "started_at": self.started_at,
+            "success": self.success,
+            "records": {
+                "parsed": self.records_parsed,
+                "invalid": self.records_invalid,
+                "rejected": self.records_rejected,
+                "duplicate": self.records_duplicate,
+                "invalid_fields": self.invalid_fields,
+            },
+            "bytes": {"read": self.bytes_read, "output": self.output_bytes},
+            "durations": durations,
+            "records_per_second": self.records_parsed / durations["total"] if durations["total"] else None,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "pages": self.pages,
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Returns metrics in Prometheus text exposition format, suitable for node exporter textfile collector.
+
+        Returns:
+            str: Metrics of the run.
+        """
+        data = self.to_dict()
+        samples: list[tuple[str, str, list[tuple[str, float]]]] = [
+            ("success", "Whether last run finished without errors.", [("", int(self.success))]),
+            ("last_run_timestamp_seconds", "Start time of last run.", [("", self.started_at)]),
+            (
+                "records",
+                "Clipping records processed by last run, by state.",
+                [
+                    (f'{{state="{state}"}}', count)
+                    for state, count in data["records"].items()
+                    if state != "invalid_fields"
+                ],
+            ),
+            (
+                "invalid_fields",
+                "Invalid Clippings of last run, by missing field.",
+                [(f'{{field="{field}"}}', count) for field, count in self.invalid_fields.items()],
+            ),
+            ("input_bytes", "Input bytes read by last run.", [("", self.bytes_read)]),
+            ("output_bytes", "Output size of last run in bytes.", [("", self.output_bytes)]),
+            (
+                "stage_duration_seconds",
+                "Duration of last run stages.",
+                [(f'{{stage="{stage}"}}', duration) for stage, duration in data["durations"].items()],
+            ),
+            ("records_per_second", "Throughput of last run.", [("", data["records_per_second"])]),
+            ("peak_rss_bytes", "Peak resident set size of last run.", [("", self.peak_rss_bytes)]),
+            (
+                "pages",
+                "Pages of last run, by state.",
+                [(f'{{state="{state}"}}', count) for state, count in self.pages.items()],
+            ),
+        ]
+        lines = []
+        for name, description, values in samples:
+            values = [(labels, value) for labels, value in values if value is not None]
+            if not values:
+                continue
+            lines.append(f"# HELP {METRICS_PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {METRICS_PREFIX}_{name} gauge")
+            lines.extend(f"{METRICS_PREFIX}_{name}{labels} {value}" for labels, value in values)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """
+        Writes metrics to file - in JSON format for .json files and in Prometheus text format otherwise. File is
+        replaced atomically, so collectors never read partially written metrics.
+
+        Args:
+            path (str): Path to metrics file.
+        """
+        content = json.dumps(self.to_dict(), indent=4) if path.lower().endswith(".json") else self.to_prometheus()
+        with atomic_write(path, "w", encoding="utf-8") as file:
+            file.write(content)
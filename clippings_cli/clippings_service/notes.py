@@ -0,0 +1,80 @@
+"""
+File containing join of Kindle notes to highlights they were added to. Kindle stores note as separate Clipping of the
+same book, with location equal to the end location of highlighted passage, written right before or right after the
+highlight.
+
+Constants:
+    JOIN_WINDOW (int) - Number of recent Clippings, among which highlight of a note (or note of a highlight) is looked
+    up.
+"""
+
+from collections import deque
+from typing import Iterable, Iterator
+
+JOIN_WINDOW: int = 1000
+
+
+def _get_join_key(clipping: dict) -> tuple[str, str, int] | None:
+    """
+    Returns key joining note with its highlight - book title and author with note location or highlight end location.
+
+    Args:
+        clipping (dict): Parsed Clipping.
+
+    Returns:
+        tuple[str, str, int] | None: Join key or None, if Clipping is not a highlight or note or misses book or
+        location.
+    """
+    match clipping.get("clipping_type"):
+        case "Highlight":
+            location = clipping.get("location_end")
+        case "Note":
+            location = clipping.get("location_start")
+        case _:
+            return None
+    if location is None or not (book := clipping.get("book")):
+        return None
+    return book["title"], book["author"], location
+
+
+def join_notes_to_highlights(clippings: Iterable[dict], window: int = JOIN_WINDOW) -> Iterator[dict]:
+    """
+    Attaches every note to its highlight, as highlight "note" key, in a single pass. Unmatched highlights and notes of
+    last window Clippings are kept in hash indexes by book and location, so every Clipping is joined with one lookup,
+    without comparing Clippings pairwise. Clippings leave the window in input order, so output order is preserved and
+    only window Clippings are buffered, whatever the input size. Notes without highlight in the window are yielded as
+    separate Clippings.
+
+    Args:
+        clippings (Iterable[dict]): Parsed Clippings.
+        window (int): Number of recent Clippings searched for join partner.
+
+    Yields:
+        dict: Clipping, highlight with joined note in "note" key.
+    """
+    buffer: deque[list] = deque()
+    indexes: dict[str, dict[tuple[str, str, int], list]] = {"Highlight": {}, "Note": {}}
+    for clipping in clippings:
+        if (key := _get_join_key(clipping)) is not None:
+            clipping_type = clipping["clipping_type"]
+            partner_type = "Note" if clipping_type == "Highlight" else "Highlight"
+            if (partner := indexes[partner_type].pop(key, None)) is not None:
+                if clipping_type == "Note":
+                    partner[0]["note"] = clipping
+                    continue
+                clipping["note"], partner[0] = partner[0], None
+                key = None
+        slot = [clipping, key]
+        if key is not None:
+            indexes[clipping["clipping_type"]][key] = slot
+        buffer.append(slot)
+        if len(buffer) > window:
+            released = buffer.popleft()
+            if released[0] is None:
+                continue
+            if released[1] is not None and indexes[released[0]["clipping_type"]].get(released[1]) is released:
+                del indexes[released[0]["clipping_type"]][released[1]]
+            yield released[0]
+    for released, _ in buffer:
+        if released is not None:
+            yield released
@@ -0,0 +1,300 @@
+"""
+File containing OffsetIndex class mapping Clipping record numbers to byte offsets in plain Clippings file, kept in
+offsets file in user cache directory and extended incrementally as Kindle appends Clippings, and function reading last
+records of Clippings file by scanning it backwards from the end, without any index.
+
+Offsets file layout (little-endian):
+* header - magic bytes, format version, length of indexed head of Clippings file, number of records and SHA-256 digest
+  of indexed head,
+* record boundaries - byte offset of start of every record, followed by offset of the end of the last record.
+
+Constants:
+    OFFSETS_DIR (str) - Name of directory of offsets files in user cache directory.
+    OFFSETS_SUFFIX (str) - Suffix of offsets file name.
+    OFFSETS_MAGIC (bytes) - Magic bytes starting every offsets file.
+    OFFSETS_VERSION (int) - Version of offsets file format.
+    SCAN_CHUNK_SIZE (int) - Number of bytes read at once while scanning Clippings file for separator lines.
+    TAIL_CHUNK_SIZE (int) - Number of bytes read at once, initially, while scanning Clippings file backwards.
+"""
+
+import hashlib
+import io
+import os
+import struct
+import sys
+from array import array
+from typing import Iterator
+
+from clippings_cli.clippings_service.files import atomic_write, file_lock
+from clippings_cli.clippings_service.parsers import SEPARATOR_LINE, iter_raw_records
+from clippings_cli.clippings_service.readers import get_input_format
+from clippings_cli.clippings_service.streams import STDIO_PATH, strip_compression_extension
+
+OFFSETS_DIR: str = "clippings_cli"
+OFFSETS_SUFFIX: str = ".offsets"
+OFFSETS_MAGIC: bytes = b"CLOX"
+OFFSETS_VERSION: int = 1
+SCAN_CHUNK_SIZE: int = 1 << 20
+TAIL_CHUNK_SIZE: int = 1 << 16
+
+_SEPARATOR = SEPARATOR_LINE.encode("utf8")
+_HEADER = struct.Struct("<4sHHQ32s")
+_HEAD_SIZE: int = 1024
+
+
+def is_indexable(path: str) -> bool:
+    """
+    Checks if Clippings file can be accessed by byte offsets - it has to be uncompressed Clippings file, not JSON or
+    Excel export or standard input.
+
+    Args:
+        path (str): Full path to input Clippings file.
+
+    Returns:
+        bool: Whether Clippings file can be indexed.
+    """
+    return path != STDIO_PATH and strip_compression_extension(path) == path and get_input_format(path) == "txt"
+
+
+def get_offsets_path(path: str) -> str:
+    """
+    Returns path of offsets file of Clippings file in OFFSETS_DIR directory of user cache directory (XDG_CACHE_HOME,
+    LOCALAPPDATA on Windows or ~/.cache), so no files are created next to Clippings file, which is often kept on
+    Kindle itself. Offsets file is named after Clippings file and digest of its full path.
+
+    Args:
+        path (str): Full path to plain Clippings file.
+
+    Returns:
+        str: Full path to offsets file.
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME")
+    if not cache_dir and os.name == "nt":
+        cache_dir = os.environ.get("LOCALAPPDATA")
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache")
+    digest = hashlib.sha256(os.fsencode(os.path.abspath(path))).hexdigest()[:16]
+    return os.path.join(cache_dir, OFFSETS_DIR, f"{os.path.basename(path)}.{digest}{OFFSETS_SUFFIX}")
+
+
+def find_record_ends(data: bytes, base: int = 0, line_start: bool = True, at_eof: bool = False) -> Iterator[int]:
+    """
+    Finds ends of separator lines (including their line break) in chunk of Clippings file. Only whole lines equal to
+    SEPARATOR_LINE are matched, so separator characters inside Clipping content are skipped. Chunk is searched with
+    bytes.find(), without decoding.
+
+    Args:
+        data (bytes): Chunk of Clippings file.
+        base (int): Offset of chunk in Clippings file.
+        line_start (bool): Whether chunk starts at the beginning of a line.
+        at_eof (bool): Whether chunk ends at the end of Clippings file, so separator line without line break closes
+        the last record.
+
+    Yields:
+        int: Offset of the end of separator line in Clippings file, which is the start of the next record.
+    """
+    position = data.find(_SEPARATOR)
+    while position != -1:
+        end = position + len(_SEPARATOR)
+        if (data[position - 1] == 10) if position else line_start:
+            if data.startswith(b"\n", end):
+                yield base + end + 1
+            elif data.startswith(b"\r\n", end):
+                yield base + end + 2
+            elif at_eof and data[end:] in (b"", b"\r"):
+                yield base + len(data)
+        position = data.find(_SEPARATOR, end)
+
+
+def _parse_raw_records(data: bytes) -> list[list[str]]:
+    """
+    Splits bytes of consecutive complete records into raw records. Line breaks left before the first record, when
+    separator line was indexed before its line break was written, are skipped.
+
+    Args:
+        data (bytes): Bytes of complete records.
+
+    Returns:
+        list[list[str]]: Lines of every record.
+    """
+    return list(iter_raw_records(io.BytesIO(data.lstrip(b"\r\n"))))
+
+
+def read_last_records(path: str, count: int) -> list[list[str]]:
+    """
+    Reads last complete records of plain Clippings file, scanning it backwards from the end in chunks of doubling
+    size, until enough separator lines are found. Only the tail of the file is read, whatever its size.
+
+    Args:
+        path (str): Full path to plain Clippings file.
+        count (int): Number of records to read.
+
+    Returns:
+        list[list[str]]: Lines of at most count last records, in file order.
+    """
+    with open(path, "rb") as file:
+        position = file.seek(0, os.SEEK_END)
+        buffer, chunk_size = b"", TAIL_CHUNK_SIZE
+        while True:
+            start = max(position - chunk_size, 0)
+            file.seek(start)
+            buffer = file.read(position - start) + buffer
+            position, chunk_size = start, chunk_size * 2
+            ends = list(find_record_ends(buffer, line_start=position == 0, at_eof=True))
+            if len(ends) > count or position == 0:
+                break
+    if not ends:
+        return []
+    first, last = ends[-count - 1] if len(ends) > count else 0, ends[-1]
+    return _parse_raw_records(buffer[first:last])
+
+
+class OffsetIndex:
+    """
+    Class mapping Clipping record numbers of plain Clippings file to byte offsets, so any range of records can be read
+    with a single seek, without parsing preceding records. Offsets are found by scanning file for separator lines and
+    kept in offsets file in user cache directory (see get_offsets_path()). When Clippings file was only appended since
+    indexing (its head is unchanged and it did not shrink), only appended part is scanned. Any other modification
+    causes full scan.
+
+    Args:
+        path (str): Full path to plain Clippings file.
+
+    Attributes:
+        path (str): Full path to plain Clippings file.
+        offsets_path (str): Full path to offsets file.
+        boundaries (array): Offset of start of every record, followed by offset of the end of the last record.
+    """
+
+    def __init__(self, path: str):
+        if not is_indexable(path):
+            raise ValueError("Offset index can be built only for uncompressed Clippings .txt file.")
+        self.path: str = path
+        self.offsets_path: str = get_offsets_path(path)
+        self.boundaries: array = array("q", [0])
+        self._head_length: int = 0
+        self._head_digest: bytes = hashlib.sha256(b"").digest()
+        self._loaded: bool = False
+
+    def __len__(self) -> int:
+        return len(self.boundaries) - 1
+
+    def _load(self) -> bool:
+        """
+        Loads record boundaries from offsets file.
+
+        Returns:
+            bool: Whether valid offsets file was loaded.
+        """
+        try:
+            with open(self.offsets_path, "rb") as file:
+                magic, version, head_length, count, digest = _HEADER.unpack(file.read(_HEADER.size))
+                if os.fstat(file.fileno()).st_size != _HEADER.size + (count + 1) * 8:
+                    return False
+                boundaries = array("q")
+                boundaries.fromfile(file, count + 1)
+        except (OSError, EOFError, struct.error):
+            return False
+        if magic != OFFSETS_MAGIC or version != OFFSETS_VERSION:
+            return False
+        if sys.byteorder != "little":
+            boundaries.byteswap()
+        self.boundaries, self._head_length, self._head_digest = boundaries, head_length, digest
+        return True
+
+    def _save(self) -> None:
+        """Writes record boundaries to offsets file, replacing it atomically."""
+        boundaries = self.boundaries
+        if sys.byteorder != "little":
+            boundaries = array("q", boundaries)
+            boundaries.byteswap()
+        with atomic_write(self.offsets_path) as file:
+            file.write(_HEADER.pack(OFFSETS_MAGIC, OFFSETS_VERSION, self._head_length, len(self), self._head_digest))
+            boundaries.tofile(file)
+
+    def _scan(self, file: io.BufferedReader, start: int) -> None:
+        """
+        Appends boundaries of complete records found after given offset. Chunks are cut at the last line break, so
+        separator lines are never split between chunks.
+
+        Args:
+            file (io.BufferedReader): Clippings file.
+            start (int): Offset of the end of the last indexed record.
+        """
+        file.seek(start)
+        carry, base = b"", start
+        while chunk := file.read(SCAN_CHUNK_SIZE):
+            data = carry + chunk
+            cut = data.rfind(b"\n") + 1
+            self.boundaries.extend(find_record_ends(data[:cut], base))
+            carry, base = data[cut:], base + cut
+        self.boundaries.extend(find_record_ends(carry, base, at_eof=True))
+
+    def _update(self) -> tuple[int, bool]:
+        """
+        Scans part of Clippings file appended since last indexing or the whole file, if it was modified otherwise.
+
+        Returns:
+            tuple[int, bool]: Number of added records and whether boundaries changed.
+        """
+        with open(self.path, "rb") as file:
+            size = file.seek(0, os.SEEK_END)
+            file.seek(0)
+            head = file.read(_HEAD_SIZE)
+            end = self.boundaries[-1]
+            appended = size >= end and hashlib.sha256(head[: self._head_length]).digest() == self._head_digest
+            if appended and end:
+                file.seek(max(end - len(_SEPARATOR) - 2, 0))
+                appended = _SEPARATOR in file.read(min(end, len(_SEPARATOR) + 2))
+            if appended and size == end:
+                return 0, False
+            if not appended:
+                self.boundaries, end = array("q", [0]), 0
+            count = len(self)
+            self._scan(file, end)
+        self._head_length = min(len(head), self.boundaries[-1])
+        self._head_digest = hashlib.sha256(head[: self._head_length]).digest()
+        return (len(self) - count if appended else len(self)), True
+
+    def refresh(self) -> int:
+        """
+        Loads offsets file and updates it, if Clippings file was modified since indexing. Offsets file is updated under
+        file lock, so concurrent runs do not scan the same file twice. When offsets file can not be written, like on
+        read-only file system, index is kept only in memory.
+
+        Returns:
+            int: Number of records added to index (all records, when index was built from scratch).
+        """
+        added: int | None = None
+        try:
+            with file_lock(self.offsets_path):
+                loaded = self._loaded or self._load()
+                self._loaded = True
+                added, changed = self._update()
+                if changed or not loaded:
+                    self._save()
+        except OSError:
+            self._loaded = True
+            if added is None:
+                added = self._update()[0]
+        return added
+
+    def read_records(self, start: int, stop: int) -> list[list[str]]:
+        """
+        Reads raw records in given range of record numbers, reading only their bytes from Clippings file.
+
+        Args:
+            start (int): Number of the first record (counting from 0).
+            stop (int): Number of record after the last one.
+
+        Returns:
+            list[list[str]]: Lines of every record.
+        """
+        start, stop = max(start, 0), min(stop, len(self))
+        if start >= stop:
+            return []
+        begin = self.boundaries[start]
+        with open(self.path, "rb") as file:
+            file.seek(begin)
+            data = file.read(self.boundaries[stop] - begin)
+        return _parse_raw_records(data)
@@ -4,21 +4,91 @@ File containing data parsers for ClippingsService class.
 Constants:
     BOOK_WITH_PARENTHESES_REGEX (str) - Regex to handle book title Clipping line, like "Book title (Book author)".
     BOOK_WITH_DASH_REGEX (str) - Regex to handle book title Clipping line, like "Book title - Book author".
-    METADATA_WITH_PAGE_REGEX (str) - Regex to handle Clipping metadata line with page as first mentioned param, like
-    "- Your Highlight on page 3 | location 41-41 | Added on Monday, 6 February 2023 06:32:11"
-    METADATA_WITHOUT_PAGE_REGEX (str) - Regex to handle Clipping metadata line without page as first mentioned
-    param, like "- Your Bookmark at location 579 | Added on Tuesday, 27 September 2022 15:45:30".
+    METADATA_REGEX (str) - Regex to handle Clipping metadata line in any language of METADATA_GRAMMARS, like
+    "- Your Highlight on page 3 | location 41-41 | Added on Monday, 6 February 2023 06:32:11" or
+    "- Ihre Markierung bei Position 579 | Hinzugefügt am Dienstag, 27. September 2022 15:45:30".
+    SEPARATOR_LINE (str) - Line closing every Clipping record in Clippings file.
+    CLIPPING_FIELDS (tuple[str, ...]) - Fields of parsed Clipping, in output order, that can be selected with fields
+    projection.
+    METADATA_FIELDS (frozenset[str]) - Fields of parsed Clipping coming from metadata line.
+    CREATED_AT_REGEX (str) - Regex to handle Clipping creation datetime, like "6 February 2023 06:32:11".
+    MONTHS (dict[str, int]) - Month numbers by lowercase English month names.
 """
 
+import io
 import re
+from calendar import monthrange
 from datetime import datetime
+from typing import BinaryIO, Iterator
+
+from clippings_cli.clippings_service.grammars import CLIPPING_TYPES, METADATA_GRAMMARS, compile_metadata_regex
 
 BOOK_WITH_PARENTHESES_REGEX: str = r"^(.*) \((.*)\)$"
 BOOK_WITH_DASH_REGEX: str = r"^(.*) - (.*)$"
-METADATA_WITH_PAGE_REGEX: str = (
-    r"^- [yY]our (\w+) [oO]n [pP]age (\d+|\d+-\d+) \| ([lL]ocation (\d+|\d+-\d+) \| )?[aA]dded on (\w+), (.*)$"
+METADATA_REGEX: str = compile_metadata_regex()
+SEPARATOR_LINE: str = "=========="
+CLIPPING_FIELDS: tuple[str, ...] = (
+    "book",
+    "clipping_type",
+    "page_number",
+    "location",
+    "created_at",
+    "page_start",
+    "page_end",
+    "location_start",
+    "location_end",
+    "content",
+    "errors",
 )
-METADATA_WITHOUT_PAGE_REGEX: str = r"^- [yY]our (\w+) [aA]t [lL]ocation (\d+|\d+-\d+) \| [aA]dded on (\w+), (.*)$"
+METADATA_FIELDS: frozenset[str] = frozenset(CLIPPING_FIELDS[1:-2])
+CREATED_AT_REGEX: str = METADATA_GRAMMARS["en"]["created_at"]
+MONTHS: dict[str, int] = {month.lower(): number for number, month in enumerate(METADATA_GRAMMARS["en"]["months"], 1)}
+
+_BOOK_WITH_PARENTHESES_PATTERN = re.compile(BOOK_WITH_PARENTHESES_REGEX)
+_BOOK_WITH_DASH_PATTERN = re.compile(BOOK_WITH_DASH_REGEX)
+_METADATA_PATTERN = re.compile(METADATA_REGEX, re.IGNORECASE)
+_LANGUAGE_PATTERNS = {
+    language: re.compile(compile_metadata_regex([language]), re.IGNORECASE) for language in METADATA_GRAMMARS
+}
+_GROUP_NAMES = {
+    language: tuple(f"{language}_{name}" for name in ("type", "page", "page_location", "location", "date"))
+    for language in METADATA_GRAMMARS
+}
+_CREATED_AT_PATTERNS = {language: re.compile(grammar["created_at"]) for language, grammar in METADATA_GRAMMARS.items()}
+_MONTHS = {
+    language: {month.lower(): number for number, month in enumerate(grammar["months"], 1)}
+    for language, grammar in METADATA_GRAMMARS.items()
+}
+_CLIPPING_TYPES = {
+    language: {word.lower(): clipping_type for word, clipping_type in zip(grammar["types"], CLIPPING_TYPES)}
+    for language, grammar in METADATA_GRAMMARS.items()
+}
+
+
+def iter_raw_records(stream: BinaryIO) -> Iterator[list[str]]:
+    """
+    Splits binary Clippings stream into raw records - lists of Clipping lines, without trailing newlines, read up to
+    SEPARATOR_LINE. Stream is decoded and consumed lazily, so it is never loaded into memory as a whole. Trailing lines
+    not closed with SEPARATOR_LINE are skipped.
+
+    Args:
+        stream (BinaryIO): Binary Clippings stream.
+
+    Yields:
+        list[str]: Lines of single Clipping record.
+    """
+    lines = []
+    text_stream = io.TextIOWrapper(stream, encoding="utf8")
+    try:
+        for line in text_stream:
+            line = line.rstrip("\r\n")
+            if line == SEPARATOR_LINE:
+                yield lines
+                lines = []
+            else:
+                lines.append(line)
+    finally:
+        text_stream.detach()
 
 
 def parse_book_line(line: str) -> dict:
@@ -32,40 +102,175 @@ def parse_book_line(line: str) -> dict:
         dict: Dictionary containing Book namedtuple in "book" key or empty one.
     """
     line = line.replace("\xa0", " ").replace("\ufeff", "")
-    if match := re.match(BOOK_WITH_PARENTHESES_REGEX, line):
+    if match := _BOOK_WITH_PARENTHESES_PATTERN.match(line):
         book_title, author = match.groups()
-    elif match := re.match(BOOK_WITH_DASH_REGEX, line):
+    elif match := _BOOK_WITH_DASH_PATTERN.match(line):
         book_title, author = match.groups()
     else:
         return {}
     return {"book": {"title": book_title.strip(), "author": author.strip()}}
 
 
-def parse_metadata_line(line: str) -> dict:
+def parse_created_at(value: str, language: str = "en") -> str:
+    """
+    Converts Clipping creation datetime, like "6 February 2023 06:32:11", to "2023-02-06 06:32:11" format. Regular
+    values are converted without building datetime objects, other English ones are handled by datetime.strptime().
+    Days past 28th are checked against length of the month, so dates like "31 February 2023" are rejected.
+
+    Args:
+        value (str): Creation datetime from Clipping metadata line.
+        language (str): Language code of metadata grammar.
+
+    Returns:
+        str: Creation datetime in "%Y-%m-%d %H:%M:%S" format.
+    """
+    if (match := _CREATED_AT_PATTERNS[language].match(value)) and (month := _MONTHS[language].get(match[2].lower())):
+        day, _, year, hour, minute, second = match.groups()
+        day = int(day)
+        if (
+            (0 < day <= 28 or 28 < day <= monthrange(int(year), month)[1])
+            and int(hour) < 24
+            and int(minute) < 60
+            and int(second) < 60
+        ):
+            return f"{year}-{month:02d}-{day:02d} {int(hour):02d}:{minute}:{second}"
+    if language != "en":
+        raise ValueError(f"Invalid creation datetime [{value}] of language [{language}].")
+    return datetime.strptime(value, "%d %B %Y %H:%M:%S").strftime("%Y-%m-%d %H:%M:%S")
+
+
+def parse_range(value: str | None) -> tuple[int | None, int | None]:
+    """
+    Converts page number or location, like "69" or "69-70", to pair of integers.
+
+    Args:
+        value (str | None): Page number or location from Clipping metadata line.
+
+    Returns:
+        tuple[int | None, int | None]: Range start and end (equal to start for single value) or pair of None values.
+    """
+    if not value:
+        return None, None
+    start, _, end = value.partition("-")
+    return int(start), int(end or start)
+
+
+def _convert_created_at(value: str, language: str) -> str | None:
+    """
+    Converts Clipping creation datetime like parse_created_at(), returning None for invalid datetime, so Clipping is
+    reported by validation as missing creation datetime instead of interrupting parsing.
+
+    Args:
+        value (str): Creation datetime from Clipping metadata line.
+        language (str): Language code of metadata grammar.
+
+    Returns:
+        str | None: Creation datetime in "%Y-%m-%d %H:%M:%S" format or None, if it is invalid.
+    """
+    try:
+        return parse_created_at(value, language)
+    except ValueError:
+        return None
+
+
+def _build_metadata(match: re.Match, fields: frozenset[str] | None = None) -> dict:
+    """
+    Builds Clipping metadata from match of metadata regex. Localized Clipping type words are replaced with English
+    Clipping types, unknown ones are kept. When fields are provided, only requested fields are built, so creation
+    datetime conversion and ranges parsing are skipped for fields projected out.
+
+    Args:
+        match (re.Match): Match of METADATA_REGEX or single language metadata regex.
+        fields (frozenset[str] | None): Requested Clipping fields or None for all fields.
+
+    Returns:
+        dict: Dictionary containing Clipping metadata.
+    """
+    language = match.lastgroup
+    clipping_type, page, page_location, location, created_at = match.group(*_GROUP_NAMES[language])
+    if page:
+        location = page_location
+    if fields is None:
+        page_start, page_end = parse_range(page)
+        location_start, location_end = parse_range(location)
+        data = {
+            "clipping_type": _CLIPPING_TYPES[language].get(clipping_type.lower(), clipping_type),
+            "page_number": page,
+            "location": location,
+            "created_at": _convert_created_at(created_at, language),
+            "page_start": page_start,
+            "page_end": page_end,
+            "location_start": location_start,
+            "location_end": location_end,
+        }
+        if data["created_at"] is None:
+            del data["created_at"]
+        return data
+    data = {}
+    if "clipping_type" in fields:
+        data["clipping_type"] = _CLIPPING_TYPES[language].get(clipping_type.lower(), clipping_type)
+    if "page_number" in fields:
+        data["page_number"] = page
+    if "location" in fields:
+        data["location"] = location
+    if "created_at" in fields and (created_at := _convert_created_at(created_at, language)) is not None:
+        data["created_at"] = created_at
+    if "page_start" in fields or "page_end" in fields:
+        page_range = dict(zip(("page_start", "page_end"), parse_range(page)))
+        data.update((field, value) for field, value in page_range.items() if field in fields)
+    if "location_start" in fields or "location_end" in fields:
+        location_range = dict(zip(("location_start", "location_end"), parse_range(location)))
+        data.update((field, value) for field, value in location_range.items() if field in fields)
+    return data
+
+
+def parse_metadata_line(line: str, fields: frozenset[str] | None = None) -> dict:
     """
     Parses metadata line of Clipping with REGEX to extinguish Clipping metadata - Clipping type, page number,
-    location and creation datetime.
+    location and creation datetime. Page number and location are additionally stored as integer ranges, in
+    page_start, page_end, location_start and location_end keys. Line is matched against grammars of all languages.
 
     Args:
         line (str): File line.
+        fields (frozenset[str] | None): Requested Clipping fields or None for all fields.
 
     Returns:
         dict: Dictionary containing Clipping metadata or empty one.
     """
-    data = {}
-    if match := re.match(METADATA_WITH_PAGE_REGEX, line):
-        groups = match.groups()
-        data["clipping_type"] = groups[0]
-        data["page_number"] = groups[1]
-        data["location"] = groups[3]
-        data["created_at"] = datetime.strptime(groups[5], "%d %B %Y %H:%M:%S").strftime("%Y-%m-%d %H:%M:%S")
-    elif match := re.match(METADATA_WITHOUT_PAGE_REGEX, line):
-        groups = match.groups()
-        data["clipping_type"] = groups[0]
-        data["page_number"] = None
-        data["location"] = groups[1]
-        data["created_at"] = datetime.strptime(groups[3], "%d %B %Y %H:%M:%S").strftime("%Y-%m-%d %H:%M:%S")
-    return data
+    if match := _METADATA_PATTERN.match(line):
+        return _build_metadata(match, fields)
+    return {}
+
+
+class MetadataParser:
+    """
+    Parser of metadata lines of single Clippings file. Language is detected on first matched line with regex of all
+    grammars and pinned, so following lines are matched only against grammar of that language. Lines not matching
+    pinned grammar are matched against all grammars again, pinning their language.
+
+    Attributes:
+        language (str | None): Language code of pinned grammar or None, if no line was matched yet.
+    """
+
+    def __init__(self):
+        self.language: str | None = None
+
+    def parse(self, line: str, fields: frozenset[str] | None = None) -> dict:
+        """
+        Parses metadata line of Clipping, like parse_metadata_line().
+
+        Args:
+            line (str): File line.
+            fields (frozenset[str] | None): Requested Clipping fields or None for all fields.
+
+        Returns:
+            dict: Dictionary containing Clipping metadata or empty one.
+        """
+        if self.language is None or (match := _LANGUAGE_PATTERNS[self.language].match(line)) is None:
+            if (match := _METADATA_PATTERN.match(line)) is None:
+                return {}
+            self.language = match.lastgroup
+        return _build_metadata(match, fields)
 
 
 def parse_content_line(line: str) -> dict:
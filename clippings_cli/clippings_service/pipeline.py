@@ -0,0 +1,251 @@
+"""
+File containing threaded read/parse/write pipeline for ClippingsService class and fan-out of parsed Clippings to
+multiple writers. Stages are connected with bounded queues, so the fastest stage is blocked (backpressure) instead of
+buffering the whole input in memory.
+
+Constants:
+    PIPELINE_BLOCK_SIZE (int) - Number of Clipping records passed between pipeline stages at once.
+    PIPELINE_QUEUE_SIZE (int) - Maximal number of blocks waiting in queue between two pipeline stages.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator
+
+PIPELINE_BLOCK_SIZE: int = 512
+PIPELINE_QUEUE_SIZE: int = 8
+
+_END = object()
+_QUEUE_TIMEOUT: float = 0.1
+
+
+class _PipelineStopped(Exception):
+    """Raised in pipeline stage, when other stage stopped the pipeline."""
+
+
+class _StageError:
+    """
+    Queue item wrapping exception raised in upstream stage, re-raised in downstream stage.
+
+    Args:
+        error (BaseException): Exception raised in upstream stage.
+    """
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _put(blocks_queue: queue.Queue, item: Any, stop: threading.Event, closed: threading.Event | None = None) -> None:
+    """
+    Puts item into bounded queue, waiting for free slot as long as pipeline is not stopped. Item is dropped, when
+    consumer of the queue finished already.
+
+    Args:
+        blocks_queue (queue.Queue): Bounded queue.
+        item (Any): Item to put in queue.
+        stop (threading.Event): Pipeline stop event.
+        closed (threading.Event | None): Event set, when consumer of the queue finished.
+    """
+    while not stop.is_set():
+        if closed is not None and closed.is_set():
+            return
+        try:
+            blocks_queue.put(item, timeout=_QUEUE_TIMEOUT)
+            return
+        except queue.Full:
+            continue
+    raise _PipelineStopped
+
+
+def _get(blocks_queue: queue.Queue, stop: threading.Event) -> Any:
+    """
+    Gets item from queue, waiting for it as long as pipeline is not stopped.
+
+    Args:
+        blocks_queue (queue.Queue): Bounded queue.
+        stop (threading.Event): Pipeline stop event.
+
+    Returns:
+        Any: Item taken from queue.
+    """
+    while True:
+        try:
+            return blocks_queue.get(timeout=_QUEUE_TIMEOUT)
+        except queue.Empty:
+            if stop.is_set():
+                raise _PipelineStopped
+
+
+def _iter_queue(blocks_queue: queue.Queue, stop: threading.Event) -> Iterator[list]:
+    """
+    Yields blocks from queue until end marker received. Exceptions of upstream stage are re-raised.
+
+    Args:
+        blocks_queue (queue.Queue): Bounded queue.
+        stop (threading.Event): Pipeline stop event.
+
+    Yields:
+        list: Block of items.
+    """
+    while (block := _get(blocks_queue, stop)) is not _END:
+        if isinstance(block, _StageError):
+            raise block.error
+        yield block
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    """
+    Groups items into lists of given size.
+
+    Args:
+        items (Iterable): Items to group.
+        size (int): Size of group.
+
+    Yields:
+        list: Group of items, last one possibly smaller than size.
+    """
+    block = []
+    for item in items:
+        block.append(item)
+        if len(block) == size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def run_pipeline(
+    read: Callable[[], Iterable[Any]],
+    parse: Callable[[Any], dict | None],
+    write: Callable[[Iterable[dict]], dict],
+    block_size: int = PIPELINE_BLOCK_SIZE,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+) -> dict:
+    """
+    Runs three-stage pipeline: reader thread producing blocks of raw records, parse stage in calling thread and writer
+    thread consuming parsed Clippings. Records parsed to None are skipped. Exceptions raised in any stage stop the
+    pipeline and are re-raised in calling thread.
+
+    Args:
+        read (Callable[[], Iterable[Any]]): Function returning raw records.
+        parse (Callable[[Any], dict | None]): Function parsing raw record into Clipping.
+        write (Callable[[Iterable[dict]], dict]): Output handler consuming Clippings.
+        block_size (int): Number of records passed between stages at once.
+        queue_size (int): Maximal number of blocks waiting between two stages.
+
+    Returns:
+        dict: Result of write function.
+    """
+    raw_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    parsed_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    write_result: dict = {}
+
+    def reader() -> None:
+        try:
+            for block in _batched(read(), block_size):
+                _put(raw_queue, block, stop)
+            _put(raw_queue, _END, stop)
+        except _PipelineStopped:
+            pass
+        except BaseException as e:
+            try:
+                _put(raw_queue, _StageError(e), stop)
+            except _PipelineStopped:
+                pass
+
+    def writer() -> None:
+        try:
+            write_result["result"] = write(clipping for block in _iter_queue(parsed_queue, stop) for clipping in block)
+        except BaseException as e:
+            write_result["error"] = e
+        finally:
+            stop.set()
+
+    reader_thread = threading.Thread(target=reader, name="clippings-reader", daemon=True)
+    writer_thread = threading.Thread(target=writer, name="clippings-writer", daemon=True)
+    reader_thread.start()
+    writer_thread.start()
+    try:
+        for block in _iter_queue(raw_queue, stop):
+            _put(parsed_queue, [clipping for record in block if (clipping := parse(record)) is not None], stop)
+        _put(parsed_queue, _END, stop)
+    except _PipelineStopped:
+        pass
+    except BaseException as e:
+        try:
+            _put(parsed_queue, _StageError(e), stop)
+        except _PipelineStopped:
+            raise e
+    finally:
+        writer_thread.join()
+        stop.set()
+        reader_thread.join()
+    if "error" in write_result:
+        raise write_result["error"]
+    return write_result["result"]
+
+
+def run_fan_out(
+    clippings: Iterable[dict],
+    writers: list[Callable[[Iterable[dict]], dict]],
+    block_size: int = PIPELINE_BLOCK_SIZE,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+) -> list[dict]:
+    """
+    Feeds Clippings to multiple writers running concurrently, every writer in its own thread behind its own bounded
+    queue. Clippings are consumed once, in calling thread, and the same blocks are passed to every writer, so the
+    slowest writer sets the pace. Writers finishing early (like with handled error) stop receiving blocks. Exceptions
+    raised while producing Clippings or by writers stop all writers and the first one is re-raised in calling
+    thread.
+
+    Args:
+        clippings (Iterable[dict]): Parsed Clippings.
+        writers (list[Callable[[Iterable[dict]], dict]]): Output handlers consuming Clippings.
+        block_size (int): Number of Clippings passed to writers at once.
+        queue_size (int): Maximal number of blocks waiting for every writer.
+
+    Returns:
+        list[dict]: Results of writers, in order of writers.
+    """
+    queues: list[queue.Queue] = [queue.Queue(maxsize=queue_size) for _ in writers]
+    finished = [threading.Event() for _ in writers]
+    stop = threading.Event()
+    results: list[dict] = [{} for _ in writers]
+    errors: list[BaseException] = []
+
+    def writer(index: int) -> None:
+        try:
+            blocks = _iter_queue(queues[index], stop)
+            results[index] = writers[index](clipping for block in blocks for clipping in block)
+        except _PipelineStopped:
+            pass
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            finished[index].set()
+
+    threads = [
+        threading.Thread(target=writer, args=(index,), name=f"clippings-writer-{index}", daemon=True)
+        for index in range(len(writers))
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for block in _batched(clippings, block_size):
+            for blocks_queue, closed in zip(queues, finished):
+                _put(blocks_queue, block, stop, closed)
+        for blocks_queue, closed in zip(queues, finished):
+            _put(blocks_queue, _END, stop, closed)
+    except _PipelineStopped:
+        pass
+    except BaseException as e:
+        errors.insert(0, e)
+        stop.set()
+    finally:
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+    return results
@@ -0,0 +1,230 @@
+"""
+File containing readers of Clippings files exported with generate_json and generate_excel functions. Exports are
+read incrementally - JSON array element by element and Excel workbook in read-only mode row by row - producing the
+same Clipping records as parsing of Clippings file.
+
+Constants:
+    INPUT_FORMATS (dict[str, str]) - Input formats by extension of uncompressed input file. Other files are read as
+    Clippings files.
+    JSON_CHUNK_SIZE (int) - Number of characters read from JSON export at once.
+"""
+
+import io
+import json
+import zipfile
+from typing import Any, BinaryIO, Iterator
+
+from openpyxl import load_workbook
+
+from clippings_cli.clippings_service.format_handlers.excel_handlers import SUMMARY_SHEET_TITLE
+from clippings_cli.clippings_service.parsers import parse_range
+from clippings_cli.clippings_service.streams import STDIO_PATH, InputFormatError, strip_compression_extension
+
+INPUT_FORMATS: dict[str, str] = {".json": "json", ".xlsx": "excel"}
+JSON_CHUNK_SIZE: int = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+_RECORD_KEYS = (
+    "book",
+    "clipping_type",
+    "page_number",
+    "location",
+    "created_at",
+    "page_start",
+    "page_end",
+    "location_start",
+    "location_end",
+    "content",
+)
+_EXCEL_COLUMNS: dict[str, str] = {
+    "Book title": "title",
+    "Book author": "author",
+    "Content": "content",
+    "Page start": "page_start",
+    "Page end": "page_end",
+    "Location start": "location_start",
+    "Location end": "location_end",
+    "Page number": "page_number",
+    "Location": "location",
+    "Created at": "created_at",
+    "Clipping type": "clipping_type",
+}
+
+
+def get_input_format(path: str) -> str:
+    """
+    Returns format of input file based on its extension.
+
+    Args:
+        path (str): Path to input file, compressed input file or "-" for standard input.
+
+    Returns:
+        str: Input format. [txt|json|excel]
+    """
+    if path == STDIO_PATH:
+        return "txt"
+    path = strip_compression_extension(path).lower()
+    return next((format for extension, format in INPUT_FORMATS.items() if path.endswith(extension)), "txt")
+
+
+def _format_range(start: int | None, end: int | None) -> str | None:
+    """
+    Converts integer range back to raw page number or location, like "69-70".
+
+    Args:
+        start (int | None): Range start.
+        end (int | None): Range end.
+
+    Returns:
+        str | None: Raw value or None, if range start is missing.
+    """
+    if start is None:
+        return None
+    return str(start) if end in (None, start) else f"{start}-{end}"
+
+
+def normalize_clipping(data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Converts exported Clipping to Clipping record with the same keys, as produced by Clippings file parsing. Integer
+    ranges are restored from raw page number and location of exports created before they were introduced, and the
+    other way round. Missing fields stay missing, so they are reported by validation. Errors code is not copied, as
+    Clipping is validated again.
+
+    Args:
+        data (dict[str, Any]): Exported Clipping data.
+
+    Returns:
+        dict[str, Any]: Clipping record.
+    """
+    clipping: dict[str, Any] = {}
+    if book := data.get("book"):
+        clipping["book"] = {"title": book.get("title"), "author": book.get("author")}
+    if data.get("clipping_type") is not None:
+        clipping["clipping_type"] = data["clipping_type"]
+        for name in ("page", "location"):
+            raw_key = "page_number" if name == "page" else "location"
+            start, end = data.get(f"{name}_start"), data.get(f"{name}_end")
+            if start is None and data.get(raw_key):
+                start, end = parse_range(str(data[raw_key]))
+            clipping[raw_key] = data[raw_key] if data.get(raw_key) is not None else _format_range(start, end)
+            clipping[f"{name}_start"], clipping[f"{name}_end"] = start, end
+    if data.get("created_at") is not None:
+        clipping["created_at"] = str(data["created_at"])
+    if data.get("content") is not None:
+        clipping["content"] = data["content"]
+    return {key: clipping[key] for key in _RECORD_KEYS if key in clipping}
+
+
+def iter_json_clippings(stream: BinaryIO) -> Iterator[dict[str, Any]]:
+    """
+    Reads JSON array of Clippings incrementally, decoding elements one by one from buffer refilled in chunks, so the
+    whole export is never loaded into memory.
+
+    Args:
+        stream (BinaryIO): Binary stream of JSON export.
+
+    Yields:
+        dict[str, Any]: Clipping record.
+    """
+    decoder = json.JSONDecoder()
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8")
+    buffer, position, started, finished = "", 0, False, False
+    try:
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                if finished:
+                    break
+                chunk = text_stream.read(JSON_CHUNK_SIZE)
+                finished = not chunk
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            character = buffer[position]
+            if not started:
+                if character != "[":
+                    raise InputFormatError("JSON Clippings file has to contain an array.")
+                started, position = True, position + 1
+            elif character == "]":
+                return
+            elif character == ",":
+                position += 1
+            else:
+                try:
+                    data, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as e:
+                    if finished:
+                        raise InputFormatError(f"Invalid JSON Clippings file [{e}].")
+                    chunk = text_stream.read(JSON_CHUNK_SIZE)
+                    finished = not chunk
+                    buffer, position = buffer[position:] + chunk, 0
+                    continue
+                if not isinstance(data, dict):
+                    raise InputFormatError("JSON Clippings file has to contain an array of objects.")
+                yield normalize_clipping(data)
+        raise InputFormatError("JSON Clippings file is not complete.")
+    finally:
+        text_stream.detach()
+
+
+def iter_excel_clippings(stream: BinaryIO) -> Iterator[dict[str, Any]]:
+    """
+    Reads Clippings from Excel export in read-only mode, row by row. Columns are matched by headers, so exports created
+    before page and location ranges were introduced are supported. All sheets with Content column are read in workbook
+    order - sheets continued after reaching rows limit and sheets of every book - and summary sheet is skipped.
+
+    Args:
+        stream (BinaryIO): Binary stream of Excel export.
+
+    Yields:
+        dict[str, Any]: Clipping record.
+    """
+    if not stream.seekable():
+        stream = io.BytesIO(stream.read())
+    try:
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+    except (KeyError, ValueError, zipfile.BadZipFile) as e:
+        raise InputFormatError(f"Invalid Excel Clippings file [{e}].")
+    try:
+        has_content = False
+        for sheet in workbook.worksheets:
+            if sheet.title == SUMMARY_SHEET_TITLE:
+                continue
+            rows = sheet.iter_rows(values_only=True)
+            columns = [_EXCEL_COLUMNS.get(header) for header in next(rows, ())]
+            if "content" not in columns:
+                continue
+            has_content = True
+            for row in rows:
+                data = {column: value for column, value in zip(columns, row) if column}
+                if all(value is None for value in data.values()):
+                    continue
+                if data.get("title") is not None or data.get("author") is not None:
+                    data["book"] = {"title": data.get("title"), "author": data.get("author")}
+                yield normalize_clipping(data)
+        if not has_content:
+            raise InputFormatError("Excel Clippings file has to contain Content column.")
+    finally:
+        workbook.close()
+
+
+def format_raw_record(clipping: dict[str, Any]) -> list[str]:
+    """
+    Renders Clipping record as lines of Clippings file record, used to report Clippings read from exports.
+
+    Args:
+        clipping (dict[str, Any]): Clipping record.
+
+    Returns:
+        list[str]: Clipping record lines, without separator line.
+    """
+    book = clipping.get("book") or {}
+    position = f"at location {clipping.get('location')}"
+    if clipping.get("page_number"):
+        position = f"on page {clipping['page_number']} | location {clipping.get('location')}"
+    return [
+        f"{book.get('title')} ({book.get('author')})",
+        f"- Your {clipping.get('clipping_type')} {position} | Added on {clipping.get('created_at')}",
+        "",
+        clipping.get("content") or "",
+    ]
@@ -0,0 +1,281 @@
+"""
+File containing minimal asyncio HTTP/JSON server exposing ClippingsIndex queries. Server is meant to be run locally -
+on localhost or Unix socket - so Clippings are parsed once and every query is answered from memory.
+
+Endpoints (GET only):
+    /status - Number of indexed Clippings and books.
+    /books - Books with number of Clippings.
+    /clippings - Clippings filtered with title, author, type, since and until params, paginated with offset and limit.
+    /search - Clippings containing q param in content, accepting the same filters and pagination as /clippings.
+    /locations - Clippings of book given with title and author params, with location range overlapping range given
+    with start and end params (or covering start location, if end param is missing).
+    /export - All Clippings matching filters, in format given with format param. [json|excel]
+
+Constants:
+    DEFAULT_LIMIT (int) - Default number of Clippings returned by single query.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from clippings_cli.clippings_service.format_handlers.excel_handlers import generate_excel
+from clippings_cli.clippings_service.format_handlers.json_handlers import generate_json
+from clippings_cli.clippings_service.index import ClippingsIndex
+from clippings_cli.clippings_service.streams import STREAM_ERRORS
+
+DEFAULT_LIMIT: int = 100
+
+_logger = logging.getLogger(__name__)
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+_EXPORT_FORMATS = {
+    "json": (generate_json, "json", "application/json"),
+    "excel": (generate_excel, "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+class HTTPError(Exception):
+    """
+    Raised by request handlers to respond with error status.
+
+    Args:
+        status (int): HTTP status code.
+        message (str): Error message.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ClippingsServer:
+    """
+    Class handling HTTP requests with queries to ClippingsIndex. Index is refreshed before every request, so changes
+    of Clippings file are visible immediately.
+
+    Args:
+        index (ClippingsIndex): Clippings index.
+    """
+
+    def __init__(self, index: ClippingsIndex):
+        self.index: ClippingsIndex = index
+        self.routes: dict[str, Callable[[dict[str, str]], tuple[bytes, str]]] = {
+            "/status": self.status,
+            "/books": self.books,
+            "/clippings": self.clippings,
+            "/search": self.search,
+            "/locations": self.locations,
+            "/export": self.export,
+        }
+
+    @staticmethod
+    def _json(data: Any) -> tuple[bytes, str]:
+        """
+        Encodes response data as JSON.
+
+        Args:
+            data (Any): JSON serializable data.
+
+        Returns:
+            tuple[bytes, str]: Response body and content type.
+        """
+        return json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json"
+
+    @staticmethod
+    def _int_param(params: dict[str, str], name: str, default: int) -> int:
+        """
+        Reads non-negative integer query param.
+
+        Args:
+            params (dict[str, str]): Query params.
+            name (str): Param name.
+            default (int): Value returned, if param is missing.
+
+        Returns:
+            int: Param value.
+        """
+        try:
+            value = int(params.get(name, default))
+        except ValueError:
+            raise HTTPError(400, f"Param [{name}] has to be an integer.")
+        if value < 0:
+            raise HTTPError(400, f"Param [{name}] can not be negative.")
+        return value
+
+    def _filter(self, params: dict[str, str]) -> list[int]:
+        """
+        Returns positions of Clippings matching filter params.
+
+        Args:
+            params (dict[str, str]): Query params.
+
+        Returns:
+            list[int]: Positions of matching Clippings.
+        """
+        return self.index.filter(
+            title=params.get("title"),
+            author=params.get("author"),
+            clipping_type=params.get("type"),
+            since=params.get("since"),
+            until=params.get("until"),
+        )
+
+    def _page(self, positions: list[int], params: dict[str, str]) -> tuple[bytes, str]:
+        """
+        Returns page of Clippings selected with offset and limit params.
+
+        Args:
+            positions (list[int]): Positions of matching Clippings.
+            params (dict[str, str]): Query params.
+
+        Returns:
+            tuple[bytes, str]: Response body and content type.
+        """
+        offset = self._int_param(params, "offset", 0)
+        limit = self._int_param(params, "limit", DEFAULT_LIMIT)
+        clippings = self.index.clippings
+        return self._json(
+            {"count": len(positions), "clippings": [clippings[position] for position in positions[offset:][:limit]]}
+        )
+
+    def status(self, params: dict[str, str]) -> tuple[bytes, str]:
+        """Handles /status endpoint."""
+        return self._json(
+            {
+                "input_path": self.index.input_path,
+                "clippings": len(self.index.clippings),
+                "books": len(self.index.books),
+            }
+        )
+
+    def books(self, params: dict[str, str]) -> tuple[bytes, str]:
+        """Handles /books endpoint."""
+        return self._json(
+            [
+                {"title": title, "author": author, "count": len(positions)}
+                for (title, author), positions in self.index.books.items()
+            ]
+        )
+
+    def clippings(self, params: dict[str, str]) -> tuple[bytes, str]:
+        """Handles /clippings endpoint."""
+        return self._page(self._filter(params), params)
+
+    def search(self, params: dict[str, str]) -> tuple[bytes, str]:
+        """Handles /search endpoint."""
+        if not params.get("q"):
+            raise HTTPError(400, "Param [q] is required.")
+        filtered = any(name in params for name in ("title", "author", "type", "since", "until"))
+        return self._page(self.index.search(params["q"], self._filter(params) if filtered else None), params)
+
+    def locations(self, params: dict[str, str]) -> tuple[bytes, str]:
+        """Handles /locations endpoint."""
+        for name in ("title", "author", "start"):
+            if name not in params:
+                raise HTTPError(400, f"Param [{name}] is required.")
+        start = self._int_param(params, "start", 0)
+        end = self._int_param(params, "end", start)
+        return self._page(self.index.overlapping(params["title"], params["author"], start, end), params)
+
+    def export(self, params: dict[str, str]) -> tuple[bytes, str]:
+        """Handles /export endpoint."""
+        format = params.get("format", "json")
+        if format not in _EXPORT_FORMATS:
+            raise HTTPError(400, f"Format [{format}] not supported.")
+        handler, extension, content_type = _EXPORT_FORMATS[format]
+        clippings = (self.index.clippings[position] for position in self._filter(params))
+        with tempfile.TemporaryDirectory() as directory:
+            output_path = os.path.join(directory, f"Output.{extension}")
+            if "error" in (result := handler(clippings=clippings, output_path=output_path)):
+                raise HTTPError(500, str(result["error"]))
+            with open(output_path, "rb") as file:
+                return file.read(), content_type
+
+    def handle(self, method: str, target: str) -> tuple[int, bytes, str]:
+        """
+        Handles single HTTP request. Unexpected errors of request handlers are logged with traceback and answered with
+        500 status.
+
+        Args:
+            method (str): HTTP method.
+            target (str): Request target - path with query string.
+
+        Returns:
+            tuple[int, bytes, str]: Response status, body and content type.
+        """
+        url = urlsplit(target)
+        try:
+            if (route := self.routes.get(url.path.rstrip("/") or "/")) is None:
+                raise HTTPError(404, f"Endpoint [{url.path}] not found.")
+            if method != "GET":
+                raise HTTPError(405, f"Method [{method}] not allowed.")
+            self.index.refresh()
+            params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            body, content_type = route(params)
+            return 200, body, content_type
+        except HTTPError as e:
+            return e.status, *self._json({"error": str(e)})
+        except STREAM_ERRORS as e:
+            return 500, *self._json({"error": str(e)})
+        except Exception:
+            _logger.exception("Request [%s %s] failed.", method, target)
+            return 500, *self._json({"error": "Internal server error."})
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Handles HTTP/1.1 connection, answering requests until client closes connection.
+
+        Args:
+            reader (asyncio.StreamReader): Connection reader.
+            writer (asyncio.StreamWriter): Connection writer.
+        """
+        try:
+            while request_line := await reader.readline():
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    if length := int(headers.get("content-length", 0)):
+                        await reader.readexactly(length)
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    status, (body, content_type), version = 400, self._json({"error": "Invalid request."}), ""
+                else:
+                    status, body, content_type = self.handle(method, target)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                head = (
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                )
+                writer.write(head.encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(index: ClippingsIndex, host: str, port: int, socket_path: str | None = None) -> asyncio.Server:
+    """
+    Starts Clippings server on TCP host and port or on Unix socket.
+
+    Args:
+        index (ClippingsIndex): Loaded Clippings index.
+        host (str): TCP host.
+        port (int): TCP port.
+        socket_path (str | None): Unix socket path. If provided, host and port are ignored.
+
+    Returns:
+        asyncio.Server: Started server.
+    """
+    server = ClippingsServer(index)
+    if socket_path:
+        return await asyncio.start_unix_server(server.handle_connection, path=socket_path)
+    return await asyncio.start_server(server.handle_connection, host=host, port=port)
@@ -3,12 +3,46 @@ File containing ClippingsService class that manages Clippings import from input
 conversion to one of supported formats.
 """
 
+import sqlite3
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, Sequence
+
 import click
 
+from clippings_cli.clippings_service.dedupe import FuzzyDeduplicator
+from clippings_cli.clippings_service.fingerprints import FingerprintStore
 from clippings_cli.clippings_service.format_handlers.excel_handlers import generate_excel
 from clippings_cli.clippings_service.format_handlers.json_handlers import generate_json
-from clippings_cli.clippings_service.parsers import parse_book_line, parse_content_line, parse_metadata_line
-from clippings_cli.clippings_service.validators import validate_fields
+from clippings_cli.clippings_service.format_handlers.page_handlers import generate_html, generate_markdown
+from clippings_cli.clippings_service.format_handlers.snapshot_handlers import generate_snapshot
+from clippings_cli.clippings_service.keywords import KeywordsMatcher
+from clippings_cli.clippings_service.metrics import RunMetrics, get_output_size, get_peak_rss
+from clippings_cli.clippings_service.notes import join_notes_to_highlights
+from clippings_cli.clippings_service.parsers import (
+    METADATA_FIELDS,
+    MetadataParser,
+    iter_raw_records,
+    parse_book_line,
+    parse_content_line,
+)
+from clippings_cli.clippings_service.pipeline import run_fan_out, run_pipeline
+from clippings_cli.clippings_service.readers import (
+    format_raw_record,
+    get_input_format,
+    iter_excel_clippings,
+    iter_json_clippings,
+)
+from clippings_cli.clippings_service.shards import write_shards
+from clippings_cli.clippings_service.streams import (
+    STDIO_PATH,
+    STREAM_ERRORS,
+    open_input_stream,
+    open_output_stream,
+)
+from clippings_cli.clippings_service.table import ClippingsTable
+from clippings_cli.clippings_service.validators import ClippingValidationError, ValidationEngine, validate_codes
 
 
 class ClippingsService:
@@ -16,20 +50,242 @@ class ClippingsService:
     Class for retrieving Clippings from input Clippings file.
 
     Args:
-        input_path (str): Full path to input Clippings file.
-        output_path (str): Full path to output file.
+        input_path (str): Full path to input Clippings file, compressed Clippings file or "-" for standard input.
+        output_path (str | Sequence[str]): Full path to output file, compressed output file or "-" for standard output,
+        or paths of outputs of multiple formats, in order of formats passed to generate_output().
+        strict (bool): Whether to stop processing on first invalid Clipping.
+        reject_path (str | None): Path to file for raw records of invalid Clippings, excluded from output.
+        dedupe_threshold (float | None): Minimal similarity of near-duplicate Clippings skipped in output or None to
+        keep all Clippings.
+        dedupe_cache_path (str | None): Path to file caching MinHash signatures of Clippings between runs.
+        metrics_path (str | None): Path to file for run metrics in Prometheus text (default) or JSON (.json) format.
+        Stage timings and input bytes are measured only if it is provided.
+        fields (Iterable[str] | None): Clipping fields kept in output (see CLIPPING_FIELDS) or None for all fields.
+        Fields projected out are not parsed at all.
+        keywords (Iterable[str] | None): Keywords, of which at least one has to be mentioned in Clipping content, or
+        None to keep all Clippings.
+        state_dir (str | None): Path to directory with fingerprints of exported Clippings. Only Clippings not exported
+        by previous runs are written to output, if provided.
 
     Attributes:
-        clippings (list[dict]): List of collected Clippings.
+        output_paths (list[str]): Paths of outputs, output_path is the first one.
+        clippings_count (int): Number of Clippings parsed by last run.
+        validation (ValidationEngine): Validation engine of last run, containing errors statistics.
+        deduplicator (FuzzyDeduplicator | None): Near-duplicates detector of last run.
+        metrics (RunMetrics): Counters and timings of last run.
+        metadata_parser (MetadataParser): Metadata parser of last run, with language of input file pinned.
+        keywords_matcher (KeywordsMatcher | None): Matcher of keywords required in Clipping content.
+        fingerprints (FingerprintStore | None): Store of fingerprints of exported Clippings of last run.
     """
 
-    def __init__(self, input_path: str, output_path: str):
+    def __init__(
+        self,
+        input_path: str,
+        output_path: str | Sequence[str],
+        strict: bool = False,
+        reject_path: str | None = None,
+        dedupe_threshold: float | None = None,
+        dedupe_cache_path: str | None = None,
+        metrics_path: str | None = None,
+        fields: Iterable[str] | None = None,
+        keywords: Iterable[str] | None = None,
+        state_dir: str | None = None,
+    ):
         self.input_path: str = input_path
-        self.output_path: str = output_path
+        self.output_paths: list[str] = [output_path] if isinstance(output_path, str) else list(output_path)
+        self.output_path: str = self.output_paths[0]
+        self.strict: bool = strict
+        self.reject_path: str | None = reject_path
+        self.dedupe_threshold: float | None = dedupe_threshold
+        self.dedupe_cache_path: str | None = dedupe_cache_path
+        self.clippings_count: int = 0
+        self.validation: ValidationEngine = ValidationEngine(strict=strict)
+        self.metrics_path: str | None = metrics_path
+        self.deduplicator: FuzzyDeduplicator | None = None
+        self.metrics: RunMetrics = RunMetrics()
+        self.metadata_parser: MetadataParser = MetadataParser()
+        self.fields: frozenset[str] | None = frozenset(fields) if fields is not None else None
+        self.keywords_matcher: KeywordsMatcher | None = KeywordsMatcher(keywords) if keywords is not None else None
+        self.state_dir: str | None = state_dir
+        self.fingerprints: FingerprintStore | None = None
+
+    def _echo(self, message: str, fg: str) -> None:
+        """
+        Prints styled message. Messages are printed to stderr if any output is written to stdout.
+
+        Args:
+            message (str): Message to print.
+            fg (str): Message color.
+        """
+        click.echo(click.style(message, fg=fg, underline=True), err=STDIO_PATH in self.output_paths)
+
+    @contextmanager
+    def _processing_run(self) -> Iterator[ValidationEngine]:
+        """
+        Creates new ValidationEngine, MetadataParser, FuzzyDeduplicator and FingerprintStore (if needed) for single
+        run, opening reject file if needed. Signatures computed during successful run are saved to cache file.
+        Fingerprints of new Clippings are stored only by generate_output(), once output is written.
+
+        Yields:
+            ValidationEngine: Validation engine of the run.
+        """
+        with ExitStack() as stack:
+            reject_stream = stack.enter_context(open_output_stream(self.reject_path)) if self.reject_path else None
+            self.validation = ValidationEngine(strict=self.strict, reject_stream=reject_stream, fields=self.fields)
+            self.metadata_parser = MetadataParser()
+            if self.dedupe_threshold is not None:
+                self.deduplicator = FuzzyDeduplicator(self.dedupe_threshold, cache_path=self.dedupe_cache_path)
+            if self.state_dir is not None:
+                self.fingerprints = FingerprintStore(self.state_dir)
+            yield self.validation
+            if self.deduplicator is not None:
+                self.deduplicator.save_cache()
+
+    def _parse_record(self, lines: list[str] | dict) -> dict | None:
+        """
+        Parses lines of single Clipping record. Invalid Clipping is handled according to validation settings.
+        Clipping records read from JSON or Excel exports are only validated. With fields projection only lines of
+        requested fields are parsed. With keywords, content line is searched first and Clippings not mentioning any
+        keyword are skipped without parsing and validation.
+
+        Example clipping:
+        [Line 0] Django for APIs (William S. Vincent)
+        [Line 1] - Your Highlight on page 9 | location 69-70 | Added on Sunday, 17 July 2022 18:00:00
+        [Line 2]
+        [Line 3] Clipping content.
+
+        Args:
+            lines (list[str] | dict): Clipping record lines, without separator line, or Clipping record of export.
+
+        Returns:
+            dict | None: Parsed Clipping or None, if Clipping was rejected or does not mention any keyword.
+        """
+        fields = self.fields
+        keywords_matcher = self.keywords_matcher
+        if isinstance(lines, dict):
+            clipping = lines
+            if keywords_matcher is not None and not keywords_matcher.matches(clipping.get("content") or ""):
+                return None
+            lines = format_raw_record(clipping) if validate_codes(clipping) else []
+            if fields is not None:
+                clipping = {key: value for key, value in clipping.items() if key in fields}
+            return clipping if self.validation.validate(clipping, lines) else None
+        if keywords_matcher is not None and (len(lines) < 4 or not keywords_matcher.matches("\n".join(lines[3:]))):
+            return None
+        clipping = {}
+        if fields is None:
+            if len(lines) > 0:
+                clipping.update(parse_book_line(lines[0]))
+            if len(lines) > 1:
+                clipping.update(self.metadata_parser.parse(lines[1]))
+            if len(lines) > 3:
+                clipping.update(parse_content_line("\n".join(lines[3:])))
+        else:
+            if len(lines) > 0 and "book" in fields:
+                clipping.update(parse_book_line(lines[0]))
+            if len(lines) > 1 and not fields.isdisjoint(METADATA_FIELDS):
+                clipping.update(self.metadata_parser.parse(lines[1], fields))
+            if len(lines) > 3 and "content" in fields:
+                clipping.update(parse_content_line("\n".join(lines[3:])))
+        return clipping if self.validation.validate(clipping, lines) else None
+
+    def iter_clippings(self) -> Iterator[dict]:
+        """
+        Parses Clippings source stream lazily, yielding Clippings one by one. Compressed input is decompressed on the
+        fly, so input of any size can be processed without loading it into memory. JSON and Excel exports are read
+        incrementally as well.
+
+        Yields:
+            dict: Parsed Clipping.
+        """
+        self.clippings_count = 0
+        yield from self.parse_raw_records(self._iter_raw_records())
+
+    def parse_raw_records(self, records: Iterable[list[str] | dict]) -> Iterator[dict]:
+        """
+        Parses raw Clipping records lazily, yielding valid (or kept by validation settings) Clippings one by one.
+
+        Args:
+            records (Iterable[list[str] | dict]): Raw Clipping records or Clipping records of export.
+
+        Yields:
+            dict: Parsed Clipping.
+        """
+        parse = self._get_record_parser()
+        with self._processing_run():
+            for lines in records:
+                if (clipping := parse(lines)) is not None:
+                    yield clipping
+
+    def _iter_raw_records(self) -> Iterator[list[str] | dict]:
+        """
+        Reads raw Clipping records from Clippings source stream. Exports created with json and excel formats are read
+        as Clipping records, based on input file extension. Input bytes and read time are measured only if metrics
+        file is provided.
+
+        Yields:
+            list[str] | dict: Lines of single Clipping record or Clipping record of export.
+        """
+        with open_input_stream(self.input_path) as stream:
+            if self.metrics_path:
+                stream = self.metrics.count_input(stream)
+            match get_input_format(self.input_path):
+                case "json":
+                    records = iter_json_clippings(stream)
+                case "excel":
+                    records = iter_excel_clippings(stream)
+                case _:
+                    records = iter_raw_records(stream)
+            yield from self.metrics.timed(records, "read") if self.metrics_path else records
+
+    def _parse_counted_record(self, lines: list[str] | dict) -> dict | None:
+        """
+        Parses lines of single Clipping record, increasing number of processed Clippings. Near-duplicates of previous
+        Clippings are skipped, if fuzzy deduplication is enabled, and Clippings exported by previous runs, if state
+        directory is provided.
+
+        Args:
+            lines (list[str] | dict): Clipping record lines, without separator line, or Clipping record of export.
+
+        Returns:
+            dict | None: Parsed Clipping or None, if Clipping was rejected, is a near-duplicate or was already exported.
+        """
+        self.clippings_count += 1
+        clipping = self._parse_record(lines)
+        if clipping is not None and self.deduplicator is not None and self.deduplicator.is_duplicate(clipping):
+            clipping = None
+        if clipping is not None and self.fingerprints is not None and not self.fingerprints.is_new(clipping):
+            clipping = None
+        return clipping
+
+    def _parse_timed_record(self, lines: list[str] | dict) -> dict | None:
+        """
+        Parses single Clipping record like _parse_counted_record(), adding parsing duration to parse timer.
+
+        Args:
+            lines (list[str] | dict): Clipping record lines, without separator line, or Clipping record of export.
+
+        Returns:
+            dict | None: Parsed Clipping or None, if Clipping was rejected, is a near-duplicate or was already exported.
+        """
+        start = perf_counter()
+        clipping = self._parse_counted_record(lines)
+        self.metrics.add_parse_time(perf_counter() - start)
+        return clipping
+
+    def _get_record_parser(self) -> Callable[[list[str] | dict], dict | None]:
+        """
+        Returns parser of single Clipping record - timed one, if metrics file is provided, so runs without metrics do
+        not measure every record.
+
+        Returns:
+            Callable[[list[str] | dict], dict | None]: Clipping record parser.
+        """
+        return self._parse_timed_record if self.metrics_path else self._parse_counted_record
 
     def _parse_clippings(self) -> list[dict]:
         """
-        Parses Clippings source file and stores them in list of Clipping namedtuple objects.
+        Parses Clippings source file and stores them in list of Clipping dictionaries.
 
         Example clipping:
         [Line 0] Django for APIs (William S. Vincent)
@@ -39,46 +295,232 @@ class ClippingsService:
         [Line 4] ==========
 
         Returns:
-            list[Clipping]: List of Clipping namedtuples.
-        """
-
-        clippings = []
-        with open(self.input_path, "r", encoding="utf8") as file:
-            line_number = 0
-            while line := file.readline():
-                if line_number == 0:
-                    clipping = {**parse_book_line(line)}
-                elif line_number == 1:
-                    clipping = {**clipping, **parse_metadata_line(line)}
-                elif line_number == 2:
-                    pass
-                elif line_number == 3:
-                    clipping = {**clipping, **parse_content_line(line)}
-                elif line_number == 4:
-                    line_number = -1
-                    clipping["errors"] = validate_fields(clipping)
-                    clippings.append(clipping)
-                    clipping = {}
-                line_number += 1
-        return clippings
-
-    def generate_output(self, format: str) -> dict:
+            list[dict]: List of Clippings dictionaries.
         """
-        In provided output_path creates file of given format containing data collected from Clippings input file.
+        return list(self.iter_clippings())
+
+    def parse_table(self) -> ClippingsTable:
+        """
+        Parses Clippings source stream into columnar ClippingsTable, for in-process analytics. Clippings are added to
+        table while being streamed, so list of Clipping dictionaries is never built.
+
+        Returns:
+            ClippingsTable: Table of parsed Clippings.
+        """
+        return ClippingsTable.from_clippings(self.iter_clippings())
+
+    def _write_timed(self, write: Callable[..., dict], clippings: Iterable[dict]) -> dict:
+        """
+        Writes Clippings with output handler in pipeline writer thread, measuring write stage duration.
+
+        Args:
+            write (Callable[..., dict]): Output handler, bound to output path.
+            clippings (Iterable[dict]): Parsed Clippings.
+
+        Returns:
+            dict: Result of output handler.
+        """
+        with self.metrics.measure("write"):
+            return write(clippings=self.metrics.timed(clippings, "write_wait"))
+
+    @staticmethod
+    def _write_joined(write: Callable[..., dict], clippings: Iterable[dict]) -> dict:
+        """
+        Writes Clippings with notes joined to their highlights.
+
+        Args:
+            write (Callable[..., dict]): Output handler, bound to output path.
+            clippings (Iterable[dict]): Parsed Clippings.
+
+        Returns:
+            dict: Result of output handler.
+        """
+        return write(clippings=join_notes_to_highlights(clippings))
+
+    @staticmethod
+    def _write_fan_out(writers: list[Callable[..., dict]], clippings: Iterable[dict]) -> dict:
+        """
+        Writes Clippings with multiple output handlers concurrently, parsing them only once. Results of handlers are
+        merged - first error is reported and numbers of written and skipped pages are summed.
+
+        Args:
+            writers (list[Callable[..., dict]]): Output handlers, bound to their output paths.
+            clippings (Iterable[dict]): Parsed Clippings.
+
+        Returns:
+            dict: Merged results of output handlers.
+        """
+        results = run_fan_out(clippings, [lambda items, write=write: write(clippings=items) for write in writers])
+        if errors := [result for result in results if "error" in result]:
+            return errors[0]
+        merged: dict = {}
+        for result in results:
+            for key, value in result.items():
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def _commit_fingerprints(self, result: dict) -> dict:
+        """
+        Stores fingerprints of Clippings exported by successful run. Fingerprints of failed run are discarded, so its
+        Clippings are exported again by the next run.
+
+        Args:
+            result (dict): Result of the run.
+
+        Returns:
+            dict: Result of the run or error of storing fingerprints.
+        """
+        if "error" in result:
+            self.fingerprints.close()
+            return result
+        try:
+            self.fingerprints.commit()
+        except (OSError, sqlite3.Error) as e:
+            self.fingerprints.close()
+            return {"error": e}
+        return result
+
+    def _finish_metrics(self, result: dict, sharded: bool) -> None:
+        """
+        Collects counters of finished run into metrics and writes them to metrics file, if needed.
+
+        Args:
+            result (dict): Result of the run.
+            sharded (bool): Whether output was split into shard files.
+        """
+        metrics = self.metrics
+        metrics.success = "error" not in result
+        metrics.records_parsed = self.clippings_count
+        metrics.records_invalid = self.validation.invalid_count
+        metrics.records_rejected = self.validation.rejected_count
+        metrics.invalid_fields = self.validation.error_counts
+        metrics.records_duplicate = self.deduplicator.duplicates_count if self.deduplicator is not None else 0
+        if "written" in result:
+            metrics.pages = {"written": result["written"], "skipped": result["skipped"]}
+        sizes = [get_output_size(path, sharded) for path in self.output_paths] if metrics.success else []
+        metrics.output_bytes = sum(sizes) if sizes and None not in sizes else None
+        metrics.peak_rss_bytes = get_peak_rss()
+        if self.metrics_path:
+            try:
+                metrics.write(self.metrics_path)
+            except OSError as e:
+                self._echo(f"Metrics file [{self.metrics_path}] not written [{e}].", fg="yellow")
+
+    def _get_handler(
+        self, format: str, sheet_per_book: bool = False, join_notes: bool = False
+    ) -> Callable[..., dict] | None:
+        """
+        Returns output handler of given format, with fields projection and Excel options applied.
 
         Args:
             format (str): Format of output file.
+            sheet_per_book (bool): Whether to write Clippings of every book to separate Excel sheet.
+            join_notes (bool): Whether notes are joined to highlights, written in Excel "Note" column.
 
         Returns:
-            dict: Dictionary containing data about potential errors.
+            Callable[..., dict] | None: Output handler or None, if format is not supported.
         """
-        clippings = self._parse_clippings()
-        click.echo(click.style("Clippings file content loaded.", fg="green", underline=True), err=False)
         match format:
             case "json":
-                return generate_json(clippings=clippings, output_path=self.output_path)
+                return generate_json
             case "excel":
-                return generate_excel(clippings=clippings, output_path=self.output_path)
-            case _:
-                click.echo(click.style(f"Format [{format}] not supported.", fg="red", underline=True), err=True)
+                if self.fields is not None or sheet_per_book or join_notes:
+                    return partial(generate_excel, fields=self.fields, sheet_per_book=sheet_per_book, notes=join_notes)
+                return generate_excel
+            case "markdown":
+                return generate_markdown
+            case "html":
+                return generate_html
+            case "snapshot":
+                return generate_snapshot
+        return None
+
+    def generate_output(
+        self,
+        format: str | Sequence[str],
+        pipelined: bool = False,
+        shard_size: int | None = None,
+        shard_by: str | None = None,
+        sheet_per_book: bool = False,
+        join_notes: bool = False,
+    ) -> dict:
+        """
+        In provided output_path creates file of given format containing data collected from Clippings input file.
+        Clippings are streamed from input to output handler. In pipelined mode reading, parsing and writing are
+        performed concurrently - reading and writing in separate threads, connected with bounded queues. If shard size
+        or shard key is provided, output is split into shard files written concurrently, described by manifest file.
+        Counters and timings of the run are collected in metrics and written to metrics file, if provided.
+
+        With multiple formats, Clippings are parsed once and fed to output handlers of all formats concurrently, every
+        handler writing to its output path in its own thread behind a bounded queue, so the run takes about as long as
+        the slowest handler.
+
+        With state directory, fingerprints of written Clippings are stored once all outputs are written, so the next
+        run writes only Clippings added since.
+
+        With join_notes, every note is attached to highlight it was added to, found by book and location in hash index
+        of recent Clippings, before Clippings are passed to output handlers.
+
+        Args:
+            format (str | Sequence[str]): Format of output file or formats of outputs, in order of output paths.
+            pipelined (bool): Whether to read, parse and write Clippings concurrently.
+            shard_size (int | None): Maximal number of Clippings in a shard file.
+            shard_by (str | None): Grouping of Clippings into shard files. [book|month]
+            sheet_per_book (bool): Whether to write Clippings of every book to separate Excel sheet, with summary sheet.
+            join_notes (bool): Whether to attach notes to their highlights, as nested "note" of highlight.
+
+        Returns:
+            dict: Dictionary containing data about potential errors.
+        """
+        formats = [format] if isinstance(format, str) else list(format)
+        if len(formats) != len(self.output_paths):
+            return {"error": "Number of formats does not match number of output paths."}
+        sharded = bool(shard_size or shard_by)
+        writers = []
+        for output_format, output_path in zip(formats, self.output_paths):
+            if (handler := self._get_handler(output_format, sheet_per_book, join_notes)) is None:
+                click.echo(click.style(f"Format [{output_format}] not supported.", fg="red", underline=True), err=True)
                 return {"error": "Format not supported."}
+            if sharded:
+                handler = partial(write_shards, handler=handler, shard_size=shard_size, shard_by=shard_by)
+            writers.append(partial(handler, output_path=output_path))
+        write = writers[0] if len(writers) == 1 else partial(self._write_fan_out, writers)
+        if join_notes:
+            write = partial(self._write_joined, write)
+        self.metrics = RunMetrics(format=",".join(formats))
+        try:
+            with self.metrics.measure("total"):
+                if pipelined:
+                    self.clippings_count = 0
+                    self.metrics.pipelined = True
+                    with self._processing_run():
+                        result = run_pipeline(
+                            read=self._iter_raw_records,
+                            parse=self._get_record_parser(),
+                            write=partial(self._write_timed, write) if self.metrics_path else write,
+                        )
+                else:
+                    result = write(clippings=self.iter_clippings())
+        except (*STREAM_ERRORS, ClippingValidationError) as e:
+            if self.fingerprints is not None:
+                self.fingerprints.close()
+            self._finish_metrics({"error": e}, sharded)
+            return {"error": e}
+        if self.fingerprints is not None:
+            result = self._commit_fingerprints(result)
+        self._finish_metrics(result, sharded)
+        self._echo(f"Clippings file content loaded. Clippings processed: {self.clippings_count}.", fg="green")
+        if self.deduplicator is not None:
+            self._echo(f"Near-duplicate Clippings skipped: {self.deduplicator.duplicates_count}.", fg="yellow")
+        if self.fingerprints is not None:
+            self._echo(f"Already exported Clippings skipped: {self.fingerprints.exported_count}.", fg="yellow")
+        if "written" in result:
+            self._echo(f"Pages written: {result['written']}. Unchanged pages skipped: {result['skipped']}.", fg="green")
+        if self.validation.invalid_count:
+            errors = ", ".join(f"{field}: {count}" for field, count in self.validation.error_counts.items())
+            self._echo(
+                f"Invalid Clippings: {self.validation.invalid_count} (missing {errors}). "
+                f"Rejected: {self.validation.rejected_count}.",
+                fg="yellow",
+            )
+        return result
@@ -0,0 +1,183 @@
+"""
+File containing reconstruction of reading sessions - runs of Clippings of the same book created with gaps shorter than
+given limit - in a single pass over Clippings stream, keeping only open session of every book in memory.
+
+Clippings merged from several devices are not ordered by creation time, so they are passed through bounded reorder
+buffer first - min-heap releasing the oldest buffered Clipping once it holds more than given number of Clippings. Input
+disordered by less than buffer size is fully ordered, without sorting the whole stream.
+
+Constants:
+    SESSION_GAP (int) - Default maximal gap between Clippings of the same session, in seconds.
+    REORDER_WINDOW (int) - Default number of Clippings buffered for reordering by creation time.
+    SESSION_FIELDS (tuple[str, ...]) - Clipping fields used for sessions reconstruction.
+"""
+
+import heapq
+from datetime import datetime
+from typing import Iterable, Iterator
+
+SESSION_GAP: int = 30 * 60
+REORDER_WINDOW: int = 1000
+SESSION_FIELDS: tuple[str, ...] = ("book", "clipping_type", "created_at", "location_start", "location_end")
+
+_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def reorder_by_created_at(clippings: Iterable[dict], window: int = REORDER_WINDOW) -> Iterator[dict]:
+    """
+    Orders Clippings by creation time with bounded min-heap. Clippings created at the same time keep input order.
+    Clippings displaced by more than window positions are released late, out of order.
+
+    Args:
+        clippings (Iterable[dict]): Parsed Clippings with "created_at" key.
+        window (int): Number of buffered Clippings.
+
+    Yields:
+        dict: Clipping, ordered by creation time.
+    """
+    heap: list[tuple[str, int, dict]] = []
+    for position, clipping in enumerate(clippings):
+        item = (clipping["created_at"], position, clipping)
+        if len(heap) < window:
+            heapq.heappush(heap, item)
+        else:
+            yield heapq.heappushpop(heap, item)[2]
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def _open_session(book: dict, created_at: datetime) -> dict:
+    """
+    Creates empty session of a book.
+
+    Args:
+        book (dict): Book title and author.
+        created_at (datetime): Creation time of the first Clipping of session.
+
+    Returns:
+        dict: Session state.
+    """
+    return {
+        "book": book,
+        "start": created_at,
+        "end": created_at,
+        "count": 0,
+        "clipping_types": {},
+        "location_start": None,
+        "location_end": None,
+    }
+
+
+def _close_session(session: dict) -> dict:
+    """
+    Converts session state to output session with formatted times and duration.
+
+    Args:
+        session (dict): Session state.
+
+    Returns:
+        dict: Session with start and end time, duration in minutes, counts and range of locations.
+    """
+    start, end = session["start"], session["end"]
+    return {
+        **session,
+        "start": start.strftime(_DATETIME_FORMAT),
+        "end": end.strftime(_DATETIME_FORMAT),
+        "duration": round((end - start).total_seconds() / 60),
+    }
+
+
+def _add_clipping(session: dict, clipping: dict, created_at: datetime) -> None:
+    """
+    Adds Clipping to session, extending its time and locations range.
+
+    Args:
+        session (dict): Session state.
+        clipping (dict): Parsed Clipping.
+        created_at (datetime): Creation time of Clipping.
+    """
+    session["start"], session["end"] = min(session["start"], created_at), max(session["end"], created_at)
+    session["count"] += 1
+    clipping_type = clipping.get("clipping_type")
+    session["clipping_types"][clipping_type] = session["clipping_types"].get(clipping_type, 0) + 1
+    if (location_start := clipping.get("location_start")) is not None:
+        if session["location_start"] is None or location_start < session["location_start"]:
+            session["location_start"] = location_start
+    if (location_end := clipping.get("location_end") or location_start) is not None:
+        if session["location_end"] is None or location_end > session["location_end"]:
+            session["location_end"] = location_end
+
+
+def _is_within_gap(session: dict, created_at: datetime, gap: int) -> bool:
+    """
+    Checks if Clipping created at given time belongs to session - it was created during session or less than gap
+    seconds before its start or after its end.
+
+    Args:
+        session (dict): Session state.
+        created_at (datetime): Creation time of Clipping.
+        gap (int): Maximal gap between Clippings of the same session, in seconds.
+
+    Returns:
+        bool: Whether Clipping belongs to session.
+    """
+    return (session["start"] - created_at).total_seconds() <= gap and (
+        created_at - session["end"]
+    ).total_seconds() <= gap
+
+
+def iter_sessions(clippings: Iterable[dict], gap: int = SESSION_GAP, window: int = REORDER_WINDOW) -> Iterator[dict]:
+    """
+    Groups Clippings of every book into reading sessions in a single pass. Clipping created more than gap seconds
+    after the last Clipping of the book session closes it and opens a new one. Clippings without book or valid creation
+    time are skipped. Clippings released late by reorder buffer are added to the open session of their book, if they
+    were created less than gap seconds before its start, otherwise they are grouped into separate sessions of late
+    Clippings of the book.
+
+    Args:
+        clippings (Iterable[dict]): Parsed Clippings.
+        gap (int): Maximal gap between Clippings of the same session, in seconds.
+        window (int): Number of Clippings buffered for reordering by creation time.
+
+    Yields:
+        dict: Session, in order of closing.
+    """
+    open_sessions: dict[tuple[str, str], dict] = {}
+    late_sessions: dict[tuple[str, str], dict] = {}
+    dated = (clipping for clipping in clippings if clipping.get("book") and clipping.get("created_at"))
+    for clipping in reorder_by_created_at(dated, window):
+        book = clipping["book"]
+        key = (book["title"], book["author"])
+        try:
+            created_at = datetime.fromisoformat(clipping["created_at"])
+        except (TypeError, ValueError):
+            continue
+        sessions = open_sessions
+        session = open_sessions.get(key)
+        if session is not None and (session["start"] - created_at).total_seconds() > gap:
+            sessions, session = late_sessions, late_sessions.get(key)
+        if session is None or not _is_within_gap(session, created_at, gap):
+            if session is not None:
+                yield _close_session(session)
+            session = sessions[key] = _open_session(book, created_at)
+        _add_clipping(session, clipping, created_at)
+    for session in (*late_sessions.values(), *open_sessions.values()):
+        yield _close_session(session)
+
+
+def reconstruct_sessions(clippings: Iterable[dict], gap: int = SESSION_GAP, window: int = REORDER_WINDOW) -> list[dict]:
+    """
+    Reconstructs reading sessions of all books.
+
+    Args:
+        clippings (Iterable[dict]): Parsed Clippings.
+        gap (int): Maximal gap between Clippings of the same session, in seconds.
+        window (int): Number of Clippings buffered for reordering by creation time.
+
+    Returns:
+        list[dict]: Sessions, sorted by start time.
+    """
+    return sorted(
+        iter_sessions(clippings, gap, window),
+        key=lambda session: (session["start"], session["book"]["title"], session["book"]["author"]),
+    )
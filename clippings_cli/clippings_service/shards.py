@@ -0,0 +1,157 @@
+"""
+File containing functions for splitting Clippings output into multiple shard files, written concurrently by a pool
+of writer threads, together with a manifest describing every shard.
+
+Constants:
+    SHARD_KEYS (dict[str, Callable[[dict], str]]) - Functions returning shard key of a Clipping by shard-by option.
+    SHARD_WORKERS (int) - Default number of writer threads.
+    MANIFEST_SUFFIX (str) - Suffix of manifest file, replacing output file extension.
+    SHARD_BUFFER_ROWS (int) - Maximal number of Clippings of all groups buffered with shard-by option. Once reached,
+    the largest groups are written as shards, until half of the buffer is free.
+"""
+
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable
+
+from clippings_cli.clippings_service.files import atomic_write
+from clippings_cli.clippings_service.streams import STDIO_PATH, strip_compression_extension
+
+
+def _book_key(clipping: dict) -> str:
+    """Returns shard key of Clipping book, like "Book title (Book author)"."""
+    book = clipping.get("book") or {}
+    return f"{book.get('title', '')} ({book.get('author', '')})"
+
+
+def _month_key(clipping: dict) -> str:
+    """Returns shard key of Clipping creation month, like "2025-01"."""
+    return (clipping.get("created_at") or "")[:7]
+
+
+SHARD_KEYS: dict[str, Callable[[dict], str]] = {"book": _book_key, "month": _month_key}
+SHARD_WORKERS: int = min(4, os.cpu_count() or 1)
+MANIFEST_SUFFIX: str = ".manifest.json"
+SHARD_BUFFER_ROWS: int = 100_000
+
+
+def get_shard_path(output_path: str, number: int) -> str:
+    """
+    Returns path of shard file, numbering output file name and keeping its extensions, like "Output-00001.json.gz".
+
+    Args:
+        output_path (str): Full path to output file.
+        number (int): Shard number.
+
+    Returns:
+        str: Full path to shard file.
+    """
+    uncompressed_path = strip_compression_extension(output_path)
+    root, extension = os.path.splitext(uncompressed_path)
+    return f"{root}-{number:05d}{extension}{output_path[len(uncompressed_path):]}"
+
+
+def get_manifest_path(output_path: str) -> str:
+    """
+    Returns path of manifest file for sharded output, like "Output.manifest.json".
+
+    Args:
+        output_path (str): Full path to output file.
+
+    Returns:
+        str: Full path to manifest file.
+    """
+    return os.path.splitext(strip_compression_extension(output_path))[0] + MANIFEST_SUFFIX
+
+
+def write_shards(
+    clippings: Iterable[dict[str, Any]],
+    handler: Callable[..., dict],
+    output_path: str,
+    shard_size: int | None = None,
+    shard_by: str | None = None,
+    workers: int = SHARD_WORKERS,
+) -> dict:
+    """
+    Streams Clippings into rotating shard files written with output format handler by pool of writer threads.
+
+    Without shard_by, every shard_size consecutive Clippings form a shard, so only shards being written are kept in
+    memory. With shard_by, Clippings are grouped by book or month and every group is written to separate shards,
+    split into parts of at most shard_size Clippings. Groups are buffered until they are full or input ends, with at
+    most SHARD_BUFFER_ROWS Clippings buffered - when buffer is full, the largest groups are written as shards early.
+
+    Manifest file, written next to shards, lists every shard with its path, key, row count, range of rows in input
+    order, size and byte range in concatenation of all shards.
+
+    Args:
+        clippings (Iterable[dict]): Collected Clippings.
+        handler (Callable[..., dict]): Output format handler, like generate_json.
+        output_path (str): Full path to output file, used as a template of shard paths.
+        shard_size (int | None): Maximal number of Clippings in a shard.
+        shard_by (str | None): Grouping of Clippings into shards. [book|month]
+        workers (int): Number of writer threads.
+
+    Returns:
+        dict: Dictionary containing data about potential errors.
+    """
+    if output_path == STDIO_PATH:
+        return {"error": "Sharded output can not be written to standard output."}
+    if not shard_size and not shard_by:
+        return {"error": "Shard size or shard key has to be provided."}
+    get_key = SHARD_KEYS[shard_by] if shard_by else lambda clipping: None
+    shards: list[dict] = []
+    futures: list[Future] = []
+    pending: set[Future] = set()
+    buffers: dict[str | None, list[tuple[int, dict]]] = {}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shard-writer") as executor:
+
+        def submit(key: str | None, rows: list[tuple[int, dict]]) -> None:
+            nonlocal pending
+            if len(pending) >= workers * 2:
+                pending = wait(pending, return_when=FIRST_COMPLETED).not_done
+            path = get_shard_path(output_path, len(shards) + 1)
+            shards.append({"path": path, "key": key, "rows": len(rows), "row_range": [rows[0][0], rows[-1][0] + 1]})
+            futures.append(executor.submit(handler, [clipping for _, clipping in rows], output_path=path))
+            pending.add(futures[-1])
+
+        buffered = 0
+        for row, clipping in enumerate(clippings):
+            key = get_key(clipping)
+            rows = buffers.setdefault(key, [])
+            rows.append((row, clipping))
+            buffered += 1
+            if shard_size and len(rows) >= shard_size:
+                buffered -= len(rows)
+                submit(key, buffers.pop(key))
+            elif buffered >= SHARD_BUFFER_ROWS:
+                for largest in sorted(buffers, key=lambda group: len(buffers[group]), reverse=True):
+                    if buffered <= SHARD_BUFFER_ROWS // 2:
+                        break
+                    buffered -= len(buffers[largest])
+                    submit(largest, buffers.pop(largest))
+        for key, rows in buffers.items():
+            submit(key, rows)
+    for future in futures:
+        if "error" in (result := future.result()):
+            return result
+
+    offset = 0
+    for shard in shards:
+        shard["bytes"] = os.path.getsize(shard["path"])
+        shard["byte_range"] = [offset, offset + shard["bytes"]]
+        offset += shard["bytes"]
+    manifest = {
+        "shard_size": shard_size,
+        "shard_by": shard_by,
+        "rows": sum(shard["rows"] for shard in shards),
+        "bytes": offset,
+        "shards": shards,
+    }
+    try:
+        with atomic_write(get_manifest_path(output_path), "w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=4)
+    except PermissionError as e:
+        return {"error": e}
+    return {}
@@ -0,0 +1,88 @@
+"""
+File containing ClippingsStats class aggregating Clippings statistics in a single pass over Clippings stream.
+
+Constants:
+    STATS_FIELDS (tuple[str, ...]) - Clipping fields used for statistics calculation.
+"""
+
+from collections import Counter
+from typing import Any, Iterable
+
+STATS_FIELDS: tuple[str, ...] = ("book", "clipping_type", "created_at")
+
+
+class ClippingsStats:
+    """
+    Class counting Clippings per book, author, month, Clipping type and hour of creation. Only counters are kept in
+    memory, Clippings themselves are discarded right after being counted.
+
+    Attributes:
+        total (int): Number of counted Clippings.
+        books (Counter): Number of Clippings per (title, author) pair.
+        authors (Counter): Number of Clippings per author.
+        months (Counter): Number of Clippings per creation month, like "2025-01".
+        clipping_types (Counter): Number of Clippings per Clipping type.
+        hours (list[int]): Number of Clippings per hour of creation day.
+    """
+
+    def __init__(self):
+        self.total: int = 0
+        self.books: Counter = Counter()
+        self.authors: Counter = Counter()
+        self.months: Counter = Counter()
+        self.clipping_types: Counter = Counter()
+        self.hours: list[int] = [0] * 24
+
+    def add(self, clipping: dict) -> None:
+        """
+        Counts single Clipping.
+
+        Args:
+            clipping (dict): Parsed Clipping.
+        """
+        self.total += 1
+        if book := clipping.get("book"):
+            self.books[(book["title"], book["author"])] += 1
+            self.authors[book["author"]] += 1
+        if created_at := clipping.get("created_at"):
+            self.months[created_at[:7]] += 1
+            self.hours[int(created_at[11:13])] += 1
+        if clipping_type := clipping.get("clipping_type"):
+            self.clipping_types[clipping_type] += 1
+
+    def update(self, clippings: Iterable[dict]) -> "ClippingsStats":
+        """
+        Counts all Clippings from iterable.
+
+        Args:
+            clippings (Iterable[dict]): Parsed Clippings.
+
+        Returns:
+            ClippingsStats: Updated instance.
+        """
+        for clipping in clippings:
+            self.add(clipping)
+        return self
+
+    def to_dict(self, top: int | None = None) -> dict[str, Any]:
+        """
+        Returns statistics as JSON serializable dictionary. Counters are sorted by count descending, except months
+        and hours sorted chronologically.
+
+        Args:
+            top (int | None): Maximal number of books and authors returned or None for all of them.
+
+        Returns:
+            dict[str, Any]: Clippings statistics.
+        """
+        return {
+            "total": self.total,
+            "books": [
+                {"title": title, "author": author, "count": count}
+                for (title, author), count in self.books.most_common(top)
+            ],
+            "authors": [{"author": author, "count": count} for author, count in self.authors.most_common(top)],
+            "months": dict(sorted(self.months.items())),
+            "clipping_types": dict(self.clipping_types.most_common()),
+            "hours": {f"{hour:02d}": count for hour, count in enumerate(self.hours)},
+        }
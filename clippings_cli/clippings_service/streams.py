@@ -0,0 +1,154 @@
+"""
+File containing functions for opening Clippings input and output streams - regular files, standard input/output and
+compressed files handled transparently based on their extension.
+
+Constants:
+    STDIO_PATH (str) - Path value standing for standard input (as input path) or standard output (as output path).
+    COMPRESSION_EXTENSIONS (tuple[str, ...]) - Extensions of compressed files read and written transparently.
+    STREAM_ERRORS (tuple[type[Exception], ...]) - Exceptions that can be raised while reading or writing a stream.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+import sys
+import zipfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+from clippings_cli.clippings_service.files import atomic_write
+
+STDIO_PATH: str = "-"
+COMPRESSION_EXTENSIONS: tuple[str, ...] = (".gz", ".bz2", ".xz", ".zip")
+
+
+class InputFormatError(ValueError):
+    """Raised for input stream, that can not be read in format expected from its path."""
+
+
+STREAM_ERRORS: tuple[type[Exception], ...] = (OSError, EOFError, zipfile.BadZipFile, lzma.LZMAError, InputFormatError)
+
+_COMPRESSED_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+class _ForwardOnlyWriter(io.RawIOBase):
+    """
+    Write-only wrapper hiding seek capabilities of wrapped stream. Compressed and standard output streams can only be
+    written forward, so consumers like zipfile have to be prevented from seeking back in them.
+
+    Args:
+        stream (BinaryIO): Wrapped binary stream.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        super().__init__()
+        self._stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._stream.write(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+def strip_compression_extension(path: str) -> str:
+    """
+    Removes compression extension from path, if present.
+
+    Args:
+        path (str): File path.
+
+    Returns:
+        str: File path without compression extension.
+    """
+    root, extension = os.path.splitext(path)
+    return root if extension.lower() in COMPRESSION_EXTENSIONS else path
+
+
+def _get_zip_input_member(archive: zipfile.ZipFile, path: str) -> str:
+    """
+    Selects Clippings file member of zip archive - first .txt file or the only file in archive.
+
+    Args:
+        archive (zipfile.ZipFile): Opened zip archive.
+        path (str): Path to zip archive.
+
+    Returns:
+        str: Name of archive member containing Clippings.
+    """
+    names = [name for name in archive.namelist() if not name.endswith("/")]
+    for name in names:
+        if name.lower().endswith(".txt"):
+            return name
+    if len(names) == 1:
+        return names[0]
+    raise FileNotFoundError(f"No .txt file found in [{path}] archive.")
+
+
+@contextmanager
+def open_input_stream(path: str) -> Iterator[BinaryIO]:
+    """
+    Opens binary stream for reading Clippings from file, compressed file or standard input. Compressed files are
+    decompressed on the fly, without extracting them to disk.
+
+    Args:
+        path (str): Path to input file or STDIO_PATH for standard input.
+
+    Yields:
+        BinaryIO: Binary input stream.
+    """
+    if path == STDIO_PATH:
+        yield sys.stdin.buffer
+        return
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            with archive.open(_get_zip_input_member(archive, path)) as stream:
+                yield stream
+    elif extension in _COMPRESSED_OPENERS:
+        with _COMPRESSED_OPENERS[extension](path, "rb") as stream:
+            yield stream
+    else:
+        with open(path, "rb") as stream:
+            yield stream
+
+
+@contextmanager
+def open_output_stream(path: str) -> Iterator[BinaryIO]:
+    """
+    Opens binary stream for writing output to file, compressed file or standard output. Parent directories of output
+    file are created if needed. Compressed and standard output streams are forward-only. Files are written to
+    temporary file, atomically replacing output file once the stream is closed without error.
+
+    Args:
+        path (str): Path to output file or STDIO_PATH for standard output.
+
+    Yields:
+        BinaryIO: Binary output stream.
+    """
+    if path == STDIO_PATH:
+        stream = sys.stdout.buffer
+        yield _ForwardOnlyWriter(stream)
+        stream.flush()
+        return
+    extension = os.path.splitext(path)[1].lower()
+    with atomic_write(path) as file:
+        if extension == ".zip":
+            with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                member = os.path.basename(strip_compression_extension(path))
+                with archive.open(member, "w", force_zip64=True) as stream:
+                    yield _ForwardOnlyWriter(stream)
+        elif extension == ".gz":
+            with gzip.GzipFile(filename=path, mode="wb", fileobj=file) as stream:
+                yield _ForwardOnlyWriter(stream)
+        elif extension in _COMPRESSED_OPENERS:
+            with _COMPRESSED_OPENERS[extension](file, "wb") as stream:
+                yield _ForwardOnlyWriter(stream)
+        else:
+            yield file
@@ -0,0 +1,432 @@
+"""
+File containing ClippingsTable class storing parsed Clippings in columnar form for in-process analytics.
+
+Constants:
+    NULL (int) - Value of missing creation timestamp, page number or location in integer columns.
+    INTEGER_COLUMNS (tuple[str, ...]) - Names of int64 columns.
+    GROUP_KEYS (tuple[str, ...]) - Keys Clippings can be grouped and counted by.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from datetime import date, timedelta
+from functools import lru_cache, reduce
+from itertools import compress, repeat
+from operator import and_, floordiv
+from typing import Any, Iterable, Iterator, Sequence
+
+from clippings_cli.clippings_service.validators import ClippingError, validate_codes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NULL: int = -(1 << 63)
+INTEGER_COLUMNS: tuple[str, ...] = ("created_at", "page_start", "page_end", "location_start", "location_end")
+GROUP_KEYS: tuple[str, ...] = ("book", "author", "clipping_type", "year", "month")
+
+_MAX = (1 << 63) - 1
+_EPOCH = date(1970, 1, 1)
+_SECONDS_PER_DAY = 86400
+_NUMPY_TYPES = {"q": "int64", "i": "int32", "B": "uint8"}
+
+
+@lru_cache(maxsize=None)
+def _day_to_epoch(day: str) -> int:
+    """Converts day, like "2025-01-01", to number of days since Unix epoch."""
+    return (date.fromisoformat(day) - _EPOCH).days
+
+
+@lru_cache(maxsize=None)
+def _epoch_to_day(days: int) -> str:
+    """Converts number of days since Unix epoch to day, like "2025-01-01"."""
+    return (_EPOCH + timedelta(days=days)).isoformat()
+
+
+def to_epoch(value: str) -> int:
+    """
+    Converts creation datetime, like "2025-01-01 05:00:00" or "2025-01-01", to Unix timestamp. Creation datetimes
+    have no timezone, so they are treated as UTC.
+
+    Args:
+        value (str): Creation datetime in "%Y-%m-%d %H:%M:%S" or "%Y-%m-%d" format.
+
+    Returns:
+        int: Unix timestamp.
+    """
+    seconds = int(value[11:13] or 0) * 3600 + int(value[14:16] or 0) * 60 + int(value[17:19] or 0)
+    return _day_to_epoch(value[:10]) * _SECONDS_PER_DAY + seconds
+
+
+def from_epoch(value: int) -> str:
+    """
+    Converts Unix timestamp to creation datetime.
+
+    Args:
+        value (int): Unix timestamp.
+
+    Returns:
+        str: Creation datetime in "%Y-%m-%d %H:%M:%S" format.
+    """
+    days, seconds = divmod(value, _SECONDS_PER_DAY)
+    return f"{_epoch_to_day(days)} {seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def _format_range(start: int, end: int) -> str | None:
+    """Converts integer range back to raw page number or location, like "69-70"."""
+    if start == NULL:
+        return None
+    return str(start) if end == start else f"{start}-{end}"
+
+
+def build_clipping(
+    book: tuple[str, str] | None, clipping_type: str | None, values: list[int], errors: int, content: str
+) -> dict:
+    """
+    Builds Clipping dictionary from decoded columns values, with the same keys as parsed Clipping. Raw page number
+    and location are restored from integer ranges, keys of missing fields are skipped based on errors code.
+
+    Args:
+        book (tuple[str, str] | None): Book title and author.
+        clipping_type (str | None): Clipping type.
+        values (list[int]): Values of INTEGER_COLUMNS.
+        errors (int): Errors code.
+        content (str): Clipping content.
+
+    Returns:
+        dict: Clipping.
+    """
+    created_at, page_start, page_end, location_start, location_end = values
+    clipping: dict[str, Any] = {}
+    if not errors & ClippingError.BOOK:
+        clipping["book"] = {"title": book[0], "author": book[1]} if book else None
+    if not errors & ClippingError.CLIPPING_TYPE:
+        clipping["clipping_type"] = clipping_type
+    if not errors & ClippingError.PAGE_NUMBER:
+        clipping["page_number"] = _format_range(page_start, page_end)
+    if not errors & ClippingError.LOCATION:
+        clipping["location"] = _format_range(location_start, location_end)
+    if not errors & ClippingError.CREATED_AT:
+        clipping["created_at"] = None if created_at == NULL else from_epoch(created_at)
+    if not errors & ClippingError.PAGE_NUMBER:
+        clipping["page_start"] = None if page_start == NULL else page_start
+        clipping["page_end"] = None if page_end == NULL else page_end
+    if not errors & ClippingError.LOCATION:
+        clipping["location_start"] = None if location_start == NULL else location_start
+        clipping["location_end"] = None if location_end == NULL else location_end
+    if not errors & ClippingError.CONTENT:
+        clipping["content"] = content
+    clipping["errors"] = errors
+    return clipping
+
+
+class ClippingsTable:
+    """
+    Columnar representation of parsed Clippings. Creation datetimes, page numbers and locations are stored as int64
+    Unix timestamps and integers in arrays, books and Clipping types as dictionary-encoded int32 codes, and contents
+    as a single string buffer with offsets of every Clipping content. Missing values are stored as NULL (or -1 code).
+
+    Filters and counters operate on whole columns - with C-level iteration over arrays or, when NumPy is installed,
+    with NumPy arrays sharing memory with the columns.
+
+    Attributes:
+        books (list[tuple[str, str]]): Categories of book column - (title, author) pairs.
+        clipping_types (list[str]): Categories of Clipping type column.
+        columns (dict[str, array]): Columns of book and Clipping type codes, integer columns and errors codes.
+        content_buffer (str): Contents of all Clippings.
+        content_offsets (array): Offsets of Clipping contents in content buffer, with buffer length at the end.
+    """
+
+    def __init__(self):
+        self.books: list[tuple[str, str]] = []
+        self.clipping_types: list[str] = []
+        self.columns: dict[str, array] = {
+            "book": array("i"),
+            "clipping_type": array("i"),
+            **{name: array("q") for name in INTEGER_COLUMNS},
+            "errors": array("B"),
+        }
+        self.content_buffer: str = ""
+        self.content_offsets: array = array("q", [0])
+
+    @classmethod
+    def from_clippings(cls, clippings: Iterable[dict]) -> "ClippingsTable":
+        """
+        Builds table from parsed Clippings in a single pass.
+
+        Args:
+            clippings (Iterable[dict]): Parsed Clippings.
+
+        Returns:
+            ClippingsTable: Table of Clippings.
+        """
+        table = cls()
+        books, clipping_types = table.books, table.clipping_types
+        book_codes: dict[tuple[str, str], int] = {}
+        type_codes: dict[str, int] = {}
+        contents: list[str] = []
+        offset = 0
+        append_book, append_type, append_created_at, append_page_start, append_page_end, append_errors = (
+            table.columns[name].append
+            for name in ("book", "clipping_type", "created_at", "page_start", "page_end", "errors")
+        )
+        append_location_start = table.columns["location_start"].append
+        append_location_end = table.columns["location_end"].append
+        append_offset = table.content_offsets.append
+        for clipping in clippings:
+            get = clipping.get
+            if book := get("book"):
+                key = (book["title"], book["author"])
+                if (code := book_codes.get(key)) is None:
+                    code = book_codes[key] = len(books)
+                    books.append(key)
+                append_book(code)
+            else:
+                append_book(-1)
+            if (clipping_type := get("clipping_type")) is not None:
+                if (code := type_codes.get(clipping_type)) is None:
+                    code = type_codes[clipping_type] = len(clipping_types)
+                    clipping_types.append(clipping_type)
+                append_type(code)
+            else:
+                append_type(-1)
+            append_created_at(to_epoch(created_at) if (created_at := get("created_at")) else NULL)
+            append_page_start(NULL if (value := get("page_start")) is None else value)
+            append_page_end(NULL if (value := get("page_end")) is None else value)
+            append_location_start(NULL if (value := get("location_start")) is None else value)
+            append_location_end(NULL if (value := get("location_end")) is None else value)
+            append_errors(errors if (errors := get("errors")) is not None else validate_codes(clipping))
+            content = get("content") or ""
+            contents.append(content)
+            offset += len(content)
+            append_offset(offset)
+        table.content_buffer = "".join(contents)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.columns["errors"])
+
+    def column(self, name: str) -> Any:
+        """
+        Returns column of codes, integers or errors codes - NumPy array sharing memory with the column, when NumPy is
+        installed, or the column array otherwise.
+
+        Args:
+            name (str): Column name.
+
+        Returns:
+            Any: Column values.
+        """
+        values = self.columns[name]
+        if numpy is None:
+            return values
+        dtype = _NUMPY_TYPES[values.typecode]
+        return numpy.frombuffer(values, dtype=dtype) if len(values) else numpy.zeros(0, dtype=dtype)
+
+    def content(self, position: int) -> str:
+        """
+        Returns content of single Clipping.
+
+        Args:
+            position (int): Clipping position.
+
+        Returns:
+            str: Clipping content.
+        """
+        start, end = self.content_offsets[position], self.content_offsets[position + 1]
+        return self.content_buffer[start:end]
+
+    def row(self, position: int) -> dict:
+        """
+        Returns single Clipping, with the same keys as parsed Clipping. Keys of missing fields are restored based on
+        errors code.
+
+        Args:
+            position (int): Clipping position.
+
+        Returns:
+            dict: Clipping.
+        """
+        columns = self.columns
+        book_code, type_code = columns["book"][position], columns["clipping_type"][position]
+        return build_clipping(
+            self.books[book_code] if book_code >= 0 else None,
+            self.clipping_types[type_code] if type_code >= 0 else None,
+            [columns[name][position] for name in INTEGER_COLUMNS],
+            columns["errors"][position],
+            self.content(position),
+        )
+
+    def to_records(self) -> Iterator[dict]:
+        """
+        Yields all Clippings as dictionaries, so table can be passed to output format handlers.
+
+        Yields:
+            dict: Clipping.
+        """
+        for position in range(len(self)):
+            yield self.row(position)
+
+    def to_columns(self) -> dict[str, list]:
+        """
+        Returns all columns decoded to lists of Python values - book titles and authors, Clipping types, creation
+        datetimes, page numbers and locations (None for missing values), errors codes and contents.
+
+        Returns:
+            dict[str, list]: Decoded columns.
+        """
+        columns = self.columns
+        books = [*self.books, (None, None)]
+        clipping_types = [*self.clipping_types, None]
+        decoded = {
+            "title": [books[code][0] for code in columns["book"]],
+            "author": [books[code][1] for code in columns["book"]],
+            "clipping_type": [clipping_types[code] for code in columns["clipping_type"]],
+            "created_at": [None if value == NULL else from_epoch(value) for value in columns["created_at"]],
+        }
+        for name in INTEGER_COLUMNS[1:]:
+            decoded[name] = [None if value == NULL else value for value in columns[name]]
+        decoded["errors"] = list(columns["errors"])
+        decoded["content"] = [self.content(position) for position in range(len(self))]
+        return decoded
+
+    def _isin(self, name: str, codes: Sequence[int]) -> Any:
+        """Returns mask of rows with column value in codes."""
+        if numpy is not None:
+            return numpy.isin(self.column(name), codes)
+        return map(frozenset(codes).__contains__, self.columns[name])
+
+    def _between(self, name: str, start: int, end: int) -> Any:
+        """Returns mask of rows with column value in [start, end) range."""
+        if numpy is not None:
+            values = self.column(name)
+            return (values >= start) & (values < end)
+        return map(range(start, end).__contains__, self.columns[name])
+
+    def _contains(self, phrase: str) -> Any:
+        """Returns mask of rows with content containing phrase, found by searching the whole content buffer."""
+        buffer, offsets, rows = self.content_buffer, self.content_offsets, set()
+        index = buffer.find(phrase)
+        while index >= 0:
+            row = bisect_right(offsets, index) - 1
+            if index + len(phrase) <= offsets[row + 1]:
+                rows.add(row)
+                index = buffer.find(phrase, offsets[row + 1])
+            else:
+                index = buffer.find(phrase, index + 1)
+        if numpy is not None:
+            mask = numpy.zeros(len(self), dtype=bool)
+            mask[list(rows)] = True
+            return mask
+        return map(rows.__contains__, range(len(self)))
+
+    def filter(
+        self,
+        title: str | None = None,
+        author: str | None = None,
+        clipping_type: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        contains: str | None = None,
+    ) -> list[int]:
+        """
+        Returns positions of Clippings matching all given criteria. Every criterion is evaluated on the whole column.
+
+        Args:
+            title (str | None): Book title.
+            author (str | None): Book author.
+            clipping_type (str | None): Clipping type, case-insensitive.
+            since (str | None): Minimal creation datetime (inclusive), like "2025-01-01".
+            until (str | None): Maximal creation datetime (exclusive), like "2025-02-01".
+            contains (str | None): Phrase contained in Clipping content, case-sensitive.
+
+        Returns:
+            list[int]: Positions of matching Clippings.
+        """
+        masks = []
+        if title is not None or author is not None:
+            codes = [
+                code
+                for code, (book_title, book_author) in enumerate(self.books)
+                if title in (None, book_title) and author in (None, book_author)
+            ]
+            masks.append(self._isin("book", codes))
+        if clipping_type is not None:
+            clipping_type = clipping_type.casefold()
+            codes = [code for code, value in enumerate(self.clipping_types) if value.casefold() == clipping_type]
+            masks.append(self._isin("clipping_type", codes))
+        if since is not None or until is not None:
+            start = to_epoch(since) if since is not None else NULL + 1
+            end = to_epoch(until) if until is not None else _MAX
+            masks.append(self._between("created_at", start, end))
+        if contains is not None:
+            masks.append(self._contains(contains))
+        if not masks:
+            return list(range(len(self)))
+        if numpy is not None:
+            return numpy.flatnonzero(numpy.logical_and.reduce(masks)).tolist()
+        return list(compress(range(len(self)), reduce(lambda mask, other: map(and_, mask, other), masks)))
+
+    def take(self, positions: Sequence[int]) -> "ClippingsTable":
+        """
+        Returns table containing only Clippings at given positions. Categories are shared with source table.
+
+        Args:
+            positions (Sequence[int]): Clipping positions, like filter() result.
+
+        Returns:
+            ClippingsTable: Table of selected Clippings.
+        """
+        table = ClippingsTable()
+        table.books, table.clipping_types = self.books, self.clipping_types
+        for name, values in self.columns.items():
+            if numpy is not None:
+                table.columns[name].frombytes(self.column(name)[numpy.asarray(positions, dtype=int)].tobytes())
+            else:
+                table.columns[name].extend(map(values.__getitem__, positions))
+        contents = [self.content(position) for position in positions]
+        table.content_buffer = "".join(contents)
+        offset = 0
+        for content in contents:
+            offset += len(content)
+            table.content_offsets.append(offset)
+        return table
+
+    def group_by_count(self, key: str) -> dict[Any, int]:
+        """
+        Counts Clippings by book ((title, author) pair), author, Clipping type, creation year or creation month.
+        Clippings missing grouped value are not counted.
+
+        Args:
+            key (str): One of GROUP_KEYS.
+
+        Returns:
+            dict[Any, int]: Number of Clippings by key value, sorted by number of Clippings descending.
+        """
+        if key in ("year", "month"):
+            created_at = self.column("created_at")
+            if numpy is not None:
+                days, counts = numpy.unique(created_at[created_at != NULL] // _SECONDS_PER_DAY, return_counts=True)
+                day_counts = dict(zip(days.tolist(), counts.tolist()))
+            else:
+                day_counts = Counter(map(floordiv, created_at, repeat(_SECONDS_PER_DAY)))
+                day_counts.pop(NULL // _SECONDS_PER_DAY, None)
+            length = 4 if key == "year" else 7
+            result: Counter = Counter()
+            for day, count in day_counts.items():
+                result[_epoch_to_day(day)[:length]] += count
+            return dict(result.most_common())
+        column = "book" if key == "author" else key
+        categories = self.books if column == "book" else self.clipping_types
+        if numpy is not None:
+            codes = self.column(column)
+            code_counts = enumerate(numpy.bincount(codes[codes >= 0], minlength=len(categories)).tolist())
+        else:
+            code_counts = Counter(self.columns[column]).items()
+        result = Counter()
+        for code, count in code_counts:
+            if code >= 0 and count:
+                result[categories[code][1] if key == "author" else categories[code]] += count
+        return dict(result.most_common())
@@ -0,0 +1,64 @@
+"""
+File containing functions selecting top Clippings and books in a single pass over Clippings stream, keeping only
+bounded heaps in memory.
+
+Constants:
+    CLIPPING_KEYS (dict[str, Callable]) - Functions returning value Clippings are ranked by, for every Clippings key.
+    BOOKS_FIELDS (tuple[str, ...]) - Clipping fields used for books ranking, including Clipping type for filtering.
+"""
+
+import heapq
+from collections import Counter
+from typing import Any, Callable, Iterable
+
+CLIPPING_KEYS: dict[str, Callable[[dict], Any]] = {
+    "length": lambda clipping: len(clipping["content"]) if "content" in clipping else None,
+    "recent": lambda clipping: clipping.get("created_at"),
+}
+BOOKS_FIELDS: tuple[str, ...] = ("book", "clipping_type")
+
+
+def top_clippings(clippings: Iterable[dict], count: int, key: str) -> list[dict]:
+    """
+    Selects Clippings with the highest key values with bounded min-heap - memory usage is O(count) regardless of
+    number of Clippings. Ties are resolved in favour of Clippings placed later in Clippings file.
+
+    Args:
+        clippings (Iterable[dict]): Parsed Clippings.
+        count (int): Number of selected Clippings.
+        key (str): One of CLIPPING_KEYS.
+
+    Returns:
+        list[dict]: Selected Clippings, sorted by key value descending.
+    """
+    key_function = CLIPPING_KEYS[key]
+    heap: list[tuple[Any, int, dict]] = []
+    for position, clipping in enumerate(clippings):
+        if (value := key_function(clipping)) is None:
+            continue
+        item = (value, position, clipping)
+        if len(heap) < count:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    return [clipping for _, _, clipping in sorted(heap, reverse=True)]
+
+
+def top_books(clippings: Iterable[dict], count: int) -> list[dict]:
+    """
+    Selects books with the highest number of Clippings. Only per-book counters are kept while iterating.
+
+    Args:
+        clippings (Iterable[dict]): Parsed Clippings.
+        count (int): Number of selected books.
+
+    Returns:
+        list[dict]: Selected books with number of Clippings, sorted by number of Clippings descending.
+    """
+    books = Counter(
+        (clipping["book"]["title"], clipping["book"]["author"]) for clipping in clippings if "book" in clipping
+    )
+    return [
+        {"book": {"title": title, "author": author}, "count": book_count}
+        for (title, author), book_count in heapq.nlargest(count, books.items(), key=lambda item: item[1])
+    ]
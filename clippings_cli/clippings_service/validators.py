@@ -1,8 +1,84 @@
 """
-File containing data parsers for ClippingsService class.
+File containing data validators for ClippingsService class.
+
+Constants:
+    MANDATORY_FIELDS (tuple[str, ...]) - Fields, that every parsed Clipping should contain.
+    FIELD_ERRORS (dict[str, ClippingError]) - Error code of every mandatory field, set when field is missing.
 """
 
+from enum import IntFlag
+from typing import BinaryIO
+
+from clippings_cli.clippings_service.parsers import SEPARATOR_LINE
+
+
+class ClippingError(IntFlag):
+    """Bit flags of Clipping validation errors. Valid Clipping has errors code equal to 0."""
+
+    BOOK = 1
+    CLIPPING_TYPE = 2
+    PAGE_NUMBER = 4
+    CREATED_AT = 8
+    LOCATION = 16
+    CONTENT = 32
+
+
+class ClippingValidationError(ValueError):
+    """
+    Raised for invalid Clipping in strict validation mode.
+
+    Args:
+        code (int): Clipping errors code.
+    """
+
+    def __init__(self, code: int):
+        super().__init__(f"Invalid Clipping found in strict mode. Missing fields: {describe_errors(code)}.")
+        self.code = code
+
+
 MANDATORY_FIELDS = ("book", "clipping_type", "page_number", "created_at", "location", "content")
+FIELD_ERRORS: dict[str, ClippingError] = {
+    "book": ClippingError.BOOK,
+    "clipping_type": ClippingError.CLIPPING_TYPE,
+    "page_number": ClippingError.PAGE_NUMBER,
+    "created_at": ClippingError.CREATED_AT,
+    "location": ClippingError.LOCATION,
+    "content": ClippingError.CONTENT,
+}
+_MANDATORY_FIELDS_SET = frozenset(MANDATORY_FIELDS)
+
+
+def validate_codes(clipping: dict, fields: frozenset[str] = _MANDATORY_FIELDS_SET) -> int:
+    """
+    Validates Clipping content after parsing. For valid Clipping only a single set comparison is performed.
+
+    Args:
+        clipping (dict): Parsed Clipping data.
+        fields (frozenset[str]): Mandatory fields checked - all of them or only ones kept by fields projection.
+
+    Returns:
+        int: Errors code - ClippingError bit flags of missing fields or 0 for valid Clipping.
+    """
+    if clipping.keys() >= fields:
+        return 0
+    code = 0
+    for field, flag in FIELD_ERRORS.items():
+        if field in fields and field not in clipping:
+            code |= flag
+    return int(code)
+
+
+def describe_errors(code: int) -> str:
+    """
+    Converts errors code to human-readable list of missing fields.
+
+    Args:
+        code (int): Clipping errors code.
+
+    Returns:
+        str: Comma separated missing fields or empty string for valid Clipping.
+    """
+    return ", ".join(field for field, flag in FIELD_ERRORS.items() if code & flag)
 
 
 def validate_fields(clipping: dict) -> dict:
@@ -15,8 +91,78 @@ def validate_fields(clipping: dict) -> dict:
     Returns:
         dict: Dictionary containing errors found in Clipping dictionary.
     """
-    errors = {}
-    for field in MANDATORY_FIELDS:
-        if field not in clipping:
-            errors[field] = f"Field {field} missed in Clipping."
-    return errors
+    code = validate_codes(clipping)
+    return {field: f"Field {field} missed in Clipping." for field, flag in FIELD_ERRORS.items() if code & flag}
+
+
+class ValidationEngine:
+    """
+    Class validating parsed Clippings, counting errors by type across the whole run and routing invalid Clippings.
+
+    Modes:
+    * lenient - invalid Clippings are kept in output with their errors code.
+    * strict - first invalid Clipping stops processing with ClippingValidationError.
+
+    When reject stream is provided, raw records of invalid Clippings are written to it in Clippings file format
+    instead of being kept in output. When fields are provided, only mandatory fields kept by fields projection are
+    checked and errors code is stored only if "errors" field is requested.
+
+    Args:
+        strict (bool): Whether to use strict mode.
+        reject_stream (BinaryIO | None): Binary stream for raw records of invalid Clippings.
+        fields (frozenset[str] | None): Requested Clipping fields or None for all fields.
+
+    Attributes:
+        invalid_count (int): Number of invalid Clippings found.
+        rejected_count (int): Number of invalid Clippings written to reject stream.
+    """
+
+    def __init__(
+        self, strict: bool = False, reject_stream: BinaryIO | None = None, fields: frozenset[str] | None = None
+    ):
+        self.strict: bool = strict
+        self.reject_stream: BinaryIO | None = reject_stream
+        self._mandatory_fields: frozenset[str] = (
+            _MANDATORY_FIELDS_SET if fields is None else _MANDATORY_FIELDS_SET & fields
+        )
+        self._store_errors: bool = fields is None or "errors" in fields
+        self.invalid_count: int = 0
+        self.rejected_count: int = 0
+        self._flag_counts: list[int] = [0] * len(FIELD_ERRORS)
+
+    def validate(self, clipping: dict, lines: list[str]) -> bool:
+        """
+        Validates parsed Clipping, storing its errors code in "errors" key, unless projected out.
+
+        Args:
+            clipping (dict): Parsed Clipping.
+            lines (list[str]): Raw record lines of Clipping.
+
+        Returns:
+            bool: Whether Clipping should be kept in output.
+        """
+        code = validate_codes(clipping, self._mandatory_fields)
+        if self._store_errors:
+            clipping["errors"] = code
+        if not code:
+            return True
+        self.invalid_count += 1
+        for index, flag in enumerate(FIELD_ERRORS.values()):
+            if code & flag:
+                self._flag_counts[index] += 1
+        if self.reject_stream is not None:
+            self.reject_stream.write("\n".join((*lines, SEPARATOR_LINE, "")).encode("utf8"))
+            self.rejected_count += 1
+        if self.strict:
+            raise ClippingValidationError(code)
+        return self.reject_stream is None
+
+    @property
+    def error_counts(self) -> dict[str, int]:
+        """
+        Returns numbers of invalid Clippings by missing field.
+
+        Returns:
+            dict[str, int]: Number of Clippings missing given field, for fields missing at least once.
+        """
+        return {field: count for field, count in zip(FIELD_ERRORS, self._flag_counts) if count}
@@ -0,0 +1,381 @@
+"""
+File containing SpaceSavingCounter class approximately counting the most frequent items of a stream in bounded memory,
+and VocabularyCounter class counting words and phrases (n-grams) of Clippings contents, in total or per book or author.
+
+Counters are mergeable - counters of separate chunks of Clippings, like Clippings files of several devices or runs,
+merged together approximate counters of all Clippings, with the same error bounds.
+
+Constants:
+    DEFAULT_CAPACITY (int) - Default number of items tracked by every counter.
+    DEFAULT_NGRAM (int) - Default maximal number of words of counted phrases.
+    VOCAB_FIELDS (tuple[str, ...]) - Clipping fields used for vocabulary counting.
+    GROUPINGS (tuple[str, ...]) - Supported groupings of counters.
+"""
+
+import heapq
+import re
+from typing import Any, Iterable, Iterator
+
+DEFAULT_CAPACITY: int = 1000
+DEFAULT_NGRAM: int = 2
+VOCAB_FIELDS: tuple[str, ...] = ("book", "content")
+GROUPINGS: tuple[str, ...] = ("all", "book", "author")
+
+_WORD_PATTERN = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+
+
+def tokenize(content: str) -> list[str]:
+    """
+    Splits content into lowercase words - runs of letters, with apostrophes inside words kept ("don't"). Numbers and
+    punctuation are skipped.
+
+    Args:
+        content (str): Clipping content.
+
+    Returns:
+        list[str]: Words of content.
+    """
+    return _WORD_PATTERN.findall(content.casefold())
+
+
+def iter_ngrams(words: list[str], size: int, stopwords: frozenset[str] = frozenset()) -> Iterator[str]:
+    """
+    Yields phrases of consecutive words. Phrases starting or ending with a stopword are skipped, so single stopwords
+    are skipped as well.
+
+    Args:
+        words (list[str]): Words of content.
+        size (int): Number of words of phrase.
+        stopwords (frozenset[str]): Lowercase words not starting or ending counted phrases.
+
+    Yields:
+        str: Phrase, words joined with single space.
+    """
+    for start, stop in enumerate(range(size, len(words) + 1)):
+        if words[start] in stopwords or words[stop - 1] in stopwords:
+            continue
+        yield words[start] if size == 1 else " ".join(words[start:stop])
+
+
+class SpaceSavingCounter:
+    """
+    Class counting the most frequent items of a stream with Space-Saving algorithm - at most capacity items are
+    tracked, and new item replaces the item of the lowest count, inheriting its count as error. Every tracked count
+    overestimates the real count by at most its error, and the error never exceeds total / capacity, so every item
+    more frequent than that is tracked. Items are kept in buckets of equal counts, so every increment takes constant
+    time.
+
+    Args:
+        capacity (int): Maximal number of tracked items.
+
+    Attributes:
+        capacity (int): Maximal number of tracked items.
+        total (int): Number of counted occurrences.
+        counts (dict[str, int]): Estimated count of every tracked item.
+        errors (dict[str, int]): Maximal overestimation of count of every tracked item.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity: int = capacity
+        self.total: int = 0
+        self.counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self._buckets: dict[int, dict[str, None]] = {}
+        self._min: int = 0
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def add(self, item: str) -> None:
+        """
+        Counts single occurrence of item.
+
+        Args:
+            item (str): Counted item.
+        """
+        self.total += 1
+        counts, buckets = self.counts, self._buckets
+        count = counts.get(item)
+        if count is None:
+            if len(counts) < self.capacity:
+                count = 0
+                self.errors[item] = 0
+                self._min = 1
+            else:
+                count = self._min
+                bucket = buckets[count]
+                replaced = next(iter(bucket))
+                del bucket[replaced], counts[replaced], self.errors[replaced]
+                self.errors[item] = count
+        if count:
+            bucket = buckets[count]
+            bucket.pop(item, None)
+            if not bucket:
+                del buckets[count]
+                if count == self._min:
+                    self._min = count + 1
+        counts[item] = count + 1
+        if (next_bucket := buckets.get(count + 1)) is None:
+            next_bucket = buckets[count + 1] = {}
+        next_bucket[item] = None
+
+    def _floor(self) -> int:
+        """
+        Returns upper bound of count of any untracked item.
+
+        Returns:
+            int: The lowest tracked count, if all capacity is used, otherwise 0.
+        """
+        return self._min if len(self.counts) >= self.capacity else 0
+
+    def _load(self, entries: Iterable[tuple[str, int, int]]) -> None:
+        """
+        Replaces tracked items with given ones.
+
+        Args:
+            entries (Iterable[tuple[str, int, int]]): Item, count and error of every tracked item.
+        """
+        self.counts, self.errors, self._buckets = {}, {}, {}
+        for item, count, error in entries:
+            self.counts[item], self.errors[item] = count, error
+            self._buckets.setdefault(count, {})[item] = None
+        self._min = min(self._buckets, default=0)
+
+    def merge(self, other: "SpaceSavingCounter") -> "SpaceSavingCounter":
+        """
+        Adds counts of other counter. Counts of items tracked by one counter only are increased by the lowest count
+        of the other one (if its capacity is used), as they might have been replaced there, and only capacity items
+        of the highest counts are kept.
+
+        Args:
+            other (SpaceSavingCounter): Counter of other chunk of the stream.
+
+        Returns:
+            SpaceSavingCounter: Updated instance.
+        """
+        floor, other_floor = self._floor(), other._floor()
+        merged = (
+            (
+                self.counts.get(item, floor) + other.counts.get(item, other_floor),
+                self.errors.get(item, floor) + other.errors.get(item, other_floor),
+                item,
+            )
+            for item in self.counts.keys() | other.counts.keys()
+        )
+        kept = heapq.nlargest(self.capacity, merged)
+        self._load((item, count, error) for count, error, item in kept)
+        self.total += other.total
+        return self
+
+    def most_common(self, count: int | None = None) -> list[tuple[str, int, int]]:
+        """
+        Returns tracked items of the highest counts.
+
+        Args:
+            count (int | None): Maximal number of returned items or None for all tracked items.
+
+        Returns:
+            list[tuple[str, int, int]]: Item, estimated count and error, sorted by count descending.
+        """
+        items = sorted(self.counts.items(), key=lambda entry: (-entry[1], entry[0]))[:count]
+        return [(item, item_count, self.errors[item]) for item, item_count in items]
+
+    def to_dict(self, top: int | None = None) -> dict[str, Any]:
+        """
+        Returns counter as JSON serializable dictionary.
+
+        Args:
+            top (int | None): Maximal number of returned items or None for all tracked items, to restore counter.
+
+        Returns:
+            dict[str, Any]: Total and items of the highest counts.
+        """
+        return {
+            "total": self.total,
+            "items": [{"item": item, "count": count, "error": error} for item, count, error in self.most_common(top)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], capacity: int = DEFAULT_CAPACITY) -> "SpaceSavingCounter":
+        """
+        Restores counter from dictionary returned by to_dict().
+
+        Args:
+            data (dict[str, Any]): Counter dictionary.
+            capacity (int): Maximal number of tracked items.
+
+        Returns:
+            SpaceSavingCounter: Restored counter.
+        """
+        counter = cls(capacity)
+        entries = heapq.nlargest(capacity, data["items"], key=lambda entry: entry["count"])
+        counter._load((entry["item"], entry["count"], entry["error"]) for entry in entries)
+        counter.total = data["total"]
+        return counter
+
+
+class VocabularyCounter:
+    """
+    Class counting words and phrases of Clippings contents, with SpaceSavingCounter for every phrase length, in total
+    or per book or author. Memory usage is bounded by number of groups and counters capacity, whatever the number of
+    Clippings and distinct phrases.
+
+    Args:
+        ngram (int): Maximal number of words of counted phrases.
+        capacity (int): Number of items tracked by every counter.
+        group_by (str): Grouping of counters. [all|book|author]
+        stopwords (Iterable[str]): Words not starting or ending counted phrases.
+
+    Attributes:
+        ngram (int): Maximal number of words of counted phrases.
+        capacity (int): Number of items tracked by every counter.
+        group_by (str): Grouping of counters. [all|book|author]
+        stopwords (frozenset[str]): Lowercase words not starting or ending counted phrases.
+        clippings (dict[str, int]): Number of counted Clippings of every group.
+        counters (dict[str, list[SpaceSavingCounter]]): Counters of every group, for phrases of 1 to ngram words.
+    """
+
+    def __init__(
+        self,
+        ngram: int = DEFAULT_NGRAM,
+        capacity: int = DEFAULT_CAPACITY,
+        group_by: str = "all",
+        stopwords: Iterable[str] = (),
+    ):
+        self.ngram: int = ngram
+        self.capacity: int = capacity
+        self.group_by: str = group_by
+        self.stopwords: frozenset[str] = frozenset(word.casefold() for word in stopwords)
+        self.clippings: dict[str, int] = {}
+        self.counters: dict[str, list[SpaceSavingCounter]] = {}
+
+    def _get_group(self, clipping: dict) -> str | None:
+        """
+        Returns name of group of Clipping.
+
+        Args:
+            clipping (dict): Parsed Clipping.
+
+        Returns:
+            str | None: Group name or None, if Clipping misses book required by grouping.
+        """
+        if self.group_by == "all":
+            return "All"
+        if not (book := clipping.get("book")):
+            return None
+        return book["author"] if self.group_by == "author" else f"{book['title']} ({book['author']})"
+
+    def _get_counters(self, group: str) -> list[SpaceSavingCounter]:
+        """
+        Returns counters of group, creating them, if needed.
+
+        Args:
+            group (str): Group name.
+
+        Returns:
+            list[SpaceSavingCounter]: Counters of phrases of 1 to ngram words.
+        """
+        if (counters := self.counters.get(group)) is None:
+            counters = self.counters[group] = [SpaceSavingCounter(self.capacity) for _ in range(self.ngram)]
+            self.clippings[group] = 0
+        return counters
+
+    def add(self, clipping: dict) -> None:
+        """
+        Counts words and phrases of single Clipping.
+
+        Args:
+            clipping (dict): Parsed Clipping.
+        """
+        if not (content := clipping.get("content")) or (group := self._get_group(clipping)) is None:
+            return
+        counters = self._get_counters(group)
+        self.clippings[group] += 1
+        words = tokenize(content)
+        for size, counter in enumerate(counters, start=1):
+            add = counter.add
+            for phrase in iter_ngrams(words, size, self.stopwords):
+                add(phrase)
+
+    def update(self, clippings: Iterable[dict]) -> "VocabularyCounter":
+        """
+        Counts words and phrases of all Clippings from iterable.
+
+        Args:
+            clippings (Iterable[dict]): Parsed Clippings.
+
+        Returns:
+            VocabularyCounter: Updated instance.
+        """
+        for clipping in clippings:
+            self.add(clipping)
+        return self
+
+    def merge(self, other: "VocabularyCounter") -> "VocabularyCounter":
+        """
+        Adds counters of other VocabularyCounter of the same grouping and phrase length.
+
+        Args:
+            other (VocabularyCounter): Counter of other chunk of Clippings.
+
+        Returns:
+            VocabularyCounter: Updated instance.
+        """
+        if (other.group_by, other.ngram) != (self.group_by, self.ngram):
+            raise ValueError(
+                f"Counters of [{other.group_by}] grouping and {other.ngram}-grams can not be merged with counters of "
+                f"[{self.group_by}] grouping and {self.ngram}-grams."
+            )
+        for group, other_counters in other.counters.items():
+            for counter, other_counter in zip(self._get_counters(group), other_counters):
+                counter.merge(other_counter)
+            self.clippings[group] += other.clippings[group]
+        return self
+
+    def to_dict(self, top: int | None = None) -> dict[str, Any]:
+        """
+        Returns counters as JSON serializable dictionary. Groups are sorted by number of Clippings descending.
+
+        Args:
+            top (int | None): Maximal number of phrases of every length returned or None for all tracked phrases, to
+            restore counters.
+
+        Returns:
+            dict[str, Any]: Settings and counters of every group.
+        """
+        return {
+            "group_by": self.group_by,
+            "ngram": self.ngram,
+            "capacity": self.capacity,
+            "groups": [
+                {
+                    "group": group,
+                    "clippings": self.clippings[group],
+                    "ngrams": {
+                        str(size): counter.to_dict(top) for size, counter in enumerate(self.counters[group], start=1)
+                    },
+                }
+                for group in sorted(self.counters, key=lambda group: (-self.clippings[group], group))
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], capacity: int | None = None) -> "VocabularyCounter":
+        """
+        Restores counters from dictionary returned by to_dict().
+
+        Args:
+            data (dict[str, Any]): Counters dictionary.
+            capacity (int | None): Number of items tracked by every counter or None for capacity of dictionary.
+
+        Returns:
+            VocabularyCounter: Restored counters.
+        """
+        vocabulary = cls(ngram=data["ngram"], capacity=capacity or data["capacity"], group_by=data["group_by"])
+        for group in data["groups"]:
+            vocabulary.clippings[group["group"]] = group["clippings"]
+            vocabulary.counters[group["group"]] = [
+                SpaceSavingCounter.from_dict(group["ngrams"][str(size)], vocabulary.capacity)
+                for size in range(1, vocabulary.ngram + 1)
+            ]
+        return vocabulary
@@ -3,12 +3,21 @@ import sys
 
 import click
 
+from clippings_cli.clippings_service.dedupe import DEFAULT_THRESHOLD
+from clippings_cli.clippings_service.fingerprints import FINGERPRINT_FIELDS
+from clippings_cli.clippings_service.format_handlers.page_handlers import PAGE_FIELDS
+from clippings_cli.clippings_service.keywords import load_keywords
+from clippings_cli.clippings_service.parsers import CLIPPING_FIELDS
+from clippings_cli.clippings_service.readers import INPUT_FORMATS
 from clippings_cli.clippings_service.service import ClippingsService
+from clippings_cli.clippings_service.streams import STDIO_PATH, strip_compression_extension
 
 
 def get_full_input_path(path: str | None) -> str | None:
     """
-    Function to evaluate full path to Clippings file based on input path.
+    Function to evaluate full path to Clippings file based on input path. Clippings file can be compressed
+    (.gz, .bz2, .xz, .zip) or read from standard input, when "-" passed as path. JSON (.json) and Excel (.xlsx)
+    exports are accepted as well.
 
     Args:
         path (str | None): Path to Clippings file or None.
@@ -16,7 +25,9 @@ def get_full_input_path(path: str | None) -> str | None:
     Returns:
         str | None: Full path to Clippings file or None in case of errors.
     """
-    if not path:
+    if path == STDIO_PATH:
+        return path
+    elif not path:
         path = os.path.normpath(os.path.join(os.getcwd(), "My Clippings.txt"))
     elif os.path.isabs(os.path.normpath(path)):
         pass
@@ -28,31 +39,42 @@ def get_full_input_path(path: str | None) -> str | None:
     elif not os.path.isfile(path):
         click.echo(click.style(f"Path [{path}] is not a file.", fg="red", underline=True), err=True)
         return None
-    elif not path.endswith(".txt"):
-        click.echo(click.style(f"Path [{path}] is not a .txt file.", fg="red", underline=True), err=True)
+    elif not (path.endswith(".zip") or strip_compression_extension(path).endswith((".txt", *INPUT_FORMATS))):
+        click.echo(
+            click.style(f"Path [{path}] is not a .txt, .json or .xlsx file.", fg="red", underline=True), err=True
+        )
         return None
     return path
 
 
 def get_full_output_path(path: str | None, format: str | None) -> str | None:
     """
-    Function to evaluate full path to Clippings file based on input path.
+    Function to evaluate full path to output file based on output path. Output is compressed when path ends with
+    compression extension (.gz, .bz2, .xz, .zip) and written to standard output, when "-" passed as path. For page
+    formats (markdown, html) path points to output directory.
 
     Args:
-        path (str | None): Path to Clippings file or None.
+        path (str | None): Path to output file or None.
+        format (str | None): Output format.
 
     Returns:
-        str | None: Full path to Clippings file or None in case of errors.
+        str | None: Full path to output file or None in case of errors.
     """
     match format:
         case "json":
             extension = "json"
         case "excel":
             extension = "xlsx"
+        case "snapshot":
+            extension = "snapshot"
+        case "markdown" | "html":
+            extension = None
         case _:
             return None
-    if not path:
-        path = os.path.normpath(os.path.join(os.getcwd(), f"Output.{extension}"))
+    if path == STDIO_PATH:
+        return path
+    elif not path:
+        path = os.path.normpath(os.path.join(os.getcwd(), f"Output.{extension}" if extension else "Output"))
     elif os.path.isabs(os.path.normpath(path)):
         pass
     else:
@@ -60,53 +82,316 @@ def get_full_output_path(path: str | None, format: str | None) -> str | None:
     return path
 
 
+def parse_fields(ctx: click.Context, param: click.Parameter, value: str | None) -> tuple[str, ...] | None:
+    """
+    Function to convert comma separated list of Clipping fields, like "book,content", to tuple of fields.
+
+    Args:
+        ctx (click.Context): Command context.
+        param (click.Parameter): Option of fields list.
+        value (str | None): Comma separated list of fields or None.
+
+    Returns:
+        tuple[str, ...] | None: Requested fields in output order or None for all fields.
+    """
+    if value is None:
+        return None
+    fields = {field.strip().lower() for field in value.split(",") if field.strip()}
+    if unknown := fields.difference(CLIPPING_FIELDS):
+        raise click.BadParameter(
+            f"Unknown fields [{', '.join(sorted(unknown))}]. Available fields: {', '.join(CLIPPING_FIELDS)}."
+        )
+    if not fields:
+        raise click.BadParameter("At least one field is required.")
+    return tuple(field for field in CLIPPING_FIELDS if field in fields)
+
+
 @click.command()
-@click.option("-i", "--input_path", default=None, help="Path to Clippings file (full or relative).")
-@click.option("-o", "--output_path", default=None, help="Path to output file (full or relative).")
+@click.option("-i", "--input_path", default=None, help="Path to Clippings file (full or relative). Use '-' for stdin.")
+@click.option(
+    "-o",
+    "--output_path",
+    multiple=True,
+    help="Path to output file (full or relative). Use '-' for stdout. Repeat for every format.",
+)
 @click.option(
     "-f",
     "--format",
     required=True,
-    type=click.Choice(["json", "excel"], case_sensitive=False),
-    help="Output format. [json|excel]",
+    multiple=True,
+    type=click.Choice(["json", "excel", "markdown", "html", "snapshot"], case_sensitive=False),
+    help="Output format. Repeat to write several formats from single parse. [json|excel|markdown|html|snapshot]",
+)
+@click.option(
+    "--pipelined", is_flag=True, default=False, help="Read, parse and write Clippings concurrently in separate threads."
+)
+@click.option(
+    "--strict/--lenient",
+    default=False,
+    help="Stop on first invalid Clipping (strict) or keep invalid Clippings with errors codes (lenient, default).",
 )
-def convert(input_path: str | None, output_path: str | None, format: str):
+@click.option(
+    "-r",
+    "--reject_path",
+    default=None,
+    help="Path to file for raw records of invalid Clippings (full or relative). Rejected Clippings are not in output.",
+)
+@click.option(
+    "--shard_size", default=None, type=click.IntRange(min=1), help="Split output into files of at most N Clippings."
+)
+@click.option(
+    "--shard_by",
+    default=None,
+    type=click.Choice(["book", "month"], case_sensitive=False),
+    help="Split output into files per book or per month. [book|month]",
+)
+@click.option(
+    "--fuzzy_dedupe",
+    is_flag=True,
+    default=False,
+    help="Skip near-duplicate Clippings, like the same passage highlighted in different editions of a book.",
+)
+@click.option(
+    "--similarity",
+    default=DEFAULT_THRESHOLD,
+    show_default=True,
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    help="Minimal content similarity of near-duplicate Clippings.",
+)
+@click.option(
+    "--dedupe_cache",
+    default=None,
+    help="Path to file caching Clippings signatures between runs (full or relative), so only new Clippings are hashed.",
+)
+@click.option(
+    "--metrics_file",
+    default=None,
+    help="Path to file for run metrics (full or relative). Prometheus text format, JSON for .json files.",
+)
+@click.option(
+    "--fields",
+    default=None,
+    callback=parse_fields,
+    help=f"Comma separated Clipping fields kept in output, like 'book,content'. [{'|'.join(CLIPPING_FIELDS)}]",
+)
+@click.option(
+    "--sheet_per_book",
+    is_flag=True,
+    default=False,
+    help="Write Clippings of every book to separate Excel sheet, with summary sheet of per-book counts.",
+)
+@click.option(
+    "--grep_file",
+    default=None,
+    help="Path to file with keywords, one per line (full or relative). Keeps only Clippings mentioning any of them.",
+)
+@click.option(
+    "--join_notes",
+    is_flag=True,
+    default=False,
+    help="Attach every note to its highlight (json 'note' key, excel 'Note' column, below highlight on pages).",
+)
+@click.option(
+    "--only_new",
+    is_flag=True,
+    default=False,
+    help="Write only Clippings not exported by previous runs with the same state directory.",
+)
+@click.option(
+    "--state_dir",
+    default=None,
+    help="Path to directory keeping fingerprints of exported Clippings (full or relative). Required by --only_new.",
+)
+def convert(
+    input_path: str | None,
+    output_path: tuple[str, ...],
+    format: tuple[str, ...],
+    pipelined: bool,
+    strict: bool,
+    reject_path: str | None,
+    shard_size: int | None,
+    shard_by: str | None,
+    fuzzy_dedupe: bool,
+    similarity: float,
+    dedupe_cache: str | None,
+    metrics_file: str | None,
+    fields: tuple[str, ...] | None,
+    sheet_per_book: bool,
+    grep_file: str | None,
+    join_notes: bool,
+    only_new: bool,
+    state_dir: str | None,
+):
     """
-    Convert Clippings file to one of supported formats. [json|excel]
+    Convert Clippings file to one or more of supported formats. [json|excel|markdown|html|snapshot]
 
     Args:
 
         input_path (str | None): Full or relative path to Clippings file. Searches for "My Clipping.txt" file in current
-        directory by default.
+        directory by default. Compressed files (.gz, .bz2, .xz, .zip) are decompressed on the fly, "-" reads
+        Clippings from stdin. JSON (.json) and Excel (.xlsx) exports are read back as Clippings.
+
+        output_path (tuple[str, ...]): Full or relative paths to output files, one per format, in order of formats.
+        Creates output files in current directory by default. Output is compressed according to path extension (.gz,
+        .bz2, .xz, .zip), "-" writes output to stdout. For markdown and html formats it is a path to output directory.
+
+        format (tuple[str, ...]): Demanded formats of output. [json|excel|markdown|html|snapshot] Markdown and html
+        formats create page per book in output directory, rewriting only pages of changed books. Snapshot format
+        creates binary columnar file, that can be memory-mapped with ClippingsSnapshot class. Clippings are parsed
+        once and written to all formats concurrently.
+
+        pipelined (bool): Whether to read, parse and write Clippings concurrently.
+
+        strict (bool): Whether to stop on first invalid Clipping.
+
+        reject_path (str | None): Full or relative path to file for raw records of invalid Clippings.
+
+        shard_size (int | None): Maximal number of Clippings in a shard file. Shard files are numbered after output
+        file, like "Output-00001.json", and described by manifest file, like "Output.manifest.json".
+
+        shard_by (str | None): Grouping of Clippings into shard files. [book|month]
+
+        fuzzy_dedupe (bool): Whether to skip near-duplicate Clippings.
+
+        similarity (float): Minimal content similarity (estimated Jaccard similarity of word shingles) of
+        near-duplicate Clippings.
+
+        dedupe_cache (str | None): Full or relative path to file caching Clippings signatures between runs.
+
+        metrics_file (str | None): Full or relative path to file for counters and timings of the run, in Prometheus
+        textfile format or in JSON format, if path ends with ".json". Written also when conversion fails.
+
+        fields (tuple[str, ...] | None): Clipping fields kept in output. Fields projected out are not parsed, so
+        exports of few fields are faster. Only mandatory fields kept in output are validated.
 
-        output_path (str | None): Full or relative path to output file. Creates output file in current
-        directory by default.
+        sheet_per_book (bool): Whether to write Clippings of every book to separate sheet of Excel output, with summary
+        sheet of numbers of Clippings of every book. Sheets exceeding Excel rows limit are continued in next sheets.
 
-        format (str): Demanded format of output. [json|excel]
+        grep_file (str | None): Full or relative path to file with keywords or phrases, one per line. Only Clippings
+        mentioning any of them (as whole words, case-insensitively) are kept in output. Keywords are compiled into
+        single regex, so filtering time does not depend on number of keywords.
+
+        join_notes (bool): Whether to attach every note to highlight it was added to (of the same book, ending at note
+        location), found among recent Clippings. Joined notes are not written as separate Clippings.
+
+        only_new (bool): Whether to write only Clippings not exported by previous runs. Fingerprints of written
+        Clippings are stored in state directory, once output is written.
+
+        state_dir (str | None): Full or relative path to directory keeping fingerprints of exported Clippings - Bloom
+        filter, checked in memory, in front of exact SQLite set, looked up only for Clippings found in the filter.
     """
 
     full_input_path = get_full_input_path(input_path)
-    full_output_path = get_full_output_path(output_path, format)
+    if full_input_path is None:
+        sys.exit(1)
+    if output_path and len(output_path) != len(format):
+        click.echo(
+            click.style("Number of output paths has to match number of formats.", fg="red", underline=True), err=True
+        )
+        sys.exit(1)
+    full_output_paths = [
+        get_full_output_path(path, output_format)
+        for path, output_format in zip(output_path or [None] * len(format), format)
+    ]
 
-    if full_input_path is None or full_output_path is None:
+    if None in full_output_paths:
+        sys.exit(1)
+    if len(set(full_output_paths)) != len(full_output_paths):
+        click.echo(click.style("Every format has to be written to different path.", fg="red", underline=True), err=True)
+        sys.exit(1)
+    if (shard_size or shard_by) and STDIO_PATH in full_output_paths:
+        click.echo(click.style("Sharded output can not be written to stdout.", fg="red", underline=True), err=True)
         sys.exit(1)
 
-    clippings_service = ClippingsService(input_path=full_input_path, output_path=full_output_path)
+    if sheet_per_book and "excel" not in format:
+        click.echo(click.style("Sheet per book is supported only by excel format.", fg="red", underline=True), err=True)
+        sys.exit(1)
+    if join_notes and "snapshot" in format:
+        click.echo(
+            click.style("Notes joining is not supported by snapshot format.", fg="red", underline=True), err=True
+        )
+        sys.exit(1)
+    if only_new and not state_dir:
+        click.echo(click.style("State directory is required by --only_new.", fg="red", underline=True), err=True)
+        sys.exit(1)
+    if state_dir and not only_new:
+        click.echo(click.style("State directory is used only with --only_new.", fg="red", underline=True), err=True)
+        sys.exit(1)
+    if fields is not None:
+        required = {"content"} if fuzzy_dedupe else set()
+        if not {"markdown", "html"}.isdisjoint(format):
+            required.update(PAGE_FIELDS)
+        if join_notes:
+            required.update(("book", "clipping_type", "location_start", "location_end"))
+        if only_new:
+            required.update(FINGERPRINT_FIELDS)
+        if shard_by:
+            required.add("book" if shard_by == "book" else "created_at")
+        if missing := sorted(required.difference(fields)):
+            click.echo(
+                click.style(
+                    f"Fields [{', '.join(missing)}] are required by selected options.", fg="red", underline=True
+                ),
+                err=True,
+            )
+            sys.exit(1)
+
+    keywords = None
+    if grep_file:
+        grep_file = os.path.normpath(os.path.join(os.getcwd(), grep_file))
+        try:
+            keywords = load_keywords(grep_file)
+        except (OSError, UnicodeDecodeError) as e:
+            click.echo(click.style(f"Keywords file can not be read [{e}].", fg="red", underline=True), err=True)
+            sys.exit(1)
+        if not keywords:
+            click.echo(
+                click.style(f"Keywords file [{grep_file}] contains no keywords.", fg="red", underline=True), err=True
+            )
+            sys.exit(1)
+
+    if reject_path and reject_path != STDIO_PATH:
+        reject_path = os.path.normpath(os.path.join(os.getcwd(), reject_path))
+    if dedupe_cache:
+        dedupe_cache = os.path.normpath(os.path.join(os.getcwd(), dedupe_cache))
+    if metrics_file:
+        metrics_file = os.path.normpath(os.path.join(os.getcwd(), metrics_file))
+    if state_dir:
+        state_dir = os.path.normpath(os.path.join(os.getcwd(), state_dir))
+    clippings_service = ClippingsService(
+        input_path=full_input_path,
+        output_path=full_output_paths,
+        strict=strict,
+        reject_path=reject_path,
+        dedupe_threshold=similarity if fuzzy_dedupe else None,
+        dedupe_cache_path=dedupe_cache,
+        metrics_path=metrics_file,
+        fields=fields,
+        keywords=keywords,
+        state_dir=state_dir,
+    )
     click.echo(
         click.style(
-            f"Output file generation started: \n* Format [{format}]\n"
-            f"* Input path [{full_input_path}]\n* Output path [{full_output_path}]",
+            f"Output file generation started: \n* Format [{', '.join(format)}]\n"
+            f"* Input path [{full_input_path}]\n* Output path [{', '.join(full_output_paths)}]",
             fg="yellow",
             underline=True,
         ),
-        err=False,
+        err=STDIO_PATH in full_output_paths,
+    )
+    result = clippings_service.generate_output(
+        format=list(format),
+        pipelined=pipelined,
+        shard_size=shard_size,
+        shard_by=shard_by,
+        sheet_per_book=sheet_per_book,
+        join_notes=join_notes,
     )
-    result = clippings_service.generate_output(format=format)
 
     if "error" in result:
         click.echo(
             click.style(
-                f"Output file in [{format}] format generation finished with error [{result['error']}].",
+                f"Output file in [{', '.join(format)}] format generation finished with error [{result['error']}].",
                 fg="red",
                 underline=True,
             ),
@@ -120,6 +405,6 @@ def convert(input_path: str | None, output_path: str | None, format: str):
                 fg="green",
                 underline=True,
             ),
-            err=False,
+            err=STDIO_PATH in full_output_paths,
         )
         sys.exit(0)
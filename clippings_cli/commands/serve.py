@@ -0,0 +1,71 @@
+import asyncio
+import sys
+
+import click
+
+from clippings_cli.clippings_service.index import ClippingsIndex
+from clippings_cli.clippings_service.server import serve as start_server
+from clippings_cli.clippings_service.streams import STDIO_PATH, STREAM_ERRORS
+from clippings_cli.commands.convert import get_full_input_path
+
+
+async def run_server(index: ClippingsIndex, host: str, port: int, socket_path: str | None) -> None:
+    """
+    Runs Clippings server until interrupted.
+
+    Args:
+        index (ClippingsIndex): Loaded Clippings index.
+        host (str): TCP host.
+        port (int): TCP port.
+        socket_path (str | None): Unix socket path.
+    """
+    server = await start_server(index, host=host, port=port, socket_path=socket_path)
+    address = socket_path or "http://{}:{}".format(*server.sockets[0].getsockname()[:2])
+    click.echo(click.style(f"Serving Clippings on [{address}]. Press Ctrl+C to stop.", fg="green", underline=True))
+    async with server:
+        await server.serve_forever()
+
+
+@click.command()
+@click.option("-i", "--input_path", default=None, help="Path to Clippings file (full or relative).")
+@click.option("-h", "--host", default="127.0.0.1", help="Server host.")
+@click.option("-p", "--port", default=8765, type=click.IntRange(min=0, max=65535), help="Server port.")
+@click.option("-s", "--socket_path", default=None, help="Unix socket path. Overrides host and port.")
+def serve(input_path: str | None, host: str, port: int, socket_path: str | None):
+    """
+    Serve Clippings queries over local HTTP/JSON API.
+
+    Args:
+
+        input_path (str | None): Full or relative path to Clippings file. Searches for "My Clipping.txt" file in current
+        directory by default.
+
+        host (str): Server host. Localhost by default.
+
+        port (int): Server port.
+
+        socket_path (str | None): Unix socket path. If provided, server listens on Unix socket instead of TCP port.
+    """
+    full_input_path = get_full_input_path(input_path)
+    if full_input_path is None:
+        sys.exit(1)
+    if full_input_path == STDIO_PATH:
+        click.echo(click.style("Clippings can not be served from stdin.", fg="red", underline=True), err=True)
+        sys.exit(1)
+
+    index = ClippingsIndex(full_input_path)
+    try:
+        index.refresh()
+    except STREAM_ERRORS as e:
+        click.echo(click.style(f"Clippings loading finished with error [{e}].", fg="red", underline=True), err=True)
+        sys.exit(1)
+    click.echo(
+        click.style(
+            f"Clippings loaded: {len(index.clippings)} from {len(index.books)} books.", fg="green", underline=True
+        )
+    )
+    try:
+        asyncio.run(run_server(index, host=host, port=port, socket_path=socket_path))
+    except KeyboardInterrupt:
+        pass
+    sys.exit(0)
@@ -0,0 +1,99 @@
+import sys
+
+import click
+
+from clippings_cli.clippings_service.format_handlers.json_handlers import generate_json
+from clippings_cli.clippings_service.service import ClippingsService
+from clippings_cli.clippings_service.sessions import REORDER_WINDOW, SESSION_FIELDS, reconstruct_sessions
+from clippings_cli.clippings_service.streams import STDIO_PATH, STREAM_ERRORS
+from clippings_cli.commands.convert import get_full_input_path, get_full_output_path
+from clippings_cli.commands.top import write_text
+
+
+def format_sessions_table(sessions: list[dict]) -> str:
+    """
+    Formats reading sessions as plain text table.
+
+    Args:
+        sessions (list[dict]): Reading sessions.
+
+    Returns:
+        str: Formatted table.
+    """
+    lines = []
+    for number, session in enumerate(sessions, start=1):
+        locations = ""
+        if session["location_start"] is not None:
+            locations = f"  locations {session['location_start']}-{session['location_end']}"
+        lines.append(
+            f"{number:>3}. [{session['start']} - {session['end']}] {session['duration']:>4} min  "
+            f"{session['count']:>4} clippings{locations}\n     {session['book']['title']} ({session['book']['author']})"
+        )
+    return "\n".join(lines)
+
+
+@click.command()
+@click.option("-i", "--input_path", default=None, help="Path to Clippings file (full or relative). Use '-' for stdin.")
+@click.option(
+    "-o", "--output_path", default=None, help="Path to output file (full or relative). Prints to stdout by default."
+)
+@click.option(
+    "-g", "--gap", default=30, type=click.IntRange(min=1), help="Maximal gap between Clippings of session, in minutes."
+)
+@click.option(
+    "--reorder_window",
+    default=REORDER_WINDOW,
+    type=click.IntRange(min=1),
+    help="Number of Clippings buffered to order input merged from several devices by creation time.",
+)
+@click.option(
+    "-f",
+    "--format",
+    default="table",
+    type=click.Choice(["table", "json"], case_sensitive=False),
+    help="Output format. [table|json]",
+)
+def sessions(input_path: str | None, output_path: str | None, gap: int, reorder_window: int, format: str):
+    """
+    Group Clippings of every book into reading sessions. [table|json]
+
+    Args:
+
+        input_path (str | None): Full or relative path to Clippings file. Searches for "My Clipping.txt" file in current
+        directory by default.
+
+        output_path (str | None): Full or relative path to output file. Prints sessions to stdout by default.
+
+        gap (int): Maximal gap between Clippings of the same session, in minutes. Longer gap starts a new session.
+
+        reorder_window (int): Number of Clippings buffered to order Clippings by creation time. Input merged from
+        several devices, disordered by less Clippings than the window, is grouped as if it was sorted.
+
+        format (str): Demanded format of output. [table|json]
+    """
+    full_input_path = get_full_input_path(input_path)
+    if full_input_path is None:
+        sys.exit(1)
+    full_output_path = get_full_output_path(output_path, "json") if output_path else STDIO_PATH
+
+    clippings = ClippingsService(
+        input_path=full_input_path, output_path=full_output_path, fields=SESSION_FIELDS
+    ).iter_clippings()
+    try:
+        records = reconstruct_sessions(clippings, gap=gap * 60, window=reorder_window)
+    except STREAM_ERRORS as e:
+        click.echo(
+            click.style(f"Sessions reconstruction finished with error [{e}].", fg="red", underline=True), err=True
+        )
+        sys.exit(1)
+
+    if format == "json":
+        result = generate_json(clippings=records, output_path=full_output_path)
+    else:
+        result = write_text(f"{format_sessions_table(records)}\n", full_output_path)
+    if "error" in result:
+        click.echo(
+            click.style(f"Output saving finished with error [{result['error']}].", fg="red", underline=True), err=True
+        )
+        sys.exit(1)
+    sys.exit(0)
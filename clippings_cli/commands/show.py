@@ -0,0 +1,78 @@
+import sys
+from itertools import islice
+
+import click
+
+from clippings_cli.clippings_service.offsets import OffsetIndex, is_indexable
+from clippings_cli.clippings_service.service import ClippingsService
+from clippings_cli.clippings_service.streams import STDIO_PATH, STREAM_ERRORS
+from clippings_cli.commands.convert import get_full_input_path, get_full_output_path
+from clippings_cli.commands.tail import write_clippings
+
+
+@click.command()
+@click.option("-i", "--input_path", default=None, help="Path to Clippings file (full or relative). Use '-' for stdin.")
+@click.option(
+    "-o", "--output_path", default=None, help="Path to output file (full or relative). Prints to stdout by default."
+)
+@click.option("-p", "--page", default=1, type=click.IntRange(min=1), help="Number of shown page.")
+@click.option("-s", "--page_size", default=20, type=click.IntRange(min=1), help="Number of Clippings per page.")
+@click.option(
+    "-f",
+    "--format",
+    default="table",
+    type=click.Choice(["table", "json"], case_sensitive=False),
+    help="Output format. [table|json]",
+)
+def show(input_path: str | None, output_path: str | None, page: int, page_size: int, format: str):
+    """
+    Show page of Clippings, parsing only shown Clippings. [table|json]
+
+    Args:
+
+        input_path (str | None): Full or relative path to Clippings file. Searches for "My Clipping.txt" file in current
+        directory by default. Plain Clippings file is indexed in offsets file in user cache directory (like
+        "~/.cache/clippings_cli/My Clippings.txt.<digest>.offsets"), extended on every call with Clippings appended
+        since. Compressed files, exports and stdin are parsed up to shown page.
+
+        output_path (str | None): Full or relative path to output file. Prints Clippings to stdout by default.
+
+        page (int): Number of shown page, counting from 1.
+
+        page_size (int): Number of Clippings per page.
+
+        format (str): Demanded format of output. [table|json]
+    """
+    full_input_path = get_full_input_path(input_path)
+    if full_input_path is None:
+        sys.exit(1)
+    full_output_path = get_full_output_path(output_path, "json") if output_path else STDIO_PATH
+
+    clippings_service = ClippingsService(input_path=full_input_path, output_path=full_output_path)
+    start, footer = (page - 1) * page_size, ""
+    try:
+        if is_indexable(full_input_path):
+            index = OffsetIndex(full_input_path)
+            index.refresh()
+            pages = max(-(-len(index) // page_size), 1)
+            if page > pages:
+                click.echo(click.style(f"Page [{page}] out of range [1-{pages}].", fg="red", underline=True), err=True)
+                sys.exit(1)
+            clippings = list(clippings_service.parse_raw_records(index.read_records(start, start + page_size)))
+            footer = f"Page {page} of {pages}"
+        else:
+            clippings = list(islice(clippings_service.iter_clippings(), start, start + page_size))
+            if not clippings and page > 1:
+                click.echo(click.style(f"Page [{page}] out of range.", fg="red", underline=True), err=True)
+                sys.exit(1)
+    except STREAM_ERRORS as e:
+        click.echo(click.style(f"Reading Clippings finished with error [{e}].", fg="red", underline=True), err=True)
+        sys.exit(1)
+
+    result = write_clippings(clippings, full_output_path, format, start=start + 1, footer=footer)
+    if "error" in result:
+        click.echo(
+            click.style(f"Output saving finished with error [{result['error']}].", fg="red", underline=True), err=True
+        )
+        sys.exit(1)
+    sys.exit(0)
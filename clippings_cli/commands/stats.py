@@ -0,0 +1,102 @@
+import json
+import os
+import sys
+
+import click
+
+from clippings_cli.clippings_service.service import ClippingsService
+from clippings_cli.clippings_service.stats import STATS_FIELDS, ClippingsStats
+from clippings_cli.clippings_service.streams import STDIO_PATH, STREAM_ERRORS, open_output_stream
+from clippings_cli.commands.convert import get_full_input_path
+
+
+def format_table(title: str, rows: list[tuple[str, int]]) -> str:
+    """
+    Formats statistics section as plain text table.
+
+    Args:
+        title (str): Section title.
+        rows (list[tuple[str, int]]): Pairs of label and count.
+
+    Returns:
+        str: Formatted table.
+    """
+    width = max([len(title), *(len(label) for label, _ in rows)])
+    lines = [f"{title:<{width}}  Count", f"{'-' * width}  -----"]
+    lines.extend(f"{label:<{width}}  {count}" for label, count in rows)
+    return "\n".join(lines)
+
+
+def format_stats(stats: dict) -> str:
+    """
+    Formats Clippings statistics as plain text tables.
+
+    Args:
+        stats (dict): Clippings statistics returned by ClippingsStats.to_dict().
+
+    Returns:
+        str: Formatted statistics.
+    """
+    sections = [
+        format_table("Book", [(f"{book['title']} ({book['author']})", book["count"]) for book in stats["books"]]),
+        format_table("Author", [(author["author"], author["count"]) for author in stats["authors"]]),
+        format_table("Month", list(stats["months"].items())),
+        format_table("Clipping type", list(stats["clipping_types"].items())),
+        format_table("Hour", list(stats["hours"].items())),
+    ]
+    return f"Clippings: {stats['total']}\n\n" + "\n\n".join(sections)
+
+
+@click.command()
+@click.option("-i", "--input_path", default=None, help="Path to Clippings file (full or relative). Use '-' for stdin.")
+@click.option(
+    "-o", "--output_path", default=None, help="Path to output file (full or relative). Prints to stdout by default."
+)
+@click.option(
+    "-f",
+    "--format",
+    default="table",
+    type=click.Choice(["table", "json"], case_sensitive=False),
+    help="Output format. [table|json]",
+)
+@click.option("--top", default=None, type=click.IntRange(min=1), help="Number of top books and authors listed.")
+def stats(input_path: str | None, output_path: str | None, format: str, top: int | None):
+    """
+    Count Clippings per book, author, month, type and hour. [table|json]
+
+    Args:
+
+        input_path (str | None): Full or relative path to Clippings file. Searches for "My Clipping.txt" file in current
+        directory by default.
+
+        output_path (str | None): Full or relative path to output file. Prints statistics to stdout by default.
+
+        format (str): Demanded format of statistics. [table|json]
+
+        top (int | None): Number of top books and authors listed. Lists all of them by default.
+    """
+    full_input_path = get_full_input_path(input_path)
+    if full_input_path is None:
+        sys.exit(1)
+
+    clippings_service = ClippingsService(input_path=full_input_path, output_path=STDIO_PATH, fields=STATS_FIELDS)
+    try:
+        result = ClippingsStats().update(clippings_service.iter_clippings()).to_dict(top=top)
+    except STREAM_ERRORS as e:
+        click.echo(
+            click.style(f"Statistics calculation finished with error [{e}].", fg="red", underline=True), err=True
+        )
+        sys.exit(1)
+
+    content = json.dumps(result, ensure_ascii=False, indent=4) if format == "json" else format_stats(result)
+    if not output_path or output_path == STDIO_PATH:
+        click.echo(content)
+        sys.exit(0)
+    try:
+        with open_output_stream(os.path.normpath(os.path.join(os.getcwd(), output_path))) as stream:
+            stream.write(content.encode("utf-8"))
+    except PermissionError as e:
+        click.echo(click.style(f"Statistics saving finished with error [{e}].", fg="red", underline=True), err=True)
+        sys.exit(1)
+    click.echo(click.style("Statistics saved successfully.", fg="green", underline=True), err=False)
+    sys.exit(0)
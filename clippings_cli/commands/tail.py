@@ -0,0 +1,89 @@
+import os
+import sys
+from collections import deque
+
+import click
+
+from clippings_cli.clippings_service.format_handlers.json_handlers import generate_json
+from clippings_cli.clippings_service.offsets import OffsetIndex, get_offsets_path, is_indexable, read_last_records
+from clippings_cli.clippings_service.service import ClippingsService
+from clippings_cli.clippings_service.streams import STDIO_PATH, STREAM_ERRORS
+from clippings_cli.commands.convert import get_full_input_path, get_full_output_path
+from clippings_cli.commands.top import format_clippings_table, write_text
+
+
+def write_clippings(clippings: list[dict], output_path: str, format: str, start: int = 1, footer: str = "") -> dict:
+    """
+    Writes selected Clippings as plain text table or JSON to output file or stdout.
+
+    Args:
+        clippings (list[dict]): Selected Clippings.
+        output_path (str): Full path to output file or "-" for standard output.
+        format (str): Output format. [table|json]
+        start (int): Number of the first Clipping in table.
+        footer (str): Line appended to table.
+
+    Returns:
+        dict: Dictionary containing data about potential errors.
+    """
+    if format == "json":
+        return generate_json(clippings=clippings, output_path=output_path)
+    table = format_clippings_table(clippings, start=start)
+    return write_text(f"{table}\n{footer}\n" if footer else f"{table}\n", output_path)
+
+
+@click.command()
+@click.option("-i", "--input_path", default=None, help="Path to Clippings file (full or relative). Use '-' for stdin.")
+@click.option(
+    "-o", "--output_path", default=None, help="Path to output file (full or relative). Prints to stdout by default."
+)
+@click.option("-n", "--count", default=10, type=click.IntRange(min=1), help="Number of last Clippings shown.")
+@click.option(
+    "-f",
+    "--format",
+    default="table",
+    type=click.Choice(["table", "json"], case_sensitive=False),
+    help="Output format. [table|json]",
+)
+def tail(input_path: str | None, output_path: str | None, count: int, format: str):
+    """
+    Show last Clippings, without parsing the whole Clippings file. [table|json]
+
+    Args:
+
+        input_path (str | None): Full or relative path to Clippings file. Searches for "My Clipping.txt" file in current
+        directory by default. Plain Clippings file is read with its offsets file, if it was created by "show" command,
+        or scanned backwards from the end otherwise. Compressed files, exports and stdin are parsed as a whole.
+
+        output_path (str | None): Full or relative path to output file. Prints Clippings to stdout by default.
+
+        count (int): Number of last Clippings shown.
+
+        format (str): Demanded format of output. [table|json]
+    """
+    full_input_path = get_full_input_path(input_path)
+    if full_input_path is None:
+        sys.exit(1)
+    full_output_path = get_full_output_path(output_path, "json") if output_path else STDIO_PATH
+
+    clippings_service = ClippingsService(input_path=full_input_path, output_path=full_output_path)
+    try:
+        if not is_indexable(full_input_path):
+            clippings = list(deque(clippings_service.iter_clippings(), maxlen=count))
+        elif os.path.exists(get_offsets_path(full_input_path)):
+            index = OffsetIndex(full_input_path)
+            index.refresh()
+            clippings = list(clippings_service.parse_raw_records(index.read_records(len(index) - count, len(index))))
+        else:
+            clippings = list(clippings_service.parse_raw_records(read_last_records(full_input_path, count)))
+    except STREAM_ERRORS as e:
+        click.echo(click.style(f"Reading Clippings finished with error [{e}].", fg="red", underline=True), err=True)
+        sys.exit(1)
+
+    result = write_clippings(clippings, full_output_path, format)
+    if "error" in result:
+        click.echo(
+            click.style(f"Output saving finished with error [{result['error']}].", fg="red", underline=True), err=True
+        )
+        sys.exit(1)
+    sys.exit(0)
@@ -0,0 +1,156 @@
+import sys
+
+import click
+
+from clippings_cli.clippings_service.format_handlers.excel_handlers import generate_excel
+from clippings_cli.clippings_service.format_handlers.json_handlers import generate_json
+from clippings_cli.clippings_service.service import ClippingsService
+from clippings_cli.clippings_service.streams import STDIO_PATH, STREAM_ERRORS, open_output_stream
+from clippings_cli.clippings_service.top import BOOKS_FIELDS, top_books, top_clippings
+from clippings_cli.commands.convert import get_full_input_path, get_full_output_path
+
+CONTENT_PREVIEW_LENGTH: int = 60
+
+
+def format_clippings_table(clippings: list[dict], start: int = 1) -> str:
+    """
+    Formats selected Clippings as plain text table.
+
+    Args:
+        clippings (list[dict]): Selected Clippings.
+        start (int): Number of the first Clipping in table.
+
+    Returns:
+        str: Formatted table.
+    """
+    lines = []
+    for rank, clipping in enumerate(clippings, start=start):
+        book = clipping.get("book", {})
+        content = clipping.get("content", "")
+        if len(content) > CONTENT_PREVIEW_LENGTH:
+            content = content[: CONTENT_PREVIEW_LENGTH - 3] + "..."
+        lines.append(
+            f"{rank:>3}. [{clipping.get('created_at')}] [{clipping.get('clipping_type')}] "
+            f"{book.get('title')} ({book.get('author')}) - {len(clipping.get('content', ''))} chars\n     {content}"
+        )
+    return "\n".join(lines)
+
+
+def format_books_table(books: list[dict]) -> str:
+    """
+    Formats selected books as plain text table.
+
+    Args:
+        books (list[dict]): Selected books with number of Clippings.
+
+    Returns:
+        str: Formatted table.
+    """
+    return "\n".join(
+        f"{rank:>3}. {book['count']:>6}  {book['book']['title']} ({book['book']['author']})"
+        for rank, book in enumerate(books, start=1)
+    )
+
+
+def write_text(text: str, output_path: str) -> dict:
+    """
+    Writes text to output file or stdout.
+
+    Args:
+        text (str): Text to write.
+        output_path (str): Full path to output file or "-" for standard output.
+
+    Returns:
+        dict: Dictionary containing data about potential errors.
+    """
+    try:
+        with open_output_stream(output_path) as stream:
+            stream.write(text.encode("utf-8"))
+    except PermissionError as e:
+        return {"error": e}
+    return {}
+
+
+@click.command()
+@click.option("-i", "--input_path", default=None, help="Path to Clippings file (full or relative). Use '-' for stdin.")
+@click.option(
+    "-o",
+    "--output_path",
+    default=None,
+    help="Path to output file (full or relative). Prints table and json to stdout by default.",
+)
+@click.option(
+    "-k",
+    "--key",
+    default="length",
+    type=click.Choice(["length", "recent", "books"], case_sensitive=False),
+    help="Ranking key - Clippings content length, Clippings creation time or number of Clippings per book.",
+)
+@click.option("-n", "--count", default=10, type=click.IntRange(min=1), help="Number of selected records.")
+@click.option("-t", "--type", "clipping_type", default=None, help="Clipping type filter, like Highlight or Note.")
+@click.option(
+    "-f",
+    "--format",
+    default="table",
+    type=click.Choice(["table", "json", "excel"], case_sensitive=False),
+    help="Output format. [table|json|excel]",
+)
+def top(input_path: str | None, output_path: str | None, key: str, count: int, clipping_type: str | None, format: str):
+    """
+    Select top Clippings or books. [length|recent|books]
+
+    Args:
+
+        input_path (str | None): Full or relative path to Clippings file. Searches for "My Clipping.txt" file in current
+        directory by default.
+
+        output_path (str | None): Full or relative path to output file. Prints table and json to stdout by default.
+
+        key (str): Ranking key. [length|recent|books]
+
+        count (int): Number of selected Clippings or books.
+
+        clipping_type (str | None): Clipping type of ranked Clippings. All types are ranked by default.
+
+        format (str): Demanded format of output. [table|json|excel]
+    """
+    full_input_path = get_full_input_path(input_path)
+    if full_input_path is None:
+        sys.exit(1)
+    if key == "books" and format == "excel":
+        click.echo(click.style("Books ranking can not be saved in [excel] format.", fg="red", underline=True), err=True)
+        sys.exit(1)
+    if output_path or format == "excel":
+        full_output_path = get_full_output_path(output_path, "json" if format == "table" else format)
+    else:
+        full_output_path = STDIO_PATH
+
+    # Selected Clippings are written whole, so only books ranking is limited to fields it uses.
+    fields = BOOKS_FIELDS if key == "books" else None
+    clippings = ClippingsService(
+        input_path=full_input_path, output_path=full_output_path, fields=fields
+    ).iter_clippings()
+    if clipping_type:
+        clippings = (
+            clipping for clipping in clippings if clipping.get("clipping_type", "").lower() == clipping_type.lower()
+        )
+    try:
+        records = top_books(clippings, count) if key == "books" else top_clippings(clippings, count, key)
+    except STREAM_ERRORS as e:
+        click.echo(click.style(f"Top records selection finished with error [{e}].", fg="red", underline=True), err=True)
+        sys.exit(1)
+
+    match format:
+        case "json":
+            result = generate_json(clippings=records, output_path=full_output_path)
+        case "excel":
+            result = generate_excel(clippings=records, output_path=full_output_path)
+        case _:
+            table = format_books_table(records) if key == "books" else format_clippings_table(records)
+            result = write_text(f"{table}\n", full_output_path)
+    if "error" in result:
+        click.echo(
+            click.style(f"Output saving finished with error [{result['error']}].", fg="red", underline=True), err=True
+        )
+        sys.exit(1)
+    sys.exit(0)
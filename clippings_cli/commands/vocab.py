@@ -0,0 +1,171 @@
+import json
+import os
+import sys
+
+import click
+
+from clippings_cli.clippings_service.files import atomic_write, file_lock
+from clippings_cli.clippings_service.keywords import load_keywords
+from clippings_cli.clippings_service.service import ClippingsService
+from clippings_cli.clippings_service.streams import STDIO_PATH, STREAM_ERRORS
+from clippings_cli.clippings_service.vocab import (
+    DEFAULT_CAPACITY,
+    DEFAULT_NGRAM,
+    GROUPINGS,
+    VOCAB_FIELDS,
+    VocabularyCounter,
+)
+from clippings_cli.commands.convert import get_full_input_path
+from clippings_cli.commands.stats import format_table
+from clippings_cli.commands.top import write_text
+
+
+def format_vocabulary(vocabulary: dict) -> str:
+    """
+    Formats the most common words and phrases of every group as plain text tables.
+
+    Args:
+        vocabulary (dict): Vocabulary counters returned by VocabularyCounter.to_dict().
+
+    Returns:
+        str: Formatted tables.
+    """
+    sections = []
+    for group in vocabulary["groups"]:
+        tables = [
+            format_table(
+                "Words" if size == "1" else f"{size}-word phrases",
+                [(entry["item"], entry["count"]) for entry in counter["items"]],
+            )
+            for size, counter in group["ngrams"].items()
+        ]
+        sections.append(f"{group['group']} - Clippings: {group['clippings']}\n\n" + "\n\n".join(tables))
+    return "\n\n\n".join(sections)
+
+
+def merge_counters_file(vocabulary: VocabularyCounter, path: str) -> None:
+    """
+    Merges counters saved in counters file into counters of current run and saves merged counters back, under file
+    lock, so counters of concurrent runs are never lost.
+
+    Args:
+        vocabulary (VocabularyCounter): Counters of current run, updated in place.
+        path (str): Full path to counters file.
+    """
+    with file_lock(path):
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                vocabulary.merge(VocabularyCounter.from_dict(json.load(file), capacity=vocabulary.capacity))
+        with atomic_write(path, mode="w", encoding="utf-8") as file:
+            json.dump(vocabulary.to_dict(), file, ensure_ascii=False)
+
+
+@click.command()
+@click.option("-i", "--input_path", default=None, help="Path to Clippings file (full or relative). Use '-' for stdin.")
+@click.option(
+    "-o", "--output_path", default=None, help="Path to output file (full or relative). Prints to stdout by default."
+)
+@click.option("-n", "--count", default=20, type=click.IntRange(min=1), help="Number of listed words and phrases.")
+@click.option(
+    "--ngram", default=DEFAULT_NGRAM, type=click.IntRange(min=1, max=5), help="Maximal number of words of phrases."
+)
+@click.option(
+    "-g",
+    "--group_by",
+    default="all",
+    type=click.Choice(GROUPINGS, case_sensitive=False),
+    help="Count words and phrases of all Clippings or per book or author. [all|book|author]",
+)
+@click.option(
+    "--capacity",
+    default=DEFAULT_CAPACITY,
+    type=click.IntRange(min=1),
+    help="Number of words and phrases tracked by every counter.",
+)
+@click.option("--stopwords", default=None, help="Path to file with words skipped at phrase edges, one per line.")
+@click.option(
+    "--counters_file",
+    default=None,
+    help="Path to counters file (full or relative), merged with counters of this run and saved back.",
+)
+@click.option(
+    "-f",
+    "--format",
+    default="table",
+    type=click.Choice(["table", "json"], case_sensitive=False),
+    help="Output format. [table|json]",
+)
+def vocab(
+    input_path: str | None,
+    output_path: str | None,
+    count: int,
+    ngram: int,
+    group_by: str,
+    capacity: int,
+    stopwords: str | None,
+    counters_file: str | None,
+    format: str,
+):
+    """
+    Count the most common words and phrases of Clippings. [table|json]
+
+    Args:
+
+        input_path (str | None): Full or relative path to Clippings file. Searches for "My Clipping.txt" file in current
+        directory by default.
+
+        output_path (str | None): Full or relative path to output file. Prints words and phrases to stdout by default.
+
+        count (int): Number of listed words and phrases of every length.
+
+        ngram (int): Maximal number of words of counted phrases. Phrases of 1 to ngram words are counted separately.
+
+        group_by (str): Grouping of counters. [all|book|author]
+
+        capacity (int): Number of words and phrases tracked by every counter. Counters are approximate (Space-Saving),
+        so memory usage does not grow with number of Clippings - every word or phrase more frequent than 1/capacity of
+        all counted ones is listed, with count overestimated by at most reported error.
+
+        stopwords (str | None): Full or relative path to file with stopwords, one per line. Stopwords are not counted
+        as words and phrases starting or ending with them are skipped.
+
+        counters_file (str | None): Full or relative path to counters file. Counters saved by previous runs, like runs
+        for Clippings files of other devices, are merged with counters of this run and saved back.
+
+        format (str): Demanded format of output. [table|json]
+    """
+    full_input_path = get_full_input_path(input_path)
+    if full_input_path is None:
+        sys.exit(1)
+    words = []
+    if stopwords:
+        try:
+            words = load_keywords(os.path.normpath(os.path.join(os.getcwd(), stopwords)))
+        except (OSError, UnicodeDecodeError) as e:
+            click.echo(click.style(f"Stopwords file can not be read [{e}].", fg="red", underline=True), err=True)
+            sys.exit(1)
+
+    vocabulary = VocabularyCounter(ngram=ngram, capacity=capacity, group_by=group_by, stopwords=words)
+    clippings_service = ClippingsService(input_path=full_input_path, output_path=STDIO_PATH, fields=VOCAB_FIELDS)
+    try:
+        vocabulary.update(clippings_service.iter_clippings())
+    except STREAM_ERRORS as e:
+        click.echo(click.style(f"Vocabulary counting finished with error [{e}].", fg="red", underline=True), err=True)
+        sys.exit(1)
+    if counters_file:
+        try:
+            merge_counters_file(vocabulary, os.path.normpath(os.path.join(os.getcwd(), counters_file)))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            click.echo(click.style(f"Counters file can not be merged [{e}].", fg="red", underline=True), err=True)
+            sys.exit(1)
+
+    result = vocabulary.to_dict(top=count)
+    content = json.dumps(result, ensure_ascii=False, indent=4) if format == "json" else format_vocabulary(result)
+    full_output_path = os.path.normpath(os.path.join(os.getcwd(), output_path)) if output_path else STDIO_PATH
+    result = write_text(f"{content}\n", full_output_path)
+    if "error" in result:
+        click.echo(
+            click.style(f"Output saving finished with error [{result['error']}].", fg="red", underline=True), err=True
+        )
+        sys.exit(1)
+    sys.exit(0)
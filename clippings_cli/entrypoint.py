@@ -1,6 +1,13 @@
 import click
 
 from clippings_cli.commands.convert import convert
+from clippings_cli.commands.serve import serve
+from clippings_cli.commands.sessions import sessions
+from clippings_cli.commands.show import show
+from clippings_cli.commands.stats import stats
+from clippings_cli.commands.tail import tail
+from clippings_cli.commands.top import top
+from clippings_cli.commands.vocab import vocab
 
 
 @click.group()
@@ -10,6 +17,13 @@ def cli():
 
 
 cli.add_command(convert)
+cli.add_command(serve)
+cli.add_command(sessions)
+cli.add_command(show)
+cli.add_command(stats)
+cli.add_command(tail)
+cli.add_command(top)
+cli.add_command(vocab)
 
 if __name__ == "__main__":
     cli()
@@ -1,4 +1,5 @@
 import shutil
+from pathlib import Path
 from typing import Any
 
 import pytest
@@ -21,6 +22,23 @@ def cleanup_temp_files(request: SubRequest):
     request.addfinalizer(remove_temp_files)
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    Fixture pointing user cache directory to temporary location, so offsets files are not written to home directory.
+
+    Args:
+        tmp_path_factory (TempPathFactory): Temporary pytest files location factory.
+        monkeypatch (MonkeyPatch): Pytest monkeypatch.
+
+    Returns:
+        Path: Temporary user cache directory.
+    """
+    path = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(path))
+    return path
+
+
 @pytest.fixture
 def clippings_input() -> str:
     """
@@ -61,8 +79,12 @@ def clippings_list() -> list[dict[str, Any]]:
             "page_number": "1",
             "location": "11-12",
             "created_at": "2025-01-01 05:00:00",
+            "page_start": 1,
+            "page_end": 1,
+            "location_start": 11,
+            "location_end": 12,
             "content": "Highlighted content.",
-            "errors": {},
+            "errors": 0,
         },
         {
             "book": {"title": "Book 2", "author": "Author 2"},
@@ -70,8 +92,12 @@ def clippings_list() -> list[dict[str, Any]]:
             "page_number": "2",
             "location": "11-12",
             "created_at": "2025-01-01 06:00:00",
+            "page_start": 2,
+            "page_end": 2,
+            "location_start": 11,
+            "location_end": 12,
             "content": "Noted content.",
-            "errors": {},
+            "errors": 0,
         },
         {
             "book": {"title": "Book 3", "author": "Author 3"},
@@ -79,7 +105,11 @@ def clippings_list() -> list[dict[str, Any]]:
             "page_number": "3",
             "location": "11-12",
             "created_at": "2025-01-01 07:00:00",
+            "page_start": 3,
+            "page_end": 3,
+            "location_start": 11,
+            "location_end": 12,
             "content": "Highlighted content.",
-            "errors": {},
+            "errors": 0,
         },
     ]
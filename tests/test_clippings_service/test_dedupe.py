@@ -0,0 +1,119 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from clippings_service.dedupe import (
+    NUM_PERMUTATIONS,
+    FuzzyDeduplicator,
+    get_bands,
+    get_shingles,
+    get_signature,
+)
+
+PASSAGE = (
+    "It is a truth universally acknowledged, that a single man in possession of a good fortune "
+    "must be in want of a wife."
+)
+
+
+class TestFuzzyDeduplicator:
+    """Tests for clippings_service.dedupe.py."""
+
+    @pytest.mark.parametrize(
+        "content, expected_shingles",
+        (
+            pytest.param("One, two! Three four", {b"one two three", b"two three four"}, id="long"),
+            pytest.param("Just Two", {b"just two"}, id="short"),
+            pytest.param("...", set(), id="empty"),
+        ),
+    )
+    def test_get_shingles(self, content: str, expected_shingles: set[bytes]):
+        """
+        GIVEN: Clipping content.
+        WHEN: Calling get_shingles() function.
+        THEN: Word shingles returned, case and punctuation ignored.
+        """
+        assert get_shingles(content) == expected_shingles
+
+    def test_get_signature(self):
+        """
+        GIVEN: Shingles of similar and different contents.
+        WHEN: Calling get_signature() function.
+        THEN: Signatures of similar contents share most values, signatures of different contents share few of them.
+        """
+        signature = get_signature(get_shingles(PASSAGE))
+        similar = get_signature(get_shingles(PASSAGE.replace("wife", "husband")))
+        different = get_signature(get_shingles("Call me Ishmael. Some years ago - never mind how long precisely."))
+
+        assert len(signature) == NUM_PERMUTATIONS
+        assert sum(a == b for a, b in zip(signature, similar)) > NUM_PERMUTATIONS * 0.7
+        assert sum(a == b for a, b in zip(signature, different)) < NUM_PERMUTATIONS * 0.2
+
+    @pytest.mark.parametrize("threshold", (0.5, 0.8, 0.9))
+    def test_get_bands(self, threshold: float):
+        """
+        GIVEN: Similarity threshold.
+        WHEN: Calling get_bands() function.
+        THEN: Bands cover whole signature.
+        """
+        bands, rows = get_bands(threshold)
+
+        assert bands * rows == NUM_PERMUTATIONS
+
+    def test_is_duplicate(self):
+        """
+        GIVEN: FuzzyDeduplicator instance.
+        WHEN: Calling is_duplicate() for Clippings of different books with similar and different contents.
+        THEN: Only near-duplicates of previous Clippings reported.
+        """
+        deduplicator = FuzzyDeduplicator(threshold=0.8)
+        clippings = [
+            {"book": {"title": "Pride and Prejudice"}, "content": PASSAGE},
+            {"book": {"title": "Pride & Prejudice (Annotated)"}, "content": f"“{PASSAGE.upper()}”"},
+            {"book": {"title": "Moby Dick"}, "content": "Call me Ishmael."},
+            {"book": {"title": "Moby Dick"}, "content": ""},
+        ]
+
+        assert list(deduplicator.filter(clippings)) == [clippings[0], *clippings[2:]]
+        assert deduplicator.duplicates_count == 1
+
+    def test_cache(self, tmp_path: Path):
+        """
+        GIVEN: Signatures cache file saved by FuzzyDeduplicator.
+        WHEN: Checking the same and new contents with new FuzzyDeduplicator using cache file.
+        THEN: Only new content hashed, cache file extended with its signature.
+        """
+        cache_path = os.path.join(tmp_path, "cache", "signatures.bin")
+        first = FuzzyDeduplicator(cache_path=cache_path)
+        first.is_duplicate({"content": PASSAGE})
+        first.save_cache()
+        size = os.path.getsize(cache_path)
+
+        second = FuzzyDeduplicator(cache_path=cache_path)
+        with patch("clippings_service.dedupe.get_signature", wraps=get_signature) as mocked_signature:
+            assert second.is_duplicate({"content": PASSAGE}) is False
+            assert second.is_duplicate({"content": "Call me Ishmael."}) is False
+        second.save_cache()
+
+        assert mocked_signature.call_count == 1
+        assert os.path.getsize(cache_path) - size == size - 8
+
+    def test_cache_invalid(self, tmp_path: Path):
+        """
+        GIVEN: Corrupted signatures cache file.
+        WHEN: Using it with FuzzyDeduplicator.
+        THEN: Cache file ignored and rewritten.
+        """
+        cache_path = os.path.join(tmp_path, "signatures.bin")
+        with open(cache_path, "wb") as file:
+            file.write(b"corrupted")
+        deduplicator = FuzzyDeduplicator(cache_path=cache_path)
+        deduplicator.is_duplicate({"content": PASSAGE})
+        deduplicator.save_cache()
+
+        with patch("clippings_service.dedupe.get_signature") as mocked_signature:
+            signature = FuzzyDeduplicator(cache_path=cache_path).signature(PASSAGE)
+
+        mocked_signature.assert_not_called()
+        assert signature == get_signature(get_shingles(PASSAGE))
@@ -0,0 +1,126 @@
+import os
+import stat
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from clippings_service.files import LOCK_SUFFIX, atomic_write, file_lock
+
+
+class TestFiles:
+    """
+    Tests for clippings_service.files.py.
+    """
+
+    def test_atomic_write(self, tmp_path: Path):
+        """
+        GIVEN: Path to existing file.
+        WHEN: Writing new content with atomic_write().
+        THEN: File replaced with new content, old content visible until block finishes, no temporary file left.
+        """
+        path = str(tmp_path / "output.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("old")
+
+        with atomic_write(path, "w", encoding="utf-8") as file:
+            file.write("new")
+            file.flush()
+            with open(path, "r", encoding="utf-8") as old_file:
+                assert old_file.read() == "old"
+
+        with open(path, "r", encoding="utf-8") as file:
+            assert file.read() == "new"
+        assert os.listdir(tmp_path) == ["output.txt"]
+
+    def test_atomic_write_error(self, tmp_path: Path):
+        """
+        GIVEN: Path to existing file.
+        WHEN: Error raised while writing new content with atomic_write().
+        THEN: Error propagated, old file kept and temporary file removed.
+        """
+        path = str(tmp_path / "output.txt")
+        with open(path, "wb") as file:
+            file.write(b"old")
+
+        with pytest.raises(RuntimeError):
+            with atomic_write(path) as file:
+                file.write(b"partial")
+                raise RuntimeError("Interrupted")
+
+        with open(path, "rb") as file:
+            assert file.read() == b"old"
+        assert os.listdir(tmp_path) == ["output.txt"]
+
+    def test_atomic_write_creates_directory_with_default_mode(self, tmp_path: Path):
+        """
+        GIVEN: Path to file in missing directory.
+        WHEN: Writing file with atomic_write().
+        THEN: Directory created, file permissions follow umask, like for files created with open().
+        """
+        path = str(tmp_path / "subdir" / "output.bin")
+        reference_path = str(tmp_path / "reference.bin")
+        open(reference_path, "wb").close()
+
+        with atomic_write(path) as file:
+            file.write(b"data")
+
+        assert os.stat(path).st_mode == os.stat(reference_path).st_mode
+
+    @pytest.mark.skipif(not hasattr(os, "fchmod"), reason="File modes are not supported.")
+    def test_atomic_write_keeps_mode(self, tmp_path: Path):
+        """
+        GIVEN: Path to existing file with non-default permissions.
+        WHEN: Writing new content with atomic_write().
+        THEN: File replaced, its permissions kept.
+        """
+        path = str(tmp_path / "output.bin")
+        with open(path, "wb") as file:
+            file.write(b"old")
+        os.chmod(path, 0o640)
+
+        with atomic_write(path) as file:
+            file.write(b"new")
+
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+    def test_file_lock(self, tmp_path: Path):
+        """
+        GIVEN: Path to file shared by two threads.
+        WHEN: Both threads modify the file under exclusive file_lock().
+        THEN: Modifications serialized, lock file created next to locked file.
+        """
+        path = str(tmp_path / "counter.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("0")
+
+        def increment() -> None:
+            for _ in range(5):
+                with file_lock(path):
+                    with open(path, "r", encoding="utf-8") as file:
+                        value = int(file.read())
+                    time.sleep(0.001)
+                    with atomic_write(path, "w", encoding="utf-8") as file:
+                        file.write(str(value + 1))
+
+        threads = [threading.Thread(target=increment) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with open(path, "r", encoding="utf-8") as file:
+            assert file.read() == "10"
+        assert os.path.exists(path + LOCK_SUFFIX)
+
+    def test_file_lock_shared(self, tmp_path: Path):
+        """
+        GIVEN: Path to file.
+        WHEN: Taking shared file_lock() while other shared lock is held.
+        THEN: Lock acquired without waiting.
+        """
+        path = str(tmp_path / "cache.bin")
+
+        with file_lock(path, shared=True):
+            with file_lock(path, shared=True):
+                pass
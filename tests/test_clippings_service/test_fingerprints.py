@@ -0,0 +1,149 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from clippings_service.fingerprints import (
+    FINGERPRINTS_FILTER,
+    BloomFilter,
+    FingerprintStore,
+    get_fingerprint,
+)
+
+
+def _clipping(content: str) -> dict:
+    """
+    Builds parsed Clipping with given content.
+
+    Args:
+        content (str): Clipping content.
+
+    Returns:
+        dict: Parsed Clipping.
+    """
+    return {
+        "book": {"title": "Book 1", "author": "Author 1"},
+        "clipping_type": "Highlight",
+        "page_number": "1",
+        "location": "11-12",
+        "created_at": "2025-01-01 05:00:00",
+        "content": content,
+    }
+
+
+class TestFingerprints:
+    """
+    Tests for clippings_service.fingerprints.py.
+    """
+
+    def test_get_fingerprint(self):
+        """
+        GIVEN: Equal Clippings, Clipping of other content and Clipping without book.
+        WHEN: Calling get_fingerprint().
+        THEN: Equal fingerprints of equal Clippings only.
+        """
+        result = get_fingerprint(_clipping("Content."))
+
+        assert len(result) == 16
+        assert result == get_fingerprint({**_clipping("Content."), "errors": {}})
+        assert result != get_fingerprint(_clipping("Other content."))
+        assert result != get_fingerprint({**_clipping("Content."), "book": None})
+
+    def test_bloom_filter(self, tmp_path: Path):
+        """
+        GIVEN: Bloom filter filled up to its capacity.
+        WHEN: Checking added and other fingerprints, before and after saving and loading filter.
+        THEN: All added fingerprints found, only few others reported as found.
+        """
+        bloom_filter = BloomFilter(1000)
+        added = [get_fingerprint(_clipping(str(number))) for number in range(1000)]
+        others = [get_fingerprint(_clipping(f"other {number}")) for number in range(10000)]
+        for fingerprint in added:
+            bloom_filter.add(fingerprint)
+        path = os.path.join(tmp_path, FINGERPRINTS_FILTER)
+        bloom_filter.save(path)
+
+        loaded = BloomFilter.load(path)
+
+        assert (loaded.capacity, loaded.count) == (1000, 1000)
+        assert all(fingerprint in loaded for fingerprint in added)
+        assert sum(fingerprint in loaded for fingerprint in others) < 300
+
+    def test_bloom_filter_load_invalid(self, tmp_path: Path):
+        """
+        GIVEN: Missing, corrupted and truncated filter files.
+        WHEN: Calling BloomFilter.load().
+        THEN: None returned.
+        """
+        path = os.path.join(tmp_path, FINGERPRINTS_FILTER)
+        assert BloomFilter.load(path) is None
+        with open(path, "wb") as file:
+            file.write(b"corrupted")
+        assert BloomFilter.load(path) is None
+        BloomFilter(1000).save(path)
+        with open(path, "r+b") as file:
+            file.truncate(100)
+        assert BloomFilter.load(path) is None
+
+    def test_is_new(self, tmp_path: Path):
+        """
+        GIVEN: Fingerprints of Clippings committed by previous run.
+        WHEN: Checking exported, new and repeated new Clippings with new FingerprintStore.
+        THEN: Only first occurrences of new Clippings are new, new Clippings not looked up in database.
+        """
+        state_dir = os.path.join(tmp_path, "state")
+        first = FingerprintStore(state_dir)
+        assert [first.is_new(_clipping(content)) for content in ("A", "B", "A")] == [True, True, False]
+        first.commit()
+
+        second = FingerprintStore(state_dir)
+        with patch.object(second, "_is_stored", wraps=second._is_stored) as mocked_is_stored:
+            result = [second.is_new(_clipping(content)) for content in ("A", "C", "B", "C")]
+        second.commit()
+
+        assert result == [False, True, False, False]
+        assert second.exported_count == 3
+        assert mocked_is_stored.call_count == 2
+        assert FingerprintStore(state_dir).is_new(_clipping("C")) is False
+
+    def test_is_new_not_committed(self, tmp_path: Path):
+        """
+        GIVEN: FingerprintStore closed without commit, like after failed export.
+        WHEN: Checking the same Clippings with new FingerprintStore.
+        THEN: Clippings are new.
+        """
+        first = FingerprintStore(str(tmp_path))
+        first.is_new(_clipping("A"))
+        first.close()
+
+        assert FingerprintStore(str(tmp_path)).is_new(_clipping("A")) is True
+
+    @patch("clippings_service.fingerprints.FILTER_CAPACITY", 4)
+    def test_commit_rebuild(self, tmp_path: Path):
+        """
+        GIVEN: Fingerprints committed up to Bloom filter capacity.
+        WHEN: Committing more fingerprints.
+        THEN: Filter rebuilt from database with doubled capacity, holding all fingerprints.
+        """
+        for contents in (("A", "B", "C"), ("D", "E", "F", "G", "H")):
+            store = FingerprintStore(str(tmp_path))
+            for content in contents:
+                store.is_new(_clipping(content))
+            store.commit()
+
+        bloom_filter = BloomFilter.load(os.path.join(tmp_path, FINGERPRINTS_FILTER))
+
+        assert (bloom_filter.capacity, bloom_filter.count) == (16, 8)
+        assert all(get_fingerprint(_clipping(content)) in bloom_filter for content in "ABCDEFGH")
+
+    def test_filter_missing(self, tmp_path: Path):
+        """
+        GIVEN: Committed fingerprints, Bloom filter file removed.
+        WHEN: Checking committed Clipping with new FingerprintStore.
+        THEN: Filter rebuilt from database, Clipping is not new.
+        """
+        store = FingerprintStore(str(tmp_path))
+        store.is_new(_clipping("A"))
+        store.commit()
+        os.remove(os.path.join(tmp_path, FINGERPRINTS_FILTER))
+
+        assert FingerprintStore(str(tmp_path)).is_new(_clipping("A")) is False
@@ -8,12 +8,11 @@ from clippings_service.format_handlers.excel_handlers import (
     DATA_STYLING,
     FIELDS,
     HEADERS_STYLING,
-    apply_data_cells_styling,
-    apply_headers_styling,
     generate_excel,
+    get_sheet_title,
 )
+from clippings_service.validators import ClippingError, describe_errors
 from openpyxl import load_workbook
-from openpyxl.workbook import Workbook
 
 
 @pytest.fixture
@@ -33,18 +32,16 @@ def output_excel_path(tmp_path: Path) -> str:
 class TestExcelHandlers:
     """Tests for clippings_service.format_handlers.excel_handlers.py."""
 
-    def test_apply_headers_styling(self):
+    def test_generate_excel_styling(self, output_excel_path: str, clippings_list: list[dict[str, Any]]):
         """
-        GIVEN: Excel sheet with headers row.
-        WHEN: Calling apply_headers_styling() function on Excel sheet.
-        THEN: All headers cells filterable, styled according to HEADERS_STYLING dictionary and with width
-        specified in FIELDS OrderedDict.
+        GIVEN: List containing Clippings.
+        WHEN: Calling generate_excel() function with clippings and output path.
+        THEN: Headers cells filterable, styled according to HEADERS_STYLING dictionary and with width specified in
+        FIELDS OrderedDict. Data cells styled according to DATA_STYLING dictionary, number columns formatted as
+        integers.
         """
-        wb = Workbook()
-        ws = wb.active
-        ws.append(list(FIELDS.keys()))
-
-        apply_headers_styling(ws)
+        generate_excel(clippings_list, output_excel_path)
+        ws = load_workbook(output_excel_path).active
 
         assert ws.auto_filter.ref == ws.dimensions
         for cell in ws[1]:
@@ -52,40 +49,23 @@ class TestExcelHandlers:
             assert cell.fill == HEADERS_STYLING["fill"]
             assert cell.alignment == HEADERS_STYLING["alignment"]
             assert cell.border == HEADERS_STYLING["border"]
-        for col in ws.columns:
-            col_letter = col[0].column_letter
-            assert ws.column_dimensions[col_letter].width == FIELDS[col[0].value].get("width", 2)
-
-    def test_apply_data_cells_styling(self):
-        """
-        GIVEN: Excel sheet with headers row and two data rows.
-        WHEN: Calling apply_data_cells_styling() function on Excel sheet.
-        THEN: All data cells styled according to DATA_STYLING dictionary.
-        """
-        wb = Workbook()
-        ws = wb.active
-        ws.append(list(FIELDS.keys()))
-        ws.append(
-            ["Sample Book 1", "Author Name 1", "Sample content 1", "1", "1", "2025-01-01", "Highlight", "{}"],
-        )
-        ws.append(
-            ["Sample Book 2", "Author Name 2", "Sample content 2", "2", "2", "2025-02-02", "Note", "{}"],
-        )
-
-        apply_data_cells_styling(ws)
-
+            assert ws.column_dimensions[cell.column_letter].width == FIELDS[cell.value].get("width", 2)
         for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
             for cell in row:
                 assert cell.font == DATA_STYLING["font"]
                 assert cell.fill == DATA_STYLING["fill"]
-                assert cell.alignment == DATA_STYLING["alignment"]
                 assert cell.border == DATA_STYLING["border"]
+                if FIELDS[ws.cell(row=1, column=cell.column).value].get("is_number"):
+                    assert cell.alignment == DATA_STYLING["number_alignment"]
+                    assert cell.number_format == DATA_STYLING["number_format"]
+                else:
+                    assert cell.alignment == DATA_STYLING["alignment"]
 
     def test_generate_excel(self, output_excel_path: str, clippings_list: list[dict[str, Any]]):
         """
         GIVEN: List containing two clippings.
         WHEN: Calling generate_excel() function with clippings and output path.
-        THEN: Excel file generated and containing clippings data.
+        THEN: Excel file generated and containing clippings data, columns of earlier exports kept in their positions.
         """
         result = generate_excel(clippings_list, output_excel_path)
         wb = load_workbook(output_excel_path)
@@ -93,12 +73,146 @@ class TestExcelHandlers:
 
         assert result == {}
         assert os.path.exists(output_excel_path)
+        assert [cell.value for cell in ws[1]][:8] == [
+            "Book title",
+            "Book author",
+            "Content",
+            "Page number",
+            "Location",
+            "Created at",
+            "Clipping type",
+            "Errors",
+        ]
         assert ws.max_row == len(clippings_list) + 1
         assert ws.max_column == len(FIELDS)
         for idx, clipping in enumerate(clippings_list, start=2):
             for col in ws.columns:
                 assert ws.cell(row=idx, column=col[0].col_idx).value == FIELDS[col[0].value]["fetch_method"](clipping)
 
+    def test_generate_excel_fields(self, output_excel_path: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: List containing Clippings projected to book and content fields.
+        WHEN: Calling generate_excel() function with clippings, output path and fields.
+        THEN: Excel file generated with columns of requested fields only.
+        """
+        clippings = [{"book": clipping["book"], "content": clipping["content"]} for clipping in clippings_list]
+
+        result = generate_excel(clippings, output_excel_path, fields=("book", "content"))
+        rows = list(load_workbook(output_excel_path).active.values)
+
+        assert result == {}
+        assert rows[0] == ("Book title", "Book author", "Content")
+        assert rows[1] == (clippings[0]["book"]["title"], clippings[0]["book"]["author"], clippings[0]["content"])
+
+    def test_generate_excel_invalid_clipping(self, output_excel_path: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: List of Clippings containing invalid Clipping kept in lenient mode, without book and metadata.
+        WHEN: Calling generate_excel() function with clippings and output path.
+        THEN: Excel file generated, missing cells of invalid Clipping left empty and its errors described.
+        """
+        errors = ClippingError.BOOK | ClippingError.CLIPPING_TYPE | ClippingError.CREATED_AT
+        clippings = [*clippings_list, {"content": "Orphan highlight", "errors": errors}]
+
+        result = generate_excel(clippings, output_excel_path)
+        rows = list(load_workbook(output_excel_path).active.values)
+        row = dict(zip(rows[0], rows[-1]))
+
+        assert result == {}
+        assert row["Book title"] is None
+        assert row["Book author"] is None
+        assert row["Content"] == "Orphan highlight"
+        assert row["Created at"] is None
+        assert row["Errors"] == describe_errors(errors)
+
+    def test_generate_excel_notes(self, output_excel_path: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: List containing highlight with joined note.
+        WHEN: Calling generate_excel() function with notes flag.
+        THEN: Note column written after Content column, filled only for highlight with note.
+        """
+        clippings = [dict(clipping) for clipping in clippings_list]
+        clippings[0]["note"] = {"content": "Noted content."}
+
+        result = generate_excel(clippings, output_excel_path, notes=True)
+        rows = list(load_workbook(output_excel_path).active.values)
+
+        assert result == {}
+        position = rows[0].index("Content") + 1
+        assert rows[0][position] == "Note"
+        assert [row[position] for row in rows[1:]] == ["Noted content.", None, None]
+
+    def test_generate_excel_rollover(self, output_excel_path: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: List containing three Clippings and sheet rows limit of three rows.
+        WHEN: Calling generate_excel() function with clippings, output path and max_rows.
+        THEN: Clippings continued in next sheet with the same styled headers.
+        """
+        result = generate_excel(clippings_list, output_excel_path, max_rows=3)
+        wb = load_workbook(output_excel_path)
+
+        assert result == {}
+        assert wb.sheetnames == ["Clippings", "Clippings (2)"]
+        assert [ws.max_row for ws in wb.worksheets] == [3, 2]
+        for ws in wb.worksheets:
+            assert [cell.value for cell in ws[1]] == list(FIELDS)
+            assert ws["A1"].font.b is True
+            assert ws.auto_filter.ref == ws.dimensions
+        assert [row[2] for row in [*wb.worksheets[0].values, *wb.worksheets[1].values] if row[2] != "Content"] == [
+            clipping["content"] for clipping in clippings_list
+        ]
+
+    def test_generate_excel_sheet_per_book(self, output_excel_path: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: List containing Clippings of three books.
+        WHEN: Calling generate_excel() function with clippings, output path and sheet_per_book.
+        THEN: Summary sheet with per-book counts placed first, followed by sheet of every book.
+        """
+        result = generate_excel(clippings_list, output_excel_path, sheet_per_book=True)
+        wb = load_workbook(output_excel_path)
+        summary = list(wb["Summary"].values)
+
+        assert result == {}
+        assert wb.sheetnames == ["Summary", "Book 1", "Book 2", "Book 3"]
+        assert summary[0] == ("Book title", "Book author", "Sheet", "Clippings", "Highlights", "Notes", "Bookmarks")
+        assert summary[1] == ("Book 1", "Author 1", "Book 1", 1, 1, 0, 0)
+        assert wb["Book 2"].max_row == 2
+
+    @mock.patch("clippings_service.format_handlers.excel_handlers.MAX_OPEN_SHEETS", 1)
+    def test_generate_excel_sheet_per_book_spilled(self, output_excel_path: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: List containing Clippings of three books, interleaved, and limit of one open per-book sheet.
+        WHEN: Calling generate_excel() function with clippings, output path and sheet_per_book.
+        THEN: Clippings of books over the limit written after grouping, every book sheet complete.
+        """
+        clippings = [*clippings_list, {**clippings_list[1], "content": "Second content."}, clippings_list[0]]
+
+        result = generate_excel(clippings, output_excel_path, sheet_per_book=True)
+        wb = load_workbook(output_excel_path)
+
+        assert result == {}
+        assert wb.sheetnames == ["Summary", "Book 1", "Book 2", "Book 3"]
+        assert [row[3] for row in list(wb["Summary"].values)[1:]] == [2, 2, 1]
+        assert [row[2] for row in list(wb["Book 2"].values)[1:]] == [clippings_list[1]["content"], "Second content."]
+
+    @pytest.mark.parametrize(
+        "name, used_titles, expected_output",
+        (
+            pytest.param("Book: Part 1/2?", set(), "Book  Part 1 2", id="invalid-characters"),
+            pytest.param("A" * 40, set(), "A" * 31, id="truncated"),
+            pytest.param("Book", {"book"}, "Book (2)", id="duplicate"),
+            pytest.param("A" * 40, {"a" * 31}, "A" * 27 + " (2)", id="duplicate-truncated"),
+            pytest.param("[]", set(), "Unknown", id="empty"),
+        ),
+    )
+    def test_get_sheet_title(self, name: str, used_titles: set[str], expected_output: str):
+        """
+        GIVEN: Sheet name and titles of workbook sheets.
+        WHEN: Calling get_sheet_title() function with name and used titles.
+        THEN: Valid unique sheet title returned and added to used titles.
+        """
+        assert get_sheet_title(name, used_titles) == expected_output
+        assert expected_output.lower() in used_titles
+
     def test_generate_excel_permission_error(self, output_excel_path: str, clippings_list: list[dict[str, Any]]):
         """
         GIVEN: List containing two clippings.
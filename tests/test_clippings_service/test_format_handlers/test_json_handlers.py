@@ -40,13 +40,30 @@ class TestJsonHandlers:
             data = json.load(json_file)
             assert data == clippings_list
 
+    @pytest.mark.parametrize("clippings_count", (0, 1, 3))
+    def test_generate_json_matches_json_dump(
+        self, output_json_path: str, clippings_list: list[dict[str, Any]], clippings_count: int
+    ):
+        """
+        GIVEN: Generator of Clippings.
+        WHEN: Calling generate_json() function with clippings generator and output path.
+        THEN: Streamed JSON file content the same as json.dump() output for list of Clippings.
+        """
+        clippings = clippings_list[:clippings_count]
+
+        result = generate_json((clipping for clipping in clippings), output_json_path)
+
+        assert result == {}
+        with open(output_json_path, "r", encoding="utf-8") as json_file:
+            assert json_file.read() == json.dumps(clippings, ensure_ascii=False, indent=4)
+
     def test_generate_json_permission_error(self, output_json_path, clippings_list: list[dict[str, Any]]):
         """
         GIVEN: List containing two clippings.
         WHEN: Calling generate_json() function with clippings and inaccessible output path.
         THEN: PermissionError raised and handled.
         """
-        with mock.patch("builtins.open", side_effect=PermissionError("Permission denied")):
+        with mock.patch("os.open", side_effect=PermissionError("Permission denied")):
             result = generate_json(clippings_list, output_json_path)
 
         assert "error" in result
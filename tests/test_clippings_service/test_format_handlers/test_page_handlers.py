@@ -0,0 +1,174 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+from unittest import mock
+
+import pytest
+from clippings_service.files import LOCK_SUFFIX
+from clippings_service.format_handlers.page_handlers import (
+    MANIFEST_FILENAME,
+    PAGE_FORMATS,
+    escape_markdown,
+    generate_html,
+    generate_markdown,
+    get_page_filename,
+    render_book_page,
+)
+
+
+@pytest.fixture
+def output_directory(tmp_path: Path) -> str:
+    """
+    Returns path to output directory in temporary location.
+
+    Args:
+        tmp_path (Path): Temporary pytest files location.
+
+    Returns:
+         str: Path to output directory in temporary pytest files location.
+    """
+    return os.path.normpath(os.path.join(tmp_path, "pages"))
+
+
+class TestPageHandlers:
+    """Tests for clippings_service.format_handlers.page_handlers.py."""
+
+    def test_get_page_filename(self):
+        """
+        GIVEN: Book title and author.
+        WHEN: Calling get_page_filename() function for the same title with different authors.
+        THEN: Slug of title used in file names, file names different.
+        """
+        first = get_page_filename("Django for APIs: Build web APIs", "Author 1", "md")
+        second = get_page_filename("Django for APIs: Build web APIs", "Author 2", "md")
+
+        assert first.startswith("django-for-apis-build-web-apis-")
+        assert first.endswith(".md")
+        assert first != second
+
+    def test_render_book_page(self):
+        """
+        GIVEN: Clippings of a book with HTML special characters and multiline content.
+        WHEN: Calling render_book_page() function for markdown and html format.
+        THEN: Content quoted line by line and escaped in both formats.
+        """
+        clippings = [
+            {
+                "clipping_type": "Highlight",
+                "page_number": "9",
+                "location": "69-70",
+                "created_at": "2025-01-01 05:00:00",
+                "content": "First <line>\nSecond line",
+            }
+        ]
+
+        markdown = render_book_page(PAGE_FORMATS["markdown"], "Title", "Author", clippings)
+        html = render_book_page(PAGE_FORMATS["html"], "Title", "Author", clippings)
+
+        assert markdown == (
+            "# Title\n\n*Author*\n\n## Highlight - page 9, location 69-70\n\n*2025-01-01 05:00:00*\n\n"
+            "> First \\<line>\n> Second line\n\n"
+        )
+        assert "<blockquote>First &lt;line&gt;<br>\nSecond line</blockquote>" in html
+
+    def test_render_book_page_note(self):
+        """
+        GIVEN: Highlight with joined note.
+        WHEN: Calling render_book_page() function for markdown and html format.
+        THEN: Note rendered below highlighted content.
+        """
+        clippings = [
+            {
+                "clipping_type": "Highlight",
+                "page_number": "9",
+                "location": "69-70",
+                "created_at": "2025-01-01 05:00:00",
+                "content": "Highlighted content.",
+                "note": {"clipping_type": "Note", "content": "Noted <content>."},
+            }
+        ]
+
+        markdown = render_book_page(PAGE_FORMATS["markdown"], "Title", "Author", clippings)
+        html = render_book_page(PAGE_FORMATS["html"], "Title", "Author", clippings)
+
+        assert markdown.endswith("> Highlighted content.\n\n**Note:** Noted \\<content>.\n\n")
+        assert "</blockquote>\n<p><strong>Note:</strong> Noted &lt;content&gt;.</p>" in html
+
+    @pytest.mark.parametrize(
+        "value, expected_output",
+        (
+            pytest.param("*bold* _italic_ `code`", "\\*bold\\* \\_italic\\_ \\`code\\`", id="emphasis"),
+            pytest.param("[link](url) <b> &amp; a|b ~x~", "\\[link\\](url) \\<b> \\&amp; a\\|b \\~x\\~", id="inline"),
+            pytest.param(
+                "# Title\n- item\n 2. item\n> quote", "\\# Title\n\\- item\n 2\\. item\n\\> quote", id="line-start"
+            ),
+            pytest.param("Page 9 - 2025-01-01. C# #1", "Page 9 - 2025-01-01. C# #1", id="not-special"),
+        ),
+    )
+    def test_escape_markdown(self, value: str, expected_output: str):
+        """
+        GIVEN: Text with Markdown metacharacters.
+        WHEN: Calling escape_markdown() function with text.
+        THEN: Metacharacters escaped with backslashes, characters special only at line start kept elsewhere.
+        """
+        assert escape_markdown(value) == expected_output
+
+    @pytest.mark.parametrize(
+        "handler, extension", ((generate_markdown, "md"), (generate_html, "html")), ids=("markdown", "html")
+    )
+    def test_generate_pages(
+        self, output_directory: str, clippings_list: list[dict[str, Any]], handler: Callable[..., dict], extension: str
+    ):
+        """
+        GIVEN: List containing Clippings of three books.
+        WHEN: Calling page handler function with Clippings and output directory.
+        THEN: Page of every book and index page written, content hashes stored in locked manifest.
+        """
+        result = handler(clippings_list, output_directory)
+
+        with open(os.path.join(output_directory, MANIFEST_FILENAME), "r", encoding="utf8") as file:
+            manifest = json.load(file)
+        assert result == {"written": 4, "skipped": 0}
+        assert sorted(os.listdir(output_directory)) == sorted(
+            [MANIFEST_FILENAME, MANIFEST_FILENAME + LOCK_SUFFIX, *manifest["files"]]
+        )
+        assert f"index.{extension}" in manifest["files"]
+        with open(os.path.join(output_directory, get_page_filename("Book 2", "Author 2", extension)), "r") as file:
+            assert "Noted content." in file.read()
+
+    def test_generate_pages_incremental(self, output_directory: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: Pages generated for Clippings of three books.
+        WHEN: Regenerating pages with new Clipping of one book and without Clippings of another one.
+        THEN: Only pages of changed book and index rewritten, page of removed book deleted.
+        """
+        generate_markdown(clippings_list, output_directory)
+        new_clipping = {**clippings_list[0], "content": "New content."}
+
+        result = generate_markdown([clippings_list[0], new_clipping, clippings_list[1]], output_directory)
+
+        assert result == {"written": 2, "skipped": 1}
+        assert not os.path.exists(os.path.join(output_directory, get_page_filename("Book 3", "Author 3", "md")))
+
+    def test_generate_pages_stdout(self, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: List containing Clippings.
+        WHEN: Calling page handler function with "-" as output path.
+        THEN: Error returned.
+        """
+        assert "error" in generate_markdown(clippings_list, "-")
+
+    def test_generate_pages_permission_error(self, output_directory: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: List containing Clippings.
+        WHEN: Calling page handler function with inaccessible output directory.
+        THEN: PermissionError raised and handled.
+        """
+        with mock.patch(
+            "clippings_service.format_handlers.page_handlers.os.makedirs",
+            side_effect=PermissionError("Permission denied"),
+        ):
+            result = generate_html(clippings_list, output_directory)
+
+        assert isinstance(result["error"], PermissionError)
@@ -0,0 +1,110 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from clippings_service.format_handlers.snapshot_handlers import ClippingsSnapshot, generate_snapshot
+from clippings_service.table import NULL
+
+
+@pytest.fixture
+def output_snapshot_path(tmp_path: Path) -> str:
+    """
+    Returns path to output file in temporary location.
+
+    Args:
+        tmp_path (Path): Temporary pytest files location.
+
+    Returns:
+         str: Path to output file in temporary pytest files location.
+    """
+    return os.path.normpath(os.path.join(tmp_path, "subdir", "output.snapshot"))
+
+
+@pytest.fixture
+def snapshot_clippings(clippings_list: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Returns Clippings list with Clipping containing non-ASCII content and Clipping missing metadata.
+
+    Args:
+        clippings_list (list[dict[str, Any]]): Clippings list.
+
+    Returns:
+        list[dict[str, Any]]: Clippings list.
+    """
+    return [
+        *clippings_list,
+        {**clippings_list[0], "page_number": None, "page_start": None, "page_end": None, "content": "Zażółć 🙂"},
+        {"book": {"title": "Book 2", "author": "Author 2"}, "content": "No metadata.", "errors": 30},
+    ]
+
+
+class TestSnapshotHandlers:
+    """Tests for clippings_service.format_handlers.snapshot_handlers.py."""
+
+    def test_generate_snapshot_round_trip(self, output_snapshot_path: str, snapshot_clippings: list[dict[str, Any]]):
+        """
+        GIVEN: Clippings list.
+        WHEN: Calling generate_snapshot() function and opening snapshot with ClippingsSnapshot.
+        THEN: Clippings decoded from snapshot equal to source Clippings.
+        """
+        result = generate_snapshot((clipping for clipping in snapshot_clippings), output_snapshot_path)
+
+        assert result == {}
+        with ClippingsSnapshot(output_snapshot_path) as snapshot:
+            assert len(snapshot) == 5
+            assert snapshot.row(3) == snapshot_clippings[3]
+            assert list(snapshot.to_records()) == snapshot_clippings
+            assert list(snapshot.to_table().to_records()) == snapshot_clippings
+
+    def test_snapshot_columns(self, output_snapshot_path: str, snapshot_clippings: list[dict[str, Any]]):
+        """
+        GIVEN: Snapshot file.
+        WHEN: Reading columns and decoding codes with ClippingsSnapshot.
+        THEN: Columns values and decoded books and Clipping types returned.
+        """
+        generate_snapshot(snapshot_clippings, output_snapshot_path)
+
+        with ClippingsSnapshot(output_snapshot_path) as snapshot:
+            assert list(snapshot.column("book")) == [0, 1, 2, 0, 1]
+            assert list(snapshot.column("clipping_type")) == [0, 1, 0, 0, -1]
+            assert list(snapshot.column("created_at")) == [1735707600, 1735711200, 1735714800, 1735707600, NULL]
+            assert snapshot.book(2) == ("Book 3", "Author 3")
+            assert snapshot.clipping_type(1) == "Note"
+            assert snapshot.content(3) == "Zażółć 🙂"
+
+    def test_generate_snapshot_empty(self, output_snapshot_path: str):
+        """
+        GIVEN: Empty Clippings list.
+        WHEN: Calling generate_snapshot() function and opening snapshot with ClippingsSnapshot.
+        THEN: Empty snapshot opened.
+        """
+        assert generate_snapshot([], output_snapshot_path) == {}
+
+        with ClippingsSnapshot(output_snapshot_path) as snapshot:
+            assert len(snapshot) == 0
+            assert list(snapshot.to_records()) == []
+            with pytest.raises(IndexError):
+                snapshot.row(0)
+
+    @pytest.mark.parametrize("output_path", ("-", "output.snapshot.gz"))
+    def test_generate_snapshot_not_regular_file(self, output_path: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: Standard output or compressed file path.
+        WHEN: Calling generate_snapshot() function with path.
+        THEN: Result dict with "error" key returned.
+        """
+        assert "error" in generate_snapshot(clippings_list, output_path)
+
+    def test_open_invalid_snapshot(self, tmp_path: Path):
+        """
+        GIVEN: File, that is not a snapshot.
+        WHEN: Opening file with ClippingsSnapshot.
+        THEN: ValueError raised.
+        """
+        path = os.path.join(tmp_path, "output.json")
+        with open(path, "w", encoding="utf8") as file:
+            file.write("[]" * 100)
+
+        with pytest.raises(ValueError, match="is not a Clippings snapshot"):
+            ClippingsSnapshot(path)
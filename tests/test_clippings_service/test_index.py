@@ -0,0 +1,162 @@
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from clippings_service.index import ClippingsIndex
+
+
+@pytest.fixture
+def input_path(tmp_path: Path, clippings_input: str) -> str:
+    """
+    Returns path to Clippings file in temporary location.
+
+    Args:
+        tmp_path (Path): Temporary pytest files location.
+        clippings_input (str): Clippings file content.
+
+    Returns:
+         str: Path to Clippings file in temporary pytest files location.
+    """
+    path = os.path.join(tmp_path, "My Clippings.txt")
+    with open(path, "w", encoding="utf8") as file:
+        file.write(clippings_input)
+    return path
+
+
+def append(path: str, content: str) -> None:
+    """
+    Appends content to Clippings file.
+
+    Args:
+        path (str): Path to Clippings file.
+        content (str): Appended content.
+    """
+    with open(path, "a", encoding="utf8") as file:
+        file.write(content)
+
+
+class TestClippingsIndex:
+    """Tests for clippings_service.index.py."""
+
+    def test_refresh_initial_load(self, input_path: str, clippings_list: list[dict]):
+        """
+        GIVEN: ClippingsIndex instance for Clippings file.
+        WHEN: Calling refresh() for the first time and again without file changes.
+        THEN: All Clippings loaded and indexed by book and author, second refresh does not change index.
+        """
+        index = ClippingsIndex(input_path)
+
+        assert index.refresh() is None
+        assert index.refresh() == 0
+        assert index.clippings == clippings_list
+        assert index.books == {("Book 1", "Author 1"): [0], ("Book 2", "Author 2"): [1], ("Book 3", "Author 3"): [2]}
+        assert index.authors == {"Author 1": [0], "Author 2": [1], "Author 3": [2]}
+
+    def test_refresh_appended(self, input_path: str):
+        """
+        GIVEN: ClippingsIndex instance with loaded Clippings.
+        WHEN: Appending Clipping in two parts to Clippings file, calling refresh() after each part.
+        THEN: Incomplete Clipping skipped, complete one added incrementally.
+        """
+        index = ClippingsIndex(input_path)
+        index.refresh()
+
+        append(input_path, "\nBook 1 (Author 1)\n- Your Note on page 1 | location 12 | Added on")
+        assert index.refresh() == 0
+        append(input_path, " Sunday, 1 January 2025 08:00:00\n\nNew note.\n==========\n")
+        assert index.refresh() == 1
+
+        assert len(index.clippings) == 4
+        assert index.clippings[3]["content"] == "New note."
+        assert index.books[("Book 1", "Author 1")] == [0, 3]
+
+    @pytest.mark.parametrize("chunk_size", (16, 1 << 20))
+    def test_refresh_appended_separator_in_content(self, input_path: str, chunk_size: int):
+        """
+        GIVEN: ClippingsIndex instance with loaded Clippings, Clippings file read in chunks of given size.
+        WHEN: Appending Clipping with separator characters inside content, before and after its separator line.
+        THEN: Clipping added only after its separator line is appended.
+        """
+        with mock.patch("clippings_service.index.SCAN_CHUNK_SIZE", chunk_size):
+            index = ClippingsIndex(input_path)
+            index.refresh()
+
+            append(input_path, "\nBook 1 (Author 1)\n- Your Note on page 1 | location 12 | Added on Sunday, 1 January")
+            append(input_path, " 2025 08:00:00\n\nSee ========== here.\n")
+            assert index.refresh() == 0
+            append(input_path, "==========\n")
+            assert index.refresh() == 1
+
+        assert len(index.clippings) == 4
+        assert index.clippings[3]["content"] == "See ========== here."
+
+    def test_refresh_rewritten(self, input_path: str, clippings_input: str):
+        """
+        GIVEN: ClippingsIndex instance with loaded Clippings.
+        WHEN: Rewriting Clippings file with smaller content and calling refresh().
+        THEN: Index fully reloaded.
+        """
+        index = ClippingsIndex(input_path)
+        index.refresh()
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input.split("==========")[0] + "==========")
+
+        assert index.refresh() is None
+        assert len(index.clippings) == 1
+
+    @pytest.mark.parametrize(
+        "filters, expected_positions",
+        (
+            pytest.param({}, [0, 1, 2], id="no-filters"),
+            pytest.param({"title": "Book 2"}, [1], id="title"),
+            pytest.param({"title": "Book 2", "author": "Author 1"}, [], id="title-and-other-author"),
+            pytest.param({"author": "Author 3"}, [2], id="author"),
+            pytest.param({"clipping_type": "highlight"}, [0, 2], id="type"),
+            pytest.param({"since": "2025-01-01 06:00:00"}, [1, 2], id="since"),
+            pytest.param({"until": "2025-01-01 06:00:00"}, [0], id="until"),
+        ),
+    )
+    def test_filter(self, input_path: str, filters: dict, expected_positions: list[int]):
+        """
+        GIVEN: ClippingsIndex instance with loaded Clippings.
+        WHEN: Calling filter() with various criteria.
+        THEN: Positions of matching Clippings returned.
+        """
+        index = ClippingsIndex(input_path)
+        index.refresh()
+
+        assert index.filter(**filters) == expected_positions
+
+    def test_search(self, input_path: str):
+        """
+        GIVEN: ClippingsIndex instance with loaded Clippings.
+        WHEN: Calling search() with phrase in different case, with and without positions.
+        THEN: Positions of Clippings containing phrase returned.
+        """
+        index = ClippingsIndex(input_path)
+        index.refresh()
+
+        assert index.search("HIGHLIGHTED") == [0, 2]
+        assert index.search("highlighted", positions=[1, 2]) == [2]
+        assert index.search("missing") == []
+
+    def test_overlapping(self, input_path: str):
+        """
+        GIVEN: ClippingsIndex instance with loaded Clippings.
+        WHEN: Calling overlapping() before and after appending Clipping of the same book.
+        THEN: Positions of book Clippings overlapping location returned, location index rebuilt after append.
+        """
+        index = ClippingsIndex(input_path)
+        index.refresh()
+
+        assert index.overlapping("Book 1", "Author 1", 12) == [0]
+        assert index.overlapping("Book 1", "Author 1", 13, 20) == []
+        append(
+            input_path,
+            "\nBook 1 (Author 1)\n- Your Note on page 1 | location 12 | Added on Sunday, 1 January 2025 08:00:00\n"
+            "\nNote.\n==========\n",
+        )
+        index.refresh()
+        assert index.overlapping("Book 1", "Author 1", 12) == [0, 3]
+        assert index.overlapping("Missing", "Author 1", 12) == []
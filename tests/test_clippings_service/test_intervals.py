@@ -0,0 +1,64 @@
+import random
+
+import pytest
+from clippings_service.intervals import IntervalIndex
+
+
+class TestIntervalIndex:
+    """Tests for clippings_service.intervals.py."""
+
+    @pytest.mark.parametrize(
+        "start, end, expected_values",
+        (
+            pytest.param(15, None, [0, 1], id="point-inside"),
+            pytest.param(20, None, [0, 1, 2], id="point-on-boundaries"),
+            pytest.param(5, None, [], id="point-before"),
+            pytest.param(100, None, [], id="point-after"),
+            pytest.param(21, 25, [1, 2], id="range-inside"),
+            pytest.param(1, 100, [0, 1, 2, 3], id="range-covering-all"),
+            pytest.param(31, 39, [], id="range-in-gap"),
+        ),
+    )
+    def test_overlapping(self, start: int, end: int | None, expected_values: list[int]):
+        """
+        GIVEN: IntervalIndex with nested, adjacent and separate intervals.
+        WHEN: Calling overlapping() with point or range.
+        THEN: Values of intervals overlapping point or range returned in ascending order.
+        """
+        index = IntervalIndex([(40, 40, 3), (20, 30, 2), (10, 20, 0), (12, 25, 1)])
+
+        assert index.overlapping(start, end) == expected_values
+
+    def test_overlapping_random(self):
+        """
+        GIVEN: IntervalIndex with random intervals.
+        WHEN: Calling overlapping() with random ranges.
+        THEN: Result equal to brute force check of every interval.
+        """
+        generator = random.Random(0)
+        intervals = []
+        for value in range(500):
+            start = generator.randint(0, 1000)
+            intervals.append((start, start + generator.randint(0, 50), value))
+        index = IntervalIndex(intervals)
+
+        for _ in range(200):
+            start = generator.randint(0, 1100)
+            end = start + generator.randint(0, 20)
+            expected = sorted(
+                value
+                for interval_start, interval_end, value in intervals
+                if interval_start <= end and interval_end >= start
+            )
+            assert index.overlapping(start, end) == expected
+
+    def test_empty(self):
+        """
+        GIVEN: IntervalIndex without intervals.
+        WHEN: Calling overlapping().
+        THEN: Empty list returned.
+        """
+        index = IntervalIndex([])
+
+        assert len(index) == 0
+        assert index.overlapping(1) == []
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+from clippings_service.keywords import KeywordsMatcher, compile_keywords_regex, load_keywords
+
+
+class TestKeywords:
+    """
+    Tests for clippings_service.keywords.py.
+    """
+
+    def test_compile_keywords_regex(self):
+        """
+        GIVEN: Keywords sharing prefixes.
+        WHEN: Calling compile_keywords_regex().
+        THEN: Keywords merged into trie regex of whole words.
+        """
+        result = compile_keywords_regex(["data", "Database", "date", " data ", "c++"])
+
+        assert result == r"(?<!\w)(?:(?:c\+\+|dat(?:a(?:base)?|e)))(?!\w)"
+
+    def test_compile_keywords_regex_empty(self):
+        """
+        GIVEN: Blank keywords only.
+        WHEN: Calling compile_keywords_regex().
+        THEN: ValueError raised.
+        """
+        with pytest.raises(ValueError):
+            compile_keywords_regex(["", "  "])
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        (
+            pytest.param("Databases are everywhere, Database too.", True, id="case-insensitive"),
+            pytest.param("The dates.", False, id="whole-words"),
+            pytest.param("Up-to-date", True, id="punctuation"),
+            pytest.param("Machine\xa0\nLearning", True, id="phrase-whitespace"),
+            pytest.param("Machine-learning", False, id="phrase-separator"),
+            pytest.param("Written in C++.", True, id="special-characters"),
+            pytest.param("", False, id="empty"),
+        ),
+    )
+    def test_keywords_matcher(self, text: str, expected: bool):
+        """
+        GIVEN: KeywordsMatcher with words, phrase and keyword with regex special characters.
+        WHEN: Calling matches() with text.
+        THEN: Only texts mentioning any keyword as whole words matched.
+        """
+        matcher = KeywordsMatcher(["database", "date", "machine learning", "c++"])
+
+        assert matcher.matches(text) is expected
+
+    def test_load_keywords(self, tmp_path: Path):
+        """
+        GIVEN: Keywords file with BOM, comments and blank lines.
+        WHEN: Calling load_keywords().
+        THEN: Stripped keywords returned.
+        """
+        path = tmp_path / "keywords.txt"
+        path.write_text("\ufeffstoicism\n# Philosophy\n\n  virtue ethics  \n", encoding="utf-8")
+
+        assert load_keywords(str(path)) == ["stoicism", "virtue ethics"]
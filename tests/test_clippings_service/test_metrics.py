@@ -0,0 +1,131 @@
+import io
+import json
+import os
+from pathlib import Path
+
+import pytest
+from clippings_service.metrics import RunMetrics, get_output_size
+
+
+@pytest.fixture
+def run_metrics() -> RunMetrics:
+    """
+    Fixture for RunMetrics test instance with counters of finished run.
+
+    Returns:
+        RunMetrics: RunMetrics test instance.
+    """
+    metrics = RunMetrics(format="json")
+    metrics.success = True
+    metrics.records_parsed = 10
+    metrics.records_invalid = 2
+    metrics.records_rejected = 2
+    metrics.invalid_fields = {"content": 2}
+    metrics.bytes_read = 1000
+    metrics.output_bytes = 500
+    return metrics
+
+
+class TestRunMetrics:
+    """
+    Tests for clippings_service.metrics.py.
+    """
+
+    def test_count_input(self):
+        """
+        GIVEN: RunMetrics instance and binary input stream.
+        WHEN: Reading lines from stream wrapped with count_input().
+        THEN: All lines read, number of bytes read counted.
+        """
+        metrics = RunMetrics()
+        content = b"line 1\nline 2\n" * 1000
+
+        stream = io.TextIOWrapper(metrics.count_input(io.BytesIO(content)), encoding="utf8")
+
+        assert len(stream.readlines()) == 2000
+        assert metrics.bytes_read == len(content)
+
+    def test_timed(self):
+        """
+        GIVEN: RunMetrics instance and generator of items.
+        WHEN: Iterating over generator wrapped with timed() and stopping early.
+        THEN: Items yielded, time accumulated in timer, wrapped generator closed.
+        """
+        metrics = RunMetrics()
+        closed = []
+
+        def items():
+            try:
+                yield from range(10)
+            finally:
+                closed.append(True)
+
+        timed = metrics.timed(items(), "read")
+        assert [next(timed) for _ in range(3)] == [0, 1, 2]
+        timed.close()
+
+        assert closed == [True]
+        assert metrics.durations["read"] > 0
+
+    @pytest.mark.parametrize("pipelined, expected_write", ((False, 3.0), (True, 4.0)))
+    def test_durations(self, pipelined: bool, expected_write: float):
+        """
+        GIVEN: RunMetrics instance with measured timers in sequential or pipelined mode.
+        WHEN: Getting durations of RunMetrics.
+        THEN: Write duration derived from total duration (sequential) or from writer thread timers (pipelined).
+        """
+        metrics = RunMetrics()
+        metrics.pipelined = pipelined
+        metrics._timers.update(read=1.0, parse=2.0, write=9.0, write_wait=5.0, total=6.0)
+
+        assert metrics.durations == {"read": 1.0, "parse": 2.0, "write": expected_write, "total": 6.0}
+
+    def test_to_prometheus(self, run_metrics: RunMetrics):
+        """
+        GIVEN: RunMetrics instance with counters of finished run.
+        WHEN: Calling to_prometheus() of RunMetrics.
+        THEN: Metrics in Prometheus text format returned, metrics without values skipped.
+        """
+        result = run_metrics.to_prometheus()
+
+        assert "# TYPE clippings_convert_success gauge\nclippings_convert_success 1\n" in result
+        assert 'clippings_convert_records{state="invalid"} 2\n' in result
+        assert 'clippings_convert_invalid_fields{field="content"} 2\n' in result
+        assert "clippings_convert_input_bytes 1000\n" in result
+        assert 'clippings_convert_stage_duration_seconds{stage="total"} 0.0\n' in result
+        assert "clippings_convert_records_per_second" not in result
+        assert "clippings_convert_pages" not in result
+
+    @pytest.mark.parametrize("filename", ("metrics.prom", "metrics.json"))
+    def test_write(self, tmp_path: Path, run_metrics: RunMetrics, filename: str):
+        """
+        GIVEN: RunMetrics instance with counters of finished run.
+        WHEN: Calling write() of RunMetrics with Prometheus or JSON file path.
+        THEN: Metrics written in format based on file extension, no temporary file left.
+        """
+        path = os.path.join(tmp_path, filename)
+
+        run_metrics.write(path)
+
+        with open(path, "r", encoding="utf8") as file:
+            content = file.read()
+        if filename.endswith(".json"):
+            assert json.loads(content) == json.loads(json.dumps(run_metrics.to_dict()))
+        else:
+            assert content == run_metrics.to_prometheus()
+        assert os.listdir(tmp_path) == [filename]
+
+    def test_get_output_size(self, tmp_path: Path):
+        """
+        GIVEN: Output file, output directory and missing output path.
+        WHEN: Calling get_output_size function with paths.
+        THEN: Size of file, sum of sizes of directory files or None returned.
+        """
+        path = os.path.join(tmp_path, "output.json")
+        with open(path, "w", encoding="utf8") as file:
+            file.write("[]")
+
+        assert get_output_size(path) == 2
+        assert get_output_size(str(tmp_path)) == 2
+        assert get_output_size(os.path.join(tmp_path, "missing.json")) is None
+        assert get_output_size("-") is None
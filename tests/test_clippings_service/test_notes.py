@@ -0,0 +1,123 @@
+from clippings_service.notes import join_notes_to_highlights
+
+
+def _clipping(clipping_type: str, title: str, location_start: int, location_end: int) -> dict:
+    """
+    Builds parsed Clipping of given type, book and location.
+
+    Args:
+        clipping_type (str): Type of Clipping.
+        title (str): Book title.
+        location_start (int): Start location.
+        location_end (int): End location.
+
+    Returns:
+        dict: Parsed Clipping.
+    """
+    return {
+        "book": {"title": title, "author": "Author"},
+        "clipping_type": clipping_type,
+        "location_start": location_start,
+        "location_end": location_end,
+        "content": f"{clipping_type} {title} {location_start}",
+    }
+
+
+class TestNotes:
+    """
+    Tests for clippings_service.notes.py.
+    """
+
+    def test_join_notes_to_highlights_note_after_highlight(self):
+        """
+        GIVEN: Highlight followed by its note and unrelated Clippings in between.
+        WHEN: Calling join_notes_to_highlights().
+        THEN: Note attached to highlight, not yielded separately, order preserved.
+        """
+        highlight = _clipping("Highlight", "Book 1", 10, 12)
+        other = _clipping("Highlight", "Book 2", 10, 12)
+        bookmark = _clipping("Bookmark", "Book 1", 12, 12)
+        note = _clipping("Note", "Book 1", 12, 12)
+
+        result = list(join_notes_to_highlights([highlight, other, bookmark, note]))
+
+        assert result == [highlight, other, bookmark]
+        assert highlight["note"] is note
+        assert "note" not in other
+
+    def test_join_notes_to_highlights_note_before_highlight(self):
+        """
+        GIVEN: Note followed by its highlight.
+        WHEN: Calling join_notes_to_highlights().
+        THEN: Note attached to highlight, highlight yielded at its own position.
+        """
+        first = _clipping("Highlight", "Book 1", 1, 2)
+        note = _clipping("Note", "Book 1", 12, 12)
+        highlight = _clipping("Highlight", "Book 1", 10, 12)
+
+        result = list(join_notes_to_highlights([first, note, highlight]))
+
+        assert result == [first, highlight]
+        assert highlight["note"] is note
+
+    def test_join_notes_to_highlights_unmatched(self):
+        """
+        GIVEN: Note of other location and note of other book than highlight.
+        WHEN: Calling join_notes_to_highlights().
+        THEN: Notes yielded as separate Clippings.
+        """
+        clippings = [
+            _clipping("Highlight", "Book 1", 10, 12),
+            _clipping("Note", "Book 1", 11, 11),
+            _clipping("Note", "Book 2", 12, 12),
+        ]
+
+        result = list(join_notes_to_highlights(clippings))
+
+        assert result == clippings
+        assert "note" not in clippings[0]
+
+    def test_join_notes_to_highlights_single_note_per_highlight(self):
+        """
+        GIVEN: Highlight followed by two notes of its location.
+        WHEN: Calling join_notes_to_highlights().
+        THEN: Only the first note attached, the second one yielded separately.
+        """
+        highlight = _clipping("Highlight", "Book 1", 10, 12)
+        first, second = _clipping("Note", "Book 1", 12, 12), _clipping("Note", "Book 1", 12, 12)
+
+        result = list(join_notes_to_highlights([highlight, first, second]))
+
+        assert result == [highlight, second]
+        assert highlight["note"] is first
+
+    def test_join_notes_to_highlights_window(self):
+        """
+        GIVEN: Note separated from its highlight by more Clippings than window size.
+        WHEN: Calling join_notes_to_highlights() with small window.
+        THEN: Note not joined, all Clippings yielded in input order.
+        """
+        highlight = _clipping("Highlight", "Book 1", 10, 12)
+        others = [_clipping("Highlight", "Book 2", location, location + 1) for location in range(3)]
+        note = _clipping("Note", "Book 1", 12, 12)
+
+        result = list(join_notes_to_highlights([highlight, *others, note], window=3))
+
+        assert result == [highlight, *others, note]
+        assert "note" not in highlight
+
+    def test_join_notes_to_highlights_incomplete(self):
+        """
+        GIVEN: Clippings missing book or location.
+        WHEN: Calling join_notes_to_highlights().
+        THEN: Clippings yielded unchanged.
+        """
+        clippings = [
+            {"clipping_type": "Highlight", "location_end": 12},
+            {"book": {"title": "Book 1", "author": "Author"}, "clipping_type": "Note"},
+            {"errors": {"clipping_type": "Invalid"}},
+        ]
+
+        result = list(join_notes_to_highlights(clippings))
+
+        assert result == clippings
@@ -0,0 +1,257 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from clippings_service.offsets import (
+    OffsetIndex,
+    find_record_ends,
+    get_offsets_path,
+    is_indexable,
+    read_last_records,
+)
+from clippings_service.parsers import iter_raw_records
+
+
+def write_clippings(path: str, content: str, mode: str = "w") -> None:
+    """
+    Writes Clippings file content.
+
+    Args:
+        path (str): Path to Clippings file.
+        content (str): Clippings file content.
+        mode (str): File open mode. [w|a]
+    """
+    with open(path, mode, encoding="utf8", newline="") as file:
+        file.write(content)
+
+
+@pytest.fixture
+def input_path(tmp_path: Path, clippings_input: str) -> str:
+    """
+    Returns path to Clippings file in temporary location.
+
+    Args:
+        tmp_path (Path): Temporary pytest files location.
+        clippings_input (str): Clippings file content.
+
+    Returns:
+         str: Path to Clippings file in temporary pytest files location.
+    """
+    path = os.path.join(tmp_path, "My Clippings.txt")
+    write_clippings(path, clippings_input)
+    return path
+
+
+def read_raw_records(path: str) -> list[list[str]]:
+    """
+    Reads all raw records of Clippings file.
+
+    Args:
+        path (str): Path to Clippings file.
+
+    Returns:
+        list[list[str]]: Lines of every record.
+    """
+    with open(path, "rb") as file:
+        return list(iter_raw_records(file))
+
+
+class TestOffsets:
+    """
+    Tests for clippings_service.offsets.py.
+    """
+
+    @pytest.mark.parametrize(
+        "data, at_eof, expected",
+        (
+            pytest.param(b"a\n==========\nb\n==========\n", False, [13, 26], id="lf"),
+            pytest.param(b"a\r\n==========\r\nb\r\n", False, [15], id="crlf"),
+            pytest.param(b"a\n==========", True, [12], id="eof"),
+            pytest.param(b"a\n==========", False, [], id="incomplete"),
+            pytest.param(b"a==========\n===========\n", True, [], id="not-whole-line"),
+        ),
+    )
+    def test_find_record_ends(self, data: bytes, at_eof: bool, expected: list[int]):
+        """
+        GIVEN: Chunk of Clippings file.
+        WHEN: Calling find_record_ends().
+        THEN: Offsets after whole separator lines returned.
+        """
+        assert list(find_record_ends(data, at_eof=at_eof)) == expected
+
+    @pytest.mark.parametrize(
+        "path, expected",
+        (
+            pytest.param("/path/My Clippings.txt", True, id="txt"),
+            pytest.param("/path/My Clippings.txt.gz", False, id="compressed"),
+            pytest.param("/path/Output.json", False, id="export"),
+            pytest.param("-", False, id="stdin"),
+        ),
+    )
+    def test_is_indexable(self, path: str, expected: bool):
+        """
+        GIVEN: Path to input file.
+        WHEN: Calling is_indexable().
+        THEN: Only plain Clippings files are indexable.
+        """
+        assert is_indexable(path) is expected
+
+    @pytest.mark.parametrize("count", (1, 2, 3, 10))
+    @pytest.mark.parametrize("chunk_size", (4, 1 << 16))
+    def test_read_last_records(self, input_path: str, count: int, chunk_size: int):
+        """
+        GIVEN: Clippings file.
+        WHEN: Calling read_last_records() with various numbers of records and chunk sizes.
+        THEN: Last records returned in file order.
+        """
+        with patch("clippings_service.offsets.TAIL_CHUNK_SIZE", chunk_size):
+            records = read_last_records(input_path, count)
+
+        assert records == read_raw_records(input_path)[-count:]
+
+    def test_read_last_records_incomplete(self, input_path: str):
+        """
+        GIVEN: Clippings file ending with record not closed with separator line.
+        WHEN: Calling read_last_records().
+        THEN: Incomplete record skipped.
+        """
+        records = read_raw_records(input_path)
+        write_clippings(input_path, "\nBook 4 (Author 4)\n- Your Highlight", mode="a")
+
+        assert read_last_records(input_path, 1) == records[-1:]
+
+    def test_offset_index(self, input_path: str):
+        """
+        GIVEN: Clippings file without offsets file.
+        WHEN: Calling refresh() of OffsetIndex and reading records.
+        THEN: Offsets file created in cache directory, records read by ranges the same as records of whole file.
+        """
+        index = OffsetIndex(input_path)
+
+        assert index.refresh() == 3
+        assert os.path.exists(index.offsets_path)
+        assert os.listdir(os.path.dirname(input_path)) == ["My Clippings.txt"]
+        records = read_raw_records(input_path)
+        assert index.read_records(0, 3) == records
+        assert index.read_records(1, 2) == records[1:2]
+        assert index.read_records(2, 10) == records[2:]
+        assert index.read_records(3, 4) == []
+
+        loaded = OffsetIndex(input_path)
+        assert loaded.refresh() == 0
+        assert list(loaded.boundaries) == list(index.boundaries)
+
+    def test_offset_index_appended(self, input_path: str):
+        """
+        GIVEN: Indexed Clippings file.
+        WHEN: Appending Clippings to file (with incomplete record at the end) and refreshing index from offsets file.
+        THEN: Only complete appended records added, appended part scanned only.
+        """
+        OffsetIndex(input_path).refresh()
+        write_clippings(
+            input_path,
+            "\nBook 4 (Author 4)\n- Your Note on page 4 | location 11-12 | Added on Sunday, 1 January 2025 08:00:00\n\n"
+            "Noted content.\n==========\nBook 5 (Author 5)\n",
+            mode="a",
+        )
+        index = OffsetIndex(input_path)
+
+        with patch.object(OffsetIndex, "_scan", wraps=index._scan) as mocked_scan:
+            assert index.refresh() == 1
+
+        assert mocked_scan.call_args.args[1] == index.boundaries[3]
+        assert len(index) == 4
+        assert index.read_records(3, 4) == [
+            [
+                "Book 4 (Author 4)",
+                "- Your Note on page 4 | location 11-12 | Added on Sunday, 1 January 2025 08:00:00",
+                "",
+                "Noted content.",
+            ]
+        ]
+
+    def test_offset_index_modified(self, input_path: str):
+        """
+        GIVEN: Indexed Clippings file.
+        WHEN: Replacing Clippings file with file of the same size but different content and refreshing index.
+        THEN: Index rebuilt from scratch.
+        """
+        index = OffsetIndex(input_path)
+        index.refresh()
+        with open(input_path, "r", encoding="utf8") as file:
+            content = file.read()
+        write_clippings(input_path, content.replace("Book 1", "Book 9"))
+
+        assert index.refresh() == 3
+        assert index.read_records(0, 1)[0][0] == "Book 9 (Author 1)"
+
+    def test_offset_index_corrupted(self, input_path: str):
+        """
+        GIVEN: Clippings file with corrupted offsets file.
+        WHEN: Calling refresh() of OffsetIndex.
+        THEN: Index rebuilt and offsets file replaced.
+        """
+        os.makedirs(os.path.dirname(get_offsets_path(input_path)))
+        write_clippings(get_offsets_path(input_path), "not an offsets file")
+        index = OffsetIndex(input_path)
+
+        assert index.refresh() == 3
+        assert OffsetIndex(input_path).refresh() == 0
+
+    @pytest.mark.parametrize("failing", ("file_lock", "atomic_write"))
+    def test_offset_index_read_only(self, input_path: str, failing: str):
+        """
+        GIVEN: Clippings file and cache directory on read-only file system.
+        WHEN: Calling refresh() of OffsetIndex and reading records.
+        THEN: Index kept in memory, records read the same as records of whole file.
+        """
+        with patch(f"clippings_service.offsets.{failing}", side_effect=OSError(30, "Read-only file system")):
+            index = OffsetIndex(input_path)
+
+            assert index.refresh() == 3
+            assert index.read_records(0, 3) == read_raw_records(input_path)
+            assert index.refresh() == 0
+
+        assert not os.path.exists(index.offsets_path)
+
+    @pytest.mark.parametrize(
+        "path, other_path",
+        (
+            pytest.param("/kindle/My Clippings.txt", "/backup/My Clippings.txt", id="directory"),
+            pytest.param("/kindle/My Clippings.txt", "/kindle/Other Clippings.txt", id="name"),
+        ),
+    )
+    def test_get_offsets_path(self, cache_dir: Path, path: str, other_path: str):
+        """
+        GIVEN: Paths of two different Clippings files.
+        WHEN: Calling get_offsets_path() function with both paths.
+        THEN: Different offsets files in cache directory returned, named after Clippings files.
+        """
+        offsets_path, other_offsets_path = get_offsets_path(path), get_offsets_path(other_path)
+
+        assert offsets_path != other_offsets_path
+        assert Path(offsets_path).parent == cache_dir / "clippings_cli"
+        assert os.path.basename(offsets_path).startswith(os.path.basename(path))
+
+    def test_offset_index_compressed(self):
+        """
+        GIVEN: Path to compressed Clippings file.
+        WHEN: Creating OffsetIndex.
+        THEN: ValueError raised.
+        """
+        with pytest.raises(ValueError):
+            OffsetIndex("/path/My Clippings.txt.gz")
+
+    def test_offset_index_crlf(self, tmp_path: Path, clippings_input: str):
+        """
+        GIVEN: Clippings file with CRLF line breaks and BOM, like the one written by Kindle.
+        WHEN: Calling refresh() of OffsetIndex and reading records.
+        THEN: Records the same as records of whole file.
+        """
+        path = os.path.join(tmp_path, "My Clippings.txt")
+        write_clippings(path, "\ufeff" + clippings_input.replace("\n", "\r\n") + "\r\n")
+        index = OffsetIndex(path)
+        index.refresh()
+
+        assert index.read_records(0, 3) == read_raw_records(path)
@@ -1,5 +1,15 @@
+from io import BytesIO
+
 import pytest
-from clippings_service.parsers import parse_book_line, parse_content_line, parse_metadata_line
+from clippings_service.parsers import (
+    MetadataParser,
+    iter_raw_records,
+    parse_book_line,
+    parse_content_line,
+    parse_created_at,
+    parse_metadata_line,
+    parse_range,
+)
 
 
 class TestClippingServiceParsers:
@@ -68,12 +78,25 @@ class TestClippingServiceParsers:
                     "page_number": "14",
                     "location": "208",
                     "created_at": "2022-07-26 17:59:48",
+                    "page_start": 14,
+                    "page_end": 14,
+                    "location_start": 208,
+                    "location_end": 208,
                 },
                 id="highlight",
             ),
             pytest.param(
                 "- Your Note on page 14 | location 208 | Added on Tuesday, 26 July 2022 17:59:48",
-                {"clipping_type": "Note", "page_number": "14", "location": "208", "created_at": "2022-07-26 17:59:48"},
+                {
+                    "clipping_type": "Note",
+                    "page_number": "14",
+                    "location": "208",
+                    "created_at": "2022-07-26 17:59:48",
+                    "page_start": 14,
+                    "page_end": 14,
+                    "location_start": 208,
+                    "location_end": 208,
+                },
                 id="note",
             ),
             pytest.param(
@@ -83,6 +106,10 @@ class TestClippingServiceParsers:
                     "page_number": "14",
                     "location": None,
                     "created_at": "2022-07-26 17:59:48",
+                    "page_start": 14,
+                    "page_end": 14,
+                    "location_start": None,
+                    "location_end": None,
                 },
                 id="without-location",
             ),
@@ -93,6 +120,10 @@ class TestClippingServiceParsers:
                     "page_number": "14",
                     "location": "208-208",
                     "created_at": "2022-07-26 17:59:48",
+                    "page_start": 14,
+                    "page_end": 14,
+                    "location_start": 208,
+                    "location_end": 208,
                 },
                 id="location-with-dash",
             ),
@@ -103,6 +134,10 @@ class TestClippingServiceParsers:
                     "page_number": "14-14",
                     "location": "208",
                     "created_at": "2022-07-26 17:59:48",
+                    "page_start": 14,
+                    "page_end": 14,
+                    "location_start": 208,
+                    "location_end": 208,
                 },
                 id="page-with-dash",
             ),
@@ -111,7 +146,7 @@ class TestClippingServiceParsers:
     def test_parse_metadata_line_with_page(self, line: str, expected_output: dict):
         """
         GIVEN: Clipping line with Clipping metadata - type, location, page_number, created_at
-        matching METADATA_WITH_PAGE_REGEX.
+        with page number.
         WHEN: Calling parse_metadata_line with line as an argument.
         THEN: Line parsed properly, function result the same as expected.
         """
@@ -128,12 +163,25 @@ class TestClippingServiceParsers:
                     "page_number": None,
                     "location": "123",
                     "created_at": "2023-07-11 15:50:10",
+                    "page_start": None,
+                    "page_end": None,
+                    "location_start": 123,
+                    "location_end": 123,
                 },
                 id="highlight",
             ),
             pytest.param(
                 "- Your Note at location 123 | Added on Tuesday, 11 July 2023 15:50:10",
-                {"clipping_type": "Note", "page_number": None, "location": "123", "created_at": "2023-07-11 15:50:10"},
+                {
+                    "clipping_type": "Note",
+                    "page_number": None,
+                    "location": "123",
+                    "created_at": "2023-07-11 15:50:10",
+                    "page_start": None,
+                    "page_end": None,
+                    "location_start": 123,
+                    "location_end": 123,
+                },
                 id="note",
             ),
             pytest.param(
@@ -143,6 +191,10 @@ class TestClippingServiceParsers:
                     "page_number": None,
                     "location": "123-124",
                     "created_at": "2023-07-11 15:50:10",
+                    "page_start": None,
+                    "page_end": None,
+                    "location_start": 123,
+                    "location_end": 124,
                 },
                 id="location-with-dash",
             ),
@@ -151,13 +203,201 @@ class TestClippingServiceParsers:
     def test_parse_metadata_line_without_page(self, line: str, expected_output: dict):
         """
         GIVEN: Clipping line with Clipping metadata - type, location, page_number, created_at
-        matching METADATA_WITHOUT_PAGE_REGEX.
+        without page number.
         WHEN: Calling parse_metadata_line with line as an argument.
         THEN: Line parsed properly, function result the same as expected.
         """
         result = parse_metadata_line(line)
         assert result == expected_output
 
+    @pytest.mark.parametrize(
+        "line, expected_output",
+        (
+            pytest.param(
+                "- Ihre Markierung auf Seite 12 | Position 170-171 | Hinzugefügt am Sonntag, 5. März 2023 10:45:12",
+                ("Highlight", "12", "170-171", "2023-03-05 10:45:12"),
+                id="de",
+            ),
+            pytest.param(
+                "- Ihr Lesezeichen bei Position 170 | Hinzugefügt am Sonntag, 5. März 2023 10:45:12",
+                ("Bookmark", None, "170", "2023-03-05 10:45:12"),
+                id="de-without-page",
+            ),
+            pytest.param(
+                "- Tu nota en la página 12 | posición 171 | Añadido el domingo, 5 de marzo de 2023 10:45:12",
+                ("Note", "12", "171", "2023-03-05 10:45:12"),
+                id="es",
+            ),
+            pytest.param(
+                "- Votre surlignement à l’emplacement 170-171 | Ajouté le dimanche 1er octobre 2023 10:45:12",
+                ("Highlight", None, "170-171", "2023-10-01 10:45:12"),
+                id="fr-without-page",
+            ),
+            pytest.param(
+                "- La tua evidenziazione a pagina 12 | posizione 170-171 | Aggiunto in data domenica 5 marzo 2023 "
+                "10:45:12",
+                ("Highlight", "12", "170-171", "2023-03-05 10:45:12"),
+                id="it",
+            ),
+            pytest.param(
+                "- Seu destaque na posição 170-171 | Adicionado: domingo, 5 de março de 2023 10:45:12",
+                ("Highlight", None, "170-171", "2023-03-05 10:45:12"),
+                id="pt-without-page",
+            ),
+            pytest.param(
+                "- Twoje zakreślenie na stronie 12 | lokalizacja 170-171 | Dodano: niedziela, 5 marca 2023 10:45:12",
+                ("Highlight", "12", "170-171", "2023-03-05 10:45:12"),
+                id="pl",
+            ),
+            pytest.param(
+                "- Twoje zakreślenie na stronie 12 | lokalizacja 170-171 | Dodano niedziela, 5 marca 2023 10:45:12",
+                ("Highlight", "12", "170-171", "2023-03-05 10:45:12"),
+                id="pl-without-colon",
+            ),
+            pytest.param(
+                "- Je notitie op locatie 171 | Toegevoegd op zondag 5 maart 2023 10:45:12",
+                ("Note", None, "171", "2023-03-05 10:45:12"),
+                id="nl-without-page",
+            ),
+        ),
+    )
+    def test_parse_metadata_line_localized(self, line: str, expected_output: tuple):
+        """
+        GIVEN: Clipping metadata line written by Kindle with non-English UI language.
+        WHEN: Calling parse_metadata_line with line as an argument.
+        THEN: Line parsed with grammar of its language, Clipping type translated and creation datetime normalized.
+        """
+        result = parse_metadata_line(line)
+        assert (result["clipping_type"], result["page_number"], result["location"], result["created_at"]) == (
+            expected_output
+        )
+
+    @pytest.mark.parametrize(
+        "template, weekdays",
+        (
+            pytest.param(
+                "- Ihre Markierung auf Seite 12 | Position 170-171 | Hinzugefügt am {weekday}, {day}. März 2023 "
+                "10:45:12",
+                ("Sonntag", "Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag"),
+                id="de",
+            ),
+            pytest.param(
+                "- Tu subrayado en la página 12 | posición 170-171 | Añadido el {weekday}, {day} de marzo de 2023 "
+                "10:45:12",
+                ("domingo", "lunes", "martes", "miércoles", "jueves", "viernes", "sábado"),
+                id="es",
+            ),
+            pytest.param(
+                "- Votre surlignement sur la page 12 | emplacement 170-171 | Ajouté le {weekday} {day} mars 2023 "
+                "10:45:12",
+                ("dimanche", "lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi"),
+                id="fr",
+            ),
+            pytest.param(
+                "- La tua evidenziazione a pagina 12 | posizione 170-171 | Aggiunto in data {weekday} {day} marzo 2023 "
+                "10:45:12",
+                ("domenica", "lunedì", "martedì", "mercoledì", "giovedì", "venerdì", "sabato"),
+                id="it",
+            ),
+            pytest.param(
+                "- Seu destaque na página 12 | posição 170-171 | Adicionado: {weekday}, {day} de março de 2023 "
+                "10:45:12",
+                ("domingo", "segunda-feira", "terça-feira", "quarta-feira", "quinta-feira", "sexta-feira", "sábado"),
+                id="pt",
+            ),
+            pytest.param(
+                "- Twoje zakreślenie na stronie 12 | lokalizacja 170-171 | Dodano: {weekday}, {day} marca 2023 "
+                "10:45:12",
+                ("niedziela", "poniedziałek", "wtorek", "środa", "czwartek", "piątek", "sobota"),
+                id="pl",
+            ),
+            pytest.param(
+                "- Je markering op pagina 12 | locatie 170-171 | Toegevoegd op {weekday} {day} maart 2023 10:45:12",
+                ("zondag", "maandag", "dinsdag", "woensdag", "donderdag", "vrijdag", "zaterdag"),
+                id="nl",
+            ),
+        ),
+    )
+    def test_parse_metadata_line_weekdays(self, template: str, weekdays: tuple[str, ...]):
+        """
+        GIVEN: Clipping metadata lines written by Kindle with non-English UI language on every weekday, from Sunday,
+        5 March 2023 to Saturday, 11 March 2023.
+        WHEN: Calling parse_metadata_line with every line as an argument.
+        THEN: Every line parsed, including lines with hyphenated weekdays.
+        """
+        for day, weekday in enumerate(weekdays, 5):
+            result = parse_metadata_line(template.format(weekday=weekday, day=day))
+            assert (result["clipping_type"], result["location"], result["created_at"]) == (
+                "Highlight",
+                "170-171",
+                f"2023-03-{day:02d} 10:45:12",
+            )
+
+    @pytest.mark.parametrize(
+        "fields, expected_output",
+        (
+            pytest.param(frozenset({"clipping_type"}), {"clipping_type": "Highlight"}, id="type"),
+            pytest.param(
+                frozenset({"location", "location_end", "content"}),
+                {"location": "208-209", "location_end": 209},
+                id="location",
+            ),
+            pytest.param(frozenset({"created_at"}), {"created_at": "2022-07-26 17:59:48"}, id="created-at"),
+            pytest.param(frozenset({"book"}), {}, id="no-metadata"),
+        ),
+    )
+    def test_parse_metadata_line_fields(self, fields: frozenset[str], expected_output: dict):
+        """
+        GIVEN: Clipping metadata line and set of requested fields.
+        WHEN: Calling parse_metadata_line with line and fields as arguments.
+        THEN: Only requested metadata fields parsed.
+        """
+        line = "- Your Highlight on page 14 | location 208-209 | Added on Tuesday, 26 July 2022 17:59:48"
+
+        assert parse_metadata_line(line, fields) == expected_output
+
+    @pytest.mark.parametrize("fields", (None, frozenset({"clipping_type", "created_at"})))
+    def test_parse_metadata_line_invalid_created_at(self, fields: frozenset[str] | None):
+        """
+        GIVEN: Clipping metadata line with creation date not existing in calendar.
+        WHEN: Calling parse_metadata_line with line and fields as arguments.
+        THEN: Other metadata parsed, creation datetime missing, so Clipping is reported by validation.
+        """
+        line = "- Your Highlight on page 14 | location 208-209 | Added on Friday, 31 February 2023 06:32:11"
+
+        result = parse_metadata_line(line, fields)
+
+        assert result["clipping_type"] == "Highlight"
+        assert "created_at" not in result
+
+    def test_parse_metadata_line_not_supported(self):
+        """
+        GIVEN: Metadata line not matching any grammar.
+        WHEN: Calling parse_metadata_line with line as an argument.
+        THEN: Empty dictionary returned.
+        """
+        assert parse_metadata_line("- Your Highlight somewhere | Added on Tuesday, 11 July 2023 15:50:10") == {}
+
+    def test_metadata_parser(self):
+        """
+        GIVEN: MetadataParser instance.
+        WHEN: Parsing Polish metadata lines followed by German one.
+        THEN: Polish language detected and pinned, pinned language switched on German line.
+        """
+        parser = MetadataParser()
+
+        first = parser.parse("- Twoja notatka w lokalizacji 171 | Dodano niedziela, 5 marca 2023 10:45:12")
+        language = parser.language
+        second = parser.parse("- Twoja zakładka na stronie 3 | Dodano poniedziałek, 6 marca 2023 10:45:12")
+        third = parser.parse("- Ihre Notiz bei Position 171 | Hinzugefügt am Sonntag, 5. März 2023 10:45:12")
+
+        assert language == "pl"
+        assert (first["clipping_type"], second["clipping_type"], third["clipping_type"]) == ("Note", "Bookmark", "Note")
+        assert second["page_start"] == 3
+        assert parser.language == "de"
+        assert parser.parse("- Metadata") == {}
+        assert parser.language == "de"
+
     @pytest.mark.parametrize(
         "line, expected_output",
         (
@@ -175,3 +415,99 @@ class TestClippingServiceParsers:
         """
         result = parse_content_line(line)
         assert result["content"] == expected_output
+
+    @pytest.mark.parametrize(
+        "data",
+        (
+            pytest.param(b"Book (Author)\n- Metadata\n\nContent\n==========\n", id="lf"),
+            pytest.param(b"Book (Author)\r\n- Metadata\r\n\r\nContent\r\n==========\r\n", id="crlf"),
+            pytest.param(b"Book (Author)\n- Metadata\n\nContent\n==========", id="no-trailing-newline"),
+            pytest.param(b"Book (Author)\n- Metadata\n\nContent\n==========\nBook (Author)\n", id="incomplete-last"),
+        ),
+    )
+    def test_iter_raw_records(self, data: bytes):
+        """
+        GIVEN: Binary Clippings stream.
+        WHEN: Calling iter_raw_records with stream as an argument.
+        THEN: Stream split into records without newline characters, not closed record skipped.
+        """
+        result = list(iter_raw_records(BytesIO(data)))
+        assert result == [["Book (Author)", "- Metadata", "", "Content"]]
+
+    @pytest.mark.parametrize(
+        "value, expected_output",
+        (
+            pytest.param("6 February 2023 06:32:11", "2023-02-06 06:32:11", id="regular"),
+            pytest.param("26 july 2022 7:59:48", "2022-07-26 07:59:48", id="lowercase-month-one-digit-hour"),
+            pytest.param("31 December 1999 23:59:59", "1999-12-31 23:59:59", id="end-of-year"),
+            pytest.param("29 February 2024 06:32:11", "2024-02-29 06:32:11", id="leap-day"),
+        ),
+    )
+    def test_parse_created_at(self, value: str, expected_output: str):
+        """
+        GIVEN: Clipping creation datetime from metadata line.
+        WHEN: Calling parse_created_at with value as an argument.
+        THEN: Datetime converted to "%Y-%m-%d %H:%M:%S" format.
+        """
+        assert parse_created_at(value) == expected_output
+
+    @pytest.mark.parametrize(
+        "value, language, expected_output",
+        (
+            pytest.param("5 Lutego 2023 10:45:12", "pl", "2023-02-05 10:45:12", id="pl"),
+            pytest.param("5. März 2023 7:45:12", "de", "2023-03-05 07:45:12", id="de"),
+            pytest.param("5 de marzo de 2023, 10:45:12", "es", "2023-03-05 10:45:12", id="es"),
+        ),
+    )
+    def test_parse_created_at_localized(self, value: str, language: str, expected_output: str):
+        """
+        GIVEN: Clipping creation datetime from metadata line written in given language.
+        WHEN: Calling parse_created_at with value and language as arguments.
+        THEN: Datetime converted to "%Y-%m-%d %H:%M:%S" format.
+        """
+        assert parse_created_at(value, language) == expected_output
+
+    def test_parse_created_at_localized_invalid(self):
+        """
+        GIVEN: English Clipping creation datetime.
+        WHEN: Calling parse_created_at with value and other language as arguments.
+        THEN: ValueError raised.
+        """
+        with pytest.raises(ValueError):
+            parse_created_at("6 February 2023 06:32:11", "pl")
+
+    @pytest.mark.parametrize(
+        "value",
+        (
+            "6 Lutego 2023 06:32:11",
+            "32 February 2023 06:32:11",
+            "31 February 2023 06:32:11",
+            "29 February 2023 06:32:11",
+            "31 April 2023 06:32:11",
+            "6 February 2023",
+        ),
+    )
+    def test_parse_created_at_invalid(self, value: str):
+        """
+        GIVEN: Invalid Clipping creation datetime.
+        WHEN: Calling parse_created_at with value as an argument.
+        THEN: ValueError raised.
+        """
+        with pytest.raises(ValueError):
+            parse_created_at(value)
+
+    @pytest.mark.parametrize(
+        "value, expected_output",
+        (
+            pytest.param("69", (69, 69), id="single"),
+            pytest.param("69-70", (69, 70), id="range"),
+            pytest.param(None, (None, None), id="missing"),
+        ),
+    )
+    def test_parse_range(self, value: str | None, expected_output: tuple[int | None, int | None]):
+        """
+        GIVEN: Page number or location value.
+        WHEN: Calling parse_range with value as an argument.
+        THEN: Value converted to integer start and end.
+        """
+        assert parse_range(value) == expected_output
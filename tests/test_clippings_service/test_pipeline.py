@@ -0,0 +1,154 @@
+from typing import Iterable
+
+import pytest
+from clippings_service.pipeline import run_fan_out, run_pipeline
+
+
+def collect(clippings: Iterable[dict]) -> dict:
+    """
+    Test output handler collecting Clippings into result dictionary.
+
+    Args:
+        clippings (Iterable[dict]): Clippings.
+
+    Returns:
+        dict: Dictionary containing collected Clippings.
+    """
+    return {"clippings": list(clippings)}
+
+
+class TestPipeline:
+    """Tests for clippings_service.pipeline.py."""
+
+    @pytest.mark.parametrize("records_count", (0, 1, 10, 1000))
+    @pytest.mark.parametrize("block_size, queue_size", ((1, 1), (3, 2), (512, 8)))
+    def test_run_pipeline(self, records_count: int, block_size: int, queue_size: int):
+        """
+        GIVEN: Raw records reader, parser and output handler.
+        WHEN: Calling run_pipeline() with various block and queue sizes.
+        THEN: All records parsed and passed to output handler in original order.
+        """
+        result = run_pipeline(
+            read=lambda: iter(range(records_count)),
+            parse=lambda record: {"number": record},
+            write=collect,
+            block_size=block_size,
+            queue_size=queue_size,
+        )
+
+        assert result == {"clippings": [{"number": number} for number in range(records_count)]}
+
+    def test_run_pipeline_reader_error(self):
+        """
+        GIVEN: Raw records reader raising exception in the middle of reading.
+        WHEN: Calling run_pipeline().
+        THEN: Reader exception re-raised in calling thread.
+        """
+
+        def read():
+            yield from range(10)
+            raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+
+        with pytest.raises(EOFError):
+            run_pipeline(read=read, parse=lambda record: {}, write=collect, block_size=2, queue_size=1)
+
+    def test_run_pipeline_parser_error(self):
+        """
+        GIVEN: Parser raising exception.
+        WHEN: Calling run_pipeline().
+        THEN: Parser exception re-raised in calling thread.
+        """
+
+        def parse(record: int) -> dict:
+            raise ValueError(record)
+
+        with pytest.raises(ValueError):
+            run_pipeline(read=lambda: iter(range(100)), parse=parse, write=collect, block_size=2, queue_size=1)
+
+    def test_run_pipeline_writer_stops_early(self):
+        """
+        GIVEN: Output handler returning error without consuming all Clippings.
+        WHEN: Calling run_pipeline() with input larger than queues capacity.
+        THEN: Pipeline stopped, output handler result returned.
+        """
+        result = run_pipeline(
+            read=lambda: iter(range(100_000)),
+            parse=lambda record: {},
+            write=lambda clippings: {"error": "Permission denied"},
+            block_size=2,
+            queue_size=1,
+        )
+
+        assert result == {"error": "Permission denied"}
+
+    @pytest.mark.parametrize("records_count", (0, 1, 1000))
+    @pytest.mark.parametrize("block_size, queue_size", ((1, 1), (3, 2), (512, 8)))
+    def test_run_fan_out(self, records_count: int, block_size: int, queue_size: int):
+        """
+        GIVEN: Clippings and multiple output handlers.
+        WHEN: Calling run_fan_out() with various block and queue sizes.
+        THEN: Clippings consumed once, every handler received all Clippings in original order, results in order of
+        handlers.
+        """
+        consumed = []
+
+        def clippings():
+            for number in range(records_count):
+                consumed.append(number)
+                yield {"number": number}
+
+        results = run_fan_out(
+            clippings(),
+            [collect, lambda clippings: {"count": sum(1 for _ in clippings)}],
+            block_size=block_size,
+            queue_size=queue_size,
+        )
+
+        assert results == [
+            {"clippings": [{"number": number} for number in range(records_count)]},
+            {"count": records_count},
+        ]
+        assert consumed == list(range(records_count))
+
+    def test_run_fan_out_writer_stops_early(self):
+        """
+        GIVEN: Output handler returning error without consuming all Clippings and other output handler.
+        WHEN: Calling run_fan_out() with input larger than queues capacity.
+        THEN: Other handler received all Clippings, results of both handlers returned.
+        """
+        results = run_fan_out(
+            ({"number": number} for number in range(10_000)),
+            [lambda clippings: {"error": "Permission denied"}, lambda clippings: {"count": sum(1 for _ in clippings)}],
+            block_size=2,
+            queue_size=1,
+        )
+
+        assert results == [{"error": "Permission denied"}, {"count": 10_000}]
+
+    def test_run_fan_out_writer_error(self):
+        """
+        GIVEN: Output handler raising exception and other output handler.
+        WHEN: Calling run_fan_out().
+        THEN: All handlers stopped, handler exception re-raised in calling thread.
+        """
+
+        def fail(clippings: Iterable[dict]) -> dict:
+            next(iter(clippings))
+            raise ValueError("Invalid Clipping")
+
+        with pytest.raises(ValueError):
+            run_fan_out(({} for _ in range(100_000)), [collect, fail], block_size=2, queue_size=1)
+
+    def test_run_fan_out_producer_error(self):
+        """
+        GIVEN: Clippings iterable raising exception in the middle of iteration.
+        WHEN: Calling run_fan_out().
+        THEN: All handlers stopped, exception re-raised in calling thread.
+        """
+
+        def clippings():
+            yield from ({} for _ in range(10))
+            raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+
+        with pytest.raises(EOFError):
+            run_fan_out(clippings(), [collect, collect], block_size=2, queue_size=1)
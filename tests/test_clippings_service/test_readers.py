@@ -0,0 +1,180 @@
+import gzip
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from clippings_service.format_handlers.excel_handlers import generate_excel
+from clippings_service.readers import (
+    format_raw_record,
+    get_input_format,
+    iter_excel_clippings,
+    iter_json_clippings,
+    normalize_clipping,
+)
+from openpyxl import Workbook
+
+
+class TestReaders:
+    """
+    Tests for clippings_service.readers.py.
+    """
+
+    @pytest.mark.parametrize(
+        "path, expected_format",
+        (
+            pytest.param("My Clippings.txt", "txt", id="txt"),
+            pytest.param("-", "txt", id="stdin"),
+            pytest.param("Output.json", "json", id="json"),
+            pytest.param("Output.JSON.gz", "json", id="compressed-json"),
+            pytest.param("Output.xlsx", "excel", id="excel"),
+            pytest.param("My Clippings.zip", "txt", id="zip"),
+        ),
+    )
+    def test_get_input_format(self, path: str, expected_format: str):
+        """
+        GIVEN: Input file path.
+        WHEN: Calling get_input_format function with path.
+        THEN: Input format based on uncompressed file extension returned.
+        """
+        assert get_input_format(path) == expected_format
+
+    def test_normalize_clipping_legacy(self, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: Exported Clipping without page and location ranges, with errors code.
+        WHEN: Calling normalize_clipping function with Clipping.
+        THEN: Clipping record with ranges restored from raw values returned, errors code dropped.
+        """
+        data = {key: value for key, value in clippings_list[0].items() if not key.endswith(("_start", "_end"))}
+
+        result = normalize_clipping({**data, "errors": 2})
+
+        assert result == {key: value for key, value in clippings_list[0].items() if key != "errors"}
+
+    @pytest.mark.parametrize("chunk_size", (1, 7, 65536))
+    def test_iter_json_clippings(self, clippings_list: list[dict[str, Any]], chunk_size: int):
+        """
+        GIVEN: JSON export of Clippings read in chunks of various sizes.
+        WHEN: Calling iter_json_clippings function with export stream.
+        THEN: Exported Clippings yielded one by one, without errors codes.
+        """
+        stream = io.BytesIO(json.dumps(clippings_list, indent=4).encode("utf-8"))
+
+        with patch("clippings_service.readers.JSON_CHUNK_SIZE", chunk_size):
+            result = list(iter_json_clippings(stream))
+
+        assert result == [{key: value for key, value in c.items() if key != "errors"} for c in clippings_list]
+        assert not stream.closed
+
+    @pytest.mark.parametrize(
+        "content, expected_message",
+        (
+            pytest.param('{"content": "x"}', "has to contain an array", id="not-array"),
+            pytest.param('["content"]', "array of objects", id="not-objects"),
+            pytest.param('[{"content": "x"}', "not complete", id="incomplete"),
+            pytest.param('[{"content": x}]', "Invalid JSON", id="invalid"),
+        ),
+    )
+    def test_iter_json_clippings_invalid(self, content: str, expected_message: str):
+        """
+        GIVEN: Invalid JSON export.
+        WHEN: Calling iter_json_clippings function with export stream.
+        THEN: InputFormatError (ValueError) raised.
+        """
+        with pytest.raises(ValueError, match=expected_message):
+            list(iter_json_clippings(io.BytesIO(content.encode("utf-8"))))
+
+    def test_iter_excel_clippings(self, tmp_path: Path, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: Excel export of Clippings, read from non-seekable gzip stream.
+        WHEN: Calling iter_excel_clippings function with export stream.
+        THEN: Exported Clippings yielded one by one, with raw page numbers and locations restored.
+        """
+        output_path = os.path.join(tmp_path, "output.xlsx")
+        generate_excel(clippings_list, output_path)
+        with open(output_path, "rb") as file:
+            compressed = gzip.compress(file.read())
+
+        with gzip.open(io.BytesIO(compressed), "rb") as stream:
+            result = list(iter_excel_clippings(stream))
+
+        assert result == [{key: value for key, value in c.items() if key != "errors"} for c in clippings_list]
+
+    @pytest.mark.parametrize(
+        "options",
+        (
+            pytest.param({"max_rows": 2}, id="rollover"),
+            pytest.param({"sheet_per_book": True}, id="sheet-per-book"),
+        ),
+    )
+    def test_iter_excel_clippings_sheets(
+        self, tmp_path: Path, clippings_list: list[dict[str, Any]], options: dict[str, Any]
+    ):
+        """
+        GIVEN: Excel export of Clippings written to several sheets, with or without summary sheet.
+        WHEN: Calling iter_excel_clippings function with export stream.
+        THEN: Clippings of all sheets yielded, summary sheet skipped.
+        """
+        output_path = os.path.join(tmp_path, "output.xlsx")
+        generate_excel(clippings_list, output_path, **options)
+
+        with open(output_path, "rb") as stream:
+            result = list(iter_excel_clippings(stream))
+
+        assert result == [{key: value for key, value in c.items() if key != "errors"} for c in clippings_list]
+
+    def test_iter_excel_clippings_legacy(self, tmp_path: Path):
+        """
+        GIVEN: Excel export with raw page number and location columns and empty row.
+        WHEN: Calling iter_excel_clippings function with export stream.
+        THEN: Clippings with integer ranges yielded, empty row skipped.
+        """
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["Book title", "Book author", "Content", "Page number", "Location", "Created at", "Clipping type"])
+        sheet.append(["Book", "Author", "Text", "3", "40-42", "2025-01-01 05:00:00", "highlight"])
+        sheet.append([None] * 7)
+        output_path = os.path.join(tmp_path, "legacy.xlsx")
+        workbook.save(output_path)
+
+        with open(output_path, "rb") as stream:
+            result = list(iter_excel_clippings(stream))
+
+        assert result == [
+            {
+                "book": {"title": "Book", "author": "Author"},
+                "clipping_type": "highlight",
+                "page_number": "3",
+                "location": "40-42",
+                "created_at": "2025-01-01 05:00:00",
+                "page_start": 3,
+                "page_end": 3,
+                "location_start": 40,
+                "location_end": 42,
+                "content": "Text",
+            }
+        ]
+
+    def test_iter_excel_clippings_invalid(self):
+        """
+        GIVEN: Stream, that is not an Excel workbook.
+        WHEN: Calling iter_excel_clippings function with stream.
+        THEN: InputFormatError (ValueError) raised.
+        """
+        with pytest.raises(ValueError):
+            list(iter_excel_clippings(io.BytesIO(b"not a workbook")))
+
+    def test_format_raw_record(self, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: Clipping record.
+        WHEN: Calling format_raw_record function with Clipping.
+        THEN: Lines of Clippings file record returned.
+        """
+        result = format_raw_record(clippings_list[0])
+
+        assert result[0] == "Book 1 (Author 1)"
+        assert result[1].startswith("- Your Highlight on page 1 | location 11-12 | Added on ")
+        assert result[3] == clippings_list[0]["content"]
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from clippings_service.index import ClippingsIndex
+from clippings_service.server import ClippingsServer, serve
+
+
+@pytest.fixture
+def server(tmp_path: Path, clippings_input: str) -> ClippingsServer:
+    """
+    Returns ClippingsServer for Clippings file in temporary location.
+
+    Args:
+        tmp_path (Path): Temporary pytest files location.
+        clippings_input (str): Clippings file content.
+
+    Returns:
+         ClippingsServer: ClippingsServer instance.
+    """
+    path = os.path.join(tmp_path, "My Clippings.txt")
+    with open(path, "w", encoding="utf8") as file:
+        file.write(clippings_input)
+    return ClippingsServer(ClippingsIndex(path))
+
+
+class TestClippingsServer:
+    """Tests for clippings_service.server.py."""
+
+    @pytest.mark.parametrize(
+        "target, expected_count, expected_titles",
+        (
+            pytest.param("/clippings", 3, ["Book 1", "Book 2", "Book 3"], id="all"),
+            pytest.param("/clippings?type=Note", 1, ["Book 2"], id="type"),
+            pytest.param("/clippings?offset=1&limit=1", 3, ["Book 2"], id="pagination"),
+            pytest.param("/search?q=highlighted&author=Author%203", 1, ["Book 3"], id="search-with-filter"),
+            pytest.param("/locations?title=Book%202&author=Author%202&start=12", 1, ["Book 2"], id="locations"),
+            pytest.param("/locations?title=Book%202&author=Author%202&start=1&end=10", 0, [], id="locations-range"),
+        ),
+    )
+    def test_handle_clippings(
+        self, server: ClippingsServer, target: str, expected_count: int, expected_titles: list[str]
+    ):
+        """
+        GIVEN: ClippingsServer instance.
+        WHEN: Handling GET request to /clippings, /search or /locations endpoint.
+        THEN: Matching Clippings returned with total number of matching Clippings.
+        """
+        status, body, content_type = server.handle("GET", target)
+
+        data = json.loads(body)
+        assert status == 200
+        assert content_type == "application/json"
+        assert data["count"] == expected_count
+        assert [clipping["book"]["title"] for clipping in data["clippings"]] == expected_titles
+
+    def test_handle_books(self, server: ClippingsServer):
+        """
+        GIVEN: ClippingsServer instance.
+        WHEN: Handling GET request to /books endpoint.
+        THEN: Books with number of Clippings returned.
+        """
+        status, body, _ = server.handle("GET", "/books")
+
+        assert status == 200
+        assert json.loads(body)[0] == {"title": "Book 1", "author": "Author 1", "count": 1}
+
+    @pytest.mark.parametrize("format", ("json", "excel"))
+    def test_handle_export(self, server: ClippingsServer, format: str):
+        """
+        GIVEN: ClippingsServer instance.
+        WHEN: Handling GET request to /export endpoint.
+        THEN: Output file content returned.
+        """
+        status, body, _ = server.handle("GET", f"/export?format={format}&type=Note")
+
+        assert status == 200
+        if format == "json":
+            assert len(json.loads(body)) == 1
+        else:
+            assert body.startswith(b"PK")
+
+    @pytest.mark.parametrize(
+        "method, target, expected_status",
+        (
+            pytest.param("GET", "/unknown", 404, id="unknown-endpoint"),
+            pytest.param("POST", "/clippings", 405, id="invalid-method"),
+            pytest.param("GET", "/search", 400, id="missing-param"),
+            pytest.param("GET", "/locations?title=Book%201&author=Author%201", 400, id="missing-location"),
+            pytest.param("GET", "/clippings?limit=many", 400, id="invalid-param"),
+            pytest.param("GET", "/export?format=xml", 400, id="invalid-format"),
+        ),
+    )
+    def test_handle_error(self, server: ClippingsServer, method: str, target: str, expected_status: int):
+        """
+        GIVEN: ClippingsServer instance.
+        WHEN: Handling invalid request.
+        THEN: Error status and message returned.
+        """
+        status, body, _ = server.handle(method, target)
+
+        assert status == expected_status
+        assert "error" in json.loads(body)
+
+    def test_handle_handler_error(self, server: ClippingsServer, caplog: pytest.LogCaptureFixture):
+        """
+        GIVEN: ClippingsServer instance with request handler failing with ValueError.
+        WHEN: Handling request of the handler.
+        THEN: Error logged with traceback, 500 status returned.
+        """
+        server.routes["/books"] = MagicMock(side_effect=ValueError("Handler bug."))
+
+        with caplog.at_level(logging.ERROR):
+            status, body, _ = server.handle("GET", "/books")
+
+        assert status == 500
+        assert json.loads(body) == {"error": "Internal server error."}
+        assert "Request [GET /books] failed." in caplog.text
+        assert "Handler bug." in caplog.text
+
+    def test_serve(self, server: ClippingsServer):
+        """
+        GIVEN: ClippingsIndex instance.
+        WHEN: Starting server on random port and sending two requests over single keep-alive connection.
+        THEN: Both requests answered.
+        """
+
+        async def scenario() -> list[bytes]:
+            tcp_server = await serve(server.index, host="127.0.0.1", port=0)
+            host, port = tcp_server.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            responses = []
+            for connection in ("keep-alive", "close"):
+                writer.write(f"GET /status HTTP/1.1\r\nHost: {host}\r\nConnection: {connection}\r\n\r\n".encode())
+                responses.append(await reader.readuntil(b"}"))
+            writer.close()
+            tcp_server.close()
+            await tcp_server.wait_closed()
+            return responses
+
+        responses = asyncio.run(scenario())
+
+        for response in responses:
+            assert response.startswith(b"HTTP/1.1 200 OK")
+            assert b'"clippings": 3' in response
@@ -1,9 +1,14 @@
-from io import StringIO
+import gzip
+import json
+import os
+from io import BytesIO
+from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
 from clippings_service.service import ClippingsService
+from openpyxl import load_workbook
 
 
 @pytest.fixture
@@ -37,13 +42,477 @@ class TestClippingsService:
         WHEN: Calling _parse_clippings() of ClippingsService with access to input file.
         THEN: Expected Clippings list returned.
         """
-        mock_open.return_value = StringIO(clippings_input)
+        mock_open.return_value = BytesIO(clippings_input.encode())
 
         clippings = clippings_service._parse_clippings()
 
         assert len(clippings) == 3
         assert clippings == clippings_list
 
+    def test_parse_table(self, tmp_path: Path, clippings_input: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: ClippingsService instance and Clippings input file.
+        WHEN: Calling parse_table() of ClippingsService.
+        THEN: ClippingsTable containing all parsed Clippings returned.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+        service = ClippingsService(input_path=input_path, output_path="path/to/output.json")
+
+        table = service.parse_table()
+
+        assert list(table.to_records()) == clippings_list
+        assert service.clippings_count == 3
+
+    def test_iter_clippings_fields(self, tmp_path: Path, clippings_input: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: ClippingsService instance with fields projection and Clippings input file.
+        WHEN: Calling iter_clippings() of ClippingsService.
+        THEN: Clippings containing only requested fields yielded.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+        service = ClippingsService(input_path=input_path, output_path="-", fields=("book", "created_at", "errors"))
+
+        clippings = list(service.iter_clippings())
+
+        assert clippings == [
+            {"book": clipping["book"], "created_at": clipping["created_at"], "errors": 0} for clipping in clippings_list
+        ]
+
+    @pytest.mark.parametrize("fields", (None, ("book",)))
+    def test_iter_clippings_keywords(
+        self, tmp_path: Path, clippings_input: str, clippings_list: list[dict[str, Any]], fields: tuple | None
+    ):
+        """
+        GIVEN: ClippingsService instance with keywords and Clippings input file and JSON export.
+        WHEN: Calling iter_clippings() of ClippingsService, with and without fields projection.
+        THEN: Only Clippings mentioning keyword yielded, also when content is projected out.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+        export_path = os.path.join(tmp_path, "Clippings.json")
+        with open(export_path, "w", encoding="utf8") as file:
+            json.dump(clippings_list, file)
+        expected = [
+            {key: value for key, value in clipping.items() if fields is None or key in fields}
+            for clipping in clippings_list
+            if clipping["clipping_type"] == "Note"
+        ]
+
+        for path in (input_path, export_path):
+            service = ClippingsService(input_path=path, output_path="-", fields=fields, keywords=["NOTED"])
+
+            assert list(service.iter_clippings()) == expected
+            assert service.clippings_count == 3
+
+    def test_iter_clippings_compressed_input(
+        self, tmp_path: Path, clippings_input: str, clippings_list: list[dict[str, Any]]
+    ):
+        """
+        GIVEN: ClippingsService instance with gzip compressed Clippings input file.
+        WHEN: Iterating over iter_clippings() of ClippingsService.
+        THEN: Expected Clippings yielded, number of processed Clippings stored.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt.gz")
+        with gzip.open(input_path, "wt", encoding="utf8") as file:
+            file.write(clippings_input)
+        service = ClippingsService(input_path=input_path, output_path="path/to/output.json")
+
+        clippings = list(service.iter_clippings())
+
+        assert clippings == clippings_list
+        assert service.clippings_count == 3
+
+    @pytest.mark.parametrize("format", ("json", "excel"))
+    def test_generate_output_pipelined(self, tmp_path: Path, clippings_input: str, format: str):
+        """
+        GIVEN: ClippingsService instance and Clippings input file.
+        WHEN: Calling generate_output() of ClippingsService in sequential and pipelined mode.
+        THEN: Pipelined output the same as sequential one.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+        outputs = []
+        for pipelined in (False, True):
+            service = ClippingsService(input_path=input_path, output_path=os.path.join(tmp_path, f"{pipelined}.xlsx"))
+            assert service.generate_output(format, pipelined=pipelined) == {}
+            assert service.clippings_count == 3
+            outputs.append(service.output_path)
+
+        if format == "json":
+            with open(outputs[0], "rb") as sequential, open(outputs[1], "rb") as pipelined:
+                assert sequential.read() == pipelined.read()
+        else:
+            sequential, pipelined = (load_workbook(path).active for path in outputs)
+            assert list(sequential.values) == list(pipelined.values)
+
+    @pytest.mark.parametrize("pipelined", (False, True))
+    def test_generate_output_sharded(self, tmp_path: Path, clippings_input: str, pipelined: bool):
+        """
+        GIVEN: ClippingsService instance and Clippings input file.
+        WHEN: Calling generate_output() of ClippingsService with 'json' param and shard size.
+        THEN: Clippings written to shard files described by manifest file.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+        service = ClippingsService(input_path=input_path, output_path=os.path.join(tmp_path, "output.json"))
+
+        result = service.generate_output("json", pipelined=pipelined, shard_size=2)
+
+        assert result == {}
+        assert not os.path.exists(service.output_path)
+        with open(os.path.join(tmp_path, "output.manifest.json"), "r", encoding="utf8") as file:
+            assert [shard["rows"] for shard in json.load(file)["shards"]] == [2, 1]
+
+    @pytest.mark.parametrize("pipelined", (False, True))
+    def test_generate_output_fuzzy_dedupe(self, tmp_path: Path, clippings_input: str, pipelined: bool):
+        """
+        GIVEN: ClippingsService instance with fuzzy deduplication and Clippings input file with near-duplicates.
+        WHEN: Calling generate_output() of ClippingsService with 'json' param.
+        THEN: Near-duplicates skipped, signatures cache file saved.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+        service = ClippingsService(
+            input_path=input_path,
+            output_path=os.path.join(tmp_path, "output.json"),
+            dedupe_threshold=0.8,
+            dedupe_cache_path=os.path.join(tmp_path, "signatures.bin"),
+        )
+
+        result = service.generate_output("json", pipelined=pipelined)
+
+        assert result == {}
+        with open(service.output_path, "r", encoding="utf8") as file:
+            assert [clipping["book"]["title"] for clipping in json.load(file)] == ["Book 1", "Book 2"]
+        assert service.clippings_count == 3
+        assert service.deduplicator.duplicates_count == 1
+        assert os.path.exists(service.dedupe_cache_path)
+
+    @pytest.mark.parametrize("pipelined", (False, True))
+    def test_generate_output_reject_path(self, tmp_path: Path, clippings_input: str, pipelined: bool):
+        """
+        GIVEN: ClippingsService instance with reject path and Clippings input file containing invalid Clipping.
+        WHEN: Calling generate_output() of ClippingsService with 'json' param.
+        THEN: Invalid Clipping written to reject file, valid Clippings written to output.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(f"Invalid book line\n==========\n{clippings_input}")
+        service = ClippingsService(
+            input_path=input_path,
+            output_path=os.path.join(tmp_path, "output.json"),
+            reject_path=os.path.join(tmp_path, "rejected.txt"),
+        )
+
+        result = service.generate_output("json", pipelined=pipelined)
+
+        assert result == {}
+        with open(service.output_path, "r", encoding="utf8") as file:
+            assert len(json.load(file)) == 3
+        with open(service.reject_path, "r", encoding="utf8") as file:
+            assert file.read() == "Invalid book line\n==========\n"
+        assert service.clippings_count == 4
+        assert service.validation.rejected_count == 1
+
+    @pytest.mark.parametrize("format, extension", (("json", "json.gz"), ("excel", "xlsx")))
+    def test_generate_output_from_export(
+        self, tmp_path: Path, clippings_input: str, clippings_list: list[dict[str, Any]], format: str, extension: str
+    ):
+        """
+        GIVEN: Clippings input file converted to JSON or Excel export.
+        WHEN: Calling generate_output() of ClippingsService with export as input.
+        THEN: Clippings read back from export equal to parsed Clippings.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+        export_path = os.path.join(tmp_path, f"export.{extension}")
+        ClippingsService(input_path=input_path, output_path=export_path).generate_output(format)
+        service = ClippingsService(input_path=export_path, output_path=os.path.join(tmp_path, "output.json"))
+
+        result = service.generate_output("json")
+
+        assert result == {}
+        with open(service.output_path, "r", encoding="utf8") as file:
+            assert json.load(file) == clippings_list
+        assert service.validation.rejected_count == 0
+
+    @pytest.mark.parametrize("pipelined", (False, True))
+    def test_generate_output_metrics(self, tmp_path: Path, clippings_input: str, pipelined: bool):
+        """
+        GIVEN: ClippingsService instance with JSON metrics path and Clippings input file containing invalid Clipping.
+        WHEN: Calling generate_output() of ClippingsService with 'json' param.
+        THEN: Counters and timings of the run written to metrics file.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(f"Invalid book line\n==========\n{clippings_input}")
+        service = ClippingsService(
+            input_path=input_path,
+            output_path=os.path.join(tmp_path, "output.json"),
+            reject_path=os.path.join(tmp_path, "rejected.txt"),
+            metrics_path=os.path.join(tmp_path, "metrics", "metrics.json"),
+        )
+
+        result = service.generate_output("json", pipelined=pipelined)
+
+        assert result == {}
+        with open(service.metrics_path, "r", encoding="utf8") as file:
+            metrics = json.load(file)
+        assert metrics["success"] is True
+        assert metrics["records"] == {
+            "parsed": 4,
+            "invalid": 1,
+            "rejected": 1,
+            "duplicate": 0,
+            "invalid_fields": {
+                "book": 1,
+                "clipping_type": 1,
+                "page_number": 1,
+                "created_at": 1,
+                "location": 1,
+                "content": 1,
+            },
+        }
+        assert metrics["bytes"] == {"read": os.path.getsize(input_path), "output": os.path.getsize(service.output_path)}
+        assert set(metrics["durations"]) == {"read", "parse", "write", "total"}
+        assert all(duration >= 0 for duration in metrics["durations"].values())
+
+    @pytest.mark.parametrize("pipelined", (False, True))
+    def test_generate_output_without_metrics(self, tmp_path: Path, clippings_input: str, pipelined: bool):
+        """
+        GIVEN: ClippingsService instance without metrics path and Clippings input file.
+        WHEN: Calling generate_output() of ClippingsService with 'json' param.
+        THEN: Output written without measuring records or wrapping input and output iterators.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+        service = ClippingsService(input_path=input_path, output_path=os.path.join(tmp_path, "output.json"))
+
+        with (
+            patch("clippings_service.service.perf_counter") as mocked_perf_counter,
+            patch("clippings_service.service.RunMetrics.timed") as mocked_timed,
+            patch("clippings_service.service.RunMetrics.count_input") as mocked_count_input,
+        ):
+            result = service.generate_output("json", pipelined=pipelined)
+
+        assert result == {}
+        assert service.clippings_count == 3
+        mocked_perf_counter.assert_not_called()
+        mocked_timed.assert_not_called()
+        mocked_count_input.assert_not_called()
+
+    def test_generate_output_metrics_failed(self, tmp_path: Path):
+        """
+        GIVEN: ClippingsService instance with Prometheus metrics path and corrupted gzip input file.
+        WHEN: Calling generate_output() of ClippingsService with 'json' param.
+        THEN: Metrics file reporting failed run written.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt.gz")
+        with open(input_path, "wb") as file:
+            file.write(b"not a gzip file")
+        service = ClippingsService(
+            input_path=input_path,
+            output_path=os.path.join(tmp_path, "output.json"),
+            metrics_path=os.path.join(tmp_path, "metrics.prom"),
+        )
+
+        result = service.generate_output("json")
+
+        assert "error" in result
+        with open(service.metrics_path, "r", encoding="utf8") as file:
+            assert "clippings_convert_success 0\n" in file.read()
+
+    def test_generate_output_strict(self, tmp_path: Path, clippings_input: str):
+        """
+        GIVEN: ClippingsService instance in strict mode and Clippings input file containing invalid Clipping.
+        WHEN: Calling generate_output() of ClippingsService with 'json' param.
+        THEN: Result dict with validation error in "error" key returned.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(f"{clippings_input}\nInvalid book line\n==========\n")
+        service = ClippingsService(
+            input_path=input_path, output_path=os.path.join(tmp_path, "output.json"), strict=True
+        )
+
+        result = service.generate_output("json")
+
+        assert isinstance(result["error"], ValueError)
+        assert str(result["error"]).startswith("Invalid Clipping found in strict mode.")
+
+    @pytest.mark.parametrize("pipelined", (False, True))
+    def test_generate_output_excel_invalid_created_at(self, tmp_path: Path, clippings_input: str, pipelined: bool):
+        """
+        GIVEN: ClippingsService instance and Clippings input file containing Clipping added on 31 February.
+        WHEN: Calling generate_output() of ClippingsService with 'excel' param.
+        THEN: Excel file generated, Clipping kept with empty creation date and its error described.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(
+                f"{clippings_input}\nLeap Book (Leap Author)\n"
+                "- Your Highlight on page 14 | location 208-209 | Added on Friday, 31 February 2023 06:32:11\n\n"
+                "Never happened.\n==========\n"
+            )
+        output_path = os.path.join(tmp_path, "output.xlsx")
+        service = ClippingsService(input_path=input_path, output_path=output_path)
+
+        result = service.generate_output("excel", pipelined=pipelined)
+        rows = list(load_workbook(output_path).active.values)
+        row = dict(zip(rows[0], rows[-1]))
+
+        assert result == {}
+        assert row["Book title"] == "Leap Book"
+        assert row["Content"] == "Never happened."
+        assert row["Created at"] is None
+        assert row["Errors"] == "created_at"
+
+    def test_generate_output_corrupted_input(self, tmp_path: Path):
+        """
+        GIVEN: ClippingsService instance with corrupted gzip input file.
+        WHEN: Calling generate_output() of ClippingsService with 'json' param.
+        THEN: Result dict with "error" key returned.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt.gz")
+        with open(input_path, "wb") as file:
+            file.write(b"not a gzip file")
+        service = ClippingsService(input_path=input_path, output_path=os.path.join(tmp_path, "output.json"))
+
+        result = service.generate_output("json")
+
+        assert isinstance(result["error"], OSError)
+
+    @pytest.mark.parametrize("pipelined", (False, True))
+    def test_generate_output_multiple_formats(self, tmp_path: Path, clippings_input: str, pipelined: bool):
+        """
+        GIVEN: ClippingsService instance with output path per format and Clippings input file.
+        WHEN: Calling generate_output() of ClippingsService with multiple formats.
+        THEN: Clippings parsed once, outputs of all formats the same as outputs of separate runs.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+        output_paths = [os.path.join(tmp_path, "output.json"), os.path.join(tmp_path, "output.xlsx")]
+        service = ClippingsService(input_path=input_path, output_path=output_paths)
+
+        result = service.generate_output(["json", "excel"], pipelined=pipelined)
+
+        assert result == {}
+        assert service.clippings_count == 3
+        assert service.metrics.format == "json,excel"
+        assert service.metrics.output_bytes == sum(os.path.getsize(path) for path in output_paths)
+        for format, output_path in zip(("json", "excel"), output_paths):
+            reference_path = os.path.join(tmp_path, f"reference-{os.path.basename(output_path)}")
+            ClippingsService(input_path=input_path, output_path=reference_path).generate_output(format)
+            if format == "json":
+                with open(output_path, "rb") as output, open(reference_path, "rb") as reference:
+                    assert output.read() == reference.read()
+            else:
+                assert list(load_workbook(output_path).active.values) == list(
+                    load_workbook(reference_path).active.values
+                )
+
+    @pytest.mark.parametrize("pipelined", (False, True))
+    def test_generate_output_join_notes(self, tmp_path: Path, pipelined: bool):
+        """
+        GIVEN: ClippingsService instance and Clippings input file with note written after its highlight.
+        WHEN: Calling generate_output() of ClippingsService with join_notes flag.
+        THEN: Note nested in its highlight, other Clippings written unchanged.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(
+                "Book 1 (Author 1)\n- Your Highlight on page 1 | location 11-12 | Added on Sunday, 1 January 2025 "
+                "05:00:00\n\nHighlighted content.\n==========\n"
+                "Book 1 (Author 1)\n- Your Note on page 1 | location 12 | Added on Sunday, 1 January 2025 05:01:00\n\n"
+                "Noted content.\n==========\n"
+                "Book 1 (Author 1)\n- Your Highlight on page 2 | location 20-21 | Added on Sunday, 1 January 2025 "
+                "06:00:00\n\nOther content.\n==========\n"
+            )
+        output_path = os.path.join(tmp_path, "output.json")
+        service = ClippingsService(input_path=input_path, output_path=output_path)
+
+        result = service.generate_output("json", pipelined=pipelined, join_notes=True)
+
+        assert result == {}
+        with open(output_path, "r", encoding="utf8") as file:
+            clippings = json.load(file)
+        assert [clipping["content"] for clipping in clippings] == ["Highlighted content.", "Other content."]
+        assert clippings[0]["note"]["content"] == "Noted content."
+        assert clippings[0]["note"]["location_start"] == 12
+        assert "note" not in clippings[1]
+
+    @pytest.mark.parametrize("pipelined", (False, True))
+    def test_generate_output_only_new(self, tmp_path: Path, clippings_input: str, pipelined: bool):
+        """
+        GIVEN: ClippingsService instance with state directory and Clippings input file.
+        WHEN: Calling generate_output() twice, with Clipping appended to input file before the second call.
+        THEN: All Clippings written by the first run, only appended Clipping written by the second one.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+        output_path = os.path.join(tmp_path, "output.json")
+        state_dir = os.path.join(tmp_path, "state")
+
+        first = ClippingsService(input_path=input_path, output_path=output_path, state_dir=state_dir)
+        assert first.generate_output("json", pipelined=pipelined) == {}
+        with open(output_path, "r", encoding="utf8") as file:
+            assert len(json.load(file)) == 3
+        with open(input_path, "a", encoding="utf8") as file:
+            file.write(
+                "\nBook 4 (Author 4)\n- Your Highlight on page 4 | location 11-12 | Added on Sunday, 1 January 2025 "
+                "08:00:00\n\nNew content.\n=========="
+            )
+        second = ClippingsService(input_path=input_path, output_path=output_path, state_dir=state_dir)
+        result = second.generate_output("json", pipelined=pipelined)
+
+        assert result == {}
+        assert second.fingerprints.exported_count == 3
+        with open(output_path, "r", encoding="utf8") as file:
+            assert [clipping["content"] for clipping in json.load(file)] == ["New content."]
+
+    def test_generate_output_only_new_failed(self, tmp_path: Path, clippings_input: str):
+        """
+        GIVEN: ClippingsService instance with state directory and inaccessible output path.
+        WHEN: Calling generate_output() of ClippingsService.
+        THEN: Error returned, fingerprints of Clippings not stored, so next run writes all Clippings.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+        state_dir = os.path.join(tmp_path, "state")
+        service = ClippingsService(input_path=input_path, output_path=str(tmp_path), state_dir=state_dir)
+
+        result = service.generate_output("json")
+        retry = ClippingsService(
+            input_path=input_path, output_path=os.path.join(tmp_path, "output.json"), state_dir=state_dir
+        )
+
+        assert "error" in result
+        assert retry.generate_output("json") == {}
+        assert retry.fingerprints.exported_count == 0
+
+    def test_generate_output_multiple_formats_mismatch(self, clippings_service: ClippingsService):
+        """
+        GIVEN: ClippingsService instance with single output path.
+        WHEN: Calling generate_output() of ClippingsService with multiple formats.
+        THEN: Result dict with "error" key returned.
+        """
+        result = clippings_service.generate_output(["json", "excel"])
+
+        assert result == {"error": "Number of formats does not match number of output paths."}
+
     @patch("clippings_service.service.generate_json")
     def test_generate_output_json(
         self, mock_generate_json: MagicMock, clippings_service: ClippingsService, clippings_list: list[dict[str, Any]]
@@ -53,7 +522,7 @@ class TestClippingsService:
         WHEN: Calling generate_output() of ClippingsService with 'json' param.
         THEN: generate_json() method called once with clippings_list.
         """
-        clippings_service._parse_clippings = MagicMock(return_value=clippings_list)
+        clippings_service.iter_clippings = MagicMock(return_value=clippings_list)
         mock_generate_json.return_value = {}
 
         result = clippings_service.generate_output("json")
@@ -70,7 +539,7 @@ class TestClippingsService:
         WHEN: Calling generate_output() of ClippingsService with 'excel' param.
         THEN: generate_excel() method called once with clippings_list.
         """
-        clippings_service._parse_clippings = MagicMock(return_value=clippings_list)
+        clippings_service.iter_clippings = MagicMock(return_value=clippings_list)
         mock_generate_excel.return_value = {}
 
         result = clippings_service.generate_output("excel")
@@ -84,7 +553,7 @@ class TestClippingsService:
         WHEN: Calling generate_output() of ClippingsService with 'unsupported' param.
         THEN: Result dict with "error" key returned.
         """
-        clippings_service._parse_clippings = MagicMock(return_value=[])
+        clippings_service.iter_clippings = MagicMock(return_value=[])
 
         result = clippings_service.generate_output("unsupported")
 
@@ -0,0 +1,178 @@
+import pytest
+from clippings_service.sessions import iter_sessions, reconstruct_sessions, reorder_by_created_at
+
+
+def _clipping(title: str, created_at: str, location: int | None = None, clipping_type: str = "Highlight") -> dict:
+    """
+    Builds parsed Clipping of given book, creation time and location.
+
+    Args:
+        title (str): Book title.
+        created_at (str): Creation time.
+        location (int | None): Start location, end location is one location further.
+        clipping_type (str): Type of Clipping.
+
+    Returns:
+        dict: Parsed Clipping.
+    """
+    return {
+        "book": {"title": title, "author": "Author"},
+        "clipping_type": clipping_type,
+        "created_at": created_at,
+        "location_start": location,
+        "location_end": location + 1 if location is not None else None,
+    }
+
+
+class TestSessions:
+    """
+    Tests for clippings_service.sessions.py.
+    """
+
+    @pytest.mark.parametrize(
+        "window, expected",
+        (
+            pytest.param(3, ["05", "06", "07", "08", "09"], id="ordered"),
+            pytest.param(1, ["06", "05", "07", "08", "09"], id="window-too-small"),
+        ),
+    )
+    def test_reorder_by_created_at(self, window: int, expected: list[str]):
+        """
+        GIVEN: Clippings disordered by two positions.
+        WHEN: Calling reorder_by_created_at() with window.
+        THEN: Clippings ordered by creation time, if window is large enough.
+        """
+        clippings = [{"created_at": f"2025-01-01 {hour}:00:00"} for hour in ("06", "07", "05", "08", "09")]
+
+        result = [clipping["created_at"][11:13] for clipping in reorder_by_created_at(clippings, window)]
+
+        assert result == expected
+
+    def test_reorder_by_created_at_stable(self):
+        """
+        GIVEN: Clippings created at the same time.
+        WHEN: Calling reorder_by_created_at().
+        THEN: Input order kept.
+        """
+        clippings = [{"created_at": "2025-01-01 05:00:00", "content": str(number)} for number in range(5)]
+
+        assert list(reorder_by_created_at(clippings, 2)) == clippings
+
+    def test_reconstruct_sessions(self):
+        """
+        GIVEN: Clippings of two books read alternately, with gap splitting the first book reading.
+        WHEN: Calling reconstruct_sessions() with 30 minutes gap.
+        THEN: Sessions of every book returned, sorted by start time, with counts and locations progress.
+        """
+        clippings = [
+            _clipping("Book 1", "2025-01-01 05:00:00", 100),
+            _clipping("Book 2", "2025-01-01 05:10:00", 10),
+            _clipping("Book 1", "2025-01-01 05:25:00", 150, "Note"),
+            _clipping("Book 1", "2025-01-01 05:50:00", 180),
+            _clipping("Book 1", "2025-01-01 07:00:00", 300),
+        ]
+
+        result = reconstruct_sessions(clippings, gap=30 * 60)
+
+        assert result == [
+            {
+                "book": {"title": "Book 1", "author": "Author"},
+                "start": "2025-01-01 05:00:00",
+                "end": "2025-01-01 05:50:00",
+                "duration": 50,
+                "count": 3,
+                "clipping_types": {"Highlight": 2, "Note": 1},
+                "location_start": 100,
+                "location_end": 181,
+            },
+            {
+                "book": {"title": "Book 2", "author": "Author"},
+                "start": "2025-01-01 05:10:00",
+                "end": "2025-01-01 05:10:00",
+                "duration": 0,
+                "count": 1,
+                "clipping_types": {"Highlight": 1},
+                "location_start": 10,
+                "location_end": 11,
+            },
+            {
+                "book": {"title": "Book 1", "author": "Author"},
+                "start": "2025-01-01 07:00:00",
+                "end": "2025-01-01 07:00:00",
+                "duration": 0,
+                "count": 1,
+                "clipping_types": {"Highlight": 1},
+                "location_start": 300,
+                "location_end": 301,
+            },
+        ]
+
+    def test_reconstruct_sessions_merged_devices(self):
+        """
+        GIVEN: Clippings of two devices appended one after another.
+        WHEN: Calling reconstruct_sessions() with window covering the disorder.
+        THEN: Sessions equal to sessions of Clippings sorted by creation time.
+        """
+        first = [_clipping("Book 1", f"2025-01-01 05:{minute:02d}:00", minute) for minute in range(0, 60, 20)]
+        second = [_clipping("Book 1", f"2025-01-01 05:{minute:02d}:00", minute) for minute in range(10, 60, 20)]
+
+        result = reconstruct_sessions(first + second, gap=15 * 60, window=4)
+
+        assert result == reconstruct_sessions(sorted(first + second, key=lambda clipping: clipping["created_at"]))
+        assert [session["count"] for session in result] == [6]
+
+    def test_iter_sessions_late_clipping(self):
+        """
+        GIVEN: Clipping displaced by more Clippings than window size.
+        WHEN: Calling iter_sessions().
+        THEN: Late Clipping added to open session of its book, extending its start.
+        """
+        clippings = [
+            _clipping("Book 1", "2025-01-01 05:10:00"),
+            _clipping("Book 1", "2025-01-01 05:20:00"),
+            _clipping("Book 1", "2025-01-01 05:00:00"),
+        ]
+
+        result = list(iter_sessions(clippings, window=1))
+
+        assert [(session["start"], session["end"], session["count"]) for session in result] == [
+            ("2025-01-01 05:00:00", "2025-01-01 05:20:00", 3)
+        ]
+        assert result[0]["location_start"] is None
+
+    def test_iter_sessions_late_clipping_outside_gap(self):
+        """
+        GIVEN: Clippings displaced by more Clippings than window size, created long before open session of their book.
+        WHEN: Calling iter_sessions().
+        THEN: Late Clippings grouped into separate sessions by gap, open session not extended.
+        """
+        clippings = [
+            _clipping("Book 1", "2025-01-02 05:00:00"),
+            _clipping("Book 1", "2025-01-02 05:10:00"),
+            _clipping("Book 1", "2024-01-01 05:00:00"),
+            _clipping("Book 1", "2024-01-01 05:20:00"),
+            _clipping("Book 1", "2024-06-01 05:00:00"),
+        ]
+
+        result = reconstruct_sessions(clippings, window=1)
+
+        assert [(session["start"], session["end"], session["count"]) for session in result] == [
+            ("2024-01-01 05:00:00", "2024-01-01 05:20:00", 2),
+            ("2024-06-01 05:00:00", "2024-06-01 05:00:00", 1),
+            ("2025-01-02 05:00:00", "2025-01-02 05:10:00", 2),
+        ]
+
+    def test_iter_sessions_incomplete(self):
+        """
+        GIVEN: Clippings missing book or creation time and Clipping with invalid creation time.
+        WHEN: Calling iter_sessions().
+        THEN: Clippings skipped.
+        """
+        clippings = [
+            {"created_at": "2025-01-01 05:00:00"},
+            {"book": {"title": "Book 1", "author": "Author"}},
+            {},
+            _clipping("Book 1", "2023-02-31 05:00:00"),
+        ]
+
+        assert list(iter_sessions(clippings)) == []
@@ -0,0 +1,142 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from clippings_service.format_handlers.excel_handlers import generate_excel
+from clippings_service.format_handlers.json_handlers import generate_json
+from clippings_service.shards import get_manifest_path, get_shard_path, write_shards
+from openpyxl import load_workbook
+
+
+def read_manifest(output_path: str) -> dict:
+    """
+    Reads manifest file of sharded output.
+
+    Args:
+        output_path (str): Path to output file.
+
+    Returns:
+        dict: Manifest content.
+    """
+    with open(get_manifest_path(output_path), "r", encoding="utf8") as file:
+        return json.load(file)
+
+
+class TestShards:
+    """Tests for clippings_service.shards.py."""
+
+    @pytest.mark.parametrize(
+        "output_path, expected_shard_path, expected_manifest_path",
+        (
+            pytest.param("/out/Output.json", "/out/Output-00007.json", "/out/Output.manifest.json", id="plain"),
+            pytest.param("/out/Output.json.gz", "/out/Output-00007.json.gz", "/out/Output.manifest.json", id="gzip"),
+            pytest.param("/out/Output.xlsx.zip", "/out/Output-00007.xlsx.zip", "/out/Output.manifest.json", id="zip"),
+        ),
+    )
+    def test_paths(self, output_path: str, expected_shard_path: str, expected_manifest_path: str):
+        """
+        GIVEN: Output file path.
+        WHEN: Calling get_shard_path() and get_manifest_path() functions.
+        THEN: Shard number inserted before extensions, manifest placed next to shards.
+        """
+        assert get_shard_path(output_path, 7) == expected_shard_path
+        assert get_manifest_path(output_path) == expected_manifest_path
+
+    def test_write_shards_by_size(self, tmp_path: Path, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: Clippings list.
+        WHEN: Calling write_shards() with JSON handler and shard size.
+        THEN: Consecutive Clippings written to shard files, manifest lists rows and byte ranges of shards.
+        """
+        output_path = os.path.join(tmp_path, "Output.json")
+
+        result = write_shards(clippings_list * 3, generate_json, output_path, shard_size=4, workers=2)
+
+        manifest = read_manifest(output_path)
+        assert result == {}
+        assert manifest["rows"] == 9
+        assert [shard["rows"] for shard in manifest["shards"]] == [4, 4, 1]
+        assert [shard["row_range"] for shard in manifest["shards"]] == [[0, 4], [4, 8], [8, 9]]
+        offset = 0
+        for number, shard in enumerate(manifest["shards"], start=1):
+            assert shard["path"] == get_shard_path(output_path, number)
+            assert shard["byte_range"] == [offset, offset + os.path.getsize(shard["path"])]
+            offset = shard["byte_range"][1]
+        assert manifest["bytes"] == offset
+        with open(manifest["shards"][2]["path"], "r", encoding="utf8") as file:
+            assert json.load(file) == clippings_list[2:]
+
+    def test_write_shards_by_book(self, tmp_path: Path, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: Clippings list with Clippings of three books repeated.
+        WHEN: Calling write_shards() with Excel handler, shard key and shard size.
+        THEN: Clippings of every book written to separate shards of at most shard size rows.
+        """
+        output_path = os.path.join(tmp_path, "Output.xlsx")
+
+        result = write_shards(clippings_list * 3, generate_excel, output_path, shard_size=2, shard_by="book")
+
+        manifest = read_manifest(output_path)
+        assert result == {}
+        assert [(shard["key"], shard["rows"]) for shard in manifest["shards"]] == [
+            ("Book 1 (Author 1)", 2),
+            ("Book 2 (Author 2)", 2),
+            ("Book 3 (Author 3)", 2),
+            ("Book 1 (Author 1)", 1),
+            ("Book 2 (Author 2)", 1),
+            ("Book 3 (Author 3)", 1),
+        ]
+        worksheet = load_workbook(manifest["shards"][0]["path"]).active
+        assert [row[0] for row in worksheet.iter_rows(min_row=2, values_only=True)] == ["Book 1", "Book 1"]
+
+    @patch("clippings_service.shards.SHARD_BUFFER_ROWS", 4)
+    def test_write_shards_by_book_buffer_full(self, tmp_path: Path, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: Clippings list with Clippings of three books repeated and buffer of four Clippings.
+        WHEN: Calling write_shards() with JSON handler and shard key, without shard size.
+        THEN: The largest groups written to shards when buffer is full, remaining groups written at input end.
+        """
+        output_path = os.path.join(tmp_path, "Output.json")
+        clippings = [clippings_list[0], clippings_list[0], clippings_list[1], clippings_list[2], clippings_list[1]]
+
+        result = write_shards(clippings, generate_json, output_path, shard_by="book")
+
+        manifest = read_manifest(output_path)
+        assert result == {}
+        assert [(shard["key"], shard["rows"]) for shard in manifest["shards"]] == [
+            ("Book 1 (Author 1)", 2),
+            ("Book 2 (Author 2)", 2),
+            ("Book 3 (Author 3)", 1),
+        ]
+
+    def test_write_shards_handler_error(self, tmp_path: Path, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: Clippings list and handler failing with error.
+        WHEN: Calling write_shards().
+        THEN: Handler error returned, manifest not written.
+        """
+        output_path = os.path.join(tmp_path, "Output.json")
+        handler = MagicMock(return_value={"error": "Permission denied"})
+
+        result = write_shards(clippings_list, handler, output_path, shard_by="month")
+
+        assert result == {"error": "Permission denied"}
+        assert not os.path.exists(get_manifest_path(output_path))
+
+    @pytest.mark.parametrize(
+        "output_path, shard_size, expected_error",
+        (
+            pytest.param("-", 1, "Sharded output can not be written to standard output.", id="stdout"),
+            pytest.param("Output.json", None, "Shard size or shard key has to be provided.", id="no-shards"),
+        ),
+    )
+    def test_write_shards_invalid(self, output_path: str, shard_size: int | None, expected_error: str):
+        """
+        GIVEN: Invalid sharding options.
+        WHEN: Calling write_shards().
+        THEN: Error returned.
+        """
+        assert write_shards([], generate_json, output_path, shard_size=shard_size) == {"error": expected_error}
@@ -0,0 +1,42 @@
+from typing import Any
+
+from clippings_service.stats import ClippingsStats
+
+
+class TestClippingsStats:
+    """Tests for clippings_service.stats.py."""
+
+    def test_to_dict(self, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: List of Clippings and one invalid Clipping.
+        WHEN: Counting Clippings with ClippingsStats and calling to_dict().
+        THEN: Clippings counted per book, author, month, type and hour.
+        """
+        clippings = [*clippings_list, {**clippings_list[0], "created_at": "2025-02-03 05:59:59"}, {"errors": 63}]
+
+        result = ClippingsStats().update(clippings).to_dict()
+
+        assert result["total"] == 5
+        assert result["books"] == [
+            {"title": "Book 1", "author": "Author 1", "count": 2},
+            {"title": "Book 2", "author": "Author 2", "count": 1},
+            {"title": "Book 3", "author": "Author 3", "count": 1},
+        ]
+        assert result["authors"][0] == {"author": "Author 1", "count": 2}
+        assert result["months"] == {"2025-01": 3, "2025-02": 1}
+        assert result["clipping_types"] == {"Highlight": 3, "Note": 1}
+        assert result["hours"]["05"] == 2
+        assert result["hours"]["06"] == 1
+        assert result["hours"]["07"] == 1
+        assert sum(result["hours"].values()) == 4
+
+    def test_to_dict_top(self, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: List of Clippings.
+        WHEN: Counting Clippings with ClippingsStats and calling to_dict() with top param.
+        THEN: Number of returned books and authors limited.
+        """
+        result = ClippingsStats().update(clippings_list).to_dict(top=1)
+
+        assert len(result["books"]) == 1
+        assert len(result["authors"]) == 1
@@ -0,0 +1,87 @@
+import io
+import os
+import sys
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from clippings_service.streams import (
+    STDIO_PATH,
+    open_input_stream,
+    open_output_stream,
+    strip_compression_extension,
+)
+
+
+class TestStreams:
+    """Tests for clippings_service.streams.py."""
+
+    @pytest.mark.parametrize(
+        "path, expected_output",
+        (
+            pytest.param("My Clippings.txt", "My Clippings.txt", id="not-compressed"),
+            pytest.param("My Clippings.txt.gz", "My Clippings.txt", id="gz"),
+            pytest.param("My Clippings.txt.BZ2", "My Clippings.txt", id="bz2-uppercase"),
+            pytest.param("My Clippings.txt.xz", "My Clippings.txt", id="xz"),
+            pytest.param("My Clippings.zip", "My Clippings", id="zip"),
+        ),
+    )
+    def test_strip_compression_extension(self, path: str, expected_output: str):
+        """
+        GIVEN: File path.
+        WHEN: Calling strip_compression_extension() function with path.
+        THEN: Compression extension removed from path.
+        """
+        assert strip_compression_extension(path) == expected_output
+
+    @pytest.mark.parametrize("extension", ("", ".gz", ".bz2", ".xz", ".zip"))
+    def test_output_and_input_stream_roundtrip(self, tmp_path: Path, extension: str):
+        """
+        GIVEN: Output path with or without compression extension.
+        WHEN: Writing data with open_output_stream() and reading it with open_input_stream().
+        THEN: Read data the same as written one, compressed file smaller than written data.
+        """
+        path = os.path.join(tmp_path, "subdir", f"output.txt{extension}")
+        data = b"Clipping content.\n" * 1000
+
+        with open_output_stream(path) as stream:
+            stream.write(data)
+        with open_input_stream(path) as stream:
+            result = stream.read()
+
+        assert result == data
+        if extension:
+            assert os.path.getsize(path) < len(data)
+
+    def test_input_stream_zip_without_txt_member(self, tmp_path: Path):
+        """
+        GIVEN: Zip archive containing multiple files, none of them with .txt extension.
+        WHEN: Calling open_input_stream() with archive path.
+        THEN: FileNotFoundError raised.
+        """
+        path = os.path.join(tmp_path, "archive.zip")
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("first.json", "[]")
+            archive.writestr("second.json", "[]")
+
+        with pytest.raises(FileNotFoundError):
+            with open_input_stream(path):
+                pass  # pragma: no cover
+
+    def test_stdio_streams(self):
+        """
+        GIVEN: STDIO_PATH as input and output path.
+        WHEN: Reading with open_input_stream() and writing with open_output_stream().
+        THEN: Data read from stdin and written to stdout.
+        """
+        stdin = io.TextIOWrapper(io.BytesIO(b"Clipping content."))
+        stdout = io.TextIOWrapper(io.BytesIO())
+
+        with patch.object(sys, "stdin", stdin), patch.object(sys, "stdout", stdout):
+            with open_input_stream(STDIO_PATH) as stream:
+                data = stream.read()
+            with open_output_stream(STDIO_PATH) as stream:
+                stream.write(data)
+
+        assert stdout.buffer.getvalue() == b"Clipping content."
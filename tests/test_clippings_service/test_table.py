@@ -0,0 +1,159 @@
+from typing import Any, Iterator
+from unittest.mock import patch
+
+import pytest
+from _pytest.fixtures import SubRequest
+from clippings_service.table import NULL, ClippingsTable, from_epoch, to_epoch
+
+
+@pytest.fixture(params=("python", "numpy"))
+def backend(request: SubRequest) -> Iterator[str]:
+    """
+    Runs test with columns processed with pure Python or with NumPy (skipped, if NumPy is not installed).
+
+    Args:
+        request (SubRequest): Pytest request.
+
+    Yields:
+        str: Backend name.
+    """
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        yield request.param
+    else:
+        with patch("clippings_service.table.numpy", None):
+            yield request.param
+
+
+@pytest.fixture
+def clippings_table(clippings_list: list[dict[str, Any]]) -> ClippingsTable:
+    """
+    Fixture for ClippingsTable built from clippings_list fixture and invalid Clipping missing metadata and content.
+
+    Args:
+        clippings_list (list[dict[str, Any]]): Clippings list.
+
+    Returns:
+        ClippingsTable: ClippingsTable test instance.
+    """
+    invalid = {"book": {"title": "Book 1", "author": "Author 1"}, "errors": 62}
+    return ClippingsTable.from_clippings([*clippings_list, invalid])
+
+
+class TestClippingsTable:
+    """
+    Tests for clippings_service.table.py.
+    """
+
+    @pytest.mark.parametrize(
+        "value, expected_epoch",
+        (
+            pytest.param("1970-01-01 00:00:00", 0, id="epoch"),
+            pytest.param("2025-01-01 05:00:00", 1735707600, id="datetime"),
+            pytest.param("2025-01-01", 1735689600, id="date"),
+        ),
+    )
+    def test_to_epoch(self, value: str, expected_epoch: int):
+        """
+        GIVEN: Creation datetime or date.
+        WHEN: Calling to_epoch function with value.
+        THEN: Unix timestamp returned, converted back to datetime with from_epoch function.
+        """
+        assert to_epoch(value) == expected_epoch
+        assert from_epoch(expected_epoch) == (value if len(value) > 10 else f"{value} 00:00:00")
+
+    def test_from_clippings(self, clippings_table: ClippingsTable):
+        """
+        GIVEN: Clippings list with invalid Clipping.
+        WHEN: Building ClippingsTable with from_clippings().
+        THEN: Books and Clipping types dictionary-encoded, integer columns and content buffer filled.
+        """
+        assert len(clippings_table) == 4
+        assert clippings_table.books == [("Book 1", "Author 1"), ("Book 2", "Author 2"), ("Book 3", "Author 3")]
+        assert clippings_table.clipping_types == ["Highlight", "Note"]
+        assert list(clippings_table.columns["book"]) == [0, 1, 2, 0]
+        assert list(clippings_table.columns["clipping_type"]) == [0, 1, 0, -1]
+        assert list(clippings_table.columns["created_at"]) == [1735707600, 1735711200, 1735714800, NULL]
+        assert clippings_table.content_buffer == "Highlighted content.Noted content.Highlighted content."
+        assert list(clippings_table.content_offsets) == [0, 20, 34, 54, 54]
+
+    def test_to_records(self, clippings_table: ClippingsTable, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: ClippingsTable with invalid Clipping.
+        WHEN: Calling to_records() of ClippingsTable.
+        THEN: Clippings equal to source Clippings returned, keys of missing fields not restored.
+        """
+        assert list(clippings_table.to_records()) == [
+            *clippings_list,
+            {"book": {"title": "Book 1", "author": "Author 1"}, "errors": 62},
+        ]
+
+    def test_to_columns(self, clippings_table: ClippingsTable):
+        """
+        GIVEN: ClippingsTable with invalid Clipping.
+        WHEN: Calling to_columns() of ClippingsTable.
+        THEN: Decoded columns returned, with None for missing values.
+        """
+        columns = clippings_table.to_columns()
+
+        assert columns["title"] == ["Book 1", "Book 2", "Book 3", "Book 1"]
+        assert columns["clipping_type"] == ["Highlight", "Note", "Highlight", None]
+        assert columns["created_at"][3] is None
+        assert columns["location_end"] == [12, 12, 12, None]
+        assert columns["content"] == ["Highlighted content.", "Noted content.", "Highlighted content.", ""]
+
+    @pytest.mark.parametrize(
+        "filters, expected_positions",
+        (
+            pytest.param({}, [0, 1, 2, 3], id="no-filters"),
+            pytest.param({"title": "Book 1"}, [0, 3], id="title"),
+            pytest.param({"title": "Book 2", "author": "Author 1"}, [], id="title-and-other-author"),
+            pytest.param({"author": "Author 3"}, [2], id="author"),
+            pytest.param({"clipping_type": "highlight"}, [0, 2], id="type"),
+            pytest.param({"since": "2025-01-01 06:00:00"}, [1, 2], id="since"),
+            pytest.param({"until": "2025-01-01 06:00:00"}, [0], id="until"),
+            pytest.param({"contains": "content."}, [0, 1, 2], id="contains"),
+            pytest.param({"contains": "d content.N"}, [], id="contains-across-contents"),
+            pytest.param({"contains": "Noted", "since": "2025-01-01"}, [1], id="contains-and-since"),
+        ),
+    )
+    def test_filter(self, backend: str, clippings_table: ClippingsTable, filters: dict, expected_positions: list):
+        """
+        GIVEN: ClippingsTable with invalid Clipping.
+        WHEN: Calling filter() of ClippingsTable with various criteria.
+        THEN: Positions of matching Clippings returned.
+        """
+        assert clippings_table.filter(**filters) == expected_positions
+
+    def test_take(self, backend: str, clippings_table: ClippingsTable, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: ClippingsTable with invalid Clipping.
+        WHEN: Calling take() of ClippingsTable with positions of filtered Clippings.
+        THEN: Table of selected Clippings returned.
+        """
+        table = clippings_table.take(clippings_table.filter(clipping_type="highlight"))
+
+        assert list(table.to_records()) == [clippings_list[0], clippings_list[2]]
+        assert table.filter(contains="Noted") == []
+
+    @pytest.mark.parametrize(
+        "key, expected_counts",
+        (
+            pytest.param(
+                "book",
+                {("Book 1", "Author 1"): 2, ("Book 2", "Author 2"): 1, ("Book 3", "Author 3"): 1},
+                id="book",
+            ),
+            pytest.param("author", {"Author 1": 2, "Author 2": 1, "Author 3": 1}, id="author"),
+            pytest.param("clipping_type", {"Highlight": 2, "Note": 1}, id="clipping_type"),
+            pytest.param("month", {"2025-01": 3}, id="month"),
+            pytest.param("year", {"2025": 3}, id="year"),
+        ),
+    )
+    def test_group_by_count(self, backend: str, clippings_table: ClippingsTable, key: str, expected_counts: dict):
+        """
+        GIVEN: ClippingsTable with invalid Clipping.
+        WHEN: Calling group_by_count() of ClippingsTable with key.
+        THEN: Numbers of Clippings by key value returned, missing values not counted.
+        """
+        assert clippings_table.group_by_count(key) == expected_counts
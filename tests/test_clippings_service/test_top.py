@@ -0,0 +1,57 @@
+from typing import Any
+
+import pytest
+from clippings_service.top import top_books, top_clippings
+
+
+@pytest.fixture
+def clippings() -> list[dict[str, Any]]:
+    """
+    Example Clippings list with various content lengths and creation dates.
+
+    Returns:
+        list[dict[str, Any]]: Clippings list.
+    """
+    return [
+        {"book": {"title": "Book 1", "author": "Author"}, "content": "a" * 5, "created_at": "2025-01-03 00:00:00"},
+        {"book": {"title": "Book 2", "author": "Author"}, "content": "a" * 50, "created_at": "2025-01-01 00:00:00"},
+        {"book": {"title": "Book 1", "author": "Author"}, "content": "a" * 20, "created_at": "2025-01-05 00:00:00"},
+        {"book": {"title": "Book 1", "author": "Author"}, "content": "a" * 20, "created_at": "2025-01-02 00:00:00"},
+        {"errors": 63},
+    ]
+
+
+class TestTop:
+    """Tests for clippings_service.top.py."""
+
+    @pytest.mark.parametrize(
+        "key, count, expected_indexes",
+        (
+            pytest.param("length", 1, [1], id="longest"),
+            pytest.param("length", 3, [1, 3, 2], id="longest-tie-later-first"),
+            pytest.param("recent", 2, [2, 0], id="recent"),
+            pytest.param("recent", 10, [2, 0, 3, 1], id="more-than-available"),
+        ),
+    )
+    def test_top_clippings(self, clippings: list[dict[str, Any]], key: str, count: int, expected_indexes: list[int]):
+        """
+        GIVEN: Clippings list.
+        WHEN: Calling top_clippings() with generator of Clippings, count and key.
+        THEN: Clippings with highest key values returned in descending order, invalid Clippings skipped.
+        """
+        result = top_clippings((clipping for clipping in clippings), count, key)
+
+        assert result == [clippings[index] for index in expected_indexes]
+
+    def test_top_books(self, clippings: list[dict[str, Any]]):
+        """
+        GIVEN: Clippings list.
+        WHEN: Calling top_books() with generator of Clippings and count.
+        THEN: Books with highest number of Clippings returned in descending order.
+        """
+        result = top_books((clipping for clipping in clippings), 5)
+
+        assert result == [
+            {"book": {"title": "Book 1", "author": "Author"}, "count": 3},
+            {"book": {"title": "Book 2", "author": "Author"}, "count": 1},
+        ]
@@ -1,5 +1,23 @@
+from io import BytesIO
+
 import pytest
-from clippings_service.validators import validate_fields
+from clippings_service.validators import (
+    ClippingError,
+    ClippingValidationError,
+    ValidationEngine,
+    describe_errors,
+    validate_codes,
+    validate_fields,
+)
+
+VALID_CLIPPING = {
+    "book": {"title": "Title", "author": "Author"},
+    "clipping_type": "Highlight",
+    "page_number": 1,
+    "created_at": "2025-01-01 18:00:00",
+    "location": 1,
+    "content": "Content",
+}
 
 
 class TestClippingServiceValidators:
@@ -111,3 +129,125 @@ class TestClippingServiceValidators:
         assert result != {}
         for key in result.keys():
             assert result[key] == f"Field {key} missed in Clipping."
+
+    @pytest.mark.parametrize(
+        "clipping, expected_code",
+        (
+            pytest.param(VALID_CLIPPING, 0, id="valid"),
+            pytest.param({**VALID_CLIPPING, "additional": True}, 0, id="additional-data"),
+            pytest.param({}, 63, id="empty"),
+            pytest.param(
+                {key: value for key, value in VALID_CLIPPING.items() if key not in ("book", "content")},
+                ClippingError.BOOK | ClippingError.CONTENT,
+                id="book-and-content-missing",
+            ),
+        ),
+    )
+    def test_validate_codes(self, clipping: dict, expected_code: int):
+        """
+        GIVEN: Dictionary with Clipping data.
+        WHEN: Executing validate_codes on clipping dict.
+        THEN: Errors code containing bit flags of missing fields returned.
+        """
+        result = validate_codes(clipping)
+        assert result == expected_code
+        assert type(result) is int
+
+    def test_validate_codes_fields(self):
+        """
+        GIVEN: Dictionary with book and content of Clipping.
+        WHEN: Executing validate_codes on clipping dict with book and content as mandatory fields.
+        THEN: Clipping valid, fields projected out are not checked.
+        """
+        clipping = {"book": VALID_CLIPPING["book"]}
+
+        assert validate_codes(clipping, frozenset({"book", "content"})) == ClippingError.CONTENT
+        assert validate_codes({**clipping, "content": ""}, frozenset({"book", "content"})) == 0
+
+    @pytest.mark.parametrize(
+        "code, expected_output",
+        (
+            pytest.param(0, "", id="valid"),
+            pytest.param(ClippingError.LOCATION, "location", id="single"),
+            pytest.param(ClippingError.BOOK | ClippingError.CONTENT, "book, content", id="multiple"),
+        ),
+    )
+    def test_describe_errors(self, code: int, expected_output: str):
+        """
+        GIVEN: Clipping errors code.
+        WHEN: Executing describe_errors on code.
+        THEN: Missing fields names returned.
+        """
+        assert describe_errors(code) == expected_output
+
+
+class TestValidationEngine:
+    """
+    Tests for clippings_service.validators.ValidationEngine class.
+    """
+
+    def test_lenient_mode(self):
+        """
+        GIVEN: ValidationEngine in lenient mode without reject stream.
+        WHEN: Validating valid and invalid Clippings.
+        THEN: All Clippings kept with errors codes, errors counted by missing field.
+        """
+        engine = ValidationEngine()
+        clippings = [dict(VALID_CLIPPING), {"book": {}}, {"content": ""}]
+
+        results = [engine.validate(clipping, []) for clipping in clippings]
+
+        assert results == [True, True, True]
+        assert [clipping["errors"] for clipping in clippings] == [0, 62, 31]
+        assert engine.invalid_count == 2
+        assert engine.rejected_count == 0
+        assert engine.error_counts == {
+            "book": 1,
+            "clipping_type": 2,
+            "page_number": 2,
+            "created_at": 2,
+            "location": 2,
+            "content": 1,
+        }
+
+    def test_reject_stream(self):
+        """
+        GIVEN: ValidationEngine in lenient mode with reject stream.
+        WHEN: Validating valid and invalid Clippings.
+        THEN: Invalid Clipping excluded from output and its raw record written to reject stream.
+        """
+        reject_stream = BytesIO()
+        engine = ValidationEngine(reject_stream=reject_stream)
+
+        assert engine.validate(dict(VALID_CLIPPING), ["Valid"]) is True
+        assert engine.validate({}, ["Invalid book line", "Invalid metadata line"]) is False
+        assert engine.rejected_count == 1
+        assert reject_stream.getvalue() == b"Invalid book line\nInvalid metadata line\n==========\n"
+
+    def test_strict_mode(self):
+        """
+        GIVEN: ValidationEngine in strict mode.
+        WHEN: Validating valid and invalid Clipping.
+        THEN: Valid Clipping kept, ClippingValidationError raised for invalid one.
+        """
+        engine = ValidationEngine(strict=True)
+
+        assert engine.validate(dict(VALID_CLIPPING), []) is True
+        with pytest.raises(ClippingValidationError) as error:
+            engine.validate({}, [])
+        assert error.value.code == 63
+
+    def test_fields(self):
+        """
+        GIVEN: ValidationEngine with fields projection without errors field.
+        WHEN: Validating Clippings containing only projected fields.
+        THEN: Only projected mandatory fields checked, errors codes not stored in Clippings.
+        """
+        engine = ValidationEngine(fields=frozenset({"book", "content"}))
+        clippings = [{"book": VALID_CLIPPING["book"], "content": "Content"}, {"content": "Content"}]
+
+        results = [engine.validate(clipping, []) for clipping in clippings]
+
+        assert results == [True, True]
+        assert all("errors" not in clipping for clipping in clippings)
+        assert engine.error_counts == {"book": 1}
@@ -0,0 +1,169 @@
+import random
+from collections import Counter
+from typing import Any
+
+import pytest
+from clippings_service.vocab import SpaceSavingCounter, VocabularyCounter, iter_ngrams, tokenize
+
+
+@pytest.fixture
+def stream() -> list[str]:
+    """
+    Returns stream of items of Zipf-like distribution.
+
+    Returns:
+        list[str]: Items stream.
+    """
+    generator = random.Random(7)
+    items = [f"item {number}" for number in range(500)]
+    return generator.choices(items, [1 / (rank + 1) for rank in range(len(items))], k=20000)
+
+
+class TestVocab:
+    """
+    Tests for clippings_service.vocab.py.
+    """
+
+    def test_tokenize(self):
+        """
+        GIVEN: Content with punctuation, numbers, apostrophes and mixed case.
+        WHEN: Calling tokenize().
+        THEN: Lowercase words returned, numbers and punctuation skipped.
+        """
+        assert tokenize("Don't PANIC - it's 42, Zaphod’s towel!") == ["don't", "panic", "it's", "zaphod’s", "towel"]
+
+    @pytest.mark.parametrize(
+        "size, stopwords, expected",
+        (
+            pytest.param(1, frozenset(), ["the", "cat", "on", "the", "mat"], id="words"),
+            pytest.param(2, frozenset(), ["the cat", "cat on", "on the", "the mat"], id="phrases"),
+            pytest.param(2, frozenset({"the"}), ["cat on"], id="stopwords"),
+            pytest.param(6, frozenset(), [], id="too-long"),
+        ),
+    )
+    def test_iter_ngrams(self, size: int, stopwords: frozenset[str], expected: list[str]):
+        """
+        GIVEN: Words of content.
+        WHEN: Calling iter_ngrams() with phrase size and stopwords.
+        THEN: Phrases not starting or ending with stopwords returned.
+        """
+        assert list(iter_ngrams(["the", "cat", "on", "the", "mat"], size, stopwords)) == expected
+
+    def test_space_saving_counter(self, stream: list[str]):
+        """
+        GIVEN: Stream of more distinct items than counter capacity.
+        WHEN: Counting items with SpaceSavingCounter.
+        THEN: At most capacity items tracked, counts bounded by errors, the most frequent items exact.
+        """
+        exact = Counter(stream)
+        counter = SpaceSavingCounter(50)
+
+        for item in stream:
+            counter.add(item)
+
+        assert len(counter) == 50
+        assert counter.total == sum(counter.counts.values()) == len(stream)
+        assert all(count - counter.errors[item] <= exact[item] <= count for item, count in counter.counts.items())
+        assert max(counter.errors.values()) <= len(stream) / 50
+        assert [item for item, _, _ in counter.most_common(3)] == [item for item, _ in exact.most_common(3)]
+
+    def test_space_saving_counter_exact(self):
+        """
+        GIVEN: Stream of less distinct items than counter capacity.
+        WHEN: Counting items with SpaceSavingCounter.
+        THEN: Exact counts without errors, ties sorted alphabetically.
+        """
+        counter = SpaceSavingCounter(10)
+
+        for item in ["b", "a", "c", "a", "b", "a"]:
+            counter.add(item)
+
+        assert counter.most_common() == [("a", 3, 0), ("b", 2, 0), ("c", 1, 0)]
+        assert counter.most_common(1) == [("a", 3, 0)]
+
+    def test_space_saving_counter_merge(self, stream: list[str]):
+        """
+        GIVEN: Counters of two halves of stream.
+        WHEN: Merging counters.
+        THEN: Merged counts bounded by errors of whole stream, the most frequent items exact.
+        """
+        exact = Counter(stream)
+        first, second = SpaceSavingCounter(50), SpaceSavingCounter(50)
+        for item in stream[:10000]:
+            first.add(item)
+        for item in stream[10000:]:
+            second.add(item)
+
+        merged = first.merge(second)
+
+        assert len(merged) == 50
+        assert merged.total == len(stream)
+        assert all(count - merged.errors[item] <= exact[item] <= count for item, count in merged.counts.items())
+        assert [item for item, _, _ in merged.most_common(3)] == [item for item, _ in exact.most_common(3)]
+        merged.add("new item")
+        assert merged.total == len(stream) + 1
+
+    def test_space_saving_counter_to_dict(self, stream: list[str]):
+        """
+        GIVEN: Counter of stream.
+        WHEN: Calling to_dict() and restoring counter with from_dict().
+        THEN: Restored counter equal to the original one.
+        """
+        counter = SpaceSavingCounter(50)
+        for item in stream:
+            counter.add(item)
+
+        restored = SpaceSavingCounter.from_dict(counter.to_dict(), capacity=50)
+
+        assert restored.most_common() == counter.most_common()
+        assert restored.total == counter.total
+        assert len(counter.to_dict(top=5)["items"]) == 5
+
+    def test_vocabulary_counter(self, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: List of Clippings and Clipping without content.
+        WHEN: Counting words and phrases with VocabularyCounter grouped by author.
+        THEN: Words and phrases counted per author, groups sorted by number of Clippings.
+        """
+        clippings = [*clippings_list, {**clippings_list[0], "content": "Highlighted content again."}, {"errors": 63}]
+
+        result = VocabularyCounter(group_by="author").update(clippings).to_dict(top=2)
+
+        assert [(group["group"], group["clippings"]) for group in result["groups"]] == [
+            ("Author 1", 2),
+            ("Author 2", 1),
+            ("Author 3", 1),
+        ]
+        assert result["groups"][0]["ngrams"]["1"]["items"] == [
+            {"item": "content", "count": 2, "error": 0},
+            {"item": "highlighted", "count": 2, "error": 0},
+        ]
+        assert result["groups"][0]["ngrams"]["2"]["total"] == 3
+
+    def test_vocabulary_counter_merge(self, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: VocabularyCounters of two chunks of Clippings.
+        WHEN: Merging counter restored from dictionary into the other one.
+        THEN: Counters equal to counters of all Clippings.
+        """
+        first = VocabularyCounter(stopwords=["Content"]).update(clippings_list[:2])
+        second = VocabularyCounter(stopwords=["Content"]).update(clippings_list[2:])
+
+        result = first.merge(VocabularyCounter.from_dict(second.to_dict()))
+
+        expected = VocabularyCounter(stopwords=["Content"]).update(clippings_list)
+        assert result.to_dict() == expected.to_dict()
+        assert result.to_dict()["groups"][0]["ngrams"]["1"]["items"][0] == {
+            "item": "highlighted",
+            "count": 2,
+            "error": 0,
+        }
+
+    def test_vocabulary_counter_merge_invalid(self):
+        """
+        GIVEN: VocabularyCounters of different groupings.
+        WHEN: Merging counters.
+        THEN: ValueError raised.
+        """
+        with pytest.raises(ValueError):
+            VocabularyCounter(group_by="book").merge(VocabularyCounter(group_by="author"))
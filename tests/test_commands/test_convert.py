@@ -1,9 +1,13 @@
+import json
 import os
+from pathlib import Path
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
 from click.testing import CliRunner
 from commands.convert import convert, get_full_input_path, get_full_output_path
+from openpyxl import load_workbook
 
 
 class TestGetFullInputPath:
@@ -25,6 +29,27 @@ class TestGetFullInputPath:
                 os.path.normpath(os.path.join(os.getcwd(), "subdir/My Clippings.txt")),
                 id="relative-path",
             ),
+            pytest.param(
+                "subdir/My Clippings.txt.gz",
+                os.path.normpath(os.path.join(os.getcwd(), "subdir/My Clippings.txt.gz")),
+                id="compressed-path",
+            ),
+            pytest.param(
+                "subdir/My Clippings.zip",
+                os.path.normpath(os.path.join(os.getcwd(), "subdir/My Clippings.zip")),
+                id="zip-path",
+            ),
+            pytest.param(
+                "subdir/Output.json.xz",
+                os.path.normpath(os.path.join(os.getcwd(), "subdir/Output.json.xz")),
+                id="json-export-path",
+            ),
+            pytest.param(
+                "subdir/Output.xlsx",
+                os.path.normpath(os.path.join(os.getcwd(), "subdir/Output.xlsx")),
+                id="excel-export-path",
+            ),
+            pytest.param("-", "-", id="stdin"),
         ),
     )
     @patch("os.path.exists", return_value=True)
@@ -76,6 +101,18 @@ class TestGetFullInputPath:
 
         assert result is None
 
+    @patch("os.path.exists", return_value=True)
+    @patch("os.path.isfile", return_value=True)
+    def test_get_full_input_path_is_not_compressed_txt_file(self, mock_isfile: MagicMock, mock_exists: MagicMock):
+        """
+        GIVEN: Compressed file, that is not a .txt file, passed as input file path.
+        WHEN: Calling get_full_input_path function with path.
+        THEN: Function returned None.
+        """
+        result = get_full_input_path("clippings/clippings.xml.gz")
+
+        assert result is None
+
 
 class TestGetFullOutputPath:
     """
@@ -87,6 +124,9 @@ class TestGetFullOutputPath:
         (
             pytest.param(None, "json", os.path.normpath(os.path.join(os.getcwd(), "Output.json")), id="default-json"),
             pytest.param(None, "excel", os.path.normpath(os.path.join(os.getcwd(), "Output.xlsx")), id="default-excel"),
+            pytest.param(
+                None, "snapshot", os.path.normpath(os.path.join(os.getcwd(), "Output.snapshot")), id="default-snapshot"
+            ),
             pytest.param(
                 os.path.normpath(os.path.join(os.getcwd(), "subdir", "Absolute.json")),
                 "json",
@@ -111,6 +151,11 @@ class TestGetFullOutputPath:
                 os.path.normpath(os.path.join(os.getcwd(), "subdir", "Absolute.xlsx")),
                 id="relative-excel",
             ),
+            pytest.param("-", "json", "-", id="stdout"),
+            pytest.param(
+                None, "markdown", os.path.normpath(os.path.join(os.getcwd(), "Output")), id="default-markdown"
+            ),
+            pytest.param("pages", "html", os.path.normpath(os.path.join(os.getcwd(), "pages")), id="relative-html"),
         ),
     )
     def test_get_full_output_path_successful(self, path: str | None, format: str, expected_output: str | None):
@@ -150,10 +195,24 @@ class TestConvert:
             pytest.param(["--format", "excel"], id="--format-excel"),
             pytest.param(["-f", "json"], id="-f-json"),
             pytest.param(["-f", "excel"], id="-f-excel"),
+            pytest.param(["-f", "markdown"], id="-f-markdown"),
+            pytest.param(["-f", "html"], id="-f-html"),
+            pytest.param(["-f", "snapshot"], id="-f-snapshot"),
             pytest.param(["-f", "json", "--input_path", "C:\\my_fancy_clippings.txt"], id="--input_path"),
             pytest.param(["-f", "json", "-i", "C:\\my_fancy_clippings.txt"], id="-i"),
             pytest.param(["-f", "json", "--output_path", "C:\\my_fancy_clippings.json"], id="--output_path"),
             pytest.param(["-f", "json", "-o", "C:\\my_fancy_clippings.json"], id="-o"),
+            pytest.param(["-f", "json", "--pipelined"], id="--pipelined"),
+            pytest.param(["-f", "json", "--strict"], id="--strict"),
+            pytest.param(["-f", "json", "--lenient", "-r", "rejected.txt"], id="--lenient-with-reject-path"),
+            pytest.param(["-f", "json", "--shard_size", "100"], id="--shard_size"),
+            pytest.param(["-f", "json", "--fuzzy_dedupe", "--similarity", "0.7"], id="--fuzzy_dedupe"),
+            pytest.param(["-f", "json", "--fuzzy_dedupe", "--dedupe_cache", "cache.bin"], id="--dedupe_cache"),
+            pytest.param(["-f", "excel", "--shard_by", "month", "--shard_size", "100"], id="--shard_by"),
+            pytest.param(["-f", "json", "--metrics_file", "metrics.prom"], id="--metrics_file"),
+            pytest.param(["-f", "excel", "--fields", "book,content"], id="--fields"),
+            pytest.param(["-f", "excel", "--sheet_per_book"], id="--sheet_per_book"),
+            pytest.param(["-f", "json", "--only_new", "--state_dir", "state"], id="--only_new"),
         ],
     )
     def test_convert_successful(
@@ -170,6 +229,10 @@ class TestConvert:
                 output_path = "C:\\Clippings.json"
             case "excel":
                 output_path = "C:\\Clippings.xlsx"
+            case "snapshot":
+                output_path = "C:\\Clippings.snapshot"
+            case "markdown" | "html":
+                output_path = "C:\\Clippings"
             case _:
                 output_path = None
         if "-i" in args:
@@ -254,3 +317,206 @@ class TestConvert:
 
         assert result.return_value is None
         assert result.exit_code == 1
+
+
+class TestConvertStdio:
+    """
+    "clippings_cli convert" command tests with standard input and output.
+    """
+
+    def test_convert_stdin_to_stdout(self, clippings_input: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: clippings_cli installed, Clippings passed to stdin.
+        WHEN: Calling "clippings_cli convert" command with "-" as input and output path.
+        THEN: JSON output written to stdout, logs written to stderr, command existed with 0 code.
+        """
+        runner = CliRunner(mix_stderr=False)
+
+        result = runner.invoke(convert, ["-f", "json", "-i", "-", "-o", "-"], input=clippings_input)
+
+        assert json.loads(result.stdout) == clippings_list
+        assert "Output file generation finished successfully." in result.stderr
+        assert result.exit_code == 0
+
+    def test_convert_sharded_to_stdout(self, clippings_input: str):
+        """
+        GIVEN: clippings_cli installed, Clippings passed to stdin.
+        WHEN: Calling "clippings_cli convert" command with "-" as output path and --shard_by option.
+        THEN: Error written to stderr, command existed with 1 code.
+        """
+        runner = CliRunner(mix_stderr=False)
+
+        result = runner.invoke(
+            convert, ["-f", "json", "-i", "-", "-o", "-", "--shard_by", "book"], input=clippings_input
+        )
+
+        assert "Sharded output can not be written to stdout." in result.stderr
+        assert result.exit_code == 1
+
+    def test_convert_fields(self, clippings_input: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: clippings_cli installed, Clippings passed to stdin.
+        WHEN: Calling "clippings_cli convert" command with --fields option.
+        THEN: JSON output containing only requested fields, in output order, written to stdout.
+        """
+        runner = CliRunner(mix_stderr=False)
+
+        result = runner.invoke(
+            convert, ["-f", "json", "-i", "-", "-o", "-", "--fields", "content, Book"], input=clippings_input
+        )
+
+        assert json.loads(result.stdout) == [
+            {"book": clipping["book"], "content": clipping["content"]} for clipping in clippings_list
+        ]
+        assert result.exit_code == 0
+
+    def test_convert_multiple_formats(self, tmp_path: Path, clippings_input: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: clippings_cli installed, Clippings passed to stdin.
+        WHEN: Calling "clippings_cli convert" command with multiple --format and --output_path options.
+        THEN: Output of every format written to its path, command existed with 0 code.
+        """
+        runner = CliRunner(mix_stderr=False)
+        json_path, excel_path = str(tmp_path / "output.json"), str(tmp_path / "output.xlsx")
+
+        result = runner.invoke(
+            convert, ["-f", "json", "-f", "excel", "-i", "-", "-o", json_path, "-o", excel_path], input=clippings_input
+        )
+
+        assert "* Format [json, excel]" in result.stdout
+        assert f"* Output path [{json_path}, {excel_path}]" in result.stdout
+        with open(json_path, "r", encoding="utf-8") as file:
+            assert json.load(file) == clippings_list
+        assert load_workbook(excel_path).active.max_row == len(clippings_list) + 1
+        assert result.exit_code == 0
+
+    @pytest.mark.parametrize(
+        "args, message",
+        (
+            pytest.param(["-o", "-"], "Number of output paths has to match number of formats.", id="mismatch"),
+            pytest.param(["-o", "-", "-o", "-"], "Every format has to be written to different path.", id="duplicate"),
+        ),
+    )
+    def test_convert_multiple_formats_invalid(self, clippings_input: str, args: list[str], message: str):
+        """
+        GIVEN: clippings_cli installed, Clippings passed to stdin.
+        WHEN: Calling "clippings_cli convert" command with multiple formats and invalid output paths.
+        THEN: Error written to stderr, command existed with 1 code.
+        """
+        runner = CliRunner(mix_stderr=False)
+
+        result = runner.invoke(convert, ["-f", "json", "-f", "html", "-i", "-", *args], input=clippings_input)
+
+        assert message in result.stderr
+        assert result.exit_code == 1
+
+    def test_convert_grep_file(self, tmp_path: Path, clippings_input: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: clippings_cli installed, Clippings passed to stdin, keywords file exists.
+        WHEN: Calling "clippings_cli convert" command with --grep_file option.
+        THEN: JSON output containing only Clippings mentioning keywords written to stdout.
+        """
+        grep_file = tmp_path / "keywords.txt"
+        grep_file.write_text("# Glossary\nnoted\nunknown keyword\n", encoding="utf-8")
+        runner = CliRunner(mix_stderr=False)
+
+        result = runner.invoke(
+            convert, ["-f", "json", "-i", "-", "-o", "-", "--grep_file", str(grep_file)], input=clippings_input
+        )
+
+        assert json.loads(result.stdout) == [clippings_list[1]]
+        assert result.exit_code == 0
+
+    @pytest.mark.parametrize(
+        "content, message",
+        (
+            pytest.param("# Glossary\n\n", "contains no keywords.", id="empty"),
+            pytest.param(None, "Keywords file can not be read", id="missing"),
+        ),
+    )
+    def test_convert_grep_file_invalid(self, tmp_path: Path, clippings_input: str, content: str | None, message: str):
+        """
+        GIVEN: clippings_cli installed, Clippings passed to stdin, keywords file empty or missing.
+        WHEN: Calling "clippings_cli convert" command with --grep_file option.
+        THEN: Error written to stderr, command existed with 1 code.
+        """
+        grep_file = tmp_path / "keywords.txt"
+        if content is not None:
+            grep_file.write_text(content, encoding="utf-8")
+        runner = CliRunner(mix_stderr=False)
+
+        result = runner.invoke(
+            convert, ["-f", "json", "-i", "-", "-o", "-", "--grep_file", str(grep_file)], input=clippings_input
+        )
+
+        assert message in result.stderr
+        assert result.exit_code == 1
+
+    def test_convert_join_notes(self, clippings_input: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: clippings_cli installed, Clippings passed to stdin, note of other book than highlights.
+        WHEN: Calling "clippings_cli convert" command with --join_notes option.
+        THEN: Unmatched note written as separate Clipping, JSON output equal to regular output.
+        """
+        runner = CliRunner(mix_stderr=False)
+
+        result = runner.invoke(convert, ["-f", "json", "-i", "-", "-o", "-", "--join_notes"], input=clippings_input)
+
+        assert json.loads(result.stdout) == clippings_list
+        assert result.exit_code == 0
+
+    def test_convert_join_notes_snapshot(self, clippings_input: str):
+        """
+        GIVEN: clippings_cli installed, Clippings passed to stdin.
+        WHEN: Calling "clippings_cli convert" command with snapshot format and --join_notes option.
+        THEN: Error written to stderr, command existed with 1 code.
+        """
+        runner = CliRunner(mix_stderr=False)
+
+        result = runner.invoke(convert, ["-f", "snapshot", "-i", "-", "-o", "-", "--join_notes"], input=clippings_input)
+
+        assert "Notes joining is not supported by snapshot format." in result.stderr
+        assert result.exit_code == 1
+
+    def test_convert_fields_page_format(self, tmp_path: Path, clippings_input: str):
+        """
+        GIVEN: clippings_cli installed, Clippings passed to stdin.
+        WHEN: Calling "clippings_cli convert" command with markdown format and --fields option without page fields.
+        THEN: Error listing missing page fields written to stderr, command existed with 1 code.
+        """
+        runner = CliRunner(mix_stderr=False)
+        output_path = os.path.join(tmp_path, "pages")
+
+        result = runner.invoke(
+            convert, ["-f", "markdown", "-i", "-", "-o", output_path, "--fields", "book,content"], input=clippings_input
+        )
+
+        assert "Fields [clipping_type, created_at, location] are required by selected options." in result.stderr
+        assert result.exit_code == 1
+        assert not os.path.exists(output_path)
+
+    @pytest.mark.parametrize(
+        "args, message",
+        (
+            pytest.param(["--fields", "book,title"], "Unknown fields [title]", id="unknown"),
+            pytest.param(["--fields", ","], "At least one field is required.", id="empty"),
+            pytest.param(["--fields", "book", "--fuzzy_dedupe"], "Fields [content] are required", id="dedupe"),
+            pytest.param(["--sheet_per_book"], "Sheet per book is supported only by excel format.", id="sheets"),
+            pytest.param(["--fields", "content", "--join_notes"], "Fields [book, clipping_type", id="join-notes"),
+            pytest.param(["--fields", "book,content", "--only_new", "--state_dir", "state"], "Fields [", id="only-new"),
+            pytest.param(["--only_new"], "State directory is required by --only_new.", id="only-new-state"),
+            pytest.param(["--state_dir", "state"], "State directory is used only with --only_new.", id="state"),
+        ),
+    )
+    def test_convert_fields_invalid(self, clippings_input: str, args: list[str], message: str):
+        """
+        GIVEN: clippings_cli installed, Clippings passed to stdin.
+        WHEN: Calling "clippings_cli convert" command with invalid --fields option.
+        THEN: Error written to stderr, command existed with non-zero code.
+        """
+        runner = CliRunner(mix_stderr=False)
+
+        result = runner.invoke(convert, ["-f", "json", "-i", "-", "-o", "-", *args], input=clippings_input)
+
+        assert message in result.stderr
+        assert result.exit_code != 0
@@ -0,0 +1,40 @@
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from click.testing import CliRunner
+from commands.serve import serve
+
+
+class TestServe:
+    """
+    "clippings_cli serve" command tests.
+    """
+
+    @patch("commands.serve.asyncio.run")
+    def test_serve(self, mocked_run: MagicMock, tmp_path: Path, clippings_input: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli serve" command.
+        THEN: Clippings loaded, server started, command existed with 0 code.
+        """
+        input_path = os.path.join(tmp_path, "My Clippings.txt")
+        with open(input_path, "w", encoding="utf8") as file:
+            file.write(clippings_input)
+
+        result = CliRunner().invoke(serve, ["-i", input_path, "-p", "0"])
+
+        assert "Clippings loaded: 3 from 3 books." in result.stdout
+        mocked_run.assert_called_once()
+        mocked_run.call_args.args[0].close()
+        assert result.exit_code == 0
+
+    def test_serve_stdin(self):
+        """
+        GIVEN: clippings_cli installed.
+        WHEN: Calling "clippings_cli serve" command with stdin as input.
+        THEN: Command existed with 1 code.
+        """
+        result = CliRunner().invoke(serve, ["-i", "-"])
+
+        assert result.exit_code == 1
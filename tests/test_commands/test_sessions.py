@@ -0,0 +1,72 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from commands.sessions import sessions
+
+
+@pytest.fixture
+def input_path(tmp_path: Path, clippings_input: str) -> str:
+    """
+    Returns path to Clippings file in temporary location.
+
+    Args:
+        tmp_path (Path): Temporary pytest files location.
+        clippings_input (str): Clippings file content.
+
+    Returns:
+         str: Path to Clippings file in temporary pytest files location.
+    """
+    path = os.path.join(tmp_path, "My Clippings.txt")
+    with open(path, "w", encoding="utf8") as file:
+        file.write(clippings_input)
+    return path
+
+
+class TestSessions:
+    """
+    "clippings_cli sessions" command tests.
+    """
+
+    def test_sessions_table(self, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli sessions" command.
+        THEN: Session of every book printed to stdout, command existed with 0 code.
+        """
+        result = CliRunner().invoke(sessions, ["-i", input_path])
+
+        assert result.stdout.splitlines()[:2] == [
+            "  1. [2025-01-01 05:00:00 - 2025-01-01 05:00:00]    0 min     1 clippings  locations 11-12",
+            "     Book 1 (Author 1)",
+        ]
+        assert result.stdout.count("clippings") == 3
+        assert result.exit_code == 0
+
+    def test_sessions_json(self, tmp_path: Path, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli sessions" command with json format and output path.
+        THEN: Sessions written to JSON file, command existed with 0 code.
+        """
+        output_path = os.path.join(tmp_path, "sessions.json")
+
+        result = CliRunner().invoke(sessions, ["-i", input_path, "-o", output_path, "-f", "json", "-g", "120"])
+
+        with open(output_path, "r", encoding="utf8") as file:
+            records = json.load(file)
+        assert [session["book"]["title"] for session in records] == ["Book 1", "Book 2", "Book 3"]
+        assert records[1]["clipping_types"] == {"Note": 1}
+        assert result.exit_code == 0
+
+    def test_sessions_invalid_input_path(self, tmp_path: Path):
+        """
+        GIVEN: clippings_cli installed, input file does not exist.
+        WHEN: Calling "clippings_cli sessions" command.
+        THEN: Command existed with 1 code.
+        """
+        result = CliRunner().invoke(sessions, ["-i", os.path.join(tmp_path, "missing.txt")])
+
+        assert result.exit_code == 1
@@ -0,0 +1,86 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from click.testing import CliRunner
+from clippings_service.offsets import get_offsets_path
+from commands.show import show
+
+
+@pytest.fixture
+def input_path(tmp_path: Path, clippings_input: str) -> str:
+    """
+    Returns path to Clippings file in temporary location.
+
+    Args:
+        tmp_path (Path): Temporary pytest files location.
+        clippings_input (str): Clippings file content.
+
+    Returns:
+         str: Path to Clippings file in temporary pytest files location.
+    """
+    path = os.path.join(tmp_path, "My Clippings.txt")
+    with open(path, "w", encoding="utf8") as file:
+        file.write(clippings_input)
+    return path
+
+
+class TestShow:
+    """
+    "clippings_cli show" command tests.
+    """
+
+    def test_show_table(self, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli show" command with --page and --page_size options.
+        THEN: Page of Clippings printed to stdout, offsets file created in cache directory, command existed with 0 code.
+        """
+        result = CliRunner().invoke(show, ["-i", input_path, "--page", "2", "--page_size", "2"])
+
+        assert result.stdout == (
+            "  3. [2025-01-01 07:00:00] [Highlight] Book 3 (Author 3) - 20 chars\n     Highlighted content.\n"
+            "Page 2 of 2\n"
+        )
+        assert os.path.exists(get_offsets_path(input_path))
+        assert os.listdir(os.path.dirname(input_path)) == ["My Clippings.txt"]
+        assert result.exit_code == 0
+
+    def test_show_json(self, input_path: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli show" command with json format.
+        THEN: Page of Clippings printed to stdout as JSON, command existed with 0 code.
+        """
+        result = CliRunner().invoke(show, ["-i", input_path, "-p", "1", "-s", "2", "-f", "json"])
+
+        assert json.loads(result.stdout) == clippings_list[:2]
+        assert result.exit_code == 0
+
+    def test_show_export(self, tmp_path: Path, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: clippings_cli installed, JSON export exists.
+        WHEN: Calling "clippings_cli show" command with --page option.
+        THEN: Page of Clippings printed to stdout as JSON, command existed with 0 code.
+        """
+        path = os.path.join(tmp_path, "Clippings.json")
+        with open(path, "w", encoding="utf8") as file:
+            json.dump(clippings_list, file)
+
+        result = CliRunner().invoke(show, ["-i", path, "-p", "3", "-s", "1", "-f", "json"])
+
+        assert json.loads(result.stdout) == clippings_list[2:]
+        assert result.exit_code == 0
+
+    def test_show_page_out_of_range(self, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli show" command with page number larger than number of pages.
+        THEN: Error printed, command existed with 1 code.
+        """
+        result = CliRunner(mix_stderr=False).invoke(show, ["-i", input_path, "-p", "3", "-s", "2"])
+
+        assert "Page [3] out of range [1-2]." in result.stderr
+        assert result.exit_code == 1
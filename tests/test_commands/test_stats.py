@@ -0,0 +1,71 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from commands.stats import stats
+
+
+@pytest.fixture
+def input_path(tmp_path: Path, clippings_input: str) -> str:
+    """
+    Returns path to Clippings file in temporary location.
+
+    Args:
+        tmp_path (Path): Temporary pytest files location.
+        clippings_input (str): Clippings file content.
+
+    Returns:
+         str: Path to Clippings file in temporary pytest files location.
+    """
+    path = os.path.join(tmp_path, "My Clippings.txt")
+    with open(path, "w", encoding="utf8") as file:
+        file.write(clippings_input)
+    return path
+
+
+class TestStats:
+    """
+    "clippings_cli stats" command tests.
+    """
+
+    def test_stats_table(self, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli stats" command.
+        THEN: Statistics tables printed to stdout, command existed with 0 code.
+        """
+        result = CliRunner().invoke(stats, ["-i", input_path])
+
+        assert "Clippings: 3" in result.stdout
+        assert "Book 1 (Author 1)  1" in result.stdout
+        assert "Highlight      2" in result.stdout
+        assert result.exit_code == 0
+
+    def test_stats_json_file(self, input_path: str, tmp_path: Path):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli stats" command with json format and output path.
+        THEN: Statistics saved in JSON file, command existed with 0 code.
+        """
+        output_path = os.path.join(tmp_path, "stats.json")
+
+        result = CliRunner().invoke(stats, ["-i", input_path, "-f", "json", "-o", output_path, "--top", "2"])
+
+        with open(output_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        assert data["total"] == 3
+        assert len(data["books"]) == 2
+        assert "Statistics saved successfully." in result.stdout
+        assert result.exit_code == 0
+
+    def test_stats_invalid_input_path(self, tmp_path: Path):
+        """
+        GIVEN: clippings_cli installed, input file does not exist.
+        WHEN: Calling "clippings_cli stats" command.
+        THEN: Command existed with 1 code.
+        """
+        result = CliRunner().invoke(stats, ["-i", os.path.join(tmp_path, "Not existing.txt")])
+
+        assert result.exit_code == 1
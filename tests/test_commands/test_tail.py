@@ -0,0 +1,76 @@
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from click.testing import CliRunner
+from commands.show import show
+from commands.tail import tail
+
+
+@pytest.fixture
+def input_path(tmp_path: Path, clippings_input: str) -> str:
+    """
+    Returns path to Clippings file in temporary location.
+
+    Args:
+        tmp_path (Path): Temporary pytest files location.
+        clippings_input (str): Clippings file content.
+
+    Returns:
+         str: Path to Clippings file in temporary pytest files location.
+    """
+    path = os.path.join(tmp_path, "My Clippings.txt")
+    with open(path, "w", encoding="utf8") as file:
+        file.write(clippings_input)
+    return path
+
+
+class TestTail:
+    """
+    "clippings_cli tail" command tests.
+    """
+
+    def test_tail_table(self, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists without offsets file.
+        WHEN: Calling "clippings_cli tail" command with -n option.
+        THEN: Last Clippings printed to stdout, no offsets file created, command existed with 0 code.
+        """
+        result = CliRunner().invoke(tail, ["-i", input_path, "-n", "1"])
+
+        assert result.stdout == (
+            "  1. [2025-01-01 07:00:00] [Highlight] Book 3 (Author 3) - 20 chars\n     Highlighted content.\n"
+        )
+        assert os.listdir(os.path.dirname(input_path)) == ["My Clippings.txt"]
+        assert result.exit_code == 0
+
+    def test_tail_indexed(self, input_path: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: clippings_cli installed, input .txt file indexed by "clippings_cli show" command.
+        WHEN: Calling "clippings_cli tail" command with json format.
+        THEN: Last Clippings printed to stdout as JSON, command existed with 0 code.
+        """
+        CliRunner().invoke(show, ["-i", input_path])
+
+        result = CliRunner().invoke(tail, ["-i", input_path, "-n", "2", "-f", "json"])
+
+        assert json.loads(result.stdout) == clippings_list[-2:]
+        assert result.exit_code == 0
+
+    def test_tail_compressed(self, tmp_path: Path, clippings_input: str, clippings_list: list[dict[str, Any]]):
+        """
+        GIVEN: clippings_cli installed, compressed input file exists.
+        WHEN: Calling "clippings_cli tail" command with count larger than number of Clippings.
+        THEN: All Clippings printed to stdout as JSON, command existed with 0 code.
+        """
+        path = os.path.join(tmp_path, "My Clippings.txt.gz")
+        with gzip.open(path, "wt", encoding="utf8") as file:
+            file.write(clippings_input)
+
+        result = CliRunner().invoke(tail, ["-i", path, "-n", "10", "-f", "json"])
+
+        assert json.loads(result.stdout) == clippings_list
+        assert result.exit_code == 0
@@ -0,0 +1,81 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from commands.top import top
+from openpyxl import load_workbook
+
+
+@pytest.fixture
+def input_path(tmp_path: Path, clippings_input: str) -> str:
+    """
+    Returns path to Clippings file in temporary location.
+
+    Args:
+        tmp_path (Path): Temporary pytest files location.
+        clippings_input (str): Clippings file content.
+
+    Returns:
+         str: Path to Clippings file in temporary pytest files location.
+    """
+    path = os.path.join(tmp_path, "My Clippings.txt")
+    with open(path, "w", encoding="utf8") as file:
+        file.write(clippings_input)
+    return path
+
+
+class TestTop:
+    """
+    "clippings_cli top" command tests.
+    """
+
+    def test_top_table(self, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli top" command with recent key and Note type.
+        THEN: Latest Note printed to stdout, command existed with 0 code.
+        """
+        result = CliRunner().invoke(top, ["-i", input_path, "-k", "recent", "-t", "note"])
+
+        assert result.stdout == (
+            "  1. [2025-01-01 06:00:00] [Note] Book 2 (Author 2) - 14 chars\n     Noted content.\n"
+        )
+        assert result.exit_code == 0
+
+    def test_top_books_json(self, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli top" command with books key and json format.
+        THEN: Books ranking printed to stdout as JSON, command existed with 0 code.
+        """
+        result = CliRunner().invoke(top, ["-i", input_path, "-k", "books", "-n", "2", "-f", "json"])
+
+        assert [book["count"] for book in json.loads(result.stdout)] == [1, 1]
+        assert result.exit_code == 0
+
+    def test_top_excel(self, input_path: str, tmp_path: Path):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli top" command with length key and excel format.
+        THEN: Longest Clippings saved in Excel file, command existed with 0 code.
+        """
+        output_path = os.path.join(tmp_path, "top.xlsx")
+
+        result = CliRunner().invoke(top, ["-i", input_path, "-n", "2", "-f", "excel", "-o", output_path])
+
+        ws = load_workbook(output_path).active
+        assert ws.max_row == 3
+        assert ws.cell(row=2, column=3).value == "Highlighted content."
+        assert result.exit_code == 0
+
+    def test_top_books_excel(self, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli top" command with books key and excel format.
+        THEN: Command existed with 1 code.
+        """
+        result = CliRunner().invoke(top, ["-i", input_path, "-k", "books", "-f", "excel"])
+
+        assert result.exit_code == 1
@@ -0,0 +1,94 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from commands.vocab import vocab
+
+
+@pytest.fixture
+def input_path(tmp_path: Path, clippings_input: str) -> str:
+    """
+    Returns path to Clippings file in temporary location.
+
+    Args:
+        tmp_path (Path): Temporary pytest files location.
+        clippings_input (str): Clippings file content.
+
+    Returns:
+         str: Path to Clippings file in temporary pytest files location.
+    """
+    path = os.path.join(tmp_path, "My Clippings.txt")
+    with open(path, "w", encoding="utf8") as file:
+        file.write(clippings_input)
+    return path
+
+
+class TestVocab:
+    """
+    "clippings_cli vocab" command tests.
+    """
+
+    def test_vocab_table(self, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists.
+        WHEN: Calling "clippings_cli vocab" command.
+        THEN: The most common words and phrases printed to stdout, command existed with 0 code.
+        """
+        result = CliRunner().invoke(vocab, ["-i", input_path, "-n", "1"])
+
+        assert result.stdout == (
+            "All - Clippings: 3\n\nWords    Count\n-------  -----\ncontent  3\n\n"
+            "2-word phrases       Count\n-------------------  -----\nhighlighted content  2\n"
+        )
+        assert result.exit_code == 0
+
+    def test_vocab_counters_file(self, tmp_path: Path, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists, stopwords file exists.
+        WHEN: Calling "clippings_cli vocab" command twice with the same counters file and json format.
+        THEN: Counters of the second run merged with counters saved by the first one.
+        """
+        counters_file = os.path.join(tmp_path, "counters.json")
+        stopwords = os.path.join(tmp_path, "stopwords.txt")
+        with open(stopwords, "w", encoding="utf8") as file:
+            file.write("content\n")
+        args = [
+            "-i",
+            input_path,
+            "-f",
+            "json",
+            "-g",
+            "book",
+            "--stopwords",
+            stopwords,
+            "--counters_file",
+            counters_file,
+        ]
+
+        CliRunner().invoke(vocab, args)
+        result = CliRunner().invoke(vocab, args)
+
+        groups = json.loads(result.stdout)["groups"]
+        assert [(group["group"], group["clippings"]) for group in groups] == [
+            ("Book 1 (Author 1)", 2),
+            ("Book 2 (Author 2)", 2),
+            ("Book 3 (Author 3)", 2),
+        ]
+        assert groups[0]["ngrams"]["1"]["items"] == [{"item": "highlighted", "count": 2, "error": 0}]
+        assert result.exit_code == 0
+
+    def test_vocab_counters_file_invalid(self, tmp_path: Path, input_path: str):
+        """
+        GIVEN: clippings_cli installed, input .txt file exists, counters file of different grouping exists.
+        WHEN: Calling "clippings_cli vocab" command with counters file.
+        THEN: Error written to stderr, command existed with 1 code.
+        """
+        counters_file = os.path.join(tmp_path, "counters.json")
+        CliRunner().invoke(vocab, ["-i", input_path, "-g", "author", "--counters_file", counters_file])
+
+        result = CliRunner(mix_stderr=False).invoke(vocab, ["-i", input_path, "--counters_file", counters_file])
+
+        assert "Counters file can not be merged" in result.stderr
+        assert result.exit_code == 1
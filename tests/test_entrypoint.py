@@ -14,6 +14,6 @@ def test_cli():
 
     assert "CLI for reading data from Kindle MyClippings.txt file." in result.stdout
     assert "--help  Show this message and exit." in result.stdout
-    assert "convert  Convert Clippings file to one of supported formats."
+    assert "convert  Convert Clippings file to one or more of supported formats."
     assert result.return_value is None
     assert result.exit_code == 0